@@ -1109,5 +1109,56 @@ def analyze():
     run_analysis()
 
 
+@app.command(name="startup-report")
+def startup_report(
+    analysts: str = typer.Option(
+        "market,social,news,fundamentals", help="Comma-separated analyst set to build"
+    ),
+    rag: bool = typer.Option(False, "--rag/--no-rag", help="Enable RAG components"),
+    warm: bool = typer.Option(
+        False, "--warm", help="Also initialize lazy components (memories, RAG, market regime)"
+    ),
+    imports: bool = typer.Option(
+        False, "--imports", help="Measure cold import time of heavy modules (chromadb, langchain, ...)"
+    ),
+):
+    """Build a TradingAgentsGraph and print per-component startup timings."""
+    from tradingagents.utils.startup_timing import get_startup_timer, measure_import_times
+
+    graph = TradingAgentsGraph(
+        [a.strip() for a in analysts.split(",") if a.strip()],
+        config=DEFAULT_CONFIG.copy(),
+        enable_rag=rag,
+    )
+    if warm:
+        for memory in (
+            graph.bull_memory,
+            graph.bear_memory,
+            graph.trader_memory,
+            graph.invest_judge_memory,
+            graph.risk_manager_memory,
+        ):
+            memory.situation_collection  # creates the ChromaDB collection
+        graph._ensure_rag()
+        graph._apply_adaptive_config()
+
+    table = Table(title="Component initialization", box=box.SIMPLE_HEAD)
+    table.add_column("Component", style="cyan")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Count", justify="right")
+    for name, entry in get_startup_timer().get_report().items():
+        table.add_row(name, f"{entry['total_seconds']:.3f}", str(entry["count"]))
+    console.print(table)
+
+    if imports:
+        import_table = Table(title="Cold import time", box=box.SIMPLE_HEAD)
+        import_table.add_column("Module", style="cyan")
+        import_table.add_column("Seconds", justify="right")
+        times = measure_import_times()
+        for module, seconds in sorted(times.items(), key=lambda item: item[1] or 0.0, reverse=True):
+            import_table.add_row(module, f"{seconds:.3f}" if seconds is not None else "failed")
+        console.print(import_table)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,44 @@
+-- Migration 017: Latest Two Closes Per Ticker
+-- Purpose: Let screener enrichment (current price, change %) join one view instead of
+--          running an ORDER BY price_date DESC LIMIT 2 query per result
+-- Date: 2026-10-18
+
+-- ============================================================================
+-- v_latest_closes: most recent close/volume and the close before it
+-- ============================================================================
+
+-- Each LATERAL subquery is a single index probe on idx_prices_ticker_date
+CREATE OR REPLACE VIEW v_latest_closes AS
+SELECT
+    t.ticker_id,
+    latest.price_date,
+    latest.close,
+    latest.volume,
+    prev.close AS prev_close,
+    CASE
+        WHEN prev.close > 0 THEN (latest.close - prev.close) / prev.close * 100
+    END AS change_pct
+FROM tickers t
+CROSS JOIN LATERAL (
+    SELECT dp.price_date, dp.close, dp.volume
+    FROM daily_prices dp
+    WHERE dp.ticker_id = t.ticker_id
+    ORDER BY dp.price_date DESC
+    LIMIT 1
+) latest
+LEFT JOIN LATERAL (
+    SELECT dp.close
+    FROM daily_prices dp
+    WHERE dp.ticker_id = t.ticker_id
+        AND dp.price_date < latest.price_date
+    ORDER BY dp.price_date DESC
+    LIMIT 1
+) prev ON TRUE;
+
+COMMENT ON VIEW v_latest_closes IS
+'Latest close/volume and previous close per ticker, for one-join price enrichment of scan results.';
+
+-- ============================================================================
+-- Rollback
+-- ============================================================================
+-- DROP VIEW IF EXISTS v_latest_closes;
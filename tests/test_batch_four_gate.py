@@ -0,0 +1,190 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Parity tests for the batch four-gate evaluator.
+
+Random gate inputs covering every branch (absent values, boundary values,
+optional contexts, dynamic thresholds) are scored by the scalar
+FourGateFramework.evaluate_all_gates() and by BatchFourGateEvaluator; scores,
+pass flags, decisions and confidence must match exactly.
+"""
+
+import random
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.backtest.backtest_engine import BacktestEngine
+from tradingagents.decision import BatchFourGateEvaluator, FourGateFramework, flatten_gate_inputs
+
+GATES = ['fundamental', 'technical', 'risk', 'timing']
+
+
+def _maybe(rng, values):
+    """A value from ``values`` (boundaries included) or None."""
+    return rng.choice(values + [None])
+
+
+def _random_inputs(rng):
+    fundamentals = {
+        'pe_ratio': _maybe(rng, [0, -5.0, 8.0, 15, 20.0, 25, 40.0, 60.0]),
+        'forward_pe': _maybe(rng, [0, 6.0, 12.0, 18.0, 30.0]),
+        'revenue_growth_yoy': _maybe(rng, [-0.1, 0, 0.05, 0.10, 0.15, 0.20, 0.3]),
+        'debt_to_equity': _maybe(rng, [0, 0.2, 0.5, 1.0, 2.0, 3.0]),
+        'dividend_yield': _maybe(rng, [0, 1.0, 2.0, 2.5, 3.0, 4.0]),
+    }
+    signals = {
+        'rsi': _maybe(rng, [20.0, 30, 40.0, 50, 60.0, 70, 80.0]),
+        'volume_ratio': rng.choice([0.5, 1.0, 1.5, 2.0]),
+    }
+    for name in ['macd_bullish_crossover', 'macd_bearish_crossover', 'price_above_ma20', 'price_above_ma50',
+                 'ma20_above_ma50', 'near_support', 'near_resistance']:
+        if rng.random() < 0.8:
+            signals[name] = rng.random() < 0.5
+    price_data = {
+        'current_price': _maybe(rng, [0, 80.0, 95.0, 100.0]),
+        'week_52_high': _maybe(rng, [0, 100.0, 104.0, 130.0]),
+    }
+    if rng.random() < 0.3:
+        price_data['price'] = rng.choice([85.0, 100.0, 120.0])
+    risk_analysis = {
+        'max_expected_drawdown_pct': _maybe(rng, [5.0, 15, 18.0, 20, 25.0]),
+        'risk_reward_ratio': _maybe(rng, [1.0, 1.5, 2.0, 2.5, 3.0, 4.0]),
+        'red_flags': rng.sample(['earnings', 'lawsuit', 'dilution', 'guidance'], rng.randint(0, 4)),
+    }
+    similar = [{'final_decision': rng.choice(['BUY', 'SELL', 'HOLD'])} for _ in range(rng.randint(0, 6))]
+    historical_context = {
+        'pattern_success_rate': _maybe(rng, [0, 0.3, 0.4, 0.6, 0.7, 0.9]),
+        'last_analysis': {'price': _maybe(rng, [0, 80.0, 100.0, 120.0])} if rng.random() < 0.6 else None,
+        'similar_situations': similar,
+        'sector_context': {'buy_signal_rate': _maybe(rng, [0, 0.1, 0.2, 0.4, 0.5, 0.8])},
+    }
+
+    return dict(
+        fundamentals=fundamentals,
+        signals=signals,
+        price_data=price_data,
+        risk_analysis=risk_analysis,
+        position_size_pct=rng.choice([2.0, 5.0, 7.0, 8.0, 10.0, 12.0]),
+        historical_context=historical_context,
+        sector_avg={'pe_ratio': _maybe(rng, [0, 15.0, 20.0, 25.0])} if rng.random() < 0.5 else None,
+        portfolio_context={
+            'sector': 'Technology',
+            'sector_exposure': rng.choice([0.0, 10.0, 15.0, 25.0, 30.0, 34.0]),
+            'sector_limit': rng.choice([25.0, 35.0, 40.0]),
+        } if rng.random() < 0.5 else None,
+        catalyst_timeline={'days_to_next_catalyst': _maybe(rng, [0, 10, 30, 60, 90, 120])} if rng.random() < 0.5 else None,
+        confidence_score=_maybe(rng, [50, 59, 60, 75, 85, 86, 95]),
+        correlation_risk={'max_correlation': rng.choice([0.1, 0.3, 0.5, 0.6, 0.7, 0.75, 0.9])} if rng.random() < 0.5 else None,
+    )
+
+
+class TestBatchParity:
+    """Batch evaluation equals the scalar path"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_inputs_match_scalar(self, seed):
+        rng = random.Random(seed)
+        framework = FourGateFramework()
+        cases = [_random_inputs(rng) for _ in range(600)]
+
+        batch = BatchFourGateEvaluator(framework).evaluate([flatten_gate_inputs(**case) for case in cases])
+
+        for i, case in enumerate(cases):
+            scalar = framework.evaluate_all_gates(**case)
+            row = batch.iloc[i]
+            for gate in GATES:
+                assert row[f'{gate}_score'] == scalar['gates'][gate]['score'], (gate, case)
+                assert row[f'{gate}_passed'] == scalar['gates'][gate]['passed'], (gate, case)
+            assert row['final_decision'] == scalar['final_decision'], case
+            assert row['confidence_score'] == scalar['confidence_score'], case
+            assert row['gates_passed'] == scalar['summary']['gates_passed'], case
+
+        print(f"✓ {len(cases)} random cases match (decisions: {batch['final_decision'].value_counts().to_dict()})")
+
+    def test_custom_thresholds(self):
+        rng = random.Random(7)
+        framework = FourGateFramework({
+            'fundamental_min_score': 55, 'technical_min_score': 50, 'risk_min_score': 60, 'timing_min_score': 45,
+        })
+        cases = [_random_inputs(rng) for _ in range(300)]
+
+        batch = BatchFourGateEvaluator(framework).evaluate([flatten_gate_inputs(**case) for case in cases])
+
+        decisions = [framework.evaluate_all_gates(**case)['final_decision'] for case in cases]
+        assert batch['final_decision'].tolist() == decisions
+        assert 'BUY' in decisions
+        print("✓ Custom and dynamic thresholds applied per row")
+
+
+class TestColumnarInput:
+    """Direct columnar input"""
+
+    def test_missing_columns_and_nan_are_absent(self):
+        frame = pd.DataFrame(
+            {
+                'pe_ratio': [12.0, np.nan, 60.0],
+                'rsi': [25.0, np.nan, 75.0],
+                'macd_bullish_crossover': [True, None, False],
+                'position_size_pct': [5.0, 5.0, 12.0],
+            },
+            index=['AAPL', 'MSFT', 'TSLA'],
+        )
+
+        result = BatchFourGateEvaluator().evaluate(frame)
+
+        framework = FourGateFramework()
+        expected = [
+            framework.evaluate_all_gates({'pe_ratio': 12.0}, {'rsi': 25.0, 'macd_bullish_crossover': True}, {}, {}, 5.0, {}),
+            framework.evaluate_all_gates({}, {}, {}, {}, 5.0, {}),
+            framework.evaluate_all_gates({'pe_ratio': 60.0}, {'rsi': 75.0}, {}, {}, 12.0, {}),
+        ]
+        assert list(result.index) == ['AAPL', 'MSFT', 'TSLA']
+        for (_, row), scalar in zip(result.iterrows(), expected):
+            assert [row[f'{gate}_score'] for gate in GATES] == [scalar['gates'][g]['score'] for g in GATES]
+            assert row['final_decision'] == scalar['final_decision']
+        print("✓ Missing columns and NaN treated as absent values")
+
+
+class TestBacktestEngine:
+    """BacktestEngine scores a day's tickers in one batch"""
+
+    def test_day_evaluated_in_one_batch(self, monkeypatch):
+        engine = BacktestEngine(db=object())
+        evaluated = []
+        original = engine.batch_gate.evaluate
+
+        def evaluate(rows):
+            evaluated.append(len(rows))
+            return original(rows)
+
+        strong = {
+            'fundamentals': {'pe_ratio': 10.0, 'forward_pe': 7.0, 'revenue_growth_yoy': 0.25, 'dividend_yield': 3.5},
+            'signals': {'rsi': 28.0, 'macd_bullish_crossover': True, 'price_above_ma20': True, 'near_support': True},
+        }
+        weak = {'fundamentals': {'pe_ratio': 80.0}, 'signals': {'rsi': 80.0}}
+
+        def gate_inputs(ticker, test_date):
+            case = strong if ticker == 'GOOD' else weak
+            inputs = flatten_gate_inputs(
+                case['fundamentals'], case['signals'], {'current_price': 70.0, 'week_52_high': 100.0},
+                {'max_expected_drawdown_pct': 15.0, 'risk_reward_ratio': 2.5, 'red_flags': []}, 5.0, {},
+                catalyst_timeline={'days_to_next_catalyst': 10},
+            )
+            return {'ticker': ticker, 'test_date': test_date, 'entry_price': 70.0, 'inputs': inputs}
+
+        monkeypatch.setattr(engine.batch_gate, 'evaluate', evaluate)
+        monkeypatch.setattr(engine, '_gate_inputs_on_date', gate_inputs)
+        monkeypatch.setattr(engine, '_get_exit_price', lambda ticker, exit_date, fallback: 77.0)
+        monkeypatch.setattr(engine, '_calculate_results', lambda **kwargs: kwargs['trades'])
+
+        trades = engine.test_strategy('parity', date(2024, 1, 8), date(2024, 1, 9), ['GOOD', 'BAD', 'UGLY'],
+                                      min_confidence=0)
+
+        assert evaluated == [3, 3]
+        assert [trade['ticker'] for trade in trades] == ['GOOD', 'GOOD']
+        assert trades[0]['return_pct'] == pytest.approx(10.0)
+        print("✓ One batch evaluation per trading day")
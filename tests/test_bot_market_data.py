@@ -0,0 +1,138 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the bot's shared read-through market data service.
+"""
+
+from datetime import date
+
+import pytest
+
+from tradingagents.bot.market_data import MarketDataService, get_market_data_service, market_data_turn
+
+SCAN_DATE = date(2026, 10, 16)
+
+TICKERS = {
+    "NVDA": {"ticker_id": 1, "symbol": "NVDA", "company_name": "NVIDIA", "sector": "Technology", "is_active": True},
+    "AMD": {"ticker_id": 2, "symbol": "AMD", "company_name": "AMD", "sector": "Technology", "is_active": True},
+}
+SCANS = {
+    "NVDA": {"ticker_id": 1, "symbol": "NVDA", "priority_score": 72, "price": 120.5, "triggered_alerts": ["RSI_OVERSOLD"],
+             "scanned_at": None, "technical_signals": {}},
+}
+
+
+class _FakeDB:
+    """Answers the service's queries from dicts and records each one."""
+
+    def __init__(self):
+        self.queries = []
+
+    def execute_query(self, query, params=None, fetch=True, fetch_one=False):
+        if "information_schema.views" in query:
+            return (True,)  # Migration 017 applied
+        self.queries.append(("scan_date", None))
+        return (SCAN_DATE,)
+
+    def execute_dict_query(self, query, params=None, fetch_one=False):
+        symbols = params[-1]
+        if "FROM daily_scans" in query:
+            self.queries.append(("scan_row", tuple(symbols)))
+            return [SCANS[s] for s in symbols if s in SCANS]
+        if "v_latest_closes lc ON t.ticker_id" in query:
+            self.queries.append(("quote", tuple(symbols)))
+            return [{"symbol": s, "close": 120.0} for s in symbols if s in TICKERS]
+        self.queries.append(("ticker", tuple(symbols)))
+        return [TICKERS[s] for s in symbols if s in TICKERS]
+
+
+@pytest.fixture
+def service():
+    return MarketDataService(db=_FakeDB())
+
+
+class TestMarketDataService:
+    """Memoization and batching"""
+
+    def test_batch_query_for_several_tickers(self, service):
+        assert service.prefetch(["nvda", "AMD", "ZZZZ"]) == ["NVDA", "AMD"]
+        assert service.db.queries == [
+            ("ticker", ("NVDA", "AMD", "ZZZZ")),
+            ("scan_date", None),
+            ("scan_row", ("NVDA", "AMD")),
+            ("quote", ("NVDA", "AMD")),
+        ]
+
+        # Everything, including the negative results, is now memoized
+        service.get_ticker("ZZZZ")
+        service.get_scan_row("AMD")
+        service.get_quote("NVDA")
+        assert len(service.db.queries) == 4
+        print("✓ One query per kind for several tickers")
+
+    def test_turn_scope_outlives_ttl(self, service):
+        service.ttls["ticker"] = 0  # No process-wide memo
+
+        service.get_ticker("NVDA")
+        service.get_ticker("NVDA")
+        assert len(service.db.queries) == 2
+
+        with market_data_turn():
+            service.get_ticker("NVDA")
+            service.get_ticker("NVDA")
+        assert len(service.db.queries) == 3
+        assert service.get_stats()["turn_hits"] == 1
+        print("✓ Turn scope memoizes regardless of TTL")
+
+    def test_validation_only_memoized_for_the_turn(self, service):
+        calls = []
+
+        def load():
+            calls.append(1)
+            return "report"
+
+        # PriceValidationCache owns the freshness of validation reports
+        service.memoize("validation", "NVDA", load)
+        service.memoize("validation", "NVDA", load)
+        with market_data_turn():
+            service.memoize("validation", "NVDA", load)
+            service.memoize("validation", "NVDA", load)
+        assert len(calls) == 3
+        print("✓ Validation reports are not cached twice")
+
+    def test_negative_results_expire_sooner(self, monkeypatch):
+        service = MarketDataService(db=_FakeDB(), negative_ttl=30)
+        clock = [1000.0]
+        monkeypatch.setattr("tradingagents.bot.market_data.time.monotonic", lambda: clock[0])
+
+        assert service.get_ticker("NEWCO") is None
+        service.get_ticker("NVDA")
+        clock[0] += 31
+
+        # Added to the watchlist meanwhile: the unknown result has expired
+        TICKERS["NEWCO"] = {"ticker_id": 3, "symbol": "NEWCO", "company_name": "New Co", "sector": "Technology"}
+        try:
+            assert service.get_ticker("NEWCO")["ticker_id"] == 3
+            service.get_ticker("NVDA")  # Known ticker keeps its hour-long TTL
+        finally:
+            del TICKERS["NEWCO"]
+        assert service.db.queries == [("ticker", ("NEWCO",)), ("ticker", ("NVDA",)), ("ticker", ("NEWCO",))]
+        print("✓ Unknown tickers are re-checked after the negative TTL")
+
+
+class TestToolInjection:
+    """Tools read through the injected service"""
+
+    def test_multi_tool_turn_touches_db_once_per_ticker(self, service):
+        from tradingagents.bot.tools import get_stock_info, get_stock_summary
+
+        with market_data_turn(service):
+            summary = get_stock_summary.invoke({"ticker": "NVDA"})
+            info = get_stock_info.invoke({"ticker": "nvda"})
+
+        assert "Latest Screener Score: 72/100" in summary
+        assert "Name: NVIDIA" in info
+        assert [kind for kind, _ in service.db.queries] == ["ticker", "scan_date", "scan_row"]
+        assert get_market_data_service() is not service
+        print("✓ Tools share one lookup per ticker")
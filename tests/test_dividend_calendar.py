@@ -0,0 +1,100 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Parity tests for the vectorized dividend calendar prediction.
+"""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from tradingagents.dividends.dividend_calendar import DividendCalendar
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if "FROM tickers WHERE symbol" in query:
+            self._result = [(self.db.ids[params[0]],)] if params[0] in self.db.ids else []
+        else:
+            self._result = self.db.history[params[0]][:8]
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+class _FakeDB:
+    """Serves get_ticker_id and the per-ticker history query from memory."""
+
+    def __init__(self, history):
+        self.history = history
+        self.ids = {f"T{tid}": tid for tid in history}
+
+    @contextmanager
+    def get_connection(self):
+        class _Conn:
+            def cursor(conn_self):
+                return _FakeCursor(self)
+        yield _Conn()
+
+
+def _history(last_ex, interval_days, count, amount, delay=21, jitter=0):
+    rows = []
+    for i in range(count):
+        ex = last_ex - timedelta(days=i * interval_days + (jitter if i % 2 else 0))
+        payment = ex + timedelta(days=delay) if delay is not None else None
+        rows.append((ex, Decimal(str(amount + i * 0.01)), payment))
+    return rows
+
+
+@pytest.fixture
+def universe():
+    today = date.today()
+    return {
+        1: _history(today - timedelta(days=40), 91, 8, 0.24),             # quarterly, consistent
+        2: _history(today - timedelta(days=400), 30, 6, 0.10, jitter=3),   # monthly, stale -> rolled forward
+        3: _history(today - timedelta(days=10), 182, 2, 1.05, delay=None),  # semi-annual, no payment dates
+        4: _history(today - timedelta(days=5), 365, 1, 2.00),              # not enough history
+    }
+
+
+def test_vectorized_prediction_matches_scalar(universe):
+    calendar = DividendCalendar(db_conn=_FakeDB(universe))
+
+    rows = [
+        (tid, f"T{tid}", ex, amount, payment, rn)
+        for tid, history in universe.items()
+        for rn, (ex, amount, payment) in enumerate(history[:8], start=1)
+    ]
+    frame = pd.DataFrame(rows, columns=['ticker_id', 'symbol', 'ex_date', 'amount', 'payment_date', 'rn'])
+    batch = calendar._predict_from_frame(frame)
+
+    for tid in universe:
+        scalar = calendar.predict_next_dividend(f"T{tid}")
+        if scalar is None:
+            assert tid not in batch
+            continue
+
+        vector = batch[tid]
+        assert vector['expected_ex_date'] == scalar['expected_ex_date']
+        assert vector['expected_payment_date'] == scalar['expected_payment_date']
+        assert vector['expected_amount_per_share'] == pytest.approx(float(scalar['expected_amount_per_share']))
+        assert vector['confidence'] == scalar['confidence']
+        assert vector['based_on_history'] == scalar['based_on_history']
+        assert vector['expected_ex_date'] > date.today()
@@ -0,0 +1,168 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for DividendFetcher metrics and the bulk yield-cache update: growth
+rates, consecutive years and the rows written by update_yield_caches. The
+database is an in-memory fake; execute_values is replaced by a recorder.
+"""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from tradingagents.dividends import dividend_fetcher
+from tradingagents.dividends.dividend_fetcher import DividendFetcher
+
+PAYMENTS = 25
+INTERVAL_DAYS = 91
+
+
+def _history(base_amount):
+    """Quarterly payments, newest first, growing 10% per year."""
+    today = date.today()
+    rows = []
+    for i in range(PAYMENTS):
+        offset = i * INTERVAL_DAYS
+        amount = Decimal(str(round(base_amount * 1.1 ** -(offset // 365), 6)))
+        ex_date = today - timedelta(days=offset)
+        rows.append((ex_date, amount, ex_date + timedelta(days=21)))
+    return rows
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.db.queries.append(query)
+        if "FROM tickers WHERE symbol = ANY" in query:
+            self._result = [(s, self.db.ids[s]) for s in params[0] if s in self.db.ids]
+        elif "FROM tickers WHERE symbol" in query:
+            self._result = [(self.db.ids[params[0]],)] if params[0] in self.db.ids else []
+        elif "FROM daily_prices" in query:
+            self._result = [(tid, self.db.closes[tid]) for tid in params[0] if tid in self.db.closes]
+        elif "ticker_id = ANY" in query:
+            self._result = [(tid, *row) for tid in params[0] for row in self.db.history.get(tid, [])]
+        else:
+            self._result = self.db.history.get(params[0], [])
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+class _FakeDB:
+    def __init__(self):
+        self.ids = {'AAA': 1, 'BBB': 2, 'CCC': 3}
+        self.history = {1: _history(0.5), 2: _history(0.25)}
+        self.closes = {1: Decimal('50.00')}
+        self.queries = []
+
+    @contextmanager
+    def get_connection(self):
+        class _Conn:
+            def cursor(conn_self):
+                return _FakeCursor(self)
+
+            def commit(conn_self):
+                pass
+        yield _Conn()
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    written = []
+    monkeypatch.setattr(
+        dividend_fetcher, 'execute_values',
+        lambda cur, query, records, **kwargs: written.append(list(records))
+    )
+    monkeypatch.setattr(
+        dividend_fetcher.yf, 'Ticker',
+        lambda symbol: SimpleNamespace(info={'currentPrice': 20.0})
+    )
+    fetcher = DividendFetcher(db_conn=_FakeDB())
+    fetcher.written = written
+    return fetcher
+
+
+def _expected_consecutive_years():
+    today = date.today()
+    oldest = today - timedelta(days=(PAYMENTS - 1) * INTERVAL_DAYS)
+    return today.year - oldest.year + 1
+
+
+class TestDividendMetrics:
+    """Metrics from stored history"""
+
+    def test_growth_and_consecutive_years(self, fetcher):
+        metrics = fetcher.calculate_dividend_metrics('AAA', current_price=50.0)
+
+        assert metrics['annual_dividend'] == pytest.approx(2.0)
+        assert metrics['dividend_yield_pct'] == pytest.approx(4.0)
+        assert metrics['frequency'] == 'QUARTERLY'
+        assert metrics['dividend_growth_1yr_pct'] == pytest.approx(10.0, abs=0.01)
+        assert metrics['dividend_growth_3yr_pct'] == pytest.approx(10.0, abs=0.01)
+        assert metrics['dividend_growth_5yr_pct'] == pytest.approx(10.0, abs=0.01)
+        assert metrics['consecutive_years_paid'] == _expected_consecutive_years()
+        assert metrics['total_dividends_count'] == PAYMENTS
+        print("✓ 10% yearly growth and consecutive years computed")
+
+    def test_unknown_symbol_has_no_metrics(self, fetcher):
+        assert fetcher.calculate_dividend_metrics('ZZZ') is None
+        print("✓ Unknown symbol returns None")
+
+
+class TestYieldCache:
+    """Bulk yield-cache update"""
+
+    def test_bulk_update_writes_metrics(self, fetcher):
+        results = fetcher.update_yield_caches(['AAA', 'BBB', 'CCC', 'ZZZ'], cache_hours=12)
+
+        assert results == {'AAA': True, 'BBB': True, 'CCC': False, 'ZZZ': False}
+        assert len(fetcher.written) == 1
+        rows = {row[0]: row for row in fetcher.written[0]}
+        assert set(rows) == {1, 2}
+
+        # AAA is priced from daily_prices, BBB falls back to yfinance
+        (_, price, annual, yield_pct, frequency, last_amount, last_ex,
+         growth_1yr, growth_3yr, growth_5yr, consecutive, hours) = rows[1]
+        assert (price, frequency, hours) == (50.0, 'QUARTERLY', 12)
+        assert annual == pytest.approx(2.0) and yield_pct == pytest.approx(4.0)
+        assert (last_amount, last_ex) == (Decimal('0.5'), date.today())
+        assert [growth_1yr, growth_3yr, growth_5yr] == pytest.approx([10.0] * 3, abs=0.01)
+        assert consecutive == _expected_consecutive_years()
+
+        assert rows[2][1] == 20.0 and rows[2][3] == pytest.approx(5.0)
+        print("✓ One upsert with metrics for both dividend payers")
+
+    def test_bulk_matches_single_symbol_metrics(self, fetcher):
+        fetcher.update_yield_caches(['AAA'])
+        metrics = fetcher.calculate_dividend_metrics('AAA', current_price=50.0)
+
+        row = fetcher.written[0][0]
+        assert row[1:11] == (
+            metrics['current_price'], metrics['annual_dividend'], metrics['dividend_yield_pct'],
+            metrics['frequency'], metrics['last_dividend_amount'], metrics['last_ex_date'],
+            metrics['dividend_growth_1yr_pct'], metrics['dividend_growth_3yr_pct'],
+            metrics['dividend_growth_5yr_pct'], metrics['consecutive_years_paid'],
+        )
+        print("✓ Bulk row equals calculate_dividend_metrics")
+
+    def test_single_symbol_wrapper(self, fetcher):
+        assert fetcher.update_yield_cache('BBB', cache_hours=6) is True
+        assert fetcher.update_yield_cache('CCC') is False
+        assert [row[0] for row in fetcher.written[0]] == [2]
+        print("✓ update_yield_cache delegates to the bulk path")
@@ -0,0 +1,63 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the daily earnings calendar cache.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from tradingagents.validation import earnings_calendar
+from tradingagents.validation.earnings_calendar import EarningsCalendarCache, EarningsEvent
+
+
+@pytest.fixture
+def fetch_calls(monkeypatch):
+    """Replace the live fetch with a deterministic calendar and record calls."""
+    calls = []
+    now = datetime.now(timezone.utc)
+    calendar = {
+        "AAPL": now + timedelta(days=3, hours=12),
+        "MSFT": now + timedelta(days=40, hours=12),
+    }
+
+    def fake_fetch(ticker):
+        calls.append(ticker)
+        if ticker not in calendar:
+            return None
+        return EarningsEvent(ticker=ticker, report_date=calendar[ticker], fiscal_period="Upcoming")
+
+    monkeypatch.setattr(earnings_calendar, "fetch_earnings_event", fake_fetch)
+    return calls
+
+
+def test_refresh_then_lookups_are_cached(tmp_path, fetch_calls):
+    cache = EarningsCalendarCache(path=tmp_path / "earnings.json")
+    assert cache.is_stale()
+
+    assert cache.refresh(["aapl", "MSFT", "NODATA"], requests_per_second=0) == 2
+    assert not cache.is_stale()
+    assert sorted(fetch_calls) == ["AAPL", "MSFT", "NODATA"]
+
+    assert cache.check_proximity("AAPL").is_in_proximity_window
+    assert not cache.check_proximity("MSFT").is_in_proximity_window
+    assert cache.check_proximity("NODATA").proximity_risk_level == "UNKNOWN"
+    assert not cache.ensure_fresh(["AAPL"])
+    assert len(fetch_calls) == 3
+
+
+def test_snapshot_reload_and_staleness(tmp_path, fetch_calls):
+    path = tmp_path / "earnings.json"
+    EarningsCalendarCache(path=path).refresh(["AAPL", "NODATA"], requests_per_second=0)
+
+    reloaded = EarningsCalendarCache(path=path)
+    assert reloaded.refreshed_on == date.today()
+    assert reloaded.get_event("AAPL").report_date.tzinfo is not None
+    assert reloaded.get_event("NODATA") is None
+    assert len(fetch_calls) == 2
+
+    reloaded.refreshed_on = date.today() - timedelta(days=1)
+    assert reloaded.ensure_fresh(["AAPL"], requests_per_second=0)
+    assert len(fetch_calls) == 3
@@ -0,0 +1,228 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for FinancialSituationMemory batched embeddings, the text-hash cache and
+the shared persistent store.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from tradingagents.agents.utils import memory as memory_module
+from tradingagents.agents.utils.memory import FinancialSituationMemory, SituationMemoryRun, get_embedding_cache
+
+
+class _FakeEmbeddings:
+    """Deterministic embeddings endpoint that records each request."""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, model, input):
+        self.requests.append(list(input))
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text)), float(sum(map(ord, text)) % 97), 1.0])
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def _memory(name, persist_dir, embeddings):
+    mem = FinancialSituationMemory(name, {"llm_provider": "openai", "backend_url": "x", "memory_persist_dir": persist_dir})
+    mem.llm_provider = "openai"
+    mem.use_embeddings = True
+    mem.embedding = "test-embedding"
+    mem.client = SimpleNamespace(embeddings=embeddings)
+    mem.chroma_client = memory_module._get_chroma_client(persist_dir)
+    mem.situation_collection = mem.chroma_client.get_or_create_collection(name=name)
+    return mem
+
+
+@pytest.fixture
+def embeddings():
+    get_embedding_cache().clear()
+    return _FakeEmbeddings()
+
+
+LESSONS = [
+    ("Rates rising, tech selling off", "Trim growth exposure"),
+    ("Strong dollar, EM weakness", "Hedge currency risk"),
+    ("Rates rising, tech selling off", "Trim growth exposure"),
+]
+
+
+def test_add_situations_batches_and_deduplicates(tmp_path, embeddings):
+    mem = _memory("bull_memory", str(tmp_path), embeddings)
+    mem.add_situations(LESSONS)
+
+    assert embeddings.requests == [["Rates rising, tech selling off", "Strong dollar, EM weakness"]]
+    assert mem.situation_collection.count() == 2
+
+    # Same lesson again is an upsert, and its embedding comes from the cache
+    mem.add_situations(LESSONS[:1])
+    assert mem.situation_collection.count() == 2
+    assert len(embeddings.requests) == 1
+
+
+def test_query_embedding_shared_across_role_memories(tmp_path, embeddings):
+    bull = _memory("bull_memory", str(tmp_path), embeddings)
+    bear = _memory("bear_memory", str(tmp_path), embeddings)
+    bull.add_situations(LESSONS[:2])
+    bear.add_situations(LESSONS[:2])
+
+    situation = "Rates rising, tech selling off"
+    assert bull.get_memories(situation)[0]["recommendation"] == "Trim growth exposure"
+    assert bear.get_memories(situation)[0]["recommendation"] == "Trim growth exposure"
+    assert len(embeddings.requests) == 1
+    assert bull.chroma_client is bear.chroma_client
+
+
+def test_persistent_store_is_warm_after_restart(tmp_path, embeddings):
+    _memory("trader_memory", str(tmp_path), embeddings).add_situations(LESSONS[:2])
+
+    # Simulate a new process: fresh client and empty embedding cache
+    memory_module._chroma_clients.pop(str(tmp_path))
+    get_embedding_cache().clear()
+
+    restarted = _memory("trader_memory", str(tmp_path), embeddings)
+    assert restarted.situation_collection.count() == 2
+    assert restarted.get_memories("Strong dollar, EM weakness")[0]["recommendation"] == "Hedge currency risk"
+
+
+class _CountingCollection:
+    """Wraps a ChromaDB collection and counts its queries."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.queries = 0
+
+    def count(self):
+        return self.collection.count()
+
+    def upsert(self, **kwargs):
+        return self.collection.upsert(**kwargs)
+
+    def query(self, **kwargs):
+        self.queries += 1
+        return self.collection.query(**kwargs)
+
+
+ROLES = ["bull_memory", "bear_memory", "trader_memory", "invest_judge_memory", "risk_manager_memory"]
+
+
+def _run_memories(tmp_path, embeddings):
+    memories = []
+    for name in ROLES:
+        mem = _memory(name, str(tmp_path), embeddings)
+        mem.add_situations(LESSONS[:2])
+        mem.situation_collection = _CountingCollection(mem.situation_collection)
+        memories.append(mem)
+    get_embedding_cache().clear()
+    embeddings.requests.clear()
+    return memories
+
+
+def test_run_embeds_situation_once_for_all_roles(tmp_path, embeddings):
+    memories = _run_memories(tmp_path, embeddings)
+    run = SituationMemoryRun(memories)
+    situation = "Rates rising, tech selling off\n\nStrong dollar, EM weakness"
+
+    run.begin_run()
+    # Two debate rounds of bull and bear, then the managers and the trader
+    matches = [mem.get_memories(situation, n_matches=2) for mem in memories[:2] * 2 + memories]
+    run.end_run()
+
+    assert embeddings.requests == [[situation]]
+    assert [mem.situation_collection.queries for mem in memories] == [1] * len(ROLES)
+    assert run.batches == 1
+    assert matches[0] == memories[0].get_memories(situation, n_matches=2)
+    assert all(len(found) == 2 for found in matches)
+
+
+def test_run_results_dropped_on_new_lessons_and_run_end(tmp_path, embeddings):
+    memories = _run_memories(tmp_path, embeddings)
+    run = SituationMemoryRun(memories)
+    situation = "Rates rising, tech selling off"
+
+    run.begin_run()
+    assert memories[2].get_memories(situation, n_matches=3)[0]["recommendation"] == "Trim growth exposure"
+    memories[2].add_situations([("Rates rising, tech selling off!", "Rotate into value")])
+    assert len(memories[2].get_memories(situation, n_matches=3)) == 3
+    assert run.batches == 2
+    run.end_run()
+
+    # Outside a run each memory queries its own collection again
+    memories[0].get_memories(situation)
+    assert memories[0].situation_collection.queries == 3
+
+
+class _GatedEmbeddings(_FakeEmbeddings):
+    """Holds requests for gated texts until released; fails once when asked."""
+
+    def __init__(self, gated):
+        super().__init__()
+        self.gated = gated
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.fail_next = False
+
+    def create(self, model, input):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("embeddings endpoint unavailable")
+        if self.gated in input:
+            self.entered.set()
+            self.release.wait(timeout=5)
+        return super().create(model, input)
+
+
+def test_concurrent_lookups_share_one_pass_without_blocking_others(tmp_path, embeddings):
+    memories = _run_memories(tmp_path, embeddings)
+    slow, fast = "Rates rising, tech selling off", "Strong dollar, EM weakness"
+    gated = _GatedEmbeddings(slow)
+    for mem in memories:
+        mem.client = SimpleNamespace(embeddings=gated)
+    run = SituationMemoryRun(memories)
+    run.begin_run()
+
+    try:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            first = pool.submit(memories[0].get_memories, slow, 2)
+            assert gated.entered.wait(timeout=5)
+            second = pool.submit(memories[1].get_memories, slow, 2)
+            # Another situation is served while the first pass is in flight
+            other = pool.submit(memories[2].get_memories, fast, 2)
+            assert len(other.result(timeout=2)) == 2
+            assert not first.done() and not second.done()
+            gated.release.set()
+            matches = [first.result(timeout=5), second.result(timeout=5)]
+    finally:
+        gated.release.set()
+        run.end_run()
+
+    # One request per situation; the gated one finished last
+    assert gated.requests == [[fast], [slow]]
+    assert run.batches == 2
+    assert all(len(found) == 2 for found in matches)
+
+
+def test_failed_pass_is_retried(tmp_path, embeddings):
+    memories = _run_memories(tmp_path, embeddings)
+    run = SituationMemoryRun(memories)
+    situation = "Rates rising, tech selling off"
+    gated = _GatedEmbeddings(None)
+    for mem in memories:
+        mem.client = SimpleNamespace(embeddings=gated)
+
+    run.begin_run()
+    gated.fail_next = True
+    with pytest.raises(ConnectionError):
+        memories[0].get_memories(situation, n_matches=2)
+    assert len(memories[0].get_memories(situation, n_matches=2)) == 2
+    run.end_run()
+
+    assert run.batches == 1
@@ -0,0 +1,123 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the warm TradingAgentsGraph pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from tradingagents.graph.graph_pool import GraphPool
+
+
+class _StubGraph:
+    """Stands in for TradingAgentsGraph: records construction args and per-run state."""
+
+    instances = 0
+
+    def __init__(self, config=None, selected_analysts=None, **kwargs):
+        _StubGraph.instances += 1
+        self.config = config
+        self.selected_analysts = selected_analysts
+        self.kwargs = kwargs
+        self.ticker = None
+        self.curr_state = None
+        self.resets = 0
+
+    def reset_run_state(self):
+        self.ticker = None
+        self.curr_state = None
+        self.resets += 1
+
+    def propagate(self, company_name, trade_date, store_analysis=False):
+        assert self.ticker is None, "per-run state leaked from a previous run"
+        # Like TradingAgentsGraph._apply_adaptive_config
+        self.config["max_risk_discuss_rounds"] = 3
+        self.ticker = company_name
+        self.curr_state = {"company_of_interest": company_name, "final_trade_decision": "HOLD"}
+        return self.curr_state, "HOLD"
+
+
+def _pool():
+    _StubGraph.instances = 0
+    return GraphPool(max_idle_per_key=1, graph_factory=_StubGraph)
+
+
+class TestGraphPool:
+    """Graph reuse and timing"""
+
+    def test_reuses_graph_per_configuration(self):
+        pool = _pool()
+        config = {"llm_provider": "openai", "quick_think_llm": "q", "deep_think_llm": "d"}
+
+        _, _, first = pool.propagate("AAPL", date.today(), config=config, enable_rag=False)
+        state, signal, second = pool.propagate("MSFT", date.today(), config=config, enable_rag=False)
+
+        assert _StubGraph.instances == 1
+        assert not first["graph_reused"] and second["graph_reused"]
+        assert state["company_of_interest"] == "MSFT" and signal == "HOLD"
+
+        pool.propagate("AAPL", date.today(), config=config, selected_analysts=["market"], enable_rag=False)
+        assert _StubGraph.instances == 2
+
+        stats = pool.get_stats()
+        assert sum(s["builds"] for s in stats.values()) == 2
+        assert sum(s["runs"] for s in stats.values()) == 3
+        print("✓ One graph built per configuration, reused across runs")
+
+    def test_concurrent_leases_get_distinct_graphs(self):
+        pool = _pool()
+
+        with pool.lease(enable_rag=False) as first:
+            with pool.lease(enable_rag=False) as second:
+                assert first is not second
+        assert _StubGraph.instances == 2
+
+        # Only max_idle_per_key graphs stay warm
+        with pool.lease(enable_rag=False):
+            with pool.lease(enable_rag=False):
+                pass
+        assert _StubGraph.instances == 3
+        print("✓ Leases are exclusive and the idle pool is bounded")
+
+    def test_failed_run_discards_graph(self):
+        pool = _pool()
+
+        try:
+            with pool.lease(enable_rag=False):
+                raise RuntimeError("run failed")
+        except RuntimeError:
+            pass
+
+        with pool.lease(enable_rag=False):
+            pass
+        assert _StubGraph.instances == 2
+        print("✓ Graph is dropped after a failed run")
+
+    def test_config_changes_by_graph_keep_pool_key(self):
+        pool = _pool()
+        config = {"llm_provider": "openai", "quick_think_llm": "q", "deep_think_llm": "d"}
+
+        _, _, first = pool.propagate("AAPL", date.today(), config=config, enable_rag=False)
+        _, _, second = pool.propagate("MSFT", date.today(), config=config, enable_rag=False)
+
+        assert "max_risk_discuss_rounds" not in config
+        assert _StubGraph.instances == 1 and second["graph_reused"] and not first["graph_reused"]
+        assert len(pool.get_stats()) == 1
+        print("✓ Graph config writes do not change the caller's config or pool key")
+
+    def test_concurrent_runs_report_reuse_per_lease(self):
+        pool = _pool()
+        pool.propagate("WARM", date.today(), enable_rag=False)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            timings = list(executor.map(
+                lambda ticker: pool.propagate(ticker, date.today(), enable_rag=False)[2],
+                ["AAPL", "MSFT", "NVDA", "AMD"]
+            ))
+
+        reused = sum(t["graph_reused"] for t in timings)
+        stats = next(iter(pool.get_stats().values()))
+        assert reused == stats["reuses"] and reused + (stats["builds"] - 1) == 4
+        print(f"✓ {reused} of 4 concurrent runs reused the warm graph")
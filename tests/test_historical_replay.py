@@ -0,0 +1,228 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the point-in-time store behind HistoricalReplay: one load query
+per batch of tickers, answers identical to the per-date SQL semantics,
+slices that cannot reach past the as-of date, memory-mapped reloads and
+revalidation of persisted histories. The database is an in-memory fake.
+"""
+
+import hashlib
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from tradingagents.backtest import AsOfSlice, HistoricalReplay, PointInTimeStore
+
+
+class _FakeDB:
+    """Answers the fingerprint and bulk price and analysis queries from lists of rows."""
+
+    def __init__(self):
+        self.prices = {}    # symbol -> [(price_date, open, high, low, close, volume, ma_20, ma_50, ma_200, rsi_14)]
+        self.analyses = {}  # symbol -> [(analysis_id, analysis_date, decision, confidence, entry, stop, return)]
+        self.queries = []
+
+    def execute_query(self, query, params=None, fetch_one=False):
+        symbols = params[0]
+        if 'md5(' in query:
+            self.queries.append(('versions', tuple(symbols)))
+            return [
+                (s, hashlib.md5(repr((sorted(self.prices.get(s, [])), sorted(self.analyses.get(s, [])))).encode()).hexdigest())
+                for s in symbols if s in self.prices or s in self.analyses
+            ]
+        source = self.prices if 'daily_prices' in query else self.analyses
+        self.queries.append(('prices' if source is self.prices else 'analyses', tuple(symbols)))
+        return [(s,) + row for s in sorted(symbols) for row in sorted(source.get(s, []), key=lambda r: r[0 if source is self.prices else 1])]
+
+
+def _bars(start, count, base=100.0):
+    rows = []
+    day = start
+    for i in range(count):
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        close = Decimal(f"{base + i:.2f}")
+        rsi = None if i % 7 == 3 else Decimal(f"{30 + i % 40}.5")
+        rows.append((day, close, close + 1, close - 1, close, 1_000_000 + i, close - 2, None if i < 5 else close - 5, None, rsi))
+        day += timedelta(days=1)
+    return rows
+
+
+def _reference_price(rows, as_of):
+    known = [r for r in rows if r[0] <= as_of]
+    return float(known[-1][4]) if known else None
+
+
+def _reference_analysis(rows, as_of):
+    boundary = datetime.combine(as_of, datetime.min.time()) if not isinstance(as_of, datetime) else as_of
+    known = [r for r in rows if r[1] <= boundary]
+    return max(known, key=lambda r: r[1]) if known else None
+
+
+@pytest.fixture
+def db():
+    db = _FakeDB()
+    db.prices['AAPL'] = _bars(date(2024, 1, 2), 60)
+    db.prices['MSFT'] = _bars(date(2024, 1, 15), 30, base=300.0)
+    db.analyses['AAPL'] = [
+        (1, datetime(2024, 1, 10, 16, 30), 'BUY', 80, Decimal('110.00'), Decimal('95.00'), Decimal('8.5')),
+        (2, datetime(2024, 2, 1, 0, 0), 'HOLD', 55, None, None, None),
+        (3, datetime(2024, 2, 20, 9, 15), 'SELL', 70, Decimal('140.00'), Decimal('150.00'), Decimal('-5.0')),
+    ]
+    return db
+
+
+class TestPointInTimeStore:
+    """Loading and as-of slicing"""
+
+    def test_one_query_for_many_tickers(self, db, tmp_path):
+        replay = HistoricalReplay(db=db, store=PointInTimeStore(db, str(tmp_path)))
+        replay.preload(['AAPL', 'MSFT', 'NONE'])
+
+        day = date(2024, 1, 2)
+        while day <= date(2024, 4, 1):
+            for ticker in ['AAPL', 'MSFT', 'NONE']:
+                replay.get_price_as_of_date(ticker, day)
+                replay.get_indicators_as_of_date(ticker, day)
+            day += timedelta(days=1)
+
+        symbols = ('AAPL', 'MSFT', 'NONE')
+        assert db.queries == [('versions', symbols), ('prices', symbols), ('analyses', symbols)]
+        print("✓ A 90-day replay of three tickers issued three queries")
+
+    def test_matches_per_date_semantics(self, db, tmp_path):
+        replay = HistoricalReplay(db=db, store=PointInTimeStore(db, str(tmp_path)))
+
+        day = date(2023, 12, 28)
+        while day <= date(2024, 4, 5):
+            for ticker in ['AAPL', 'MSFT']:
+                rows = db.prices[ticker]
+                assert replay.get_price_as_of_date(ticker, day) == _reference_price(rows, day)
+
+                known = [r for r in rows if r[0] <= day]
+                indicators = replay.get_indicators_as_of_date(ticker, day)
+                if not known:
+                    assert indicators is None
+                else:
+                    row = known[-1]
+                    assert indicators == {
+                        'rsi': float(row[9]) if row[9] else None,
+                        'ma20': float(row[6]) if row[6] else None,
+                        'ma50': float(row[7]) if row[7] else None,
+                        'ma200': None,
+                        'current_price': float(row[4]),
+                        'volume': int(row[5]),
+                    }
+
+            expected = _reference_analysis(db.analyses['AAPL'], day)
+            analysis = replay.get_analysis_as_of_date('AAPL', day)
+            if expected is None:
+                assert analysis is None
+            else:
+                assert (analysis['analysis_id'], analysis['analysis_date']) == (expected[0], expected[1])
+            day += timedelta(days=1)
+
+        print("✓ Prices, indicators and analyses match the per-date queries")
+
+    def test_analysis_timestamp_boundary(self, db, tmp_path):
+        store = PointInTimeStore(db, str(tmp_path))
+
+        # An analysis written during the day is not known as of that date (midnight)
+        assert store.analysis_as_of('AAPL', date(2024, 1, 10)) is None
+        assert store.analysis_as_of('AAPL', datetime(2024, 1, 10, 17, 0))['analysis_id'] == 1
+        assert store.analysis_as_of('AAPL', date(2024, 2, 1))['analysis_id'] == 2
+        assert store.analysis_as_of('AAPL', date(2024, 2, 1))['entry_price_target'] is None
+        print("✓ Analysis timestamps compared like the SQL boundary")
+
+    def test_slice_cannot_see_future(self, db, tmp_path):
+        store = PointInTimeStore(db, str(tmp_path))
+        as_of = date(2024, 1, 20)  # Saturday
+
+        view = store.as_of('AAPL', as_of)
+
+        assert isinstance(view, AsOfSlice)
+        assert view.last_date == date(2024, 1, 19)
+        assert (view.dates <= np.datetime64(as_of)).all()
+        assert len(view.window(500)) == len(view)
+        assert view.to_frame().index.max().date() == date(2024, 1, 19)
+        with pytest.raises(ValueError):
+            view.column('close')[0] = 0.0
+        assert len(store.as_of('AAPL', date(2023, 12, 1))) == 0
+        assert store.as_of('AAPL', date(2023, 12, 1)).latest('close') is None
+        print("✓ Slices end at the as-of date and are read-only")
+
+    def test_vectorized_lookups(self, db, tmp_path):
+        store = PointInTimeStore(db, str(tmp_path))
+        dates = [date(2023, 12, 29) + timedelta(days=i) for i in range(100)]
+
+        closes = store.latest_values('AAPL', dates)
+        slices = store.as_of_many('AAPL', dates)
+
+        for day, close, view in zip(dates, closes, slices):
+            expected = _reference_price(db.prices['AAPL'], day)
+            assert (np.isnan(close) and expected is None) or close == expected
+            assert view.latest('close') == expected
+        print("✓ latest_values/as_of_many match per-date lookups")
+
+
+class TestPersistence:
+    """On-disk arrays"""
+
+    def test_reload_is_memory_mapped(self, db, tmp_path):
+        PointInTimeStore(db, str(tmp_path)).load(['AAPL', 'NONE'])
+        db.queries.clear()
+
+        store = PointInTimeStore(db, str(tmp_path))
+        view = store.as_of('AAPL', date(2024, 2, 15))
+
+        # Only the fingerprint is read; the rows come from disk
+        assert db.queries == [('versions', ('AAPL',))]
+        assert isinstance(view.dates.base, np.memmap) or isinstance(view.dates, np.memmap)
+        assert np.shares_memory(view.column('close'), store.as_of('AAPL', date(2024, 3, 1)).column('close'))
+        assert view.latest('close') == _reference_price(db.prices['AAPL'], date(2024, 2, 15))
+        assert store.analysis_as_of('AAPL', date(2024, 2, 15))['confidence_score'] == 55
+        assert len(store.as_of('NONE', date(2024, 2, 15))) == 0
+        print("✓ Second process memory-maps the persisted history")
+
+    def test_stale_history_reloaded_for_recent_dates(self, db, tmp_path):
+        PointInTimeStore(db, str(tmp_path)).load(['AAPL'])
+        meta = tmp_path / 'AAPL' / 'meta.json'
+        meta.write_text(meta.read_text().replace(date.today().isoformat(), '2024-02-01'))
+        db.queries.clear()
+
+        store = PointInTimeStore(db, str(tmp_path))
+        store.as_of('AAPL', date(2024, 1, 31))
+        assert [kind for kind, _ in db.queries] == ['versions']
+
+        store.as_of('AAPL', date(2024, 2, 1))
+        assert [kind for kind, _ in db.queries] == ['versions', 'versions', 'prices', 'analyses']
+        print("✓ Dates on or after the load day trigger one reload")
+
+    def test_backfilled_history_revalidated(self, db, tmp_path):
+        PointInTimeStore(db, str(tmp_path)).load(['AAPL'])
+        # A corrected bar and a late analysis, both for past dates
+        corrected = list(db.prices['AAPL'][10])
+        corrected[4] = Decimal('999.00')
+        db.prices['AAPL'][10] = tuple(corrected)
+        db.analyses['AAPL'].append((4, datetime(2024, 1, 5, 12, 0), 'BUY', 90, None, None, None))
+        as_of = corrected[0]
+
+        trusted = PointInTimeStore(db, str(tmp_path), revalidate=False)
+        assert trusted.as_of('AAPL', as_of).latest('close') != 999.0
+        assert trusted.analysis_as_of('AAPL', date(2024, 1, 8)) is None
+
+        db.queries.clear()
+        store = PointInTimeStore(db, str(tmp_path))
+        assert store.as_of('AAPL', as_of).latest('close') == 999.0
+        assert store.analysis_as_of('AAPL', date(2024, 1, 8))['analysis_id'] == 4
+        assert [kind for kind, _ in db.queries] == ['versions', 'prices', 'analyses']
+
+        # The reload persisted the new fingerprint: next process maps it again
+        db.queries.clear()
+        assert PointInTimeStore(db, str(tmp_path)).as_of('AAPL', as_of).latest('close') == 999.0
+        assert [kind for kind, _ in db.queries] == ['versions']
+        print("✓ Backfilled bars and analyses picked up on revalidation")
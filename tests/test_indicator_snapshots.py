@@ -0,0 +1,175 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the indicator comparison-table snapshot cache: unchanged tickers
+are served from disk without recomputation, a new bar invalidates only its
+ticker, and --refresh recalculates only stale tickers. The database is an
+in-memory fake.
+"""
+
+import threading
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from tradingagents.screener import show_indicators
+from tradingagents.screener.indicator_snapshots import IndicatorSnapshotCache, snapshot_key
+from tradingagents.screener.pattern_recognition import PatternRecognition
+
+
+class _FakeDB:
+    """Answers the view check, snapshot-key and latest-scan queries from dicts."""
+
+    def __init__(self, has_view=True):
+        self.has_view = has_view
+        self.bars = {}   # symbol -> (price_date, close)
+        self.scans = {}  # symbol -> scan row
+        self.queries = []
+        self.key_queries = []
+        self.lock = threading.Lock()
+
+    def execute_query(self, query, params=None, fetch=True, fetch_one=False):
+        with self.lock:
+            self.queries.append('view')
+        return (self.has_view,)
+
+    def execute_dict_query(self, query, params=None, fetch_one=False):
+        symbols = params[0]
+        is_keys = 'lc.price_date' in query
+        with self.lock:
+            self.queries.append('keys' if is_keys else 'scans')
+            if is_keys:
+                self.key_queries.append(query)
+        if is_keys:
+            return [
+                {'symbol': s, 'price_date': self.bars[s][0], 'close': self.bars[s][1],
+                 'scan_date': self.scans.get(s, {}).get('scan_date')}
+                for s in symbols if s in self.bars
+            ]
+        return [self.scans[s] for s in symbols if s in self.scans]
+
+
+def _scan(symbol, rsi, scan_date=date(2024, 3, 1)):
+    return {
+        'symbol': symbol,
+        'sector': 'Technology',
+        'current_price': Decimal('101.25'),
+        'priority_score': 72,
+        'technical_signals': {'rsi': rsi, 'macd_histogram': 0.4, 'ma_20': 100.0, 'ma_50': 95.0, 'ma_200': 90.0,
+                              'volume_ratio': 1.3, 'atr_pct': 2.1, 'mtf_signal': 'BULLISH'},
+        'scan_date': scan_date,
+    }
+
+
+@pytest.fixture
+def display(monkeypatch, tmp_path):
+    db = _FakeDB()
+    for i, symbol in enumerate(['AAPL', 'MSFT', 'NVDA']):
+        db.bars[symbol] = (date(2024, 3, 1), Decimal(f'{100 + i}.50'))
+        db.scans[symbol] = _scan(symbol, 30 + 10 * i)
+
+    analyzed = []
+    original = PatternRecognition.analyze_patterns
+
+    def analyze(signals):
+        analyzed.append(signals['rsi'])
+        return original(signals)
+
+    monkeypatch.setattr(PatternRecognition, 'analyze_patterns', staticmethod(analyze))
+    monkeypatch.setattr(show_indicators, 'get_db_connection', lambda: db)
+
+    def make():
+        monkeypatch.setattr(show_indicators, 'get_indicator_snapshot_cache', lambda: IndicatorSnapshotCache(str(tmp_path)))
+        return show_indicators.IndicatorDisplay()
+
+    return make, db, analyzed
+
+
+class TestSnapshotCache:
+    """Cached comparison table rows"""
+
+    def test_unchanged_tickers_served_from_disk(self, display):
+        make, db, analyzed = display
+        first = make()._collect_comparison_data(['AAPL', 'MSFT', 'NVDA', 'ZZZZ'])
+        assert sorted(analyzed) == [30, 40, 50]
+        assert first[3] == {'ticker': 'ZZZZ', 'error': 'No data found'}
+
+        # New process: fresh in-memory state, same cache directory
+        db.queries.clear()
+        analyzed.clear()
+        second = make()._collect_comparison_data(['AAPL', 'MSFT', 'NVDA'])
+
+        assert analyzed == []
+        assert db.queries == ['view', 'keys']
+        assert second == first[:3]
+        assert second[0]['scan_date'] == date(2024, 3, 1) and second[0]['price'] == 101.25
+        print("✓ Second render: one key query, no recomputation")
+
+    @pytest.mark.parametrize("has_view", [True, False])
+    def test_key_query_without_latest_closes_view(self, display, has_view):
+        make, db, analyzed = display
+        db.has_view = has_view
+        make()._collect_comparison_data(['AAPL', 'MSFT'])
+        analyzed.clear()
+
+        rows = make()._collect_comparison_data(['AAPL', 'MSFT'])
+
+        assert analyzed == [] and rows[0]['rsi'] == 30
+        assert ('LEFT JOIN v_latest_closes lc' in db.key_queries[-1]) == has_view
+        if not has_view:
+            assert 'CROSS JOIN LATERAL' in db.key_queries[-1]
+        print(f"✓ View present={has_view}: snapshot keys read and rows served from cache")
+
+    def test_new_bar_invalidates_only_that_ticker(self, display):
+        make, db, analyzed = display
+        make()._collect_comparison_data(['AAPL', 'MSFT', 'NVDA'])
+        analyzed.clear()
+
+        db.bars['MSFT'] = (date(2024, 3, 4), Decimal('103.00'))
+        db.scans['MSFT'] = _scan('MSFT', 45, scan_date=date(2024, 3, 4))
+        rows = make()._collect_comparison_data(['AAPL', 'MSFT', 'NVDA'])
+
+        assert analyzed == [45]
+        assert rows[1]['rsi'] == 45
+        print("✓ Only the ticker with a new bar was rebuilt")
+
+    def test_rewritten_bar_invalidates(self):
+        assert snapshot_key(date(2024, 3, 1), Decimal('100.5')) != snapshot_key(date(2024, 3, 1), Decimal('101.0'))
+        assert snapshot_key(None, None) is None
+        print("✓ An intraday rewrite of the latest bar changes the key")
+
+    def test_refresh_recalculates_only_stale(self, display, monkeypatch):
+        make, db, analyzed = display
+        make()._collect_comparison_data(['AAPL', 'MSFT', 'NVDA'])
+        db.bars['NVDA'] = (date(2024, 3, 4), Decimal('110.00'))
+
+        view = make()
+        recalculated = []
+
+        def recalculate(ticker):
+            recalculated.append(ticker)
+            db.scans[ticker] = _scan(ticker, 65, scan_date=date(2024, 3, 4))
+            view.snapshot_cache.invalidate(ticker)
+            return True
+
+        monkeypatch.setattr(view, '_recalculate_indicators', recalculate)
+        rows = view._collect_comparison_data(['AAPL', 'MSFT', 'NVDA'], refresh=True)
+
+        assert recalculated == ['NVDA']
+        assert rows[2]['rsi'] == 65
+        print("✓ --refresh skipped the two up-to-date tickers")
+
+    def test_refresh_data_uses_data_fetcher(self, display, monkeypatch):
+        make, db, analyzed = display
+        view = make()
+        view._collect_comparison_data(['AAPL'])
+        updated = []
+        monkeypatch.setattr(view.ticker_ops, 'get_ticker', lambda symbol=None, ticker_id=None: {'ticker_id': 7})
+        monkeypatch.setattr(view.data_fetcher, 'update_ticker_prices', lambda ticker_id, symbol: updated.append((ticker_id, symbol)))
+
+        assert view._refresh_price_data('aapl')
+        assert updated == [(7, 'AAPL')]
+        assert view.snapshot_cache.get('AAPL', snapshot_key(*db.bars['AAPL'], date(2024, 3, 1))) is None
+        print("✓ Price refresh reuses the display's DataFetcher and drops the snapshot")
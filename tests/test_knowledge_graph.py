@@ -0,0 +1,98 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for KnowledgeGraph secondary indexes, BFS traversal and snapshots.
+"""
+
+import pytest
+
+from tradingagents.cognitive.knowledge_graph import KnowledgeGraph
+
+
+def _scan_query(kg: KnowledgeGraph, query_text: str, max_results: int = 10):
+    """Reference implementation of query(): full scan over every node."""
+    query_lower = query_text.lower()
+    results = []
+    for node in kg.nodes.values():
+        score = 0.0
+        if query_lower in node.label.lower():
+            score += 2.0
+        for value in node.properties.values():
+            if isinstance(value, str) and query_lower in value.lower():
+                score += 1.0
+        if score > 0:
+            results.append((node, score))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return [node.id for node, _ in results[:max_results]]
+
+
+@pytest.fixture
+def kg():
+    graph = KnowledgeGraph()
+    graph.initialize_trading_knowledge()
+    return graph
+
+
+class TestKnowledgeGraphIndexes:
+    """Indexed lookups must match the full-scan semantics"""
+
+    @pytest.mark.parametrize("text", ["RSI", "rsi over", "oversold", "cross", "MA", "7 days", "-", "nothing"])
+    def test_query_matches_full_scan(self, kg, text):
+        assert [n.id for n in kg.query(text)] == _scan_query(kg, text)
+
+    def test_find_nodes_by_type_and_confidence(self, kg):
+        kg.add_node("weak_signal", "Weak Signal", "concept", confidence=0.35)
+
+        concepts = kg.find_nodes(node_type="concept")
+        assert [n.id for n in concepts] == [n.id for n in kg.nodes.values() if n.node_type == "concept"]
+
+        confident = kg.find_nodes(min_confidence=0.4)
+        assert "weak_signal" not in [n.id for n in confident]
+        assert "weak_signal" in [n.id for n in kg.find_nodes(min_confidence=0.35)]
+
+        assert [n.id for n in kg.find_nodes(label_pattern="cross")] == ["macd_bullish", "death_cross", "golden_cross"]
+
+    def test_readding_node_reindexes(self, kg):
+        kg.add_node("death_cross", "Bearish Crossover", "pattern", confidence=0.2)
+
+        assert kg.find_nodes(label_pattern="death") == []
+        assert "death_cross" not in [n.id for n in kg.find_nodes(node_type="concept")]
+        assert [n.id for n in kg.find_nodes(node_type="pattern")] == ["death_cross"]
+        assert [n.id for n in kg.query("bearish")] == ["death_cross"]
+
+
+class TestKnowledgeGraphTraversal:
+    """BFS neighbour query"""
+
+    def test_related_nodes_unique_with_shortest_depth(self, kg):
+        related = kg.get_related_nodes("rsi_oversold", max_depth=2)
+        ids = [node.id for node, _, _ in related]
+
+        assert len(ids) == len(set(ids))
+        assert "rsi_oversold" not in ids
+        depths = {node.id: depth for node, _, depth in related}
+        assert depths["macd_bullish"] == 1
+        assert depths["earnings_risk_rule"] == 1
+
+    def test_related_nodes_respects_depth_and_type(self, kg):
+        kg.add_edge("macd_bullish", "golden_cross", "relates_to")
+
+        assert "golden_cross" not in [n.id for n, _, _ in kg.get_related_nodes("rsi_oversold", max_depth=1)]
+        assert "golden_cross" in [n.id for n, _, _ in kg.get_related_nodes("rsi_oversold", max_depth=2)]
+        assert kg.get_related_nodes("rsi_oversold", relationship_type="relates_to") == []
+
+
+class TestKnowledgeGraphSnapshot:
+    """Compact on-disk snapshot round trip"""
+
+    def test_snapshot_round_trip(self, kg, tmp_path):
+        path = kg.save_snapshot(tmp_path / "graph.kg.json.gz")
+
+        restored = KnowledgeGraph()
+        restored.load_snapshot(path)
+
+        assert restored.to_dict() == kg.to_dict()
+        assert restored.nodes["rsi_oversold"].created_at == kg.nodes["rsi_oversold"].created_at
+        assert [n.id for n in restored.query("RSI")] == [n.id for n in kg.query("RSI")]
+        assert len(restored.get_related_nodes("rsi_oversold")) == len(kg.get_related_nodes("rsi_oversold"))
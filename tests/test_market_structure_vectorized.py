@@ -0,0 +1,130 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Parity tests for the vectorized swing-point and cloud-entry detection.
+
+The reference functions below are the original bar-by-bar loops; the
+vectorized and batch implementations must return identical swing lists and
+entry flags, including on ties, NaN bars and short series.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.screener.cloud_trend import HighLowCloudTrend
+from tradingagents.screener.market_structure import MarketStructure
+
+
+def _reference_swing_points(data, lookback=5, min_swing_strength=0.01):
+    high, low = data['high'], data['low']
+    swing_highs, swing_lows = [], []
+    if len(data) < lookback * 2 + 1:
+        return swing_highs, swing_lows
+    for i in range(lookback, len(data) - lookback):
+        current_high = high.iloc[i]
+        if all(j == i or not high.iloc[j] >= current_high for j in range(i - lookback, i + lookback + 1)):
+            if not swing_highs or (current_high / swing_highs[-1][1] - 1) >= min_swing_strength:
+                swing_highs.append((i, current_high, data.index[i]))
+    for i in range(lookback, len(data) - lookback):
+        current_low = low.iloc[i]
+        if all(j == i or not low.iloc[j] <= current_low for j in range(i - lookback, i + lookback + 1)):
+            if not swing_lows or (swing_lows[-1][1] / current_low - 1) >= min_swing_strength:
+                swing_lows.append((i, current_low, data.index[i]))
+    return swing_highs, swing_lows
+
+
+def _reference_cloud_entry(data, cloud_bands):
+    close = data['close']
+    in_cloud = (close >= cloud_bands['cloud_lower']) & (close <= cloud_bands['cloud_upper'])
+    cloud_entry = pd.Series(False, index=data.index)
+    for i in range(1, len(data)):
+        if in_cloud.iloc[i] and not in_cloud.iloc[i - 1]:
+            cloud_entry.iloc[i] = True
+    return cloud_entry
+
+
+def _assert_same_swings(actual, expected):
+    """Swing lists equal, treating NaN prices (a NaN bar is never beaten) as equal."""
+    assert len(actual) == len(expected)
+    for (i, value, when), (ref_i, ref_value, ref_when) in zip(actual, expected):
+        assert (i, when) == (ref_i, ref_when)
+        assert value == ref_value or (np.isnan(value) and np.isnan(ref_value))
+
+
+def _price_frame(seed, bars=300, decimals=1, nan_bars=0):
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1.5, bars)), decimals)  # Rounding forces ties
+    spread = np.round(np.abs(rng.normal(0, 1.0, bars)), decimals)
+    frame = pd.DataFrame(
+        {'high': close + spread, 'low': close - spread, 'close': close, 'volume': rng.integers(1e5, 1e6, bars)},
+        index=pd.date_range('2023-01-02', periods=bars, freq='B'),
+    )
+    if nan_bars:
+        rows = rng.choice(bars, nan_bars, replace=False)
+        frame.iloc[rows, frame.columns.get_indexer(['high', 'low', 'close'])] = np.nan
+    return frame
+
+
+CASES = [(seed, decimals, nan_bars) for seed in range(6) for decimals in (0, 2) for nan_bars in (0, 5)]
+
+
+class TestSwingPointParity:
+    """Vectorized swing points equal the loop implementation"""
+
+    @pytest.mark.parametrize("seed,decimals,nan_bars", CASES)
+    @pytest.mark.parametrize("lookback,strength", [(5, 0.01), (2, 0.0), (3, 0.05)])
+    def test_identical_swings(self, seed, decimals, nan_bars, lookback, strength):
+        data = _price_frame(seed, decimals=decimals, nan_bars=nan_bars)
+
+        result = MarketStructure.detect_swing_points(data, lookback=lookback, min_swing_strength=strength)
+        expected_highs, expected_lows = _reference_swing_points(data, lookback, strength)
+
+        _assert_same_swings(result['swing_highs'], expected_highs)
+        _assert_same_swings(result['swing_lows'], expected_lows)
+
+    def test_short_series(self):
+        result = MarketStructure.detect_swing_points(_price_frame(0, bars=10), lookback=5)
+        assert result['swing_highs'] == [] and result['latest_swing_low'] is None
+        print("✓ Short series return no swings")
+
+    def test_batch_matches_single(self):
+        frames = {f"T{seed}": _price_frame(seed, bars=200 + 50 * (seed % 2), nan_bars=seed % 3) for seed in range(8)}
+        frames['SHORT'] = _price_frame(99, bars=8)
+
+        batch = MarketStructure.detect_swing_points_batch(frames, lookback=4, min_swing_strength=0.01)
+
+        assert set(batch) == set(frames)
+        for ticker, frame in frames.items():
+            single = MarketStructure.detect_swing_points(frame, lookback=4, min_swing_strength=0.01)
+            _assert_same_swings(batch[ticker]['swing_highs'], single['swing_highs'])
+            _assert_same_swings(batch[ticker]['swing_lows'], single['swing_lows'])
+        print(f"✓ Batch swing points match for {len(frames)} tickers")
+
+
+class TestCloudEntryParity:
+    """Vectorized cloud entries equal the loop implementation"""
+
+    @pytest.mark.parametrize("seed,decimals,nan_bars", CASES)
+    @pytest.mark.parametrize("period", [5, 20])
+    def test_identical_entries(self, seed, decimals, nan_bars, period):
+        data = _price_frame(seed, decimals=decimals, nan_bars=nan_bars)
+        bands = HighLowCloudTrend.calculate_cloud_bands(data, period=period)
+
+        result = HighLowCloudTrend.detect_cloud_entry(data, bands)
+
+        pd.testing.assert_series_equal(result, _reference_cloud_entry(data, bands))
+
+    def test_batch_matches_single(self):
+        frames = {f"T{seed}": _price_frame(seed, bars=120 + 30 * (seed % 3), nan_bars=seed % 2 * 4) for seed in range(9)}
+        frames['SHORT'] = _price_frame(42, bars=12)
+
+        batch = HighLowCloudTrend.detect_cloud_entry_batch(frames, period=20)
+
+        assert set(batch) == set(frames)
+        for ticker, frame in frames.items():
+            bands = HighLowCloudTrend.calculate_cloud_bands(frame, period=20)
+            pd.testing.assert_series_equal(batch[ticker], _reference_cloud_entry(frame, bands))
+        assert batch['SHORT'].sum() == 0
+        print(f"✓ Batch cloud entries match for {len(frames)} tickers")
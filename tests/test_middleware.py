@@ -101,6 +101,51 @@ class TestTokenTrackingMiddleware:
         assert isinstance(summary["total"], int)
 
 
+class _WordEncoding:
+    """Whitespace tokenizer standing in for a tiktoken encoding."""
+    name = "test-words"
+
+    def encode(self, text):
+        return text.split()
+
+
+class TestTokenTrackerCache:
+    """Test memoized and incremental token counting."""
+
+    def _tracker(self):
+        tracker = TokenTracker(model="gpt-4o")
+        tracker.encoding = _WordEncoding()
+        return tracker
+
+    def test_repeat_counts_hit_cache(self):
+        """Identical long text is encoded once across trackers."""
+        report = "revenue grew strongly this quarter " * 100
+        first, second = self._tracker(), self._tracker()
+
+        assert first.count_tokens(report) == 500
+        assert second.count_tokens(report) == 500
+        assert first.encode_calls == 1
+        assert second.encode_calls == 0 and second.cache_hits == 1
+
+    def test_appended_history_encodes_only_suffix(self):
+        """Debate history growth only encodes the new argument."""
+        tracker = self._tracker()
+        state = {"investment_debate_state": {"history": "Bull: buy the dip " * 50}}
+        assert tracker.count_state_tokens(state) == 200
+
+        chars_before = tracker.encoded_chars
+        argument = "\nBear: valuation is stretched"
+        state["investment_debate_state"]["history"] += argument
+
+        assert tracker.count_state_tokens(state) == 204
+        assert tracker.incremental_hits == 1
+        assert tracker.encoded_chars - chars_before == len(argument)
+
+        stats = tracker.get_summary()["cache"]
+        assert stats["reused_chars"] > 0
+        assert stats["encode_seconds_saved"] >= 0.0
+
+
 class TestSummarizationMiddleware:
     """Test summarization middleware."""
     
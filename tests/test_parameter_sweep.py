@@ -0,0 +1,198 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the StrategyValidator parameter sweep: every configuration matches
+a standalone BacktestEngine.test_strategy run, the indicator panel is built
+once per sweep, interrupted sweeps resume from the checkpoint, and the
+process pool returns the same table. yfinance is replaced by deterministic
+fake histories.
+"""
+
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.backtest import BacktestEngine, StrategyValidator, expand_grid
+from tradingagents.backtest import backtest_engine, parameter_sweep, strategy_validator
+from tradingagents.decision import BatchFourGateEvaluator, FourGateFramework
+
+END_DATE = date(2024, 3, 29)
+TICKERS = ['AAA', 'BBB', 'CCC']
+
+
+class _FakeTicker:
+    """yf.Ticker stand-in serving a slice of a fixed daily series."""
+
+    histories = {}
+    downloads = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.info = {'trailingPE': 11.0, 'forwardPE': 8.0, 'debtToEquity': 0.3}
+
+    @classmethod
+    def series(cls, symbol):
+        if symbol not in cls.histories:
+            rng = np.random.default_rng(sum(map(ord, symbol)))
+            index = pd.bdate_range('2022-06-01', '2024-12-31', tz='America/New_York')
+            close = 50 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, len(index))))
+            cls.histories[symbol] = pd.DataFrame(
+                {'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                 'Volume': rng.integers(1e6, 3e6, len(index)).astype(float)},
+                index=index,
+            )
+        return cls.histories[symbol]
+
+    def history(self, start, end):
+        _FakeTicker.downloads.append(self.symbol)
+        hist = self.series(self.symbol)
+        naive = hist.index.tz_localize(None)
+        return hist[(naive >= pd.Timestamp(start)) & (naive < pd.Timestamp(end))].copy()
+
+
+@pytest.fixture
+def fake_yf(monkeypatch):
+    _FakeTicker.downloads = []
+    monkeypatch.setattr(backtest_engine.yf, 'Ticker', _FakeTicker)
+    return _FakeTicker
+
+
+def _thresholds(config):
+    return {**FourGateFramework.DEFAULT_THRESHOLDS,
+            **{k: v for k, v in config.items() if k in FourGateFramework.DEFAULT_THRESHOLDS}}
+
+
+GRID = {
+    'holding_period_days': [10, 30],
+    'min_confidence': [0, 60],
+    'risk_min_score': [40, 70],
+    'timing_min_score': [45],
+}
+
+
+class TestSweep:
+    """Grid sweep over a shared panel"""
+
+    def test_matches_standalone_backtests(self, fake_yf, tmp_path):
+        engine = BacktestEngine(db=object())
+        table = StrategyValidator(engine).sweep(
+            'grid', GRID, TICKERS, test_period_days=40, end_date=END_DATE,
+            workers=1, checkpoint_dir=str(tmp_path),
+        )
+
+        assert len(table) == 8 and list(table['rank']) == list(range(1, 9))
+        assert table['sharpe_ratio'].is_monotonic_decreasing
+        assert table['total_trades'].max() > 0
+
+        for config in expand_grid(GRID):
+            engine.four_gate = FourGateFramework(_thresholds(config))
+            engine.batch_gate = BatchFourGateEvaluator(engine.four_gate)
+            expected = engine.test_strategy(
+                'grid', END_DATE - timedelta(days=40), END_DATE, TICKERS,
+                holding_period_days=config['holding_period_days'], min_confidence=config['min_confidence'],
+            )
+            row = table[
+                (table['holding_period_days'] == config['holding_period_days'])
+                & (table['min_confidence'] == config['min_confidence'])
+                & (table['risk_min_score'] == config['risk_min_score'])
+            ].iloc[0]
+            assert row['total_trades'] == expected.total_trades
+            assert row['total_return'] == pytest.approx(expected.total_return)
+            assert row['sharpe_ratio'] == pytest.approx(expected.sharpe_ratio)
+            assert row['max_drawdown'] == pytest.approx(expected.max_drawdown)
+
+        print(f"✓ {len(table)} configurations match standalone backtests")
+
+    def test_panel_built_once(self, fake_yf, tmp_path):
+        StrategyValidator(BacktestEngine(db=object())).sweep(
+            'grid', GRID, TICKERS, test_period_days=40, end_date=END_DATE,
+            workers=1, checkpoint_dir=str(tmp_path),
+        )
+        assert sorted(fake_yf.downloads) == TICKERS
+        print("✓ One history download per ticker for 8 configurations")
+
+    def test_resume_skips_finished_configurations(self, fake_yf, tmp_path, monkeypatch):
+        validator = StrategyValidator(BacktestEngine(db=object()))
+        kwargs = dict(test_period_days=40, end_date=END_DATE, workers=1, checkpoint_dir=str(tmp_path))
+        full = validator.sweep('grid', GRID, TICKERS, **kwargs)
+
+        # Simulate an interruption after three configurations (with a torn last line)
+        results_path = next(tmp_path.glob('*/results.jsonl'))
+        lines = results_path.read_text().splitlines()
+        results_path.write_text('\n'.join(lines[:3]) + '\n' + lines[3][:20])
+
+        ran = []
+        original = parameter_sweep.run_configuration
+        monkeypatch.setattr(
+            'tradingagents.backtest.strategy_validator.run_configuration',
+            lambda panel, name, config: ran.append(config) or original(panel, name, config),
+        )
+        fake_yf.downloads.clear()
+        resumed = validator.sweep('grid', GRID, TICKERS, **kwargs)
+
+        assert len(ran) == 5
+        assert fake_yf.downloads == []  # Panel reloaded from the checkpoint
+        pd.testing.assert_frame_equal(resumed, full)
+        assert len([json.loads(line) for line in results_path.read_text().splitlines()]) == 8
+        print("✓ Resumed sweep ran only the 5 unfinished configurations")
+
+    def test_resume_on_later_day_keeps_end_date(self, fake_yf, tmp_path, monkeypatch):
+        today = [END_DATE]
+
+        class _Date(date):
+            @classmethod
+            def today(cls):
+                return today[0]
+
+        monkeypatch.setattr(strategy_validator, 'date', _Date)
+        validator = StrategyValidator(BacktestEngine(db=object()))
+        kwargs = dict(test_period_days=40, workers=1, checkpoint_dir=str(tmp_path))
+        full = validator.sweep('grid', GRID, TICKERS, **kwargs)
+
+        # Interrupted after three configurations, resumed the next morning
+        results_path = next(tmp_path.glob('*/results.jsonl'))
+        results_path.write_text('\n'.join(results_path.read_text().splitlines()[:3]) + '\n')
+        today[0] = END_DATE + timedelta(days=1)
+
+        ran = []
+        original = parameter_sweep.run_configuration
+        monkeypatch.setattr(
+            'tradingagents.backtest.strategy_validator.run_configuration',
+            lambda panel, name, config: ran.append(panel.end_date) or original(panel, name, config),
+        )
+        resumed = validator.sweep('grid', GRID, TICKERS, **kwargs)
+
+        assert ran == [END_DATE] * 5
+        assert len(list(tmp_path.iterdir())) == 1
+        pd.testing.assert_frame_equal(resumed, full)
+
+        # A fresh (resume=False) sweep ends on the new day
+        ran.clear()
+        validator.sweep('grid', GRID, TICKERS, resume=False, **kwargs)
+        assert ran == [END_DATE + timedelta(days=1)] * 8
+        print("✓ Open-ended sweep resumed on a later day with its original end date")
+
+    def test_process_pool_matches_in_process(self, fake_yf, tmp_path):
+        validator = StrategyValidator(BacktestEngine(db=object()))
+        kwargs = dict(test_period_days=40, end_date=END_DATE, resume=False)
+
+        serial = validator.sweep('grid', GRID, TICKERS, workers=1, checkpoint_dir=str(tmp_path / 'a'), **kwargs)
+        pooled = validator.sweep('grid', GRID, TICKERS, workers=2, checkpoint_dir=str(tmp_path / 'b'), **kwargs)
+
+        pd.testing.assert_frame_equal(pooled, serial)
+        print("✓ Process pool returns the same ranked table")
+
+    def test_ranking_and_validation(self, fake_yf, tmp_path):
+        table = StrategyValidator(BacktestEngine(db=object())).sweep(
+            'grid', {'holding_period_days': [5, 20], 'risk_min_score': [40], 'timing_min_score': [45]}, TICKERS,
+            test_period_days=40, end_date=END_DATE, workers=1, checkpoint_dir=str(tmp_path),
+            rank_by='max_drawdown',
+        )
+        assert table['max_drawdown'].is_monotonic_increasing
+        for _, row in table.iterrows():
+            assert row['validated'] == (not row['issues'])
+        print("✓ max_drawdown ranks ascending; validated mirrors the threshold issues")
@@ -16,6 +16,7 @@ Tests all components of the autonomous learning system:
 import pytest
 import asyncio
 from datetime import datetime, timedelta
+import numpy as np
 from typing import Dict, List
 
 from tradingagents.cognitive.source_verifier import (
@@ -303,6 +304,129 @@ class TestLearningTriggers:
         assert events[0]["days_until"] == 1
         print(f"✓ Earnings event detected: {events[0]['ticker']} in {events[0]['days_until']} day(s)")
 
+    
+    @pytest.mark.asyncio
+    async def test_check_triggers_only_evaluates_affected(self):
+        """Test that triggers are indexed by context key and ticker"""
+        manager = EventTriggerManager()
+        spike = create_price_spike_trigger(threshold_percent=5.0)
+        spike["trigger_id"] = spike.pop("id")
+        manager.register_trigger(**spike)
+        
+        calls = []
+        manager.register_trigger(
+            trigger_id="msft_volume",
+            name="MSFT Volume",
+            trigger_type=TriggerType.PATTERN_DETECTED,
+            priority=TriggerPriority.LOW,
+            condition=TriggerCondition(
+                condition_type="volume",
+                parameters={},
+                evaluator=lambda ctx, prm: calls.append(ctx) or True,
+                depends_on=["volume_ratio"],
+                tickers=["MSFT"]
+            ),
+            action=LearningAction(action_type="noop", parameters={})
+        )
+        
+        fired = await manager.check_triggers({"ticker": "AAPL", "price_change_percent": 6.0})
+        assert [t.id for t in fired] == [spike["trigger_id"]]
+        assert calls == []  # volume trigger not affected by this context
+        
+        fired = await manager.check_triggers({"ticker": "AAPL", "volume_ratio": 3.0})
+        assert fired == [] and calls == []  # wrong ticker
+        
+        fired = await manager.check_triggers({"ticker": "MSFT", "volume_ratio": 3.0})
+        assert [t.id for t in fired] == ["msft_volume"]
+        
+        stats = manager.get_evaluation_stats()
+        assert stats[spike["trigger_id"]]["evaluations"] == 1
+        assert stats["msft_volume"]["evaluations"] == 1
+        print(f"✓ Only affected triggers evaluated")
+    
+    def test_batch_price_spike_matches_scalar(self):
+        """Test vectorized price spike evaluation over a batch of tickers"""
+        manager = EventTriggerManager()
+        spike = create_price_spike_trigger(threshold_percent=5.0)
+        spike["trigger_id"] = spike.pop("id")
+        trigger = manager.register_trigger(**spike)
+        
+        updates = {
+            "AAPL": {"price_change_percent": 7.1},
+            "MSFT": {"price_change_percent": 0.3},
+            "TSLA": {"price_change_percent": -5.0},
+            "NVDA": {"volume_ratio": 2.0},
+        }
+        
+        fired = manager.check_triggers_batch(updates)
+        
+        expected = {
+            t for t, ctx in updates.items()
+            if "price_change_percent" in ctx and trigger.condition.evaluate(ctx)
+        }
+        assert set(fired) == expected == {"AAPL", "TSLA"}
+        assert manager.get_evaluation_stats()[trigger.id]["evaluations"] == len(updates)
+        print(f"✓ Batch price spikes: {sorted(fired)}")
+    
+    def test_batch_fallback_skips_missing_dependency(self):
+        """Test that per-ticker fallback skips tickers without the dependency key"""
+        manager = EventTriggerManager()
+        calls = []
+        manager.register_trigger(
+            trigger_id="low_volume",
+            name="Low Volume",
+            trigger_type=TriggerType.PATTERN_DETECTED,
+            priority=TriggerPriority.LOW,
+            condition=TriggerCondition(
+                condition_type="volume",
+                parameters={},
+                # Would fire on a missing key if it were evaluated
+                evaluator=lambda ctx, prm: calls.append(ctx["ticker"]) or ctx.get("volume_ratio", 0.0) < 1.0,
+                depends_on=["volume_ratio"]
+            ),
+            action=LearningAction(action_type="noop", parameters={})
+        )
+        
+        fired = manager.check_triggers_batch({
+            "AAPL": {"volume_ratio": 0.5},
+            "MSFT": {"price_change_percent": 1.0},
+            "TSLA": {"volume_ratio": 2.0},
+        })
+        
+        assert {t: [tr.id for tr in trs] for t, trs in fired.items()} == {"AAPL": ["low_volume"]}
+        assert calls == ["AAPL", "TSLA"]
+        print(f"✓ MSFT (no volume_ratio) not evaluated")
+    
+    def test_batch_evaluator_without_dependencies_reads_available_columns(self):
+        """Test that a batch evaluator without depends_on sees missing columns as NaN"""
+        manager = EventTriggerManager()
+        manager.register_trigger(
+            trigger_id="move_or_volume",
+            name="Move or Volume",
+            trigger_type=TriggerType.PATTERN_DETECTED,
+            priority=TriggerPriority.MEDIUM,
+            condition=TriggerCondition(
+                condition_type="move_or_volume",
+                parameters={},
+                evaluator=lambda ctx, prm: ctx.get("price_change_percent", 0) > 5 or ctx.get("volume_ratio", 0) > 3,
+                batch_evaluator=lambda cols, prm: (
+                    (np.nan_to_num(cols["price_change_percent"]) > 5) | (np.nan_to_num(cols["volume_ratio"]) > 3)
+                )
+            ),
+            action=LearningAction(action_type="noop", parameters={})
+        )
+        
+        # No ticker in the batch carries volume_ratio
+        fired = manager.check_triggers_batch({
+            "AAPL": {"price_change_percent": 6.0},
+            "MSFT": {"price_change_percent": 1.0},
+        })
+        
+        assert list(fired) == ["AAPL"]
+        stats = manager.get_evaluation_stats()["move_or_volume"]
+        assert stats["errors"] == 0 and stats["evaluations"] == 2
+        print(f"✓ Partial-column batch evaluated: {list(fired)}")
+
 
 class TestConfidenceScorer:
     """Test confidence scoring system"""
@@ -0,0 +1,235 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the range-aware price cache: the trading-day calendar, missing and
+stale segment detection, the single multi-row upsert and segment-only vendor
+fetches merged into one frame. The database is an in-memory fake.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from tradingagents.database import price_cache_ops
+from tradingagents.database.price_cache_ops import PriceCacheOperations
+from tradingagents.dataflows import interface
+from tradingagents.market.calendar import is_trading_day, trading_day_segments, trading_days
+
+
+class _FakeDB:
+    """Serves price_cache rows from a dict and records upserts."""
+
+    def __init__(self, rows=None):
+        self.rows = dict(rows or {})  # price_date -> (o, h, l, c, adj, vol, source, fetched_at, realtime)
+        self.upserts = []
+
+    @contextmanager
+    def get_cursor(self):
+        yield self
+
+    def execute(self, query, params):
+        self._result = [
+            ("AAPL", day, *values)
+            for day, values in sorted(self.rows.items())
+            if params[1] <= day <= params[2]
+        ]
+
+    def fetchall(self):
+        return self._result
+
+
+def _row(close, fetched_at=datetime(2024, 1, 20), realtime=False):
+    return (close, close + 1, close - 1, close, close, 1000, "yfinance", fetched_at, realtime)
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = _FakeDB()
+
+    def execute_values(cursor, sql, values, page_size=100):
+        assert "VALUES %s" in sql and "ON CONFLICT" in sql
+        cursor.upserts.append(values)
+        for _, day, o, h, l, c, adj, vol, source, realtime in values:
+            cursor.rows[day] = (o, h, l, c, adj, vol, source, datetime.now(), realtime)
+
+    monkeypatch.setattr(price_cache_ops, "execute_values", execute_values)
+    monkeypatch.setattr("tradingagents.database.ticker_ops.TickerOperations.get_ticker_id", lambda self, symbol: 1)
+    monkeypatch.setattr(price_cache_ops, "_no_data_days", {})
+    return db
+
+
+class TestTradingCalendar:
+    """Exchange holidays and trading-day segments"""
+
+    def test_holidays(self):
+        assert not is_trading_day(date(2024, 3, 29))   # Good Friday
+        assert not is_trading_day(date(2024, 6, 19))   # Juneteenth
+        assert not is_trading_day(date(2021, 12, 24))  # Christmas observed
+        assert is_trading_day(date(2021, 12, 31))      # New Year's on Saturday: no closure
+        assert len(trading_days(date(2024, 1, 1), date(2024, 12, 31))) == 252
+        print("✓ NYSE holidays recognized")
+
+    def test_segments_span_weekends(self):
+        days = trading_days(date(2024, 1, 2), date(2024, 1, 19))
+        segments = trading_day_segments([date(2024, 1, 5), date(2024, 1, 8), date(2024, 1, 16)], days)
+        assert segments == [(date(2024, 1, 5), date(2024, 1, 8)), (date(2024, 1, 16), date(2024, 1, 16))]
+        print("✓ Friday and Monday form one segment; MLK day is not a gap")
+
+
+class TestPriceRange:
+    """Missing and stale segments"""
+
+    def test_gaps_detected(self, fake_db):
+        for day in [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4), date(2024, 1, 5),
+                    date(2024, 1, 10), date(2024, 1, 11), date(2024, 1, 12)]:
+            fake_db.rows[day] = _row(100.0)
+
+        frame, missing = PriceCacheOperations(fake_db).get_price_range(
+            "AAPL", date(2024, 1, 1), date(2024, 1, 16), today=date(2024, 2, 1)
+        )
+
+        assert len(frame) == 7 and list(frame.columns) == price_cache_ops.PRICE_COLUMNS
+        assert missing == [(date(2024, 1, 8), date(2024, 1, 9)), (date(2024, 1, 16), date(2024, 1, 16))]
+        print(f"✓ Missing segments: {missing}")
+
+    def test_stale_recent_rows_and_future_days(self, fake_db):
+        today = date.today()
+        old_fetch = datetime.now() - timedelta(days=2)
+        days = trading_days(today - timedelta(days=20), today - timedelta(days=1))
+        for day in days:
+            fake_db.rows[day] = _row(50.0, fetched_at=old_fetch)
+
+        frame, missing = PriceCacheOperations(fake_db).get_price_range(
+            "AAPL", days[0], today + timedelta(days=10), today=today
+        )
+
+        recent = [d for d in days if d >= today - timedelta(days=7)]
+        expected_missing = recent + ([today] if is_trading_day(today) else [])
+        assert [d for segment in missing for d in trading_days(*segment)] == expected_missing
+        assert len(frame) == len(days) - len(recent)
+        print("✓ Recent rows past their TTL are refetched; future days are not expected")
+
+
+class TestUpsert:
+    """Single multi-row write"""
+
+    def test_store_frame_is_one_statement(self, fake_db):
+        today = date(2024, 1, 5)
+        frame = pd.DataFrame(
+            {"Open": [1.0, 2.0, 3.0], "High": [1.0, 2.0, 3.0], "Low": [1.0, 2.0, 3.0],
+             "Close": [1.0, 2.0, 3.0], "Adj Close": [1.0, 2.0, float("nan")], "Volume": [10, 20, 30]},
+            index=pd.DatetimeIndex(["2024-01-03", "2024-01-04", "2024-01-05"], name="Date"),
+        )
+
+        stored = PriceCacheOperations(fake_db).store_price_frame("AAPL", frame, "yfinance", today=today)
+
+        assert stored == 3 and len(fake_db.upserts) == 1
+        values = fake_db.upserts[0]
+        assert [v[-1] for v in values] == [False, False, True]  # Only today's row is realtime
+        assert values[2][6] is None  # NaN stored as NULL
+        print("✓ Three rows written with one upsert")
+
+
+class TestStockDataFrame:
+    """Only missing segments are fetched and merged"""
+
+    def test_fetches_only_missing_segments(self, fake_db, monkeypatch):
+        monkeypatch.setattr("tradingagents.database.get_db_connection", lambda: fake_db)
+        for day in trading_days(date(2024, 1, 2), date(2024, 1, 11)):
+            fake_db.rows[day] = _row(100.0)
+
+        requests = []
+
+        def vendor(method, ticker, start, end):
+            requests.append((start, end))
+            days = trading_days(date.fromisoformat(start), date.fromisoformat(end) - timedelta(days=1))
+            csv = "Date,Open,High,Low,Close,Volume,Dividends,Stock Splits\n" + "".join(
+                f"{d} 00:00:00-05:00,200,201,199,200.5,5000,0,0\n" for d in days
+            )
+            return f"# Stock data for {ticker}\n# Total records: {len(days)}\n\n{csv}", {"vendor_used": "yfinance"}
+
+        monkeypatch.setattr(interface, "route_to_vendor_with_metadata", vendor)
+
+        frame = interface.get_stock_data_frame("aapl", "2024-01-02", "2024-01-16")
+
+        assert requests == [("2024-01-12", "2024-01-17")]
+        assert [ts.date() for ts in frame.index] == trading_days(date(2024, 1, 2), date(2024, 1, 16))
+        assert frame.loc["2024-01-16", "Close"] == 200.5
+        assert frame.loc["2024-01-16", "Adj Close"] == 200.5
+        assert frame.loc["2024-01-02", "Close"] == 100.0
+        assert len(fake_db.upserts) == 1 and len(fake_db.upserts[0]) == 2
+
+        # Now fully cached: no vendor call, CSV served from the frame
+        csv = interface.route_to_vendor_with_cache("get_stock_data", "AAPL", "2024-01-02", "2024-01-16")
+        assert len(requests) == 1
+        assert csv.splitlines()[0] == "Date,Open,High,Low,Close,Adj Close,Volume"
+        assert csv.splitlines()[-1] == "2024-01-16,200.0,201.0,199.0,200.5,200.5,5000"
+        print("✓ Only the 2 new trading days were fetched")
+
+    def test_days_without_vendor_data_not_refetched(self, fake_db, monkeypatch):
+        monkeypatch.setattr("tradingagents.database.get_db_connection", lambda: fake_db)
+        requests = []
+        listed = date(2024, 1, 4)
+
+        def vendor(method, ticker, start, end):
+            requests.append((start, end))
+            days = [d for d in trading_days(date.fromisoformat(start), date.fromisoformat(end) - timedelta(days=1))
+                    if d >= listed and d != date(2024, 1, 8)]
+            csv = "Date,Open,High,Low,Close,Adj Close,Volume\n" + "".join(f"{d},10,11,9,10,10,100\n" for d in days)
+            return csv, {"vendor_used": "alpaca"}
+
+        monkeypatch.setattr(interface, "route_to_vendor_with_metadata", vendor)
+
+        assert len(interface.get_stock_data_frame("NEWCO", "2024-01-02", "2024-01-10")) == 4
+        assert len(interface.get_stock_data_frame("NEWCO", "2024-01-02", "2024-01-10")) == 4
+        assert len(requests) == 1
+
+        # Remembered only for NO_DATA_TTL
+        monkeypatch.setattr(price_cache_ops.time, "monotonic", lambda: 1e12)
+        interface.get_stock_data_frame("NEWCO", "2024-01-02", "2024-01-10")
+        assert requests[1:] == [("2024-01-02", "2024-01-04"), ("2024-01-08", "2024-01-09")]
+        print("✓ Pre-listing days and a halt remembered as empty until the TTL expires")
+
+    def test_empty_response_is_not_remembered(self, fake_db, monkeypatch):
+        monkeypatch.setattr("tradingagents.database.get_db_connection", lambda: fake_db)
+        responses = [
+            "No data found for symbol 'AAPL' between 2024-01-02 and 2024-02-01",
+            "Date,Open,High,Low,Close,Adj Close,Volume\n" + "".join(
+                f"{d},10,11,9,10,10,100\n" for d in trading_days(date(2024, 1, 2), date(2024, 1, 31))
+            ),
+        ]
+        requests = []
+
+        def vendor(method, ticker, start, end):
+            requests.append((start, end))
+            return responses[len(requests) - 1], {"vendor_used": "yfinance"}
+
+        monkeypatch.setattr(interface, "route_to_vendor_with_metadata", vendor)
+
+        assert interface.get_stock_data_frame("AAPL", "2024-01-02", "2024-01-31").empty
+        frame = interface.get_stock_data_frame("AAPL", "2024-01-02", "2024-01-31")
+
+        assert requests == [("2024-01-02", "2024-02-01")] * 2
+        assert len(frame) == len(trading_days(date(2024, 1, 2), date(2024, 1, 31)))
+        print("✓ An empty answer is retried on the next read")
+
+    def test_failed_segment_serves_cached_rows(self, fake_db, monkeypatch):
+        monkeypatch.setattr("tradingagents.database.get_db_connection", lambda: fake_db)
+        for day in trading_days(date(2024, 1, 2), date(2024, 1, 5)):
+            fake_db.rows[day] = _row(100.0)
+
+        def vendor(method, ticker, start, end):
+            raise RuntimeError("All vendor implementations failed for method 'get_stock_data'")
+
+        monkeypatch.setattr(interface, "route_to_vendor_with_metadata", vendor)
+
+        frame = interface.get_stock_data_frame("AAPL", "2024-01-02", "2024-01-10")
+        assert [ts.date() for ts in frame.index] == trading_days(date(2024, 1, 2), date(2024, 1, 5))
+
+        # Nothing cached and nothing fetched
+        with pytest.raises(RuntimeError):
+            interface.get_stock_data_frame("AAPL", "2024-01-08", "2024-01-10")
+        print("✓ Cached rows served when the missing segment cannot be fetched")
@@ -0,0 +1,171 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for concurrent multi-source price validation: parallel fetches, the
+agreeing-quorum early exit, the per-call deadline, the TTL result cache and
+the watchlist batch variant. Vendors are replaced by slow in-process fakes.
+"""
+
+import threading
+import time
+
+import pytest
+
+from tradingagents.validation import (
+    get_price_validation_cache,
+    validate_price_multi_source,
+    validate_prices_multi_source,
+)
+from tradingagents.validation import price_validation
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Install fake vendors: name -> (price, delay seconds)."""
+    calls = []
+    lock = threading.Lock()
+    get_price_validation_cache().clear()
+
+    def install(**quotes):
+        def make(name, price, delay):
+            def fetch(ticker):
+                with lock:
+                    calls.append((name, ticker))
+                time.sleep(delay)
+                return (price, 1000) if price else (None, None)
+            return fetch
+
+        for name, attribute in [
+            ("yfinance", "get_yfinance_current_price"),
+            ("alpha_vantage", "get_alphavantage_current_price"),
+            ("alpaca", "get_alpaca_current_price"),
+            ("polygon", "get_polygon_current_price"),
+        ]:
+            price, delay = quotes.get(name, (None, 0.0))
+            monkeypatch.setattr(price_validation, attribute, make(name, price, delay))
+        return calls
+
+    yield install
+    get_price_validation_cache().clear()
+
+
+class TestConcurrentValidation:
+    """Sources are fetched in parallel"""
+
+    def test_sources_fetched_concurrently(self, sources):
+        sources(yfinance=(100.0, 0.2), alpha_vantage=(100.5, 0.2), alpaca=(100.2, 0.2), polygon=(100.1, 0.2))
+
+        started = time.perf_counter()
+        report = validate_price_multi_source("aapl", quorum=0, use_cache=False)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.6
+        assert report.ticker == "AAPL"
+        assert report.sources_checked == ["yfinance", "alpha_vantage", "alpaca", "polygon"]
+        assert report.validation_passed
+        print(f"✓ Four 0.2s sources validated in {elapsed:.2f}s")
+
+    def test_quorum_exits_early(self, sources):
+        sources(yfinance=(100.0, 0.0), alpaca=(100.4, 0.05), alpha_vantage=(150.0, 2.0), polygon=(100.0, 2.0))
+
+        started = time.perf_counter()
+        report = validate_price_multi_source("AAPL", quorum=2, use_cache=False)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        assert report.sources_checked == ["yfinance", "alpaca"]
+        assert report.validation_passed
+        assert not any("No response" in flag for flag in report.flags)
+        print(f"✓ Two agreeing sources ended validation after {elapsed:.2f}s")
+
+    def test_disagreeing_quorum_waits_for_more_sources(self, sources):
+        sources(yfinance=(100.0, 0.0), alpaca=(120.0, 0.0), polygon=(100.5, 0.2))
+
+        report = validate_price_multi_source("AAPL", quorum=2, use_cache=False)
+
+        assert report.sources_checked == ["yfinance", "alpaca", "polygon"]
+        assert not report.validation_passed
+        print("✓ Disagreement keeps validation waiting for remaining sources")
+
+    def test_deadline(self, sources):
+        sources(yfinance=(100.0, 0.0), alpha_vantage=(100.0, 2.0), polygon=(100.0, 2.0))
+
+        started = time.perf_counter()
+        report = validate_price_multi_source("AAPL", timeout=0.3, quorum=2, use_cache=False)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        assert report.sources_checked == ["yfinance"]
+        assert any("alpha_vantage, polygon" in flag for flag in report.flags)
+        print(f"✓ Slow sources dropped at the {elapsed:.2f}s deadline")
+
+
+class TestSlowSources:
+    """Abandoned fetches of a slow vendor are bounded"""
+
+    def test_slow_source_holds_limited_workers(self, sources, monkeypatch):
+        sources(yfinance=(100.0, 0.0))
+        release = threading.Event()
+        started = []
+
+        def hanging_alpaca(ticker):
+            started.append(ticker)
+            release.wait(10)
+            return (100.0, 1000)
+
+        monkeypatch.setattr(price_validation, "get_alpaca_current_price", hanging_alpaca)
+        try:
+            tickers = [f"T{i}" for i in range(10)]
+            reports = [validate_price_multi_source(t, timeout=0.05, quorum=0, use_cache=False) for t in tickers]
+            # A repeat validation joins the fetch already running for its ticker
+            validate_price_multi_source("T0", timeout=0.05, quorum=0, use_cache=False)
+        finally:
+            release.set()
+
+        assert started == tickers[:price_validation._MAX_FETCHES_PER_SOURCE]
+        assert all(r.sources_checked == ["yfinance"] for r in reports)
+        assert all(any("alpaca" in flag for flag in r.flags) for r in reports)
+        print(f"✓ Slow source held {len(started)} workers for {len(tickers)} validations")
+
+
+class TestValidationCache:
+    """Short-TTL per-ticker result cache"""
+
+    def test_repeat_validation_is_cached(self, sources):
+        calls = sources(yfinance=(100.0, 0.0), alpaca=(100.0, 0.0))
+
+        first = validate_price_multi_source("MSFT", quorum=0)
+        first.warnings.append("mutated by caller")
+        second = validate_price_multi_source("msft", quorum=0)
+
+        assert len(calls) == 4
+        assert "mutated by caller" not in second.warnings
+        assert get_price_validation_cache().get_stats()["hits"] == 1
+        print("✓ Second validation served from cache")
+
+    def test_outage_not_cached(self, sources):
+        calls = sources()
+
+        assert not validate_price_multi_source("NVDA").validation_passed
+        validate_price_multi_source("NVDA")
+
+        assert len(calls) == 8
+        print("✓ Reports without any source are retried")
+
+
+class TestBatchValidation:
+    """Watchlist validation"""
+
+    def test_batch_dedups_and_keeps_order(self, sources):
+        calls = sources(yfinance=(50.0, 0.2), polygon=(50.1, 0.2))
+
+        started = time.perf_counter()
+        reports = validate_prices_multi_source(["tsla", "AMD", "TSLA", "nvda"], quorum=0, use_cache=False)
+        elapsed = time.perf_counter() - started
+
+        assert list(reports) == ["TSLA", "AMD", "NVDA"]
+        assert all(r.validation_passed for r in reports.values())
+        assert len({ticker for _, ticker in calls}) == 3
+        assert elapsed < 0.6
+        print(f"✓ 3 tickers validated in {elapsed:.2f}s")
@@ -0,0 +1,259 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for TradingAgentsGraph.astream_propagate: typed events in node order,
+token usage from LLM callbacks, cancellation mid-run and pooled streaming.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.graph import GraphPool, PropagationEventType
+from tradingagents.graph.streaming import extract_events
+
+NODE_ORDER = [
+    "Market Analyst", "Bull Researcher", "Bear Researcher", "Research Manager",
+    "Trader", "Risky Analyst", "Risk Judge",
+]
+
+
+def _fake_workflow(visited, gate=None):
+    """Compiled graph with the real node names and update shapes, no real LLMs."""
+    llm = GenericFakeChatModel(messages=iter([
+        AIMessage(content="Uptrend", usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+    ]))
+
+    def node(name, update):
+        def run(state):
+            visited.append(name)
+            if gate is not None and name == "Bull Researcher":
+                gate.wait(timeout=5)
+            return update(state) if callable(update) else update
+        return run
+
+    def market(state):
+        return {"messages": [llm.invoke("analyze")], "market_report": "Uptrend"}
+
+    def debate(speaker, count):
+        return {"investment_debate_state": {
+            "history": "", "bull_history": "", "bear_history": "",
+            "current_response": f"{speaker} Analyst: argument {count}", "count": count,
+        }}
+
+    updates = {
+        "Market Analyst": market,
+        "Bull Researcher": debate("Bull", 1),
+        "Bear Researcher": debate("Bear", 2),
+        "Research Manager": {
+            "investment_debate_state": {"judge_decision": "Buy", "current_response": "Buy", "count": 2},
+            "investment_plan": "Buy",
+        },
+        "Trader": {"trader_investment_plan": "Buy 10 shares"},
+        "Risky Analyst": {"risk_debate_state": {
+            "latest_speaker": "Risky", "current_risky_response": "Risky Analyst: go", "count": 1,
+        }},
+        "Risk Judge": {"risk_debate_state": {"judge_decision": "BUY", "count": 1}, "final_trade_decision": "BUY"},
+    }
+
+    workflow = StateGraph(AgentState)
+    for name in NODE_ORDER:
+        workflow.add_node(name, node(name, updates[name]))
+    workflow.add_edge(START, NODE_ORDER[0])
+    for current, following in zip(NODE_ORDER, NODE_ORDER[1:]):
+        workflow.add_edge(current, following)
+    workflow.add_edge(NODE_ORDER[-1], END)
+    return workflow.compile()
+
+
+@pytest.fixture
+def trading_graph(monkeypatch):
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph import trading_graph as trading_graph_module
+
+    monkeypatch.setattr(trading_graph_module, "get_market_regime", lambda: "BULL")
+    config = DEFAULT_CONFIG.copy()
+    config["validation"] = {"enable_circuit_breaker": False}
+    graph = trading_graph_module.TradingAgentsGraph(
+        ["market"], config=config, enable_rag=False,
+        enable_subagents=False, enable_summarization=False, enable_token_tracking=False
+    )
+    graph._log_state = lambda trade_date, final_state: None
+    graph.process_signal = lambda decision: "BUY"
+    return graph
+
+
+async def _collect(events, stop_after=None):
+    collected = []
+    async for event in events:
+        collected.append(event)
+        if stop_after is not None and event.type == stop_after:
+            break
+    return collected
+
+
+class TestExtractEvents:
+    """State updates map to typed events"""
+
+    def test_research_manager_is_a_plan_not_a_debate_round(self):
+        events = extract_events("Research Manager", {
+            "investment_debate_state": {"current_response": "Buy", "count": 2},
+            "investment_plan": "Buy",
+        })
+        assert [e[0] for e in events] == [PropagationEventType.INVESTMENT_PLAN]
+        assert extract_events("Msg Clear Market", None) == []
+        print("✓ Judge updates are not reported as debate rounds")
+
+
+class TestAstreamPropagate:
+    """Events stream as nodes finish"""
+
+    def test_events_in_order_with_token_usage(self, trading_graph):
+        visited = []
+        trading_graph.graph = _fake_workflow(visited)
+
+        events = asyncio.run(_collect(trading_graph.astream_propagate("AAPL", "2024-06-07")))
+        types = [e.type for e in events if e.type != PropagationEventType.TOKEN_USAGE]
+
+        assert types == [
+            PropagationEventType.STARTED,
+            PropagationEventType.ANALYST_REPORT,
+            PropagationEventType.DEBATE_ROUND,
+            PropagationEventType.DEBATE_ROUND,
+            PropagationEventType.INVESTMENT_PLAN,
+            PropagationEventType.TRADER_PLAN,
+            PropagationEventType.RISK_ROUND,
+            PropagationEventType.RISK_VERDICT,
+            PropagationEventType.COMPLETED,
+        ]
+        assert [e.sequence for e in events] == list(range(len(events)))
+        debate = [e.data["speaker"] for e in events if e.type == PropagationEventType.DEBATE_ROUND]
+        assert debate == ["bull", "bear"]
+
+        usage = [e for e in events if e.type == PropagationEventType.TOKEN_USAGE]
+        assert len(usage) == 1 and usage[0].node == "Market Analyst"
+        assert usage[0].data["total_tokens"] == 15
+
+        completed = events[-1]
+        assert completed.data["signal"] == "BUY"
+        assert completed.data["final_state"]["trader_investment_plan"] == "Buy 10 shares"
+        assert "final_state" not in completed.to_dict()["data"]
+        assert trading_graph.curr_state is completed.data["final_state"]
+        print(f"✓ {len(events)} events in node order")
+
+    def test_cancel_stops_remaining_nodes(self, trading_graph):
+        visited = []
+        gate = threading.Event()
+        trading_graph.graph = _fake_workflow(visited, gate)
+
+        async def run():
+            events = trading_graph.astream_propagate("AAPL", "2024-06-07")
+            collected = await _collect(events, stop_after=PropagationEventType.ANALYST_REPORT)
+            await events.aclose()
+            gate.set()
+            await asyncio.sleep(0.2)
+            return collected
+
+        collected = asyncio.run(run())
+
+        assert collected[-1].type == PropagationEventType.ANALYST_REPORT
+        assert "Trader" not in visited and "Risk Judge" not in visited
+        assert trading_graph.curr_state is None
+        print(f"✓ Run stopped after {visited}")
+
+
+def _failing_workflow():
+    """Compiled graph whose only node raises."""
+    def fail(state):
+        raise RuntimeError("LLM unavailable")
+
+    workflow = StateGraph(AgentState)
+    workflow.add_node("Market Analyst", fail)
+    workflow.add_edge(START, "Market Analyst")
+    workflow.add_edge("Market Analyst", END)
+    return workflow.compile()
+
+
+class TestMemoryRunScope:
+    """The run-scoped memory matches end with the run, however it ends"""
+
+    @pytest.mark.parametrize("debug", [False, True])
+    def test_failed_propagate_ends_memory_run(self, trading_graph, debug):
+        trading_graph.graph = _failing_workflow()
+        trading_graph.debug = debug
+
+        with pytest.raises(RuntimeError):
+            trading_graph.propagate("AAPL", "2024-06-07")
+
+        assert trading_graph.memory_run.active is False
+        print(f"✓ Memory run ended after a failed run (debug={debug})")
+
+    def test_failed_stream_ends_memory_run(self, trading_graph):
+        trading_graph.graph = _failing_workflow()
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(_collect(trading_graph.astream_propagate("AAPL", "2024-06-07")))
+
+        assert trading_graph.memory_run.active is False
+        print("✓ Memory run ended after a failed stream")
+
+    def test_closed_stream_ends_memory_run(self, trading_graph):
+        gate = threading.Event()
+        trading_graph.graph = _fake_workflow([], gate)
+
+        async def run():
+            events = trading_graph.astream_propagate("AAPL", "2024-06-07")
+            await _collect(events, stop_after=PropagationEventType.ANALYST_REPORT)
+            assert trading_graph.memory_run.active is True
+            await events.aclose()
+            gate.set()
+
+        asyncio.run(run())
+
+        assert trading_graph.memory_run.active is False
+        print("✓ Memory run ended when the stream was closed")
+
+
+class _StreamingGraph:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.resets = 0
+
+    def reset_run_state(self):
+        self.resets += 1
+
+    async def astream_propagate(self, company_name, trade_date, store_analysis=False):
+        from tradingagents.graph.streaming import PropagationEvent
+
+        yield PropagationEvent(PropagationEventType.STARTED, 0, 0.0)
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        yield PropagationEvent(PropagationEventType.COMPLETED, 1, 0.1, data={"signal": "HOLD"})
+
+
+class TestPooledStreaming:
+    """Pooled graphs are returned only after a completed stream"""
+
+    def test_completed_run_returns_graph(self):
+        pool = GraphPool(graph_factory=lambda config=None, **kwargs: _StreamingGraph())
+        events = asyncio.run(_collect(pool.astream_propagate("AAPL", "2024-06-07")))
+
+        assert events[-1].data["signal"] == "HOLD"
+        stats = list(pool.get_stats().values())[0]
+        assert stats["idle"] == 1 and stats["runs"] == 1
+        print("✓ Graph returned to the pool after COMPLETED")
+
+    def test_failed_run_discards_graph(self):
+        pool = GraphPool(graph_factory=lambda config=None, **kwargs: _StreamingGraph(fail=True))
+        with pytest.raises(RuntimeError):
+            asyncio.run(_collect(pool.astream_propagate("AAPL", "2024-06-07")))
+
+        stats = list(pool.get_stats().values())[0]
+        assert stats["idle"] == 0 and stats["runs"] == 0
+        print("✓ Graph discarded after a failed stream")
@@ -0,0 +1,148 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for bulk scan-result storage and latest-close enrichment: the rows
+written by store_scan_results, the v_latest_closes guard for databases
+without migration 017, and the screener's price fallback when no close is
+stored. The database is a fake; execute_values is replaced by a recorder.
+"""
+
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from tradingagents.database import scan_ops
+from tradingagents.database.scan_ops import ScanOperations, _SCAN_COLUMNS
+from tradingagents.screener.screener import DailyScreener
+
+SCAN_DATE = date(2026, 10, 16)
+
+
+class _FakeDB:
+    """Records queries; answers the view check and the top-opportunities query."""
+
+    def __init__(self, has_view=True, rows=None):
+        self.has_view = has_view
+        self.rows = rows or []
+        self.queries = []
+
+    @contextmanager
+    def get_cursor(self, cursor_factory=None):
+        yield object()
+
+    def execute_query(self, query, params=None, fetch=True, fetch_one=False):
+        self.queries.append(query)
+        return (self.has_view,)
+
+    def execute_dict_query(self, query, params=None, fetch_one=False):
+        self.queries.append(query)
+        return [dict(row) for row in self.rows]
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    calls = []
+
+    def execute_values(cursor, query, rows, template=None, page_size=100, fetch=False):
+        calls.append({'query': query, 'rows': list(rows), 'template': template})
+        if fetch:
+            return [(row[0], 1000 + row[0]) for row in rows]
+
+    monkeypatch.setattr(scan_ops, 'execute_values', execute_values)
+    return calls
+
+
+class TestStoreScanResults:
+    """One upsert for all rows, outcomes in the same cursor"""
+
+    def test_rows_and_outcomes(self, recorder):
+        results = [
+            {'ticker_id': 1, 'price': np.float64(101.5), 'volume': np.int64(2_000_000),
+             'priority_score': np.int32(80), 'technical_signals': {'rsi': np.float32(28.5)},
+             'entry_price_min': 98.0, 'entry_price_max': 100.0, 'entry_timing': 'WAIT_FOR_DIP'},
+            {'ticker_id': 2, 'price': 55.0, 'priority_score': 40},
+            {'ticker_id': 1, 'price': 102.0, 'priority_score': 81,
+             'entry_price_min': 99.0, 'entry_price_max': 101.0},
+        ]
+
+        scan_ids = ScanOperations(_FakeDB()).store_scan_results(SCAN_DATE, results)
+
+        assert scan_ids == {1: 1001, 2: 1002}
+        upsert, outcomes = recorder
+        assert 'INSERT INTO daily_scans' in upsert['query'] and 'RETURNING ticker_id, scan_id' in upsert['query']
+
+        # Duplicate ticker collapsed to its last result
+        rows = {row[0]: dict(zip(_SCAN_COLUMNS, row)) for row in upsert['rows']}
+        assert len(upsert['rows']) == 2
+        assert rows[1]['price'] == 102.0 and rows[1]['priority_score'] == 81
+        assert rows[2]['scan_date'] == SCAN_DATE and rows[2]['triggered_alerts'] == []
+        assert all(len(row) == len(_SCAN_COLUMNS) for row in upsert['rows'])
+
+        assert 'INSERT INTO entry_price_outcomes' in outcomes['query']
+        assert outcomes['rows'] == [(1001, 1, SCAN_DATE, Decimal('99.0'), Decimal('101.0'), None)]
+        print("✓ Two scan rows and one entry price outcome written")
+
+    def test_numpy_values_converted(self, recorder):
+        ScanOperations(_FakeDB()).store_scan_results(SCAN_DATE, [
+            {'ticker_id': 3, 'price': np.float64(10.25), 'volume': np.int64(5),
+             'technical_signals': {'rsi': np.float32(28.5), 'flags': [np.bool_(True)]}},
+        ], track_entry_prices=False)
+
+        (upsert,) = recorder
+        row = dict(zip(_SCAN_COLUMNS, upsert['rows'][0]))
+        assert type(row['price']) is float and type(row['volume']) is int
+        assert row['technical_signals'] == '{"rsi": 28.5, "flags": [true]}'
+        print("✓ NumPy values stored as plain Python types")
+
+    def test_empty_batch_writes_nothing(self, recorder):
+        assert ScanOperations(_FakeDB()).store_scan_results(SCAN_DATE, []) == {}
+        assert recorder == []
+        print("✓ Empty batch is a no-op")
+
+
+class TestLatestCloses:
+    """v_latest_closes guard and screener enrichment"""
+
+    @pytest.mark.parametrize("has_view", [True, False])
+    def test_join_guarded_by_view_check(self, has_view):
+        db = _FakeDB(has_view=has_view)
+        ops = ScanOperations(db)
+
+        ops.get_top_opportunities(SCAN_DATE)
+        ops.get_top_opportunities(SCAN_DATE)
+
+        view_checks = [q for q in db.queries if 'information_schema.views' in q]
+        selects = [q for q in db.queries if 'FROM daily_scans ds' in q]
+        assert len(view_checks) == 1 and len(selects) == 2
+        if has_view:
+            assert 'LEFT JOIN v_latest_closes lc' in selects[0]
+        else:
+            assert 'v_latest_closes' not in selects[0]
+            assert 'CROSS JOIN LATERAL' in selects[0] and 'AS prev_close' in selects[0]
+        print(f"✓ View present={has_view}: enrichment query is valid")
+
+    def test_screener_price_fallback(self):
+        rows = [
+            {'ticker_id': 1, 'company_name': 'Up Co', 'price': 90.0, 'volume': 1_000.0,
+             'latest_close': Decimal('110.0'), 'latest_volume': Decimal('5000'), 'prev_close': Decimal('100.0')},
+            {'ticker_id': 2, 'company_name': 'One Bar', 'price': 40.0, 'volume': 2_000.0,
+             'latest_close': Decimal('42.0'), 'latest_volume': None, 'prev_close': None},
+            {'ticker_id': 3, 'price': 12.5, 'volume': 300.0,
+             'latest_close': None, 'latest_volume': None, 'prev_close': None},
+        ]
+        screener = DailyScreener(db=_FakeDB(has_view=False, rows=rows))
+
+        results = {r['ticker_id']: r for r in screener.get_top_opportunities(limit=3, scan_date=SCAN_DATE)}
+
+        assert results[1]['current_price'] == 110.0 and results[1]['current_volume'] == 5000.0
+        assert results[1]['change_pct'] == pytest.approx(10.0)
+        assert (results[2]['current_price'], results[2]['current_volume'], results[2]['change_pct']) == (42.0, 0.0, 0.0)
+        # No stored close: scan price and volume, no change
+        assert (results[3]['current_price'], results[3]['current_volume'], results[3]['change_pct']) == (12.5, 300.0, 0.0)
+        assert results[3]['name'] == 'N/A'
+        assert all('latest_close' not in r and 'prev_close' not in r for r in results.values())
+        print("✓ Missing closes fall back to the scan price")
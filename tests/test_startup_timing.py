@@ -0,0 +1,98 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for lazy TradingAgentsGraph initialization, the per-day regime cache
+and the startup timer.
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from tradingagents.market import regime as regime_module
+from tradingagents.utils.startup_timing import StartupTimer, format_startup_report
+
+
+class TestRegimeCache:
+    """Market regime is detected once per trading day"""
+
+    def test_regime_cached_per_trading_day(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(regime_module, "_regime_cache", {})
+        monkeypatch.setattr(regime_module, "detect_market_regime", lambda ticker="SPY", fallback="VOLATILE": calls.append(ticker) or "BULL")
+
+        friday, saturday, monday = date(2024, 6, 7), date(2024, 6, 8), date(2024, 6, 10)
+        assert regime_module.get_market_regime(trading_day=friday) == "BULL"
+        assert regime_module.get_market_regime(trading_day=saturday) == "BULL"
+        assert len(calls) == 1
+
+        regime_module.get_market_regime(trading_day=monday)
+        assert len(calls) == 2
+        assert list(regime_module._regime_cache) == [("SPY", monday)]
+        print("✓ Regime detected once per trading day")
+
+    def test_failed_detection_not_cached(self, monkeypatch):
+        histories = [pd.DataFrame(), pd.DataFrame({"Close": [100.0 + i for i in range(260)]})]
+        monkeypatch.setattr(regime_module, "_regime_cache", {})
+        monkeypatch.setattr(
+            regime_module.yf, "Ticker",
+            lambda ticker: SimpleNamespace(history=lambda period: histories.pop(0))
+        )
+
+        friday = date(2024, 6, 7)
+        assert regime_module.get_market_regime(trading_day=friday) == "VOLATILE"
+        assert regime_module._regime_cache == {}
+        assert regime_module.get_market_regime(trading_day=friday) == "BULL"
+        assert regime_module.get_market_regime(trading_day=friday) == "BULL"
+        assert histories == []
+        assert regime_module.detect_market_regime() == "VOLATILE"  # Public default unchanged
+        print("✓ Failed fetch returns VOLATILE without pinning it for the day")
+
+
+class TestStartupTimer:
+    """Component timings"""
+
+    def test_measure_and_report(self):
+        timer = StartupTimer()
+        with timer.measure("rag"):
+            pass
+        timer.record("rag", 0.5)
+        timer.record("llm_clients", 0.1)
+
+        report = timer.get_report()
+        assert list(report) == ["rag", "llm_clients"]
+        assert report["rag"]["count"] == 2
+        assert "Cold import time" in format_startup_report({"chromadb": 1.5, "missing": None})
+        print("✓ Timings recorded, slowest first")
+
+
+class TestLazyGraphInit:
+    """Heavy components are not built by the constructor"""
+
+    def test_construction_defers_regime_rag_and_memories(self, monkeypatch):
+        from tradingagents.default_config import DEFAULT_CONFIG
+        from tradingagents.graph import trading_graph
+
+        regime_calls = []
+        monkeypatch.setattr(trading_graph, "get_market_regime", lambda: regime_calls.append(1) or "BEAR")
+
+        config = DEFAULT_CONFIG.copy()
+        graph = trading_graph.TradingAgentsGraph(
+            ["market"], config=config, enable_rag=False,
+            enable_subagents=False, enable_summarization=False
+        )
+
+        assert regime_calls == []
+        assert "ticker_ops" not in graph.__dict__
+        assert "situation_collection" not in graph.bull_memory.__dict__
+
+        graph._apply_adaptive_config()
+        graph._apply_adaptive_config()
+        assert graph.market_regime == "BEAR"
+        assert config["max_risk_discuss_rounds"] == 3
+
+        assert graph.ticker_ops is None and not graph._ensure_rag()
+        print("✓ Regime, RAG and memories are initialized on first use")
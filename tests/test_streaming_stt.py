@@ -0,0 +1,171 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for incremental STT: PCM ring buffer, VAD segmentation on the worker
+thread, partial transcripts and per-segment latency metrics, driven by the
+bundled test WAV.
+"""
+
+import threading
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tradingagents.voice import PCMRingBuffer, StreamingSTTConfig, StreamingTranscriber
+
+TEST_WAV = Path(__file__).resolve().parent.parent / "test_voice_output.wav"
+
+
+class _StubSTT:
+    """Records decoded segment lengths; Whisper models cannot be downloaded in tests."""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def transcribe_array(self, audio, sample_rate=16000):
+        self.calls.append(len(audio))
+        self.threads.add(threading.current_thread().name)
+        return {"text": f"<{len(audio) / sample_rate:.2f}s>", "segments": [{"confidence": -0.2}], "language": "en"}
+
+
+def _wav_chunks(chunk_ms=20):
+    with wave.open(str(TEST_WAV), "rb") as wav_file:
+        rate = wav_file.getframerate()
+        frames = wav_file.getnframes()
+        pcm = wav_file.readframes(frames)
+    step = int(rate * chunk_ms / 1000) * 2
+    return rate, frames, pcm, [pcm[i:i + step] for i in range(0, len(pcm), step)]
+
+
+@pytest.fixture
+def wav():
+    if not TEST_WAV.exists():
+        pytest.skip("test_voice_output.wav not available")
+    return _wav_chunks()
+
+
+class TestPCMRingBuffer:
+    """Preallocated ring buffer"""
+
+    def test_wraparound_and_overrun(self):
+        ring = PCMRingBuffer(10)
+        ring.write(np.arange(7, dtype=np.int16))
+        ring.write(np.arange(7, 13, dtype=np.int16))
+
+        assert ring.total_written == 13
+        assert ring.read(3, 13).tolist() == list(range(3, 13))
+        # Samples 0-2 were overwritten
+        assert ring.read(0, 5).tolist() == [3, 4]
+        print("✓ Ring buffer wraps and clips overwritten ranges")
+
+
+class TestStreamingTranscriber:
+    """VAD-segmented incremental transcription"""
+
+    def test_segments_partials_and_metrics(self, wav):
+        rate, frames, pcm, chunks = wav
+        results = []
+        stt = _StubSTT()
+        config = StreamingSTTConfig(end_silence_ms=300, partial_interval_ms=400)
+        transcriber = StreamingTranscriber(stt, config, on_result=results.append)
+
+        for chunk in chunks:
+            transcriber.feed(chunk, sample_rate=rate)
+        transcriber.flush()
+        assert transcriber.wait_idle(timeout=10)
+        transcriber.close()
+
+        # Decoding ran on the worker thread, never on the feeding thread
+        assert stt.threads == {"streaming-stt"}
+        assert transcriber.ring.total_written == pytest.approx(frames * 16000 / rate, abs=2)
+
+        finals = [r for r in results if r["type"] == "final"]
+        partials = [r for r in results if r["type"] == "partial"]
+        assert len(finals) >= 2
+        assert partials
+        assert [f["segment_id"] for f in finals] == sorted(f["segment_id"] for f in finals)
+        for previous, current in zip(finals, finals[1:]):
+            assert previous["end"] <= current["start"]
+        assert finals[-1]["end"] <= frames / rate + 0.01
+
+        for final in finals:
+            metrics = final["metrics"]
+            assert metrics["audio_seconds"] > 0
+            assert metrics["finalize_latency_seconds"] >= 0
+            assert metrics["queue_seconds"] >= 0
+
+        summary = transcriber.get_metrics()
+        assert summary["segments"] == len(finals)
+        assert summary["partials"] == len(partials)
+        print(f"✓ {len(finals)} segments, {len(partials)} partials")
+
+    def test_reset_starts_fresh_metrics(self, wav):
+        rate, frames, pcm, chunks = wav
+        transcriber = StreamingTranscriber(_StubSTT(), StreamingSTTConfig(end_silence_ms=300))
+
+        def utterance():
+            for chunk in chunks:
+                transcriber.feed(chunk, sample_rate=rate)
+            transcriber.flush()
+            assert transcriber.wait_idle(timeout=10)
+            return transcriber.get_metrics()
+
+        first = utterance()
+        transcriber.reset()
+        assert transcriber.get_metrics() == {"segments": 0}
+        assert transcriber.final_results == []
+
+        second = utterance()
+        transcriber.close()
+        assert second["segments"] == first["segments"] > 0
+        assert second["partials"] == first["partials"]
+        print(f"✓ Each utterance reports its own {second['segments']} segments")
+
+    def test_reset_drops_in_flight_finals(self, wav):
+        rate, frames, pcm, chunks = wav
+        release = threading.Event()
+
+        class _SlowSTT(_StubSTT):
+            def transcribe_array(self, audio, sample_rate=16000):
+                release.wait(timeout=10)
+                return super().transcribe_array(audio, sample_rate)
+
+        results = []
+        transcriber = StreamingTranscriber(_SlowSTT(), StreamingSTTConfig(end_silence_ms=300), on_result=results.append)
+        for chunk in chunks:
+            transcriber.feed(chunk, sample_rate=rate)
+        transcriber.flush()
+
+        transcriber.reset()  # "stop" while segments are still decoding
+        release.set()
+        assert transcriber.wait_idle(timeout=10)
+        transcriber.close()
+
+        assert any(r["type"] == "final" for r in results)
+        assert transcriber.get_metrics() == {"segments": 0}
+        assert transcriber.final_results == []
+        print("✓ Finals of the interrupted utterance are not counted")
+
+    def test_wav_stream_matches_raw_pcm(self, wav):
+        rate, frames, pcm, chunks = wav
+        with open(TEST_WAV, "rb") as f:
+            data = f.read()
+
+        stt = _StubSTT()
+        results = list(stt_stream(stt, [data[i:i + 1000] for i in range(0, len(data), 1000)]))
+        raw = list(stt_stream(_StubSTT(), chunks, sample_rate=rate))
+
+        assert [r["end"] for r in results if r["type"] == "final"] == [
+            r["end"] for r in raw if r["type"] == "final"
+        ]
+        print("✓ WAV header is parsed from the first chunks")
+
+
+def stt_stream(stt, chunks, sample_rate=None):
+    from tradingagents.voice.streaming_stt import transcribe_pcm_stream
+
+    return transcribe_pcm_stream(stt, iter(chunks), sample_rate=sample_rate)
@@ -0,0 +1,153 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for sentence-pipelined, in-memory TTS synthesis and the phrase cache.
+"""
+
+import aifc
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import wave
+
+import numpy as np
+
+from tradingagents.voice import EmotionalTone, PhraseAudioCache, TTSEngineFallback, TTSPipeline
+from tradingagents.voice.tts_pipeline import split_sentences
+
+
+class _StubEngine:
+    """Renders text as a tiny WAV and records each call."""
+
+    voice_id = "stub-voice"
+
+    def __init__(self):
+        self.rendered = []
+
+    def render_wav(self, text, tone):
+        self.rendered.append(text)
+        return text.encode("utf-8")
+
+
+class TestSentenceSplitting:
+    """Sentence boundaries, never mid-word"""
+
+    def test_split_on_sentences(self):
+        text = "NVDA closed at $120.50 today. Dr. Smith expects growth!  Is that priced in? Maybe"
+        assert split_sentences(text) == [
+            "NVDA closed at $120.50 today.",
+            "Dr. Smith expects growth!",
+            "Is that priced in?",
+            "Maybe",
+        ]
+        print("✓ Split on sentence boundaries")
+
+    def test_long_sentence_split_at_words(self):
+        text = "word " * 100
+        chunks = split_sentences(text, max_chars=60)
+        assert all(len(c) <= 60 for c in chunks)
+        assert " ".join(chunks).split() == text.split()
+        print("✓ Long sentences split at word boundaries")
+
+
+class TestTTSPipeline:
+    """Prefetching and phrase cache"""
+
+    def test_next_sentence_synthesized_while_streaming(self):
+        engine = _StubEngine()
+        pipeline = TTSPipeline(engine, cache=PhraseAudioCache(), prefetch=1)
+
+        stream = pipeline.stream("First one. Second one. Third one.", EmotionalTone.CALM)
+        assert next(stream) == b"First one."
+        # The consumer has not asked for it yet, but sentence two is already rendering
+        for _ in range(100):
+            if "Second one." in engine.rendered:
+                break
+            time.sleep(0.01)
+        assert "Second one." in engine.rendered
+        assert list(stream) == [b"Second one.", b"Third one."]
+        assert pipeline.last_stream_stats["time_to_first_audio"] is not None
+        print("✓ Next sentence synthesized ahead of the consumer")
+
+    def test_repeated_phrases_cached_by_text_voice_tone(self):
+        engine = _StubEngine()
+        cache = PhraseAudioCache()
+        pipeline = TTSPipeline(engine, cache=cache)
+        disclaimer = "This is not financial advice."
+
+        list(pipeline.stream(disclaimer, EmotionalTone.PROFESSIONAL))
+        list(pipeline.stream(disclaimer, EmotionalTone.PROFESSIONAL))
+        list(pipeline.stream(disclaimer, EmotionalTone.CALM))
+
+        assert engine.rendered == [disclaimer, disclaimer]
+        assert cache.get_stats()["hits"] == 1
+        print("✓ Phrase cache keyed by (text, voice, tone)")
+
+    def test_direct_and_streamed_renders_never_overlap(self):
+        class _SlowEngine(_StubEngine):
+            def __init__(self):
+                super().__init__()
+                self.active = 0
+                self.overlaps = 0
+                self.lock = threading.Lock()
+
+            def render_wav(self, text, tone):
+                with self.lock:
+                    self.active += 1
+                    self.overlaps += self.active > 1
+                time.sleep(0.02)
+                with self.lock:
+                    self.active -= 1
+                return super().render_wav(text, tone)
+
+        engine = _SlowEngine()
+        pipeline = TTSPipeline(engine, cache=PhraseAudioCache(), prefetch=2)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            streamed = executor.submit(lambda: list(pipeline.stream("One. Two. Three. Four.", EmotionalTone.CALM)))
+            direct = [executor.submit(pipeline.synthesize_phrase, f"Direct {i}.", EmotionalTone.CALM) for i in range(3)]
+            assert len(streamed.result()) == 4 and all(f.result() for f in direct)
+
+        assert len(engine.rendered) == 7 and engine.overlaps == 0
+        print("✓ Backend calls serialized across executor threads and the pipeline")
+
+
+class TestFallbackConversion:
+    """AIFF output converted in memory"""
+
+    def test_aiff_to_wav_in_memory(self, tmp_path):
+        samples = np.array([0, 1000, -1000, 32767, -32768], dtype=np.int16)
+        aiff_path = tmp_path / "speech.aiff"
+        with aifc.open(str(aiff_path), "wb") as aiff_file:
+            aiff_file.setnchannels(1)
+            aiff_file.setsampwidth(2)
+            aiff_file.setframerate(22050)
+            aiff_file.writeframes(samples.astype(">i2").tobytes())
+
+        wav_bytes = TTSEngineFallback()._convert_to_wav(aiff_path.read_bytes())
+
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+            assert wav_file.getframerate() == 22050
+            decoded = np.frombuffer(wav_file.readframes(5), dtype="<i2")
+        assert decoded.tolist() == samples.tolist()
+        print("✓ AIFF converted to little-endian WAV without touching disk")
+
+    def test_24_bit_aiff_byte_swapped(self, tmp_path):
+        samples = [0, 1, -1, 0x123456, -0x400000, 0x7FFFFF]
+        aiff_path = tmp_path / "speech.aiff"
+        with aifc.open(str(aiff_path), "wb") as aiff_file:
+            aiff_file.setnchannels(1)
+            aiff_file.setsampwidth(3)
+            aiff_file.setframerate(22050)
+            aiff_file.writeframes(b"".join(v.to_bytes(3, "big", signed=True) for v in samples))
+
+        wav_bytes = TTSEngineFallback()._convert_to_wav(aiff_path.read_bytes())
+
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+            assert wav_file.getsampwidth() == 3
+            frames = wav_file.readframes(len(samples))
+        decoded = [int.from_bytes(frames[i:i + 3], "little", signed=True) for i in range(0, len(frames), 3)]
+        assert decoded == samples
+        print("✓ 24-bit AIFF converted to little-endian WAV")
@@ -0,0 +1,143 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Parity tests for the universe Market Structure and Cloud Trend scanner.
+
+Every ticker of a mixed universe (different history lengths, breakout and
+breakdown bars, volume spikes, NaN bars, too-short histories) is analyzed by
+MarketStructureCloudTrendSignalGenerator.analyze_stock() and by one
+UniverseSignalScanner.scan() pass; signals, confidence, reasoning and levels
+must agree.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.screener.market_structure_cloud_trend_signals import MarketStructureCloudTrendSignalGenerator
+from tradingagents.screener.universe_scanner import OHLCPanel, UniverseSignalScanner
+
+
+def _frame(seed, bars):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    spread = np.abs(rng.normal(0, 0.01, bars)) * close
+    high, low = close + spread, close - spread
+    volume = rng.integers(1e5, 1e6, bars).astype(float)
+
+    shape = seed % 5
+    if shape == 1:    # Breakout bar on heavy volume
+        close[-1] = close[-2] * 1.08
+        high[-1], volume[-1] = close[-1] * 1.01, volume[-2] * 3
+    elif shape == 2:  # Breakdown bar on heavy volume
+        close[-1] = close[-2] * 0.92
+        low[-1], volume[-1] = close[-1] * 0.99, volume[-2] * 3
+    elif shape == 3:  # Sweep: long wick below, close back up
+        low[-1] = low[-20:].min() * 0.95
+    if seed % 7 == 0:
+        rows = rng.choice(np.arange(bars - 30), 3, replace=False)
+        high[rows] = low[rows] = close[rows] = np.nan
+
+    return pd.DataFrame(
+        {'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=pd.bdate_range('2023-01-02', periods=bars),
+    )
+
+
+def _universe(count):
+    lengths = [40, 50, 120, 250]
+    return {f"T{seed:04d}": _frame(seed, lengths[seed % 4] + seed % 11) for seed in range(count)}
+
+
+class TestScannerParity:
+    """Universe scan equals per-ticker analysis"""
+
+    @pytest.mark.parametrize("timeframe,min_confidence", [("swing", 70), ("scalp", 0), ("swing", 80)])
+    def test_scan_matches_analyze_stock(self, timeframe, min_confidence):
+        frames = _universe(160)
+
+        table = UniverseSignalScanner(timeframe=timeframe, min_confidence=min_confidence).scan(
+            OHLCPanel.from_frames(frames)
+        )
+
+        signals = {'BUY': 0, 'SELL': 0, 'WAIT': 0}
+        for ticker, frame in frames.items():
+            expected = MarketStructureCloudTrendSignalGenerator.analyze_stock(
+                frame, timeframe=timeframe, min_confidence=min_confidence
+            )
+            row = table.loc[ticker]
+            assert (row['signal'], row['confidence'], row['reasoning']) == (
+                expected['signal'], expected['confidence'], expected['reasoning']
+            ), ticker
+            signals[row['signal']] += 1
+            if 'error' in expected:
+                continue
+
+            for key in ('structure_break_type', 'cloud_direction', 'volume_confirmed'):
+                assert row[key] == expected[key], (ticker, key)
+            assert row['atr'] == pytest.approx(expected['atr'])
+            assert row['entry_price'] == expected['entry_price']
+            for key in ('stop_loss', 'take_profit'):
+                if expected[key] is None:
+                    assert np.isnan(row[key])
+                else:
+                    assert row[key] == pytest.approx(expected[key])
+
+            structure = expected['market_structure']
+            assert row['has_inducement'] == structure['inducements']['has_inducement'], ticker
+            assert row['sweep_type'] == structure['sweeps']['sweep_type'], ticker
+            assert row['current_trend'] == structure['current_trend'], ticker
+
+        assert table['reasoning'].nunique() > 3
+        assert signals['WAIT'] < len(frames) or min_confidence > 75
+        print(f"✓ {len(frames)} tickers match analyze_stock ({signals})")
+
+
+    def test_truncated_panel_matches_truncated_frames(self):
+        frames = _universe(40)
+        table = UniverseSignalScanner().scan(OHLCPanel.from_frames(frames, bars=100))
+
+        for ticker, frame in frames.items():
+            expected = MarketStructureCloudTrendSignalGenerator.analyze_stock(frame.iloc[-100:])
+            assert table.loc[ticker, 'signal'] == expected['signal']
+            assert table.loc[ticker, 'confidence'] == expected['confidence']
+        print("✓ bars= keeps the latest bars of each ticker")
+
+
+class TestUniverse:
+    """Loading and scale"""
+
+    def test_thousand_tickers_in_seconds(self):
+        frames = {f"T{seed:04d}": _frame(seed, 250) for seed in range(1000)}
+        panel = OHLCPanel.from_frames(frames)
+
+        started = time.perf_counter()
+        table = UniverseSignalScanner().scan(panel)
+        elapsed = time.perf_counter() - started
+
+        assert len(table) == 1000
+        assert elapsed < 5.0
+        print(f"✓ 1,000 x 250-bar universe scanned in {elapsed:.2f}s")
+
+
+    def test_from_database_single_query(self):
+        class _DB:
+            queries = []
+
+            def execute_query(self, query, params=None):
+                self.queries.append(params)
+                rows = []
+                for symbol, frame in (('AAA', _frame(1, 60)), ('BBB', _frame(2, 55))):
+                    rows.extend((symbol, *values) for values in frame.itertuples(index=False))
+                return rows
+
+        db = _DB()
+        panel = OHLCPanel.from_database(db, ['aaa', 'bbb'], bars=60)
+
+        assert db.queries == [(['AAA', 'BBB'], 60)]
+        assert panel.tickers == ['AAA', 'BBB']
+        assert list(panel.lengths) == [60, 55] and np.isnan(panel.close[1, :5]).all()
+        print("✓ Universe panel loaded with one query")
@@ -0,0 +1,166 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for health-aware vendor routing: circuit breaking of failing vendors,
+health-ordered fallbacks, parallel multi-implementation vendors, hedged
+requests and structured (print-free) logging. Vendors are in-process fakes.
+"""
+
+import logging
+import time
+
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.vendor_router import VendorRouter
+from tradingagents.utils.circuit_breaker import CircuitBreaker
+
+
+def _vendor(name, result=None, delay=0.0, error=None, calls=None):
+    def impl(*args, **kwargs):
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        if error:
+            raise error
+        return result if result is not None else f"{name} data"
+    impl.__name__ = name
+    return impl
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    """Route get_news / get_stock_data through fakes with a private router."""
+    config = {"llm_provider": "openai", "data_vendors": {}, "tool_vendors": {}}
+    router = VendorRouter({"failure_threshold": 2, "cooldown_seconds": 60, "log_sample_rate": 1.0})
+    monkeypatch.setattr(interface, "get_config", lambda: config)
+    monkeypatch.setattr(interface, "get_vendor_router", lambda: router)
+
+    def install(method, vendors, primary, hedge_delay=None):
+        category = interface.get_category_for_method(method)
+        config["data_vendors"][category] = primary
+        router.settings["hedge_delay"] = hedge_delay
+        monkeypatch.setitem(interface.VENDOR_METHODS, method, vendors)
+        return router
+
+    return install
+
+
+class TestCircuitBreaking:
+    """Failing vendors are skipped until their cooldown passes"""
+
+    def test_failing_primary_is_skipped(self, routing):
+        calls = []
+        routing("get_stock_data", {
+            "alpha_vantage": _vendor("av_stock", error=TimeoutError("read timed out"), calls=calls),
+            "yfinance": _vendor("yf_stock", calls=calls),
+        }, "alpha_vantage")
+
+        for _ in range(4):
+            assert interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01") == "yf_stock data"
+
+        assert calls.count("av_stock") == 2  # Circuit opened after the threshold
+        assert calls.count("yf_stock") == 4
+        print("✓ Timing-out vendor skipped after 2 failures")
+
+    def test_breaker_recovers_after_cooldown(self):
+        breaker = CircuitBreaker(failure_threshold=1, timeout_seconds=0, name="test")
+        breaker.record_failure()
+        time.sleep(0.01)
+        assert breaker.allow_request()  # Cooled down -> half open
+        breaker.record_success()
+        breaker.record_success()
+        assert breaker.get_state()["state"] == "closed"
+        print("✓ Circuit half-opens after cooldown and closes on success")
+
+    def test_fallbacks_ordered_by_health(self, routing):
+        calls = []
+        router = routing("get_stock_data", {
+            "yfinance": _vendor("yf_stock", error=ValueError("bad ticker"), calls=calls),
+            "alpaca": _vendor("alpaca_stock", error=ValueError("no key"), calls=calls),
+            "polygon": _vendor("polygon_stock", calls=calls),
+        }, "yfinance")
+        router.settings["failure_threshold"] = 100
+
+        interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01")
+        calls.clear()
+        interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01")
+
+        assert calls == ["yf_stock", "polygon_stock"]
+        print("✓ Healthy fallback tried before a failing one")
+
+
+class TestParallelRouting:
+    """Fan-out and hedging"""
+
+    def test_multi_implementation_vendor_runs_in_parallel(self, routing):
+        routing("get_news", {
+            "local": [_vendor("finnhub", delay=0.2), _vendor("reddit", delay=0.2), _vendor("google", delay=0.2)],
+        }, "local")
+
+        started = time.perf_counter()
+        result = interface.route_to_vendor("get_news", "AAPL", "2024-01-01", "2024-01-07")
+        elapsed = time.perf_counter() - started
+
+        assert result == "finnhub data\nreddit data\ngoogle data"
+        assert elapsed < 0.45
+        print(f"✓ Three local news sources in {elapsed:.2f}s")
+
+    def test_slow_primary_is_hedged(self, routing):
+        routing("get_stock_data", {
+            "yfinance": _vendor("yf_stock", delay=1.0),
+            "alpaca": _vendor("alpaca_stock", delay=0.05),
+        }, "yfinance", hedge_delay=0.1)
+
+        started = time.perf_counter()
+        result = interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01")
+        elapsed = time.perf_counter() - started
+
+        assert result == "alpaca_stock data"
+        assert elapsed < 0.6
+        print(f"✓ Hedged request answered in {elapsed:.2f}s")
+
+    def test_fast_primary_not_hedged(self, routing):
+        calls = []
+        routing("get_stock_data", {
+            "yfinance": _vendor("yf_stock", calls=calls),
+            "alpaca": _vendor("alpaca_stock", calls=calls),
+        }, "yfinance", hedge_delay=0.5)
+
+        assert interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01") == "yf_stock data"
+        assert calls == ["yf_stock"]
+        print("✓ No backup request when the primary answers in time")
+
+
+class TestRoutingLogs:
+    """Structured logging instead of prints"""
+
+    def test_no_stdout_and_structured_fields(self, routing, capsys, caplog):
+        routing("get_stock_data", {
+            "alpha_vantage": _vendor("av_stock", error=RuntimeError("rate limited")),
+            "yfinance": _vendor("yf_stock"),
+        }, "alpha_vantage")
+
+        with caplog.at_level(logging.DEBUG, logger="tradingagents.dataflows.vendor_router"):
+            interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-02-01")
+
+        assert capsys.readouterr().out == ""
+        failed = [r for r in caplog.records if getattr(r, "event", None) == "failed"]
+        assert failed and failed[0].vendor == "alpha_vantage" and failed[0].method == "get_stock_data"
+        assert failed[0].levelno == logging.WARNING
+        assert any(getattr(r, "event", None) == "succeeded" and r.duration_ms >= 0 for r in caplog.records)
+        print("✓ Routing logged with vendor/method/duration fields")
+
+    def test_metadata_variant_uses_router(self, routing):
+        router = routing("get_stock_data", {
+            "alpha_vantage": _vendor("av_stock", error=RuntimeError("down")),
+            "yfinance": _vendor("yf_stock"),
+        }, "alpha_vantage")
+
+        data, metadata = interface.route_to_vendor_with_metadata("get_stock_data", "AAPL", "2024-01-01", "2024-02-01")
+
+        assert data == "yf_stock data"
+        assert metadata["vendor_used"] == "yfinance" and metadata["fallback_occurred"]
+        assert router.get_stats()["alpha_vantage:av_stock"]["failures"] == 1
+        print("✓ Metadata routing records vendor health")
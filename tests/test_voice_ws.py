@@ -0,0 +1,134 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the /voice/ws endpoint: unsupported WAV input is reported without
+closing the socket, a failed result send does not hang audio_end, and a
+failed audio send stops streaming synthesis. The STT and TTS engines are
+stubs.
+"""
+
+import base64
+import struct
+import threading
+import wave
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocket
+
+import tradingagents.voice as voice
+from tradingagents.api import main
+
+TEST_WAV = Path(__file__).resolve().parent.parent / "test_voice_output.wav"
+
+
+class _StubSTT:
+    def transcribe_array(self, audio, sample_rate=16000):
+        return {"text": "buy apple", "segments": [{"confidence": -0.2}], "language": "en"}
+
+
+def _wav_header(sample_width, sample_rate=16000, channels=1, data_bytes=0):
+    block_align = channels * sample_width
+    return (
+        b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                sample_rate * block_align, block_align, sample_width * 8)
+        + b"data" + struct.pack("<I", data_bytes)
+    )
+
+
+def _audio_chunk(data, sample_rate=None):
+    return {"type": "audio_chunk", "audio": base64.b64encode(data).decode(), "sample_rate": sample_rate}
+
+
+class _StubTTS:
+    def __init__(self):
+        self.sentences = []
+        self.closed = threading.Event()
+
+    def synthesize_streaming(self, text, tone=None):
+        try:
+            for sentence in text.split(". "):
+                self.sentences.append(sentence)
+                yield sentence.encode()
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture
+def tts():
+    return _StubTTS()
+
+
+@pytest.fixture
+def client(monkeypatch, tts):
+    monkeypatch.setattr(voice, "get_stt_engine", lambda: _StubSTT())
+    monkeypatch.setattr(voice, "get_tts_engine", lambda: tts)
+    return TestClient(main.app)
+
+
+class TestVoiceWebSocket:
+    """Errors are reported on the socket instead of ending or hanging it"""
+
+    def test_unsupported_sample_width_reported(self, client):
+        with client.websocket_connect("/voice/ws") as ws:
+            ws.send_json(_audio_chunk(_wav_header(3) + b"\0" * 960))
+            error = ws.receive_json()
+            assert error["type"] == "error" and "24 bits" in error["message"]
+
+            # The socket is still usable
+            ws.send_json({"type": "stop"})
+            assert ws.receive_json() == {"type": "stopped"}
+        print("✓ 24-bit WAV rejected with an error message")
+
+    def test_failed_result_send_does_not_hang_audio_end(self, client, monkeypatch):
+        if not TEST_WAV.exists():
+            pytest.skip("test_voice_output.wav not available")
+        with wave.open(str(TEST_WAV), "rb") as wav_file:
+            rate = wav_file.getframerate()
+            pcm = wav_file.readframes(wav_file.getnframes())
+
+        original = WebSocket.send_json
+
+        async def send_json(self, data, mode="text"):
+            if data["type"] in ("partial_transcription", "transcription_segment"):
+                raise RuntimeError("send failed")
+            await original(self, data, mode)
+
+        monkeypatch.setattr(WebSocket, "send_json", send_json)
+        received = []
+
+        def converse():
+            with client.websocket_connect("/voice/ws") as ws:
+                ws.send_json(_audio_chunk(pcm, sample_rate=rate))
+                ws.send_json({"type": "audio_end"})
+                received.append(ws.receive_json())
+
+        thread = threading.Thread(target=converse, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+
+        assert not thread.is_alive(), "audio_end blocked on the results queue"
+        assert received == [{"type": "error", "message": "send failed"}]
+        print("✓ audio_end reports the failed send instead of blocking")
+
+    def test_failed_audio_send_closes_synthesis(self, client, tts, monkeypatch):
+        original = WebSocket.send_json
+
+        async def send_json(self, data, mode="text"):
+            if data["type"] == "audio":
+                raise RuntimeError("client went away")
+            await original(self, data, mode)
+
+        monkeypatch.setattr(WebSocket, "send_json", send_json)
+
+        with client.websocket_connect("/voice/ws") as ws:
+            ws.send_json({"type": "synthesize", "text": "One. Two. Three. Four", "stream": True})
+            assert ws.receive_json()["type"] == "error"
+            # Closed while the socket is still open, not when the handler exits
+            assert tts.closed.is_set()
+
+        assert tts.sentences == ["One"]
+        print("✓ Streaming synthesis closed after the first failed send")
@@ -0,0 +1,288 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Tests for the concurrent crawler: per-domain politeness, URL/content dedup and
+the on-disk response cache (expiry and ETag revalidation), run against a local
+HTTP fixture server.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from tradingagents.research import WebCrawler, normalize_url
+from tradingagents.research.crawl_scheduler import HTTPFetcher, ResponseCache, compute_expiry
+
+
+def _html(title, body):
+    return (
+        f"<html><head><title>{title}</title><style>p {{}}</style></head>"
+        f"<body><h1>{title}</h1><p>{body}</p><ul><li>{body} is a meaningful key point</li></ul>"
+        f"<a href='/x'>x</a></body></html>"
+    ).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        host = self.headers.get("Host", "").split(":")[0]
+        with server.lock:
+            server.requests.append({
+                "path": self.path,
+                "host": host,
+                "if_none_match": self.headers.get("If-None-Match"),
+                "started": time.monotonic(),
+            })
+            server.in_flight[host] = server.in_flight.get(host, 0) + 1
+            server.max_in_flight[host] = max(server.max_in_flight.get(host, 0), server.in_flight[host])
+            server.total_in_flight += 1
+            server.max_total_in_flight = max(server.max_total_in_flight, server.total_in_flight)
+        try:
+            time.sleep(server.delay)
+            self._respond()
+        finally:
+            with server.lock:
+                server.in_flight[host] -= 1
+                server.total_in_flight -= 1
+
+    def _respond(self):
+        path = self.path.split("?")[0]
+        if path.startswith("/page/"):
+            number = path.rsplit("/", 1)[-1]
+            self._send(200, _html(f"Page {number}", f"Content of page {number}"), {"Cache-Control": "max-age=300"})
+        elif path == "/mirror":
+            self._send(200, _html("Page 1", "Content of page 1"), {"Cache-Control": "max-age=300"})
+        elif path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, b"", {"ETag": '"v1"', "Cache-Control": "no-cache"})
+            else:
+                self._send(200, _html("Versioned", "Versioned content"), {"ETag": '"v1"', "Cache-Control": "no-cache"})
+        elif path == "/chunked":
+            # Large page written in several delayed chunks
+            body = _html("Chunked", "Chunked content " + "filler text " * 20000) + b"<p>END-OF-PAGE</p>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "max-age=300")
+            self.end_headers()
+            step = len(body) // 4 + 1
+            for start in range(0, len(body), step):
+                self.wfile.write(body[start:start + step])
+                self.wfile.flush()
+                time.sleep(0.05)
+        elif path == "/nostore":
+            self._send(200, _html("Private", "Private content"), {"Cache-Control": "no-store"})
+        else:
+            self._send(404, b"not found", {})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.in_flight = {}
+    httpd.max_in_flight = {}
+    httpd.total_in_flight = 0
+    httpd.max_total_in_flight = 0
+    httpd.delay = 0.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.alt_base = f"http://localhost:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _crawler(tmp_path, **kwargs):
+    kwargs.setdefault("per_domain_delay", 0.0)
+    return WebCrawler(cache_dir=str(tmp_path / "web_cache"), **kwargs)
+
+
+class TestCrawlScheduler:
+    """Concurrency and per-domain politeness"""
+
+    def test_concurrent_within_domain_limits(self, server, tmp_path):
+        server.delay = 0.2
+        urls = [f"{server.base}/page/{i}" for i in range(4)] + [f"{server.alt_base}/page/{i}" for i in range(4, 8)]
+        crawler = _crawler(tmp_path, per_domain_concurrency=2)
+
+        started = time.perf_counter()
+        results = asyncio.run(crawler.crawl_many(urls))
+        elapsed = time.perf_counter() - started
+
+        assert [r.url for r in results] == urls
+        assert max(server.max_in_flight.values()) <= 2
+        assert server.max_total_in_flight > 2  # Both domains were crawled at once
+        assert elapsed < 8 * 0.2
+        print(f"✓ 8 pages in {elapsed:.2f}s, max {server.max_total_in_flight} in flight")
+
+    def test_per_domain_delay(self, server, tmp_path):
+        urls = [f"{server.base}/page/{i}" for i in range(3)]
+        crawler = _crawler(tmp_path, per_domain_concurrency=3, per_domain_delay=0.15)
+
+        asyncio.run(crawler.crawl_many(urls))
+
+        starts = sorted(r["started"] for r in server.requests)
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert len(starts) == 3
+        assert min(gaps) >= 0.13
+        print(f"✓ Requests to one domain spaced by {min(gaps):.2f}s")
+
+
+class TestDedup:
+    """URL normalization and content-hash dedup"""
+
+    def test_normalize_url(self):
+        assert normalize_url("HTTP://Example.com:80/a/?b=2&utm_source=x&a=1#top") == "http://example.com/a?a=1&b=2"
+        assert normalize_url("https://example.com") == "https://example.com/"
+        print("✓ URLs normalized")
+
+    def test_variants_and_mirrors_crawled_once(self, server, tmp_path):
+        crawler = _crawler(tmp_path)
+        urls = [
+            f"{server.base}/page/1",
+            f"{server.base}/page/1?utm_source=feed#section",
+            f"{server.base}/mirror",
+            f"{server.base}/page/2",
+        ]
+
+        results = asyncio.run(crawler.crawl_many(urls))
+
+        assert [r.url for r in results] == [urls[0], urls[3]]
+        assert sorted(r["path"] for r in server.requests) == ["/mirror", "/page/1", "/page/2"]
+        stats = crawler.get_stats()
+        assert stats["duplicate_urls"] == 1
+        assert stats["duplicate_contents"] == 1
+
+        # The mirror is now a known alias of page 1 and is not fetched again
+        results = asyncio.run(crawler.crawl_many([f"{server.base}/page/1", f"{server.base}/mirror"]))
+        assert [r.url for r in results] == [f"{server.base}/page/1"]
+        assert len(server.requests) == 3
+        print("✓ Tracking-parameter variants and mirrors deduplicated")
+
+
+class TestResponseCache:
+    """On-disk cache with expiry and ETag revalidation"""
+
+    def test_fresh_entries_survive_restart(self, server, tmp_path):
+        url = f"{server.base}/page/3"
+        first = asyncio.run(_crawler(tmp_path).crawl_page(url))
+        second = asyncio.run(_crawler(tmp_path).crawl_page(url))
+
+        assert len(server.requests) == 1
+        assert second.metadata["from_cache"] is True
+        assert second.content == first.content
+        assert second.title == "Page 3"
+        assert "- Content of page 3 is a meaningful key point" in second.markdown
+        print("✓ Fresh page served from disk without a request")
+
+    def test_etag_revalidation(self, server, tmp_path):
+        url = f"{server.base}/etag"
+        first = asyncio.run(_crawler(tmp_path).crawl_page(url))
+        second = asyncio.run(_crawler(tmp_path).crawl_page(url))
+
+        assert [r["if_none_match"] for r in server.requests] == [None, '"v1"']
+        assert second.metadata["revalidated"] is True
+        assert second.content == first.content
+        print("✓ Stale page revalidated with If-None-Match (304)")
+
+    def test_no_store_not_cached(self, server, tmp_path):
+        url = f"{server.base}/nostore"
+        asyncio.run(_crawler(tmp_path).crawl_page(url))
+        asyncio.run(_crawler(tmp_path).crawl_page(url))
+
+        assert len(server.requests) == 2
+        assert not list((tmp_path / "web_cache").glob("*.json"))
+        print("✓ no-store responses are not written to disk")
+
+    def test_body_read_across_delayed_chunks(self, server, tmp_path):
+        url = f"{server.base}/chunked"
+        first = asyncio.run(_crawler(tmp_path).crawl_page(url))
+        cached = asyncio.run(_crawler(tmp_path).crawl_page(url))
+
+        assert len(server.requests) == 1
+        assert first.content.endswith("END-OF-PAGE")
+        assert cached.metadata["from_cache"] is True
+        assert cached.content == first.content
+        print(f"✓ {len(first.content):,}-character page read and cached in full")
+
+    def test_body_capped_at_max_bytes(self, server, tmp_path):
+        import aiohttp
+
+        async def fetch():
+            fetcher = HTTPFetcher(ResponseCache(str(tmp_path / "capped")), max_bytes=100_000)
+            async with aiohttp.ClientSession() as session:
+                return await fetcher.fetch(session, f"{server.base}/chunked", contextlib.nullcontext)
+
+        response = asyncio.run(fetch())
+        assert len(response.body) == 100_000
+        print("✓ Body truncated at max_bytes")
+
+    def test_failed_pages_omitted(self, server, tmp_path):
+        results = asyncio.run(_crawler(tmp_path).crawl_many([f"{server.base}/missing", f"{server.base}/page/5"]))
+        assert [r.title for r in results] == ["Page 5"]
+        print("✓ HTTP errors are skipped")
+
+    def test_compute_expiry(self):
+        now = 1000.0
+        assert compute_expiry({"cache-control": "public, max-age=60"}, now) == 1060.0
+        assert compute_expiry({"cache-control": "no-store"}, now) is None
+        assert compute_expiry({"cache-control": "no-cache"}, now) == now
+        assert compute_expiry({"expires": "Thu, 01 Jan 1970 00:20:00 GMT"}, now) == 1200.0
+        assert compute_expiry({}, now, default_ttl=10) == 1010.0
+        print("✓ Freshness computed from caching headers")
+
+
+class TestDomainCredibilityMemo:
+    """Domain credibility scores are computed once per domain"""
+
+    def test_cognitive_verifier(self, monkeypatch):
+        from tradingagents.cognitive.source_verifier import SourceVerifier
+
+        verifier = SourceVerifier()
+        calls = []
+        original = verifier._calculate_credibility_score
+        monkeypatch.setattr(
+            verifier, "_calculate_credibility_score",
+            lambda domain, url: calls.append(domain) or original(domain, url)
+        )
+
+        verifier.verify_source("https://www.reuters.com/a", "text a")
+        verifier.verify_source("https://reuters.com/b", "text b")
+        assert verifier.domain_credibility_score("https://reuters.com/c") == 0.95
+
+        assert calls == ["reuters.com"]
+        print("✓ Cognitive verifier memoizes domain scores")
+
+    def test_research_verifier(self):
+        from tradingagents.research import SourceVerifier
+
+        verifier = SourceVerifier()
+        assert verifier.verify_source("https://sec.gov/x", "").credibility_score == 1.0
+        verifier.trusted_domains["sec.gov"] = 0.0  # Memoized score is reused
+        assert verifier.verify_source("https://sec.gov/y", "").credibility_score == 1.0
+        print("✓ Research verifier memoizes domain scores")
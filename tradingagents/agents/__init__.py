@@ -4,6 +4,7 @@
 from .utils.agent_utils import create_msg_delete
 from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
 from .utils.memory import FinancialSituationMemory
+from .utils.prompt_cache import PromptAssembler
 
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
 from .analysts.market_analyst import create_market_analyst
@@ -24,6 +25,7 @@ from .trader.trader import create_trader
 
 __all__ = [
     "FinancialSituationMemory",
+    "PromptAssembler",
     "AgentState",
     "create_msg_delete",
     "InvestDebateState",
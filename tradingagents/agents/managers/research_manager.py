@@ -4,8 +4,12 @@
 import time
 import json
 
+from tradingagents.agents.utils.prompt_cache import PromptAssembler
+
+
+def create_research_manager(llm, memory, prompt_assembler=None):
+    prompt_assembler = prompt_assembler or PromptAssembler()
 
-def create_research_manager(llm, memory):
     def research_manager_node(state) -> dict:
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
@@ -22,7 +26,7 @@ def create_research_manager(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""As the portfolio manager and debate facilitator, your role is to critically evaluate this round of debate and make a definitive decision: align with the bear analyst, the bull analyst, or choose Hold only if it is strongly justified based on the arguments presented.
+        instructions = f"""As the portfolio manager and debate facilitator, your role is to critically evaluate this round of debate and make a definitive decision: align with the bear analyst, the bull analyst, or choose Hold only if it is strongly justified based on the arguments presented.
 
 Summarize the key points from both sides concisely, focusing on the most compelling evidence or reasoning. Your recommendation—Buy, Sell, or Hold—must be clear and actionable. Avoid defaulting to Hold simply because both sides have valid points; commit to a stance grounded in the debate's strongest arguments.
 
@@ -34,12 +38,12 @@ Strategic Actions: Concrete steps for implementing the recommendation.
 Take into account your past mistakes on similar situations. Use these insights to refine your decision-making and ensure you are learning and improving. Present your analysis conversationally, as if speaking naturally, without special formatting. 
 
 Here are your past reflections on mistakes:
-\"{past_memory_str}\"
+\"{past_memory_str}\""""
 
-Here is the debate:
+        debate = f"""Here is the debate:
 Debate History:
 {history}"""
-        response = llm.invoke(prompt)
+        response = prompt_assembler.invoke(llm, "Research Manager", state, instructions, debate)
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -9,14 +9,246 @@ os.environ.setdefault("CHROMA_SERVER_GRPC_PORT", "50051")
 os.environ.setdefault("CLICKHOUSE_HOST", "localhost")
 os.environ.setdefault("CLICKHOUSE_PORT", "8123")
 
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
-import os
+import concurrent.futures
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Texts per embeddings API request
+EMBEDDING_BATCH_SIZE = 64
+# Embeddings kept in the shared text-hash cache
+EMBEDDING_CACHE_SIZE = 2048
+# Standard OpenAI embedding dimension, used for the dummy embedding
+DUMMY_EMBEDDING_DIM = 1536
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of embeddings keyed by a hash of (model, text).
+
+    Shared by all role memories, so the same situation text is embedded
+    once per process regardless of which memory asks for it.
+    """
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: Optional[str], text: str) -> str:
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: List[float]):
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_embedding_cache = EmbeddingCache()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache."""
+    return _embedding_cache
+
+
+# One ChromaDB client per persist directory (None = in-memory), shared by the role memories
+_chroma_clients: Dict[Optional[str], object] = {}
+_chroma_lock = threading.Lock()
+
+
+def _get_chroma_client(persist_dir: Optional[str] = None):
+    """Shared ChromaDB client: persistent when persist_dir is set, in-memory otherwise."""
+    with _chroma_lock:
+        client = _chroma_clients.get(persist_dir)
+        if client is not None:
+            return client
+
+        # Imported here: chromadb is one of the slowest imports in the package
+        import chromadb
+        from chromadb.config import Settings
+
+        # Fix chromadb configuration by setting required environment variables
+        # and temporarily removing extra ones that chromadb doesn't expect
+        extra_vars = {}
+        for var in ["OPENAI_API_KEY", "ALPHA_VANTAGE_API_KEY", "GOOGLE_API_KEY"]:
+            if var in os.environ:
+                extra_vars[var] = os.environ.pop(var)
+
+        # Set default values for chromadb settings
+        os.environ.setdefault("CHROMA_SERVER_HOST", "localhost")
+        os.environ.setdefault("CHROMA_SERVER_HTTP_PORT", "8000")
+        os.environ.setdefault("CHROMA_SERVER_GRPC_PORT", "50051")
+        os.environ.setdefault("CLICKHOUSE_HOST", "localhost")
+        os.environ.setdefault("CLICKHOUSE_PORT", "8123")
+
+        try:
+            if persist_dir:
+                os.makedirs(persist_dir, exist_ok=True)
+                client = chromadb.PersistentClient(
+                    path=persist_dir,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+            else:
+                # Initialize ChromaDB with telemetry disabled to avoid errors
+                try:
+                    client = chromadb.Client(Settings(
+                        allow_reset=True,
+                        anonymized_telemetry=False,  # Disable telemetry to avoid errors
+                    ))
+                except Exception:
+                    # Last resort: use persistent client
+                    client = chromadb.PersistentClient(
+                        settings=Settings(anonymized_telemetry=False)
+                    )
+        finally:
+            # Restore extra variables
+            os.environ.update(extra_vars)
+
+        _chroma_clients[persist_dir] = client
+        return client
+
+
+class SituationMemoryRun:
+    """
+    Run-scoped memory lookups shared by the role memories of one graph.
+
+    Every researcher, manager and trader node asks its memory about the same
+    situation (the four analyst reports). While a run is active, the first
+    lookup embeds the situation once and queries every member collection with
+    that embedding; later nodes and debate rounds read the stored matches.
+    Concurrent first lookups of one situation wait for that single pass;
+    lookups of other situations are not blocked by it.
+    """
+
+    def __init__(self, memories):
+        self.memories = list(memories)
+        for memory in self.memories:
+            memory.run_scope = self
+        self.active = False
+        # Pending or finished pass per (situation hash, n_matches)
+        self._results: Dict[tuple, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self.batches = 0
+
+    def begin_run(self):
+        """Start a run: lookups are served from one batched pass per situation."""
+        with self._lock:
+            self._results.clear()
+            self.active = True
+
+    def end_run(self):
+        """End the run and drop its matches."""
+        with self._lock:
+            self._results.clear()
+            self.active = False
+
+    def invalidate(self):
+        """Drop stored matches (a member collection changed)."""
+        with self._lock:
+            self._results.clear()
+
+    def lookup(self, memory: "FinancialSituationMemory", situation: str, n_matches: int) -> list:
+        """Matches of one member memory, querying all members on the first call."""
+        key = (hashlib.sha256(situation.encode("utf-8")).hexdigest(), n_matches)
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._results[key] = future
+
+        if owner:
+            # Embedding and queries run outside the lock
+            try:
+                future.set_result(self._query_all(situation, n_matches))
+            except BaseException as e:
+                with self._lock:
+                    if self._results.get(key) is future:
+                        del self._results[key]
+                future.set_exception(e)
+                raise
+        return list(future.result().get(memory.name, []))
+
+    def _query_all(self, situation: str, n_matches: int) -> Dict[str, list]:
+        populated = [memory for memory in self.memories if memory._count() > 0]
+        results = {memory.name: [] for memory in self.memories}
+        if not populated:
+            return results
+
+        # Members share one embedding model, so one vector serves every query
+        query_embedding = populated[0].get_embedding(situation)
+        for memory in populated:
+            results[memory.name] = memory._query(query_embedding, n_matches)
+        with self._lock:
+            self.batches += 1
+        return results
 
 
 class FinancialSituationMemory:
+    """
+    Role memory of past situations and advice, backed by a ChromaDB collection.
+
+    The embedding client and collection are created on first use, so building
+    a graph does not pay for memories that a run never consults. All role
+    memories share one ChromaDB client; set ``memory_persist_dir`` in the
+    config to keep it on disk so memories are warm across restarts.
+    """
+
+    # Attributes created by _initialize() on first access
+    _LAZY_ATTRIBUTES = frozenset({
+        "llm_provider", "use_embeddings", "client", "embedding",
+        "chroma_client", "situation_collection",
+    })
+
     def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        # Set when the memory joins a SituationMemoryRun
+        self.run_scope: Optional[SituationMemoryRun] = None
+
+    def __getattr__(self, name):
+        if name not in FinancialSituationMemory._LAZY_ATTRIBUTES:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self._initialize()
+        return self.__dict__[name]
+
+    def _initialize(self):
+        """Create the embedding client and ChromaDB collection."""
+        from tradingagents.utils.startup_timing import get_startup_timer
+
+        with get_startup_timer().measure(f"memory:{self.name}"):
+            self._create_clients(self.name, self.config)
+
+    def _create_clients(self, name, config):
+        from openai import OpenAI
+
         self.llm_provider = config.get("llm_provider", "openai")
 
         # Skip embeddings if using Google provider (no OpenAI key available)
@@ -39,96 +271,87 @@ class FinancialSituationMemory:
             else:
                 self.use_embeddings = False
                 self.client = None
-        
-        # Fix chromadb configuration by setting required environment variables
-        # and temporarily removing extra ones that chromadb doesn't expect
-        extra_vars = {}
-        for var in ["OPENAI_API_KEY", "ALPHA_VANTAGE_API_KEY", "GOOGLE_API_KEY"]:
-            if var in os.environ:
-                extra_vars[var] = os.environ.pop(var)
-        
-        # Set default values for chromadb settings
-        os.environ.setdefault("CHROMA_SERVER_HOST", "localhost")
-        os.environ.setdefault("CHROMA_SERVER_HTTP_PORT", "8000")
-        os.environ.setdefault("CHROMA_SERVER_GRPC_PORT", "50051")
-        os.environ.setdefault("CLICKHOUSE_HOST", "localhost")
-        os.environ.setdefault("CLICKHOUSE_PORT", "8123")
-        
-        try:
-            # Initialize ChromaDB with telemetry disabled to avoid errors
-            self.chroma_client = chromadb.Client(Settings(
-                allow_reset=True,
-                anonymized_telemetry=False,  # Disable telemetry to avoid errors
-            ))
-        except Exception as e:
-            # If chromadb fails, try with minimal settings
-            try:
-                self.chroma_client = chromadb.Client(Settings(
-                    allow_reset=True,
-                    anonymized_telemetry=False,
-                ))
-            except Exception:
-                # Last resort: use persistent client
-                self.chroma_client = chromadb.PersistentClient(
-                    settings=Settings(anonymized_telemetry=False)
-                )
-        
-        # Restore extra variables
-        os.environ.update(extra_vars)
-        
-        try:
-            self.situation_collection = self.chroma_client.create_collection(name=name)
-        except Exception:
-            # Collection might already exist
-            self.situation_collection = self.chroma_client.get_collection(name=name)
 
-    def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
+        self.chroma_client = _get_chroma_client(config.get("memory_persist_dir"))
+        self.situation_collection = self.chroma_client.get_or_create_collection(name=name)
+
+    def get_embeddings(self, texts):
+        """Get embeddings for several texts, one API request per batch of uncached texts"""
         if not self.use_embeddings or self.client is None:
-            # Return a dummy embedding if embeddings are disabled
-            return [0.0] * 1536  # Standard OpenAI embedding dimension
+            # Return dummy embeddings if embeddings are disabled
+            return [[0.0] * DUMMY_EMBEDDING_DIM for _ in texts]
 
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
-        )
-        return response.data[0].embedding
+        cache = get_embedding_cache()
+        keys = [EmbeddingCache.key(self.embedding, text) for text in texts]
+        vectors = {}
+        pending = {}  # uncached texts, deduplicated, by key
+        for key, text in zip(keys, texts):
+            if key in vectors or key in pending:
+                continue
+            vector = cache.get(key)
+            if vector is None:
+                pending[key] = text
+            else:
+                vectors[key] = vector
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        pending_keys = list(pending)
+        for start in range(0, len(pending_keys), EMBEDDING_BATCH_SIZE):
+            batch = pending_keys[start:start + EMBEDDING_BATCH_SIZE]
+            response = self.client.embeddings.create(
+                model=self.embedding, input=[pending[key] for key in batch]
+            )
+            for key, item in zip(batch, sorted(response.data, key=lambda d: d.index)):
+                vectors[key] = item.embedding
+                cache.put(key, item.embedding)
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+        return [vectors[key] for key in keys]
 
-        offset = self.situation_collection.count()
+    def get_embedding(self, text):
+        """Get OpenAI embedding for a text"""
+        return self.get_embeddings([text])[0]
+
+    def add_situations(self, situations_and_advice):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        if not situations_and_advice:
+            return
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        # Content-derived ids: re-adding the same lesson (e.g. after a restart
+        # with a persistent store) overwrites instead of duplicating
+        lessons = {}
+        for situation, recommendation in situations_and_advice:
+            lesson_id = hashlib.sha256(f"{situation}\x00{recommendation}".encode("utf-8")).hexdigest()[:32]
+            lessons[lesson_id] = (situation, recommendation)
 
-        self.situation_collection.add(
+        situations = [situation for situation, _ in lessons.values()]
+        self.situation_collection.upsert(
             documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
-            ids=ids,
+            metadatas=[{"recommendation": rec} for _, rec in lessons.values()],
+            embeddings=self.get_embeddings(situations),
+            ids=list(lessons),
         )
+        if self.run_scope is not None:
+            self.run_scope.invalidate()
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
+        if self.run_scope is not None and self.run_scope.active:
+            return self.run_scope.lookup(self, current_situation, n_matches)
+
         # Check if collection has any data
+        if self._count() == 0:
+            return []
+
+        return self._query(self.get_embedding(current_situation), n_matches)
+
+    def _count(self):
         try:
-            count = self.situation_collection.count()
-            if count == 0:
-                return []
+            return self.situation_collection.count()
         except Exception:
             # If count fails, assume empty collection
-            return []
-
-        query_embedding = self.get_embedding(current_situation)
+            return 0
 
+    def _query(self, query_embedding, n_matches):
+        """Matches for an already embedded situation"""
         try:
             results = self.situation_collection.query(
                 query_embeddings=[query_embedding],
@@ -0,0 +1,212 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Prefix-cached prompt assembly for the debate and manager nodes.
+
+Every researcher, risk debator and manager prompt is laid out as
+
+    [shared research context]  reports + historical context, byte-identical
+                               for every node of a run
+    [role block]               instructions, reflections, trader plan; stable
+                               across rounds for one role
+    [round block]              debate history and latest arguments
+
+so providers can serve the repeated prefix from their prompt cache:
+
+- "implicit" (OpenAI, OpenRouter, Google): automatic prefix caching, cached
+  tokens are read from the response usage
+- "anthropic": explicit cache_control breakpoints after the shared context
+  and after the role block
+- "ollama": prompts keep the same stable prefix layout; whether the server
+  reuses its KV cache is not visible through the OpenAI-compatible API (no
+  cache reads are reported), so cached/fresh tokens are reported as unknown
+  (None)
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = {
+    "anthropic": "anthropic",
+    "ollama": "ollama",
+    "openai": "implicit",
+    "openrouter": "implicit",
+    "google": "implicit",
+}
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+# Modes whose usage does not report cache reads
+_UNREPORTED_CACHE_MODES = {"ollama"}
+
+
+def shared_research_context(state: Dict[str, Any]) -> str:
+    """
+    The stable prompt prefix shared by all debate and manager nodes of a run.
+
+    Only fields that are final once the analysts finish go in here; anything
+    that changes between rounds belongs in the round block.
+    """
+    return f"""Research context for {state.get("company_of_interest", "")} as of {state.get("trade_date", "")}.
+
+Market research report:
+{state.get("market_report", "")}
+
+Social media sentiment report:
+{state.get("sentiment_report", "")}
+
+Latest world affairs news:
+{state.get("news_report", "")}
+
+Company fundamentals report:
+{state.get("fundamentals_report", "")}
+
+Historical context from past analyses:
+{state.get("historical_context") or "None available."}"""
+
+
+class PromptAssembler:
+    """
+    Builds prefix-cache-friendly prompts and records cached vs. fresh prompt tokens per node.
+
+    One assembler is shared by the nodes of a TradingAgentsGraph; call
+    reset() between runs.
+
+    Example:
+        response = assembler.invoke(llm, "Bull Researcher", state, role_block, round_block)
+        assembler.get_stats()["nodes"]["Bull Researcher"]["cached_tokens"]
+    """
+
+    def __init__(self, provider: Optional[str] = None, token_model: str = "gpt-4o"):
+        """
+        Args:
+            provider: LLM provider name (defaults to the configured llm_provider)
+            token_model: Model whose tokenizer estimates prompt sizes
+        """
+        if provider is None:
+            from tradingagents.dataflows.config import get_config
+            provider = get_config().get("llm_provider", "openai")
+        self.provider = provider.lower()
+        self.mode = CACHE_MODES.get(self.provider, "implicit")
+        self.token_model = token_model
+        self._tracker = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count_tokens(self, text: str) -> int:
+        if self._tracker is None:
+            from tradingagents.middleware.token_tracker import TokenTracker
+            self._tracker = TokenTracker(model=self.token_model)
+        # The shared context is counted once per run via the content-hash cache
+        return self._tracker.count_tokens(text)
+
+    def messages(self, state: Dict[str, Any], role_block: str, round_block: str) -> List[BaseMessage]:
+        """
+        Prompt messages in prefix-cache order.
+
+        Args:
+            state: Agent state (reports, historical context)
+            role_block: Instructions and other content stable across rounds for the node
+            round_block: Content that changes every round (debate history, latest arguments)
+
+        Returns:
+            [SystemMessage(shared context), HumanMessage(role block + round block)]
+        """
+        context = shared_research_context(state)
+        if self.mode == "anthropic":
+            return [
+                SystemMessage(content=[{"type": "text", "text": context, "cache_control": _EPHEMERAL}]),
+                HumanMessage(content=[
+                    {"type": "text", "text": role_block, "cache_control": _EPHEMERAL},
+                    {"type": "text", "text": round_block},
+                ]),
+            ]
+        return [
+            SystemMessage(content=context),
+            HumanMessage(content=f"{role_block}\n\n{round_block}"),
+        ]
+
+    def invoke(self, llm, node: str, state: Dict[str, Any], role_block: str, round_block: str):
+        """
+        Invoke the LLM with an assembled prompt and record its cache usage.
+
+        Args:
+            llm: Chat model
+            node: Node name the usage is reported under
+            state: Agent state
+            role_block: Stable per-node content
+            round_block: Per-round content
+
+        Returns:
+            The model response
+        """
+        response = llm.invoke(self.messages(state, role_block, round_block))
+        try:
+            self._record(node, state, role_block, round_block, getattr(response, "usage_metadata", None))
+        except Exception as e:
+            logger.debug(f"Could not record prompt cache usage for {node}: {e}")
+        return response
+
+    def _record(self, node, state, role_block, round_block, usage):
+        context = shared_research_context(state)
+        prefix_tokens = self._count_tokens(context) + self._count_tokens(role_block)
+        estimated = prefix_tokens + self._count_tokens(round_block)
+
+        reported = (usage or {}).get("input_tokens", 0)
+        prompt_tokens = reported or estimated
+        if self.mode in _UNREPORTED_CACHE_MODES:
+            # Ollama's prompt count comes from the model's own tokenizer, so a
+            # difference from the local estimate is not evidence of KV reuse
+            cached = None
+        else:
+            details = (usage or {}).get("input_token_details") or {}
+            cached = details.get("cache_read", 0) or 0
+
+        with self._lock:
+            known = cached is not None
+            stats = self._stats.setdefault(node, {
+                "calls": 0, "prompt_tokens": 0, "prefix_tokens": 0,
+                "cached_tokens": 0 if known else None, "fresh_tokens": 0 if known else None,
+            })
+            stats["calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["prefix_tokens"] += prefix_tokens
+            if known:
+                stats["cached_tokens"] += cached
+                stats["fresh_tokens"] += prompt_tokens - cached
+        logger.debug(f"{node}: {prompt_tokens} prompt tokens, {cached if known else 'unknown'} cached ({self.mode})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Cached vs. fresh prompt tokens per node.
+
+        Returns:
+            Dict with mode, per-node counters and totals (cache_hit_rate is
+            cached / prompt tokens). Cached and fresh tokens, and the hit
+            rate, are None when the provider does not report cache reads.
+        """
+        with self._lock:
+            nodes = {node: dict(stats) for node, stats in self._stats.items()}
+        total = {key: sum(stats[key] for stats in nodes.values())
+                 for key in ("calls", "prompt_tokens", "prefix_tokens")}
+        for key in ("cached_tokens", "fresh_tokens"):
+            total[key] = (
+                None if self.mode in _UNREPORTED_CACHE_MODES
+                else sum(stats[key] for stats in nodes.values())
+            )
+        if total["cached_tokens"] is None:
+            total["cache_hit_rate"] = None
+        else:
+            total["cache_hit_rate"] = round(total["cached_tokens"] / total["prompt_tokens"], 3) if total["prompt_tokens"] else 0.0
+        return {"mode": self.mode, "nodes": nodes, "total": total}
+
+    def reset(self):
+        """Clear per-run counters."""
+        with self._lock:
+            self._stats.clear()
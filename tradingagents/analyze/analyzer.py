@@ -7,11 +7,14 @@ Deep Analyzer Module
 Provides a simplified interface to TradingAgentsGraph with RAG enhancement.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import date, datetime
 import logging
+import time
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.graph_pool import GraphPool, get_graph_pool
+from tradingagents.graph.streaming import PropagationEvent, PropagationEventType
 from tradingagents.database import get_db_connection, DatabaseConnection
 from tradingagents.default_config import DEFAULT_CONFIG
 
@@ -30,7 +33,9 @@ class DeepAnalyzer:
         config: Dict[str, Any] = None,
         enable_rag: bool = True,
         db: Optional[DatabaseConnection] = None,
-        debug: bool = False
+        debug: bool = False,
+        use_pool: bool = False,
+        graph_pool: Optional[GraphPool] = None
     ):
         """
         Initialize deep analyzer.
@@ -40,6 +45,9 @@ class DeepAnalyzer:
             enable_rag: Whether to enable RAG-based historical context
             db: DatabaseConnection instance (creates new if None)
             debug: Whether to run in debug mode with detailed output
+            use_pool: Lease a warm graph from the shared GraphPool per analysis
+                instead of building one here
+            graph_pool: Pool to lease from (implies use_pool; defaults to the global pool)
         """
         # Merge config with DEFAULT_CONFIG to ensure all required fields are present
         if config:
@@ -63,18 +71,27 @@ class DeepAnalyzer:
         import os
         enable_langfuse = os.getenv("LANGFUSE_ENABLED", "false").lower() == "true"
         
-        self.graph = TradingAgentsGraph(
+        self.graph_kwargs = dict(
             selected_analysts=["market", "social", "news", "fundamentals"],
             debug=debug,
             config=self.config,
             enable_rag=enable_rag,
-            db=self.db,
             enable_langfuse=enable_langfuse,
             enable_token_tracking=False,
             enable_summarization=False,
             enable_todo_lists=False,
             enable_subagents=False
         )
+        self.graph_pool = graph_pool or (get_graph_pool() if use_pool else None)
+        self.construction_seconds = 0.0
+
+        if self.graph_pool is None:
+            start = time.perf_counter()
+            self.graph = TradingAgentsGraph(db=self.db, **self.graph_kwargs)
+            self.construction_seconds = time.perf_counter() - start
+        else:
+            # Graphs are leased per analysis from the pool
+            self.graph = None
 
         logger.info("✓ DeepAnalyzer initialized")
 
@@ -99,6 +116,7 @@ class DeepAnalyzer:
                 - summary: Human-readable summary
                 - confidence: Confidence score
                 - reports: Individual analyst reports
+                - timing: construction_seconds, run_seconds, graph_reused
         """
         if analysis_date is None:
             analysis_date = date.today()
@@ -108,17 +126,75 @@ class DeepAnalyzer:
         logger.info(f"{'='*70}\n")
 
         # Run the analysis graph
-        final_state, processed_signal = self.graph.propagate(
-            company_name=ticker,
-            trade_date=analysis_date,
-            store_analysis=store_results
-        )
+        if self.graph_pool is not None:
+            final_state, processed_signal, timing = self.graph_pool.propagate(
+                ticker,
+                analysis_date,
+                store_analysis=store_results,
+                db=self.db,
+                **self.graph_kwargs
+            )
+        else:
+            start = time.perf_counter()
+            final_state, processed_signal = self.graph.propagate(
+                company_name=ticker,
+                trade_date=analysis_date,
+                store_analysis=store_results
+            )
+            timing = {
+                'construction_seconds': round(self.construction_seconds, 3),
+                'run_seconds': round(time.perf_counter() - start, 3),
+                'graph_reused': False
+            }
 
         # Extract and structure results
         results = self._extract_results(final_state, processed_signal)
+        results['timing'] = timing
 
         return results
 
+    async def astream_analyze(
+        self,
+        ticker: str,
+        analysis_date: date = None,
+        store_results: bool = True
+    ) -> AsyncIterator[PropagationEvent]:
+        """
+        Stream an analysis as typed progress events.
+
+        Yields the events of TradingAgentsGraph.astream_propagate; the final
+        COMPLETED event also carries the structured ``results`` (as returned
+        by analyze(), without the full state).
+
+        Args:
+            ticker: Stock ticker symbol
+            analysis_date: Date to analyze (defaults to today)
+            store_results: Whether to store analysis to database
+
+        Yields:
+            PropagationEvent objects
+        """
+        if analysis_date is None:
+            analysis_date = date.today()
+
+        if self.graph_pool is not None:
+            events = self.graph_pool.astream_propagate(
+                ticker,
+                analysis_date,
+                store_analysis=store_results,
+                db=self.db,
+                **self.graph_kwargs
+            )
+        else:
+            events = self.graph.astream_propagate(ticker, analysis_date, store_analysis=store_results)
+
+        async for event in events:
+            if event.type == PropagationEventType.COMPLETED:
+                results = self._extract_results(event.data["final_state"], event.data["signal"])
+                results.pop('full_state', None)
+                event.data["results"] = results
+            yield event
+
     def _extract_results(self, final_state: Dict[str, Any], processed_signal: str) -> Dict[str, Any]:
         """
         Extract structured results from final state.
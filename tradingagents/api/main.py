@@ -1,6 +1,7 @@
 # Copyright (c) 2024. All rights reserved.
 # Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any
 from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, WebSocket, WebSocketDisconnect, Body
@@ -430,6 +431,46 @@ async def analyze(request: AnalysisRequest):
     # TODO: Implement direct analysis via agent
     raise HTTPException(status_code=501, detail="Not implemented yet")
 
+@app.post("/analyze/stream")
+async def analyze_stream(request: AnalysisRequest):
+    """
+    Streaming multi-agent analysis.
+    Returns Server-Sent Events as each analyst report, debate round, trader plan,
+    risk verdict and token usage update becomes available. Disconnecting cancels
+    the run so no further LLM calls are made.
+    """
+    ticker = request.ticker.strip().upper()
+    if not ticker:
+        raise HTTPException(status_code=400, detail="Ticker is required")
+    
+    async def generate():
+        from tradingagents.analyze.analyzer import DeepAnalyzer
+        from tradingagents.fast_config import FAST_CONFIG
+        
+        try:
+            analyzer = await asyncio.to_thread(
+                DeepAnalyzer, config=FAST_CONFIG, enable_rag=False, use_pool=True
+            )
+            async for event in analyzer.astream_analyze(ticker):
+                yield f"data: {json.dumps(event.to_dict(), default=str)}\n\n"
+            yield f"data: {json.dumps({'type': 'done', 'ticker': ticker})}\n\n"
+        except asyncio.CancelledError:
+            logger.info(f"Streaming analysis of {ticker} cancelled by client")
+            raise
+        except Exception as e:
+            logger.error(f"Error in streaming analysis for {ticker}: {e}", exc_info=True)
+            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 @app.post("/feedback")
 async def feedback(request: FeedbackRequest):
     """
@@ -639,14 +680,39 @@ async def websocket_audio_stream(websocket: WebSocket):
     await websocket.accept()
     logger.info("WebSocket connection established for audio streaming")
     
+    transcriber = None
+    forwarder = None
+    
     try:
-        from tradingagents.voice import get_stt_engine, get_tts_engine, EmotionalTone
+        from tradingagents.voice import get_stt_engine, get_tts_engine, EmotionalTone, StreamingTranscriber
         import base64
         
         stt_engine = get_stt_engine()
         tts_engine = get_tts_engine()
         
-        audio_buffer = b""
+        loop = asyncio.get_running_loop()
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def forward_results():
+            # Partial/final segment transcripts arrive from the STT worker thread
+            while True:
+                result = await results.get()
+                try:
+                    message_type = "partial_transcription" if result["type"] == "partial" else "transcription_segment"
+                    await websocket.send_json({**result, "type": message_type})
+                finally:
+                    results.task_done()
+        
+        def get_transcriber() -> StreamingTranscriber:
+            nonlocal transcriber, forwarder
+            if transcriber is None:
+                transcriber = StreamingTranscriber(
+                    stt_engine,
+                    on_result=lambda result: loop.call_soon_threadsafe(results.put_nowait, result)
+                )
+                forwarder = asyncio.create_task(forward_results())
+            return transcriber
+        
         is_listening = False
         
         while True:
@@ -655,28 +721,45 @@ async def websocket_audio_stream(websocket: WebSocket):
             message_type = data.get("type")
             
             if message_type == "audio_chunk":
-                # Accumulate audio chunks
+                # Write into the ring buffer; VAD segments are decoded off the event loop
                 audio_chunk_b64 = data.get("audio")
                 if audio_chunk_b64:
                     audio_chunk = base64.b64decode(audio_chunk_b64)
-                    audio_buffer += audio_chunk
+                    try:
+                        get_transcriber().feed(audio_chunk, sample_rate=data.get("sample_rate"))
+                    except ValueError as e:
+                        # Unsupported input format: drop the utterance, keep the socket
+                        logger.warning(f"Rejected audio chunk: {e}")
+                        transcriber.reset()
+                        is_listening = False
+                        await websocket.send_json({"type": "error", "message": str(e)})
+                        continue
                     is_listening = True
                     
             elif message_type == "audio_end":
-                # Transcribe accumulated audio
-                if audio_buffer and is_listening:
+                # Finalize the open segment and send the whole utterance
+                if transcriber is not None and is_listening:
                     try:
-                        result = stt_engine.transcribe(audio_buffer)
+                        transcriber.flush()
+                        await loop.run_in_executor(None, transcriber.wait_idle)
+                        # A forwarder that stopped on a failed send never drains the queue
+                        drained = asyncio.ensure_future(results.join())
+                        await asyncio.wait({drained, forwarder}, return_when=asyncio.FIRST_COMPLETED)
+                        if not drained.done():
+                            drained.cancel()
+                            forwarder.result()  # Raises the send error
+                            raise RuntimeError("Transcription forwarder stopped")
                         
-                        # Send transcription back
+                        segments = transcriber.final_results
                         await websocket.send_json({
                             "type": "transcription",
-                            "text": result["text"],
-                            "confidence": result.get("segments", [{}])[0].get("confidence", 0.0) if result.get("segments") else 0.0,
-                            "language": result.get("language", "en")
+                            "text": " ".join(seg["text"] for seg in segments if seg["text"]),
+                            "confidence": segments[0].get("confidence", 0.0) if segments else 0.0,
+                            "language": segments[0].get("language", "en") if segments else "en",
+                            "metrics": transcriber.get_metrics()
                         })
                         
-                        audio_buffer = b""
+                        transcriber.reset()
                         is_listening = False
                     except Exception as e:
                         logger.error(f"Error transcribing audio: {e}")
@@ -701,16 +784,39 @@ async def websocket_audio_stream(websocket: WebSocket):
                         }
                         tone_enum = tone_map.get(tone.lower(), EmotionalTone.PROFESSIONAL)
                         
-                        audio_bytes = tts_engine.synthesize(text, tone=tone_enum, return_bytes=True)
-                        
-                        if audio_bytes:
-                            # Send audio as base64
-                            audio_b64 = base64.b64encode(audio_bytes).decode('utf-8')
-                            await websocket.send_json({
-                                "type": "audio",
-                                "audio_base64": audio_b64,
-                                "format": "wav"
-                            })
+                        if data.get("stream"):
+                            # One WAV per sentence; the next sentence synthesizes while this one is sent
+                            chunks = tts_engine.synthesize_streaming(text, tone=tone_enum)
+                            index = 0
+                            try:
+                                while True:
+                                    audio_bytes = await loop.run_in_executor(None, next, chunks, None)
+                                    if audio_bytes is None:
+                                        break
+                                    await websocket.send_json({
+                                        "type": "audio",
+                                        "audio_base64": base64.b64encode(audio_bytes).decode('utf-8'),
+                                        "format": "wav",
+                                        "index": index
+                                    })
+                                    index += 1
+                            finally:
+                                # On disconnect, cancel the sentences synthesized ahead
+                                chunks.close()
+                            await websocket.send_json({"type": "audio_done", "chunks": index})
+                        else:
+                            audio_bytes = await loop.run_in_executor(
+                                None, lambda: tts_engine.synthesize(text, tone=tone_enum, return_bytes=True)
+                            )
+                            
+                            if audio_bytes:
+                                # Send audio as base64
+                                audio_b64 = base64.b64encode(audio_bytes).decode('utf-8')
+                                await websocket.send_json({
+                                    "type": "audio",
+                                    "audio_base64": audio_b64,
+                                    "format": "wav"
+                                })
                     except Exception as e:
                         logger.error(f"Error synthesizing speech: {e}")
                         await websocket.send_json({
@@ -728,7 +834,8 @@ async def websocket_audio_stream(websocket: WebSocket):
                         
             elif message_type == "stop":
                 # Stop current operation
-                audio_buffer = b""
+                if transcriber is not None:
+                    transcriber.reset()
                 is_listening = False
                 await websocket.send_json({"type": "stopped"})
                 
@@ -743,6 +850,11 @@ async def websocket_audio_stream(websocket: WebSocket):
             })
         except:
             pass
+    finally:
+        if forwarder is not None:
+            forwarder.cancel()
+        if transcriber is not None:
+            await asyncio.get_running_loop().run_in_executor(None, transcriber.close)
 
 @app.get("/analytics/prompts")
 async def get_prompt_analytics(days: int = 30):
@@ -1079,6 +1191,18 @@ async def get_system_status():
         logger.error(f"Error fetching system status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/system/graph-pool")
+async def get_graph_pool_stats():
+    """
+    Get warm graph pool stats: graph construction vs. analysis run time per configuration.
+    """
+    from tradingagents.graph.graph_pool import get_graph_pool
+
+    return {
+        "pools": get_graph_pool().get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 @app.get("/data/tickers")
 async def get_tickers(active_only: bool = True):
     """
@@ -1112,6 +1236,9 @@ async def add_ticker(ticker: TickerCreate):
             tags=ticker.tags,
             notes=ticker.notes
         )
+        # The bot may have memoized this symbol as unknown
+        from tradingagents.bot.market_data import get_market_data_service
+        get_market_data_service().invalidate("ticker")
         return {"status": "success", "ticker_id": ticker_id, "symbol": ticker.symbol}
     except Exception as e:
         logger.error(f"Error adding ticker: {e}")
@@ -8,13 +8,18 @@ Provides backtesting capabilities for trading strategies with anti-lookahead pro
 """
 
 from .backtest_engine import BacktestEngine, BacktestResult
-from .historical_replay import HistoricalReplay
+from .historical_replay import AsOfSlice, HistoricalReplay, PointInTimeStore
+from .parameter_sweep import IndicatorPanel, expand_grid
 from .strategy_validator import StrategyValidator
 
 __all__ = [
     'BacktestEngine',
     'BacktestResult',
     'HistoricalReplay',
+    'PointInTimeStore',
+    'AsOfSlice',
     'StrategyValidator',
+    'IndicatorPanel',
+    'expand_grid',
 ]
 
@@ -16,11 +16,19 @@ import yfinance as yf
 import pandas as pd
 
 from tradingagents.database import get_db_connection
-from tradingagents.decision import FourGateFramework
+from tradingagents.decision import BatchFourGateEvaluator, FourGateFramework, flatten_gate_inputs
 
 logger = logging.getLogger(__name__)
 
 
+def _naive_index(hist: pd.DataFrame) -> pd.DataFrame:
+    """Drop the exchange timezone yfinance puts on daily bars so dates compare directly."""
+    if isinstance(hist.index, pd.DatetimeIndex) and hist.index.tz is not None:
+        hist = hist.copy()
+        hist.index = hist.index.tz_localize(None)
+    return hist
+
+
 class BacktestResult:
     """Result from a backtest run."""
     
@@ -96,6 +104,7 @@ class BacktestEngine:
         """Initialize backtesting engine."""
         self.db = db or get_db_connection()
         self.four_gate = FourGateFramework()
+        self.batch_gate = BatchFourGateEvaluator(self.four_gate)
     
     def test_strategy(
         self,
@@ -132,23 +141,20 @@ class BacktestEngine:
                 current_date += timedelta(days=1)
                 continue
             
-            # Test each ticker on this date
+            # Collect gate inputs for every ticker, then score the day in one batch
+            candidates = []
             for ticker in tickers:
                 try:
-                    trade = self._test_ticker_on_date(
-                        ticker=ticker,
-                        test_date=current_date,
-                        holding_period_days=holding_period_days,
-                        min_confidence=min_confidence
-                    )
-                    
-                    if trade:
-                        trades.append(trade)
+                    candidate = self._gate_inputs_on_date(ticker, current_date)
+                    if candidate:
+                        candidates.append(candidate)
                 
                 except Exception as e:
                     logger.warning(f"Error testing {ticker} on {current_date}: {e}")
                     continue
             
+            trades.extend(self._trades_from_candidates(candidates, holding_period_days, min_confidence))
+            
             # Move to next date
             current_date += timedelta(days=1)
         
@@ -173,6 +179,21 @@ class BacktestEngine:
         
         Only uses data available on or before test_date.
         """
+        candidate = self._gate_inputs_on_date(ticker, test_date)
+        if not candidate:
+            return None
+        
+        trades = self._trades_from_candidates([candidate], holding_period_days, min_confidence)
+        return trades[0] if trades else None
+    
+    def _gate_inputs_on_date(self, ticker: str, test_date: date) -> Optional[Dict[str, Any]]:
+        """
+        Build the four-gate inputs for a ticker as of test_date (anti-lookahead).
+        
+        Returns:
+            Dictionary with ticker, test_date, entry_price and a batch row
+            ('inputs'), or None if there is not enough data
+        """
         try:
             # Get historical price data up to test_date (anti-lookahead)
             ticker_obj = yf.Ticker(ticker)
@@ -180,7 +201,32 @@ class BacktestEngine:
                 start=test_date - timedelta(days=365),
                 end=test_date + timedelta(days=1)  # Include test_date
             )
-            
+        except Exception as e:
+            logger.debug(f"Error in _gate_inputs_on_date for {ticker} on {test_date}: {e}")
+            return None
+        
+        return self._gate_inputs_from_history(ticker, test_date, _naive_index(hist))
+    
+    def _gate_inputs_from_history(
+        self,
+        ticker: str,
+        test_date: date,
+        hist: pd.DataFrame,
+        fundamentals: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the four-gate inputs from a year of history ending on test_date.
+        
+        Args:
+            ticker: Ticker symbol
+            test_date: Backtest date
+            hist: Daily bars from test_date - 365 days through test_date
+            fundamentals: Fundamentals (looked up when None)
+        
+        Returns:
+            Same as _gate_inputs_on_date()
+        """
+        try:
             if hist.empty or len(hist) < 50:
                 return None
             
@@ -201,10 +247,10 @@ class BacktestEngine:
             indicators = self._calculate_indicators(hist.loc[:price_date])
             
             # Get fundamentals (using only data available on test_date)
-            fundamentals = self._get_fundamentals_as_of_date(ticker, test_date)
+            if fundamentals is None:
+                fundamentals = self._get_fundamentals_as_of_date(ticker, test_date)
             
-            # Evaluate using Four-Gate Framework
-            gate_result = self.four_gate.evaluate_all_gates(
+            inputs = flatten_gate_inputs(
                 fundamentals=fundamentals,
                 signals=indicators,
                 price_data={
@@ -222,34 +268,63 @@ class BacktestEngine:
                 sector_avg=None,
                 portfolio_context=None
             )
-            
+        
+        except Exception as e:
+            logger.debug(f"Error in _gate_inputs_from_history for {ticker} on {test_date}: {e}")
+            return None
+        
+        return {
+            'ticker': ticker,
+            'test_date': test_date,
+            'entry_price': entry_price,
+            'inputs': inputs
+        }
+    
+    def _trades_from_candidates(
+        self,
+        candidates: List[Dict[str, Any]],
+        holding_period_days: int,
+        min_confidence: int
+    ) -> List[Dict[str, Any]]:
+        """Evaluate candidates with the batch Four-Gate evaluator and open trades on BUY."""
+        if not candidates:
+            return []
+        
+        gate_results = self.batch_gate.evaluate([candidate['inputs'] for candidate in candidates])
+        
+        trades = []
+        for candidate, gate_result in zip(candidates, gate_results.itertuples(index=False)):
             # Check if we should take the trade
-            if (gate_result['final_decision'] == 'BUY' and 
-                gate_result['confidence_score'] >= min_confidence):
-                
+            if (gate_result.final_decision != 'BUY' or
+                    gate_result.confidence_score < min_confidence):
+                continue
+            
+            ticker = candidate['ticker']
+            test_date = candidate['test_date']
+            entry_price = candidate['entry_price']
+            try:
                 # Calculate exit price (after holding period)
                 exit_date = test_date + timedelta(days=holding_period_days)
                 exit_price = self._get_exit_price(ticker, exit_date, entry_price)
+            except Exception as e:
+                logger.debug(f"Error getting exit price for {ticker} on {test_date}: {e}")
+                continue
+            
+            if exit_price:
+                return_pct = ((exit_price - entry_price) / entry_price) * 100
                 
-                if exit_price:
-                    return_pct = ((exit_price - entry_price) / entry_price) * 100
-                    
-                    return {
-                        'ticker': ticker,
-                        'entry_date': test_date,
-                        'entry_price': entry_price,
-                        'exit_date': exit_date,
-                        'exit_price': exit_price,
-                        'return_pct': return_pct,
-                        'confidence': gate_result['confidence_score'],
-                        'decision': gate_result['final_decision']
-                    }
-        
-        except Exception as e:
-            logger.debug(f"Error in _test_ticker_on_date for {ticker} on {test_date}: {e}")
-            return None
+                trades.append({
+                    'ticker': ticker,
+                    'entry_date': test_date,
+                    'entry_price': entry_price,
+                    'exit_date': exit_date,
+                    'exit_price': exit_price,
+                    'return_pct': return_pct,
+                    'confidence': int(gate_result.confidence_score),
+                    'decision': gate_result.final_decision
+                })
         
-        return None
+        return trades
     
     def _calculate_indicators(self, hist: pd.DataFrame) -> Dict[str, Any]:
         """Calculate technical indicators from historical data."""
@@ -324,6 +399,7 @@ class BacktestEngine:
             
             if hist.empty:
                 return fallback_price
+            hist = _naive_index(hist)
             
             # Find closest date to exit_date
             exit_date_ts = pd.Timestamp(exit_date)
@@ -339,8 +415,8 @@ class BacktestEngine:
             logger.debug(f"Error getting exit price for {ticker} on {exit_date}: {e}")
             return fallback_price
     
+    @staticmethod
     def _calculate_results(
-        self,
         strategy_name: str,
         start_date: date,
         end_date: date,
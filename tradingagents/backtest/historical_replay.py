@@ -5,27 +5,443 @@
 Historical Replay
 
 Replay past dates with only historical data (anti-lookahead protection).
+
+PointInTimeStore loads each ticker's daily history once, persists it as
+memory-mapped arrays and serves "as of" slices as zero-copy views that end
+at the as-of date, so data after the replay date is never reachable.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Union
 from datetime import date, datetime
+from pathlib import Path
+from decimal import Decimal
+import json
 import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
 
 from tradingagents.database import get_db_connection
 
 logger = logging.getLogger(__name__)
 
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'ma_20', 'ma_50', 'ma_200', 'rsi_14']
+
+ANALYSIS_COLUMNS = [
+    'analysis_id',
+    'analysis_date',
+    'final_decision',
+    'confidence_score',
+    'entry_price_target',
+    'stop_loss_price',
+    'expected_return_pct',
+]
+
+
+def _plain(value):
+    """JSON-safe analysis field (timestamps as ISO strings, Decimals as floats)."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+class AsOfSlice:
+    """
+    One ticker's price history as known on a date.
+
+    Every array is a read-only, zero-copy view that ends at the as-of
+    boundary; there is no way to reach a later bar through a slice.
+    """
+
+    __slots__ = ('ticker', 'as_of', 'dates', '_values', '_columns')
+
+    def __init__(self, ticker: str, as_of: date, dates: np.ndarray, values: np.ndarray, columns: Dict[str, int]):
+        self.ticker = ticker
+        self.as_of = as_of
+        self.dates = dates
+        self._values = values
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def last_date(self) -> Optional[date]:
+        """Date of the latest bar on or before the as-of date."""
+        return self.dates[-1].astype(date) if len(self.dates) else None
+
+    def column(self, name: str) -> np.ndarray:
+        """Column view (e.g. 'close'), oldest first; NULLs are NaN."""
+        return self._values[:, self._columns[name]]
+
+    def latest(self, name: str) -> Optional[float]:
+        """Latest value of a column, or None if there is no bar or it is NULL."""
+        if not len(self.dates):
+            return None
+        value = float(self._values[-1, self._columns[name]])
+        return None if np.isnan(value) else value
+
+    def window(self, bars: int) -> 'AsOfSlice':
+        """The last ``bars`` bars up to the as-of date."""
+        start = max(0, len(self.dates) - bars)
+        return AsOfSlice(self.ticker, self.as_of, self.dates[start:], self._values[start:], self._columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy of the slice as a DataFrame indexed by price_date."""
+        return pd.DataFrame(
+            np.array(self._values),
+            index=pd.DatetimeIndex(self.dates, name='price_date'),
+            columns=list(self._columns),
+        )
+
+
+class _TickerHistory:
+    """Loaded arrays for one ticker."""
+
+    __slots__ = ('dates', 'values', 'analysis_times', 'analyses', 'loaded_on', 'version')
+
+    def __init__(self, dates, values, analysis_times, analyses, loaded_on, version=None):
+        self.dates = dates
+        self.values = values
+        self.analysis_times = analysis_times
+        self.analyses = analyses
+        self.loaded_on = loaded_on
+        self.version = version  # Source fingerprint when loaded
+
+
+class PointInTimeStore:
+    """
+    Point-in-time price and analysis store for replays and backtests.
+
+    Each ticker's daily_prices history is loaded with one query (many
+    tickers per query) and persisted under <data_cache_dir>/replay/<TICKER>
+    as ``dates.npy`` / ``values.npy``, which later runs memory-map instead of
+    querying. A request as of the load day or later reloads the ticker once
+    so new bars are seen. Analyses (a handful of rows per ticker) are held
+    in memory.
+
+    Bars and analyses backfilled or corrected for earlier dates are caught
+    by revalidation: meta.json stores a fingerprint of the ticker's source
+    rows, and loading a persisted history first compares it with the
+    database (one small query per batch; the rows are only re-read for
+    tickers that changed). With ``revalidate=False`` persisted histories are
+    trusted as-is and such changes are seen only after ``load(refresh=True)``.
+    """
+
+    def __init__(self, db=None, directory: Optional[str] = None, revalidate: bool = True):
+        """
+        Args:
+            db: DatabaseConnection instance (optional)
+            directory: Array directory (defaults to <data_cache_dir>/replay)
+            revalidate: Check persisted histories against the database's
+                fingerprint before using them
+        """
+        self.db = db or get_db_connection()
+        if directory is None:
+            from tradingagents.dataflows.config import get_config
+            directory = os.path.join(get_config()["data_cache_dir"], "replay")
+        self.directory = Path(directory)
+        self.columns = {name: i for i, name in enumerate(PRICE_COLUMNS)}
+        self.revalidate = revalidate
+        self._histories: Dict[str, _TickerHistory] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, tickers: Iterable[str], refresh: bool = False):
+        """
+        Make tickers available, from disk when persisted, else from the database.
+
+        Args:
+            tickers: Ticker symbols
+            refresh: Reload from the database even if persisted
+        """
+        symbols = list(dict.fromkeys(t.upper() for t in tickers))
+        with self._lock:
+            pending = [s for s in symbols if refresh or s not in self._histories]
+            persisted = {}
+            if not refresh:
+                for symbol in pending:
+                    history = self._read_persisted(symbol)
+                    if history is not None:
+                        persisted[symbol] = history
+            if not self.revalidate:
+                self._histories.update(persisted)
+                pending = [s for s in pending if s not in persisted]
+            if not pending:
+                return
+
+            versions = self._source_versions(pending)
+            stale = []
+            for symbol in pending:
+                history = persisted.get(symbol)
+                # Unknown tickers have no rows and fingerprint as ''
+                if history is not None and history.version == versions.get(symbol, ''):
+                    self._histories[symbol] = history
+                else:
+                    stale.append(symbol)
+            if stale:
+                self._load_from_db(stale, versions)
+
+    def _source_versions(self, symbols: List[str]) -> Dict[str, str]:
+        """Fingerprint of each ticker's daily_prices and analyses rows, computed in the database."""
+        # NULLs as empty fields, so a value moving between columns changes the text
+        price_fields = ', '.join(f"coalesce(dp.{c}::text, '')" for c in PRICE_COLUMNS)
+        analysis_fields = ', '.join(f"coalesce(a.{c}::text, '')" for c in ANALYSIS_COLUMNS)
+        query = f"""
+            SELECT
+                t.symbol,
+                coalesce((
+                    SELECT md5(string_agg(
+                        concat_ws(',', dp.price_date, {price_fields}),
+                        ';' ORDER BY dp.price_date
+                    ))
+                    FROM daily_prices dp
+                    WHERE dp.ticker_id = t.ticker_id
+                ), '') || ':' || coalesce((
+                    SELECT md5(string_agg(
+                        concat_ws(',', {analysis_fields}),
+                        ';' ORDER BY a.analysis_id
+                    ))
+                    FROM analyses a
+                    WHERE a.ticker_id = t.ticker_id
+                ), '')
+            FROM tickers t
+            WHERE t.symbol = ANY(%s)
+        """
+        rows = self.db.execute_query(query, (symbols,)) or []
+        return {row[0]: row[1] for row in rows}
+
+    def _ticker_dir(self, symbol: str) -> Path:
+        return self.directory / symbol
+
+    def _read_persisted(self, symbol: str) -> Optional[_TickerHistory]:
+        ticker_dir = self._ticker_dir(symbol)
+        try:
+            with open(ticker_dir / 'meta.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('columns') != PRICE_COLUMNS:
+                return None
+            if meta['rows']:
+                dates = np.load(ticker_dir / 'dates.npy', mmap_mode='r')
+                values = np.load(ticker_dir / 'values.npy', mmap_mode='r')
+            else:
+                dates, values = self._empty_arrays()
+            analyses = meta.get('analyses', [])
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return _TickerHistory(
+            dates=dates,
+            values=values,
+            analysis_times=_read_only(np.array([a['analysis_date'] for a in analyses], dtype='datetime64[us]')),
+            analyses=analyses,
+            loaded_on=date.fromisoformat(meta['loaded_on']),
+            version=meta.get('version'),
+        )
+
+    @staticmethod
+    def _empty_arrays():
+        return (
+            _read_only(np.empty(0, dtype='datetime64[D]')),
+            _read_only(np.empty((0, len(PRICE_COLUMNS)), dtype=float)),
+        )
+
+    def _load_from_db(self, symbols: List[str], versions: Dict[str, str]):
+        price_query = f"""
+            SELECT t.symbol, dp.price_date, {', '.join('dp.' + c for c in PRICE_COLUMNS)}
+            FROM daily_prices dp
+            JOIN tickers t ON dp.ticker_id = t.ticker_id
+            WHERE t.symbol = ANY(%s)
+            ORDER BY t.symbol, dp.price_date
+        """
+        analysis_query = f"""
+            SELECT t.symbol, {', '.join('a.' + c for c in ANALYSIS_COLUMNS)}
+            FROM analyses a
+            JOIN tickers t ON a.ticker_id = t.ticker_id
+            WHERE t.symbol = ANY(%s)
+            ORDER BY t.symbol, a.analysis_date, a.analysis_id
+        """
+        price_rows = self.db.execute_query(price_query, (symbols,)) or []
+        analysis_rows = self.db.execute_query(analysis_query, (symbols,)) or []
+
+        prices: Dict[str, list] = {s: [] for s in symbols}
+        for row in price_rows:
+            prices[row[0]].append(row[1:])
+        analyses: Dict[str, list] = {s: [] for s in symbols}
+        for row in analysis_rows:
+            analyses[row[0]].append({k: _plain(v) for k, v in zip(ANALYSIS_COLUMNS, row[1:])})
+
+        loaded_on = date.today()
+        for symbol in symbols:
+            rows = prices[symbol]
+            if rows:
+                dates = np.array([r[0] for r in rows], dtype='datetime64[D]')
+                values = np.array(
+                    [[np.nan if v is None else float(v) for v in r[1:]] for r in rows],
+                    dtype=float,
+                )
+            else:
+                dates, values = self._empty_arrays()
+            history = self._persist(symbol, dates, values, analyses[symbol], loaded_on, versions.get(symbol, ''))
+            self._histories[symbol] = history
+
+        logger.info(f"Loaded point-in-time history for {len(symbols)} ticker(s) ({len(price_rows)} bars)")
+
+    def _persist(self, symbol, dates, values, analyses, loaded_on, version) -> _TickerHistory:
+        """Write arrays atomically and reopen them memory-mapped (in-memory if that fails)."""
+        ticker_dir = self._ticker_dir(symbol)
+        meta = {
+            'columns': PRICE_COLUMNS,
+            'rows': int(len(dates)),
+            'loaded_on': loaded_on.isoformat(),
+            'version': version,
+            'analyses': analyses,
+        }
+        try:
+            ticker_dir.mkdir(parents=True, exist_ok=True)
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            for name, array in (('dates.npy', dates), ('values.npy', values)):
+                tmp_path = ticker_dir / (name + suffix)
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp_path, ticker_dir / name)
+            tmp_path = ticker_dir / ('meta.json' + suffix)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, ticker_dir / 'meta.json')
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not persist point-in-time history for {symbol}: {e}")
+            return _TickerHistory(
+                _read_only(dates), _read_only(values),
+                _read_only(np.array([a['analysis_date'] for a in analyses], dtype='datetime64[us]')),
+                analyses, loaded_on, version,
+            )
+        return self._read_persisted(symbol)
+
+    def _history(self, ticker: str, as_of: Union[date, datetime]) -> _TickerHistory:
+        symbol = ticker.upper()
+        as_of_day = as_of.date() if isinstance(as_of, datetime) else as_of
+        with self._lock:
+            if symbol not in self._histories:
+                self.load([symbol])
+            history = self._histories[symbol]
+            if as_of_day >= history.loaded_on and history.loaded_on < date.today():
+                # Bars on or after the load day may have landed since
+                self.load([symbol], refresh=True)
+                history = self._histories[symbol]
+            return history
+
+    # ------------------------------------------------------------------
+    # Point-in-time access
+    # ------------------------------------------------------------------
+
+    def as_of(self, ticker: str, as_of: Union[date, datetime]) -> AsOfSlice:
+        """
+        Price history of a ticker as known on ``as_of`` (bars with price_date <= as_of).
+
+        Returns:
+            AsOfSlice of zero-copy views ending at the as-of boundary
+        """
+        history = self._history(ticker, as_of)
+        end = int(np.searchsorted(history.dates, np.datetime64(as_of, 'D'), side='right'))
+        return AsOfSlice(ticker.upper(), as_of, history.dates[:end], history.values[:end], self.columns)
+
+    def as_of_many(self, ticker: str, dates: Sequence[Union[date, datetime]]) -> List[AsOfSlice]:
+        """as_of() for many dates with one binary search over the history."""
+        if not len(dates):
+            return []
+        history = self._history(ticker, max(dates))
+        boundaries = np.array([np.datetime64(d, 'D') for d in dates])
+        ends = np.searchsorted(history.dates, boundaries, side='right')
+        return [
+            AsOfSlice(ticker.upper(), d, history.dates[:end], history.values[:end], self.columns)
+            for d, end in zip(dates, ends)
+        ]
+
+    def latest_values(self, ticker: str, dates: Sequence[Union[date, datetime]], column: str = 'close') -> np.ndarray:
+        """
+        Latest known value of a column for each date (NaN before the first bar).
+
+        Args:
+            ticker: Ticker symbol
+            dates: Replay dates
+            column: Price column name
+
+        Returns:
+            Array aligned with ``dates``
+        """
+        if not len(dates):
+            return np.empty(0)
+        history = self._history(ticker, max(dates))
+        ends = np.searchsorted(history.dates, np.array([np.datetime64(d, 'D') for d in dates]), side='right')
+        values = np.full(len(dates), np.nan)
+        known = ends > 0
+        values[known] = history.values[ends[known] - 1, self.columns[column]]
+        return values
+
+    def analysis_as_of(self, ticker: str, as_of: Union[date, datetime]) -> Optional[Dict[str, Any]]:
+        """
+        Latest analysis with analysis_date <= as_of (a date means its midnight, as in SQL).
+
+        Returns:
+            Analysis dict, or None
+        """
+        history = self._history(ticker, as_of)
+        boundary = np.datetime64(as_of, 'us')
+        end = int(np.searchsorted(history.analysis_times, boundary, side='right'))
+        if end == 0:
+            return None
+        analysis = dict(history.analyses[end - 1])
+        analysis['analysis_date'] = datetime.fromisoformat(analysis['analysis_date'])
+        return analysis
+
 
 class HistoricalReplay:
     """
     Replay historical dates with anti-lookahead protection.
     
     Ensures that only data available on or before the replay date is used.
+    Lookups are served from a PointInTimeStore, so a replay over many dates
+    loads each ticker once instead of querying per date. Histories persisted
+    by earlier runs are revalidated against the database, so bars or
+    analyses backfilled for past dates are picked up (see PointInTimeStore).
     """
     
-    def __init__(self, db=None):
-        """Initialize historical replay."""
+    def __init__(self, db=None, store: Optional[PointInTimeStore] = None, revalidate: bool = True):
+        """
+        Initialize historical replay.
+
+        Args:
+            db: DatabaseConnection instance (optional)
+            store: PointInTimeStore to read from (optional, shares ``db``)
+            revalidate: For the default store, check persisted histories
+                against the database before use; False trusts them until
+                ``preload(..., refresh=True)``
+        """
         self.db = db or get_db_connection()
+        self.store = store or PointInTimeStore(self.db, revalidate=revalidate)
+    
+    def preload(self, tickers: Iterable[str], refresh: bool = False):
+        """
+        Load the history of many tickers up front (one query per batch).
+
+        Args:
+            tickers: Ticker symbols
+            refresh: Reload from the database even if persisted
+        """
+        self.store.load(tickers, refresh=refresh)
     
     def get_price_as_of_date(
         self,
@@ -35,24 +451,9 @@ class HistoricalReplay:
         """
         Get price as it would have been known on as_of_date.
         
-        Only uses data from database where date <= as_of_date.
+        Only uses data where price_date <= as_of_date.
         """
-        query = """
-            SELECT close
-            FROM daily_prices dp
-            JOIN tickers t ON dp.ticker_id = t.ticker_id
-            WHERE t.symbol = %s
-                AND dp.price_date <= %s
-            ORDER BY dp.price_date DESC
-            LIMIT 1
-        """
-        
-        result = self.db.execute_query(query, (ticker, as_of_date), fetch_one=True)
-        
-        if result:
-            return float(result[0])
-        
-        return None
+        return self.store.as_of(ticker, as_of_date).latest('close')
     
     def get_indicators_as_of_date(
         self,
@@ -62,37 +463,25 @@ class HistoricalReplay:
         """
         Get technical indicators as they would have been on as_of_date.
         
-        Only uses data from database where date <= as_of_date.
-        """
-        query = """
-            SELECT 
-                rsi_14,
-                ma_20,
-                ma_50,
-                ma_200,
-                close,
-                volume
-            FROM daily_prices dp
-            JOIN tickers t ON dp.ticker_id = t.ticker_id
-            WHERE t.symbol = %s
-                AND dp.price_date <= %s
-            ORDER BY dp.price_date DESC
-            LIMIT 1
+        Only uses data where price_date <= as_of_date.
         """
-        
-        result = self.db.execute_dict_query(query, (ticker, as_of_date), fetch_one=True)
-        
-        if result:
-            return {
-                'rsi': float(result['rsi_14']) if result['rsi_14'] else None,
-                'ma20': float(result['ma_20']) if result['ma_20'] else None,
-                'ma50': float(result['ma_50']) if result['ma_50'] else None,
-                'ma200': float(result['ma_200']) if result['ma_200'] else None,
-                'current_price': float(result['close']) if result['close'] else None,
-                'volume': int(result['volume']) if result['volume'] else None
-            }
-        
-        return None
+        view = self.store.as_of(ticker, as_of_date)
+        if not len(view):
+            return None
+
+        def value(name):
+            latest = view.latest(name)
+            return latest if latest else None
+
+        volume = value('volume')
+        return {
+            'rsi': value('rsi_14'),
+            'ma20': value('ma_20'),
+            'ma50': value('ma_50'),
+            'ma200': value('ma_200'),
+            'current_price': value('close'),
+            'volume': int(volume) if volume else None
+        }
     
     def get_analysis_as_of_date(
         self,
@@ -104,26 +493,7 @@ class HistoricalReplay:
         
         Only returns analyses where analysis_date <= as_of_date.
         """
-        query = """
-            SELECT 
-                a.analysis_id,
-                a.analysis_date,
-                a.final_decision,
-                a.confidence_score,
-                a.entry_price_target,
-                a.stop_loss_price,
-                a.expected_return_pct
-            FROM analyses a
-            JOIN tickers t ON a.ticker_id = t.ticker_id
-            WHERE t.symbol = %s
-                AND a.analysis_date <= %s
-            ORDER BY a.analysis_date DESC
-            LIMIT 1
-        """
-        
-        result = self.db.execute_dict_query(query, (ticker, as_of_date), fetch_one=True)
-        
-        return result
+        return self.store.analysis_as_of(ticker, as_of_date)
     
     def validate_no_lookahead(
         self,
@@ -145,4 +515,3 @@ class HistoricalReplay:
             return False
         
         return True
-
@@ -0,0 +1,260 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Parameter Sweep
+
+Runs many backtest configurations (holding period, minimum confidence, gate
+thresholds) over one shared IndicatorPanel. The panel holds everything that
+does not depend on the configuration: the four-gate inputs of every
+(date, ticker) and the daily closes used for exits. It is built once, so each
+configuration only re-scores the panel with the batch four-gate evaluator.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional
+from datetime import date, timedelta
+import hashlib
+import itertools
+import json
+import logging
+import os
+import pickle
+
+import pandas as pd
+import yfinance as yf
+
+from tradingagents.decision import BatchFourGateEvaluator, FourGateFramework
+
+from .backtest_engine import BacktestEngine, BacktestResult, _naive_index
+
+logger = logging.getLogger(__name__)
+
+# Configuration keys passed to FourGateFramework (all others are run parameters)
+GATE_THRESHOLD_KEYS = tuple(FourGateFramework.DEFAULT_THRESHOLDS)
+
+DEFAULT_HOLDING_PERIOD_DAYS = 30
+DEFAULT_MIN_CONFIDENCE = 70
+
+# Days fetched past an exit date (the exit lookup window of BacktestEngine)
+_EXIT_WINDOW_DAYS = 5
+
+
+def expand_grid(param_grid: Dict[str, Iterable[Any]], base_config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into configurations.
+
+    Args:
+        param_grid: Parameter name -> candidate values
+        base_config: Values shared by every configuration
+
+    Returns:
+        One configuration per combination, in grid order
+    """
+    names = list(param_grid)
+    return [
+        {**(base_config or {}), **dict(zip(names, values))}
+        for values in itertools.product(*(list(param_grid[name]) for name in names))
+    ]
+
+
+def config_key(config: Dict[str, Any]) -> str:
+    """Stable key identifying a configuration in checkpoints."""
+    return json.dumps(config, sort_keys=True, default=str)
+
+
+class IndicatorPanel:
+    """
+    Configuration-independent backtest inputs for a period and ticker list.
+
+    ``candidates`` has one row per (trading day, ticker) with enough history,
+    in the order BacktestEngine.test_strategy visits them: ticker, test_date,
+    entry_price and the flattened four-gate input columns.
+    """
+
+    META_COLUMNS = ['ticker', 'test_date', 'entry_price']
+
+    def __init__(
+        self,
+        start_date: date,
+        end_date: date,
+        tickers: List[str],
+        candidates: pd.DataFrame,
+        closes: Dict[str, pd.Series],
+        closes_through: date
+    ):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.tickers = tickers
+        self.candidates = candidates
+        self.closes = closes
+        self.closes_through = closes_through
+
+    @property
+    def inputs(self) -> pd.DataFrame:
+        """Four-gate input columns of the candidates."""
+        return self.candidates.drop(columns=self.META_COLUMNS)
+
+    @classmethod
+    def build(
+        cls,
+        engine: BacktestEngine,
+        start_date: date,
+        end_date: date,
+        tickers: List[str],
+        max_holding_days: int = DEFAULT_HOLDING_PERIOD_DAYS
+    ) -> 'IndicatorPanel':
+        """
+        Build the panel with one price download and fundamentals lookup per ticker.
+
+        Args:
+            engine: BacktestEngine whose gate-input logic is reused
+            start_date: First backtest date
+            end_date: Last backtest date
+            tickers: Tickers to backtest
+            max_holding_days: Longest holding period the panel must cover
+        """
+        closes_through = end_date + timedelta(days=max_holding_days)
+        histories = {}
+        fundamentals = {}
+        closes = {}
+        for ticker in tickers:
+            try:
+                hist = yf.Ticker(ticker).history(
+                    start=start_date - timedelta(days=365),
+                    end=closes_through + timedelta(days=_EXIT_WINDOW_DAYS)
+                )
+            except Exception as e:
+                logger.warning(f"Error loading history for {ticker}: {e}")
+                continue
+            hist = _naive_index(hist)
+            histories[ticker] = hist
+            closes[ticker] = hist['Close'].astype(float)
+            fundamentals[ticker] = engine._get_fundamentals_as_of_date(ticker, start_date)
+
+        rows = []
+        current_date = start_date
+        while current_date <= end_date:
+            if current_date.weekday() < 5:
+                for ticker in tickers:
+                    if ticker not in histories:
+                        continue
+                    hist = histories[ticker]
+                    window = hist.loc[pd.Timestamp(current_date - timedelta(days=365)):pd.Timestamp(current_date)]
+                    candidate = engine._gate_inputs_from_history(ticker, current_date, window, fundamentals[ticker])
+                    if candidate:
+                        rows.append({
+                            'ticker': ticker,
+                            'test_date': current_date,
+                            'entry_price': candidate['entry_price'],
+                            **candidate['inputs'],
+                        })
+            current_date += timedelta(days=1)
+
+        candidates = pd.DataFrame(rows, columns=None if rows else cls.META_COLUMNS)
+        logger.info(f"Built indicator panel: {len(candidates)} candidates for {len(tickers)} tickers")
+        return cls(start_date, end_date, list(tickers), candidates, closes, closes_through)
+
+    def exit_price(self, ticker: str, exit_date: date, fallback_price: float) -> Optional[float]:
+        """Close on or up to five days before exit_date (as BacktestEngine._get_exit_price)."""
+        closes = self.closes.get(ticker)
+        if closes is None:
+            return fallback_price
+        window = closes.loc[pd.Timestamp(exit_date - timedelta(days=_EXIT_WINDOW_DAYS)):pd.Timestamp(exit_date)]
+        if window.empty:
+            return fallback_price
+        return float(window.iloc[-1])
+
+    def save(self, path: str):
+        """Write the panel atomically."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path: str) -> Optional['IndicatorPanel']:
+        """Read a saved panel (None if missing or unreadable)."""
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+
+def run_configuration(panel: IndicatorPanel, strategy_name: str, config: Dict[str, Any]) -> BacktestResult:
+    """
+    Backtest one configuration on a panel.
+
+    Produces the same trades as BacktestEngine.test_strategy with the
+    configuration's holding period, minimum confidence and gate thresholds.
+    """
+    holding_period_days = config.get('holding_period_days', DEFAULT_HOLDING_PERIOD_DAYS)
+    min_confidence = config.get('min_confidence', DEFAULT_MIN_CONFIDENCE)
+    thresholds = {
+        **FourGateFramework.DEFAULT_THRESHOLDS,
+        **{key: config[key] for key in GATE_THRESHOLD_KEYS if key in config},
+    }
+
+    trades = []
+    if len(panel.candidates):
+        gate_results = BatchFourGateEvaluator(FourGateFramework(thresholds)).evaluate(panel.inputs)
+        taken = (gate_results['final_decision'] == 'BUY') & (gate_results['confidence_score'] >= min_confidence)
+
+        for candidate, gate_result in zip(
+            panel.candidates[taken].itertuples(index=False),
+            gate_results[taken].itertuples(index=False)
+        ):
+            exit_date = candidate.test_date + timedelta(days=holding_period_days)
+            exit_price = panel.exit_price(candidate.ticker, exit_date, candidate.entry_price)
+            if exit_price:
+                trades.append({
+                    'ticker': candidate.ticker,
+                    'entry_date': candidate.test_date,
+                    'entry_price': candidate.entry_price,
+                    'exit_date': exit_date,
+                    'exit_price': exit_price,
+                    'return_pct': ((exit_price - candidate.entry_price) / candidate.entry_price) * 100,
+                    'confidence': int(gate_result.confidence_score),
+                    'decision': gate_result.final_decision
+                })
+
+    return BacktestEngine._calculate_results(
+        strategy_name=strategy_name,
+        start_date=panel.start_date,
+        end_date=panel.end_date,
+        tickers=panel.tickers,
+        trades=trades
+    )
+
+
+# Panel of the current sweep worker process (set once by the pool initializer)
+_worker_panel: Optional[IndicatorPanel] = None
+
+
+def _init_worker(panel: IndicatorPanel):
+    global _worker_panel
+    _worker_panel = panel
+
+
+def _run_in_worker(strategy_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    return run_configuration(_worker_panel, strategy_name, config).to_dict()
+
+
+def sweep_id(strategy_name: str, tickers: List[str], test_period_days: int, end_date: Optional[date]) -> str:
+    """
+    Checkpoint directory name for a sweep.
+
+    A sweep without an explicit end_date gets one directory regardless of
+    the day it runs on; the end date it resolved to is stored in the
+    checkpoint, so resuming it on a later day continues the same sweep.
+    """
+    digest = hashlib.sha1(
+        json.dumps([strategy_name, list(tickers), test_period_days, str(end_date) if end_date else None]).encode()
+    ).hexdigest()[:12]
+    return f"{strategy_name}-{digest}"
+
+
+def default_checkpoint_dir() -> str:
+    """Sweep checkpoints live under <data_cache_dir>/sweeps."""
+    from tradingagents.dataflows.config import get_config
+    return os.path.join(get_config()["data_cache_dir"], "sweeps")
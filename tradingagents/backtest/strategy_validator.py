@@ -7,11 +7,28 @@ Strategy Validator
 Validates strategies before deployment using backtesting.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date, timedelta
+import json
 import logging
+import multiprocessing
+import os
+
+import pandas as pd
 
 from .backtest_engine import BacktestEngine, BacktestResult
+from .parameter_sweep import (
+    DEFAULT_HOLDING_PERIOD_DAYS,
+    IndicatorPanel,
+    _init_worker,
+    _run_in_worker,
+    config_key,
+    default_checkpoint_dir,
+    expand_grid,
+    run_configuration,
+    sweep_id,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,46 +86,15 @@ class StrategyValidator:
         )
         
         # Evaluate against thresholds
+        thresholds_met, issues = self._check_thresholds(backtest_result.to_dict())
         validation_result = {
             'strategy_name': strategy_name,
             'validated': False,
             'backtest_result': backtest_result.to_dict(),
-            'thresholds_met': {},
-            'issues': []
+            'thresholds_met': thresholds_met,
+            'issues': issues
         }
         
-        # Check win rate
-        win_rate_ok = backtest_result.win_rate >= self.MIN_WIN_RATE
-        validation_result['thresholds_met']['win_rate'] = win_rate_ok
-        if not win_rate_ok:
-            validation_result['issues'].append(
-                f"Win rate {backtest_result.win_rate:.1f}% below minimum {self.MIN_WIN_RATE}%"
-            )
-        
-        # Check average return
-        avg_return_ok = backtest_result.avg_return >= self.MIN_AVG_RETURN
-        validation_result['thresholds_met']['avg_return'] = avg_return_ok
-        if not avg_return_ok:
-            validation_result['issues'].append(
-                f"Avg return {backtest_result.avg_return:.2f}% below minimum {self.MIN_AVG_RETURN}%"
-            )
-        
-        # Check Sharpe ratio
-        sharpe_ok = backtest_result.sharpe_ratio >= self.MIN_SHARPE_RATIO
-        validation_result['thresholds_met']['sharpe_ratio'] = sharpe_ok
-        if not sharpe_ok:
-            validation_result['issues'].append(
-                f"Sharpe ratio {backtest_result.sharpe_ratio:.2f} below minimum {self.MIN_SHARPE_RATIO}"
-            )
-        
-        # Check max drawdown
-        drawdown_ok = backtest_result.max_drawdown <= self.MAX_DRAWDOWN
-        validation_result['thresholds_met']['max_drawdown'] = drawdown_ok
-        if not drawdown_ok:
-            validation_result['issues'].append(
-                f"Max drawdown {backtest_result.max_drawdown:.2f}% exceeds maximum {self.MAX_DRAWDOWN}%"
-            )
-        
         # Overall validation
         all_ok = all(validation_result['thresholds_met'].values())
         validation_result['validated'] = all_ok
@@ -123,6 +109,184 @@ class StrategyValidator:
         
         return validation_result
     
+    def _check_thresholds(self, result: Dict[str, Any]) -> Tuple[Dict[str, bool], List[str]]:
+        """
+        Check backtest metrics against the minimum performance thresholds.
+        
+        Args:
+            result: BacktestResult.to_dict() (or a row with the same metrics)
+        
+        Returns:
+            (threshold name -> met, list of issues)
+        """
+        thresholds_met = {}
+        issues = []
+        
+        # Check win rate
+        thresholds_met['win_rate'] = result['win_rate'] >= self.MIN_WIN_RATE
+        if not thresholds_met['win_rate']:
+            issues.append(f"Win rate {result['win_rate']:.1f}% below minimum {self.MIN_WIN_RATE}%")
+        
+        # Check average return
+        thresholds_met['avg_return'] = result['avg_return'] >= self.MIN_AVG_RETURN
+        if not thresholds_met['avg_return']:
+            issues.append(f"Avg return {result['avg_return']:.2f}% below minimum {self.MIN_AVG_RETURN}%")
+        
+        # Check Sharpe ratio
+        thresholds_met['sharpe_ratio'] = result['sharpe_ratio'] >= self.MIN_SHARPE_RATIO
+        if not thresholds_met['sharpe_ratio']:
+            issues.append(f"Sharpe ratio {result['sharpe_ratio']:.2f} below minimum {self.MIN_SHARPE_RATIO}")
+        
+        # Check max drawdown
+        thresholds_met['max_drawdown'] = result['max_drawdown'] <= self.MAX_DRAWDOWN
+        if not thresholds_met['max_drawdown']:
+            issues.append(f"Max drawdown {result['max_drawdown']:.2f}% exceeds maximum {self.MAX_DRAWDOWN}%")
+        
+        return thresholds_met, issues
+    
+    def sweep(
+        self,
+        strategy_name: str,
+        param_grid: Dict[str, Iterable[Any]],
+        test_tickers: list,
+        test_period_days: int = 90,
+        base_config: Optional[Dict[str, Any]] = None,
+        end_date: Optional[date] = None,
+        workers: Optional[int] = None,
+        checkpoint_dir: Optional[str] = None,
+        resume: bool = True,
+        rank_by: str = 'sharpe_ratio'
+    ) -> pd.DataFrame:
+        """
+        Backtest every configuration of a parameter grid and rank them.
+        
+        The indicator panel (gate inputs and closes for every date and ticker)
+        is built once and shared by all configurations, which run on a process
+        pool. Each finished configuration is appended to a checkpoint file, so
+        an interrupted sweep resumes where it stopped.
+        
+        Args:
+            strategy_name: Name of the strategy
+            param_grid: Parameter -> values, e.g. {'holding_period_days': [10, 30],
+                'min_confidence': [60, 70], 'risk_min_score': [60, 70]}
+            test_tickers: List of tickers to test on
+            test_period_days: Number of days to backtest
+            base_config: Values shared by every configuration
+            end_date: Last backtest date (defaults to today; a resumed sweep
+                keeps the end date it started with)
+            workers: Worker processes (defaults to CPU count; 1 runs in-process)
+            checkpoint_dir: Checkpoint root (defaults to <data_cache_dir>/sweeps)
+            resume: Reuse the checkpointed panel and results of the same sweep
+            rank_by: Metric to rank by (max_drawdown ranks ascending)
+        
+        Returns:
+            DataFrame with one row per configuration: rank, parameters,
+            backtest metrics, validated and issues
+        """
+        configs = expand_grid(param_grid, base_config)
+        max_holding_days = max(c.get('holding_period_days', DEFAULT_HOLDING_PERIOD_DAYS) for c in configs)
+        
+        sweep_dir = os.path.join(
+            checkpoint_dir or default_checkpoint_dir(),
+            sweep_id(strategy_name, test_tickers, test_period_days, end_date)
+        )
+        os.makedirs(sweep_dir, exist_ok=True)
+        panel_path = os.path.join(sweep_dir, 'panel.pkl')
+        results_path = os.path.join(sweep_dir, 'results.jsonl')
+        
+        # The resolved end date is checkpointed so a resume on a later day keeps it
+        spec_path = os.path.join(sweep_dir, 'sweep.json')
+        if end_date is None:
+            if resume and os.path.exists(spec_path):
+                with open(spec_path, 'r', encoding='utf-8') as f:
+                    end_date = date.fromisoformat(json.load(f)['end_date'])
+            else:
+                end_date = date.today()
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            json.dump({'end_date': end_date.isoformat()}, f)
+        start_date = end_date - timedelta(days=test_period_days)
+        
+        # Results of configurations finished by an earlier run
+        done: Dict[str, Dict[str, Any]] = {}
+        if resume and os.path.exists(results_path):
+            with open(results_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line of an interrupted run
+                    done[entry['key']] = entry['result']
+        
+        # Rewrite the checkpoint with complete entries only, so appends start on a fresh line
+        with open(results_path, 'w', encoding='utf-8') as f:
+            for key, result in done.items():
+                f.write(json.dumps({'key': key, 'result': result}, default=str) + '\n')
+        
+        pending = [c for c in configs if config_key(c) not in done]
+        logger.info(
+            f"Sweeping {strategy_name}: {len(configs)} configurations "
+            f"({len(configs) - len(pending)} already checkpointed)"
+        )
+        
+        if pending:
+            panel = IndicatorPanel.load(panel_path) if resume else None
+            if panel is None or panel.closes_through < end_date + timedelta(days=max_holding_days):
+                panel = IndicatorPanel.build(
+                    self.backtest_engine, start_date, end_date, test_tickers, max_holding_days
+                )
+                panel.save(panel_path)
+            
+            with open(results_path, 'a', encoding='utf-8') as checkpoint:
+                for config, result in self._run_configurations(panel, strategy_name, pending, workers):
+                    metrics = {k: v for k, v in result.items() if k != 'trades'}
+                    done[config_key(config)] = metrics
+                    checkpoint.write(json.dumps({'key': config_key(config), 'result': metrics}, default=str) + '\n')
+                    checkpoint.flush()
+        
+        rows = []
+        for config in configs:
+            result = done[config_key(config)]
+            thresholds_met, issues = self._check_thresholds(result)
+            rows.append({
+                **config,
+                'total_trades': result['total_trades'],
+                'win_rate': result['win_rate'],
+                'avg_return': result['avg_return'],
+                'total_return': result['total_return'],
+                'sharpe_ratio': result['sharpe_ratio'],
+                'max_drawdown': result['max_drawdown'],
+                'validated': all(thresholds_met.values()),
+                'issues': issues,
+            })
+        
+        table = pd.DataFrame(rows)
+        table = table.sort_values(rank_by, ascending=(rank_by == 'max_drawdown'), kind='stable').reset_index(drop=True)
+        table.insert(0, 'rank', range(1, len(table) + 1))
+        return table
+    
+    @staticmethod
+    def _run_configurations(
+        panel: IndicatorPanel,
+        strategy_name: str,
+        configs: List[Dict[str, Any]],
+        workers: Optional[int]
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Yield (config, BacktestResult.to_dict()) as configurations finish."""
+        workers = min(workers or os.cpu_count() or 1, len(configs))
+        if workers <= 1:
+            for config in configs:
+                yield config, run_configuration(panel, strategy_name, config).to_dict()
+            return
+        
+        # Spawned (not forked) workers: the parent may hold DB pools and other threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(panel,)
+        ) as executor:
+            futures = {executor.submit(_run_in_worker, strategy_name, config): config for config in configs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
     def get_validation_summary(self, validation_result: Dict[str, Any]) -> str:
         """Get human-readable validation summary."""
         result = validation_result['backtest_result']
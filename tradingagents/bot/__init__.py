@@ -9,5 +9,12 @@ Conversational AI assistant for trading analysis and recommendations.
 
 from .agent import TradingAgent
 from .tools import get_all_tools
+from .market_data import MarketDataService, get_market_data_service, market_data_turn
 
-__all__ = ['TradingAgent', 'get_all_tools']
+__all__ = [
+    'TradingAgent',
+    'get_all_tools',
+    'MarketDataService',
+    'get_market_data_service',
+    'market_data_turn',
+]
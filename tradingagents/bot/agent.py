@@ -13,6 +13,7 @@ from langgraph.prebuilt import create_react_agent
 import logging
 
 from .tools import get_all_tools, get_core_tools
+from .market_data import market_data_turn
 from .prompts import TRADING_EXPERT_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -94,8 +95,9 @@ class TradingAgent:
             if self.debug:
                 logger.info(f"User: {message}")
 
-            # Invoke agent
-            result = self.agent.invoke(inputs)
+            # Invoke agent (tools share one market data snapshot per turn)
+            with market_data_turn():
+                result = self.agent.invoke(inputs)
 
             # Extract response
             response = result["messages"][-1].content
@@ -120,6 +122,13 @@ class TradingAgent:
         Yields:
             Chunks of the agent's response
         """
+        # Tools share one market data snapshot per turn
+        with market_data_turn():
+            async for chunk in self._astream(message, conversation_history):
+                yield chunk
+
+    async def _astream(self, message: str, conversation_history: Optional[list] = None):
+        """Stream agent responses (see astream)."""
         try:
             # Build input
             inputs = {
@@ -8,15 +8,20 @@ Eddie v2.0 conversational interface using Chainlit.
 """
 
 import chainlit as cl
+import asyncio
 import logging
+import re
 from typing import Optional, Dict, Any
 
 from tradingagents.bot.conversational_agent import ConversationalAgent
 from tradingagents.bot.state_tracker import get_state_tracker, EddieState
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.streaming import PropagationEvent, PropagationEventType
 
 logger = logging.getLogger(__name__)
 
+_ANALYZE_COMMAND = re.compile(r"^/analyze\s+([A-Za-z][A-Za-z0-9.\-]{0,9})\s*$", re.IGNORECASE)
+
 # Initialize agent
 _agent: Optional[ConversationalAgent] = None
 
@@ -49,11 +54,64 @@ async def on_chat_start():
                 "- 'What are the best stocks right now?'\n"
                 "- 'Analyze AAPL for me'\n"
                 "- 'Run a system health check for AAPL'\n"
+                "- '/analyze AAPL' (live progress as each agent finishes)\n"
                 "- 'I'm worried about my portfolio'\n\n"
                 "Let's get started! 🚀"
     ).send()
 
 
+def _format_event(event: PropagationEvent) -> Optional[str]:
+    """Chat message for a streaming analysis event (None for events shown in the status line)."""
+    data = event.data
+    if event.type == PropagationEventType.ANALYST_REPORT:
+        return f"📊 **{data['analyst'].capitalize()} analyst report**\n\n{data['report']}"
+    if event.type == PropagationEventType.DEBATE_ROUND:
+        return f"🗣️ **Debate round {data['round']} ({data['speaker']})**\n\n{data['argument']}"
+    if event.type == PropagationEventType.INVESTMENT_PLAN:
+        return f"🧭 **Research manager's plan**\n\n{data['plan']}"
+    if event.type == PropagationEventType.TRADER_PLAN:
+        return f"💼 **Trader plan**\n\n{data['plan']}"
+    if event.type == PropagationEventType.RISK_ROUND:
+        return f"⚖️ **Risk debate ({data['speaker']})**\n\n{data['argument']}"
+    if event.type == PropagationEventType.RISK_VERDICT:
+        return f"🛡️ **Risk verdict**\n\n{data['decision']}"
+    if event.type == PropagationEventType.COMPLETED:
+        results = data.get("results", {})
+        return (
+            f"✅ **Decision: {results.get('decision', data.get('signal'))}**"
+            f" (confidence {results.get('confidence', 'n/a')})\n\n{results.get('summary', '')}"
+        )
+    return None
+
+
+async def stream_analysis(ticker: str):
+    """Run a multi-agent analysis, posting each stage as soon as it finishes.
+    
+    Stopping the chat cancels this task, which stops the run after the
+    node in flight.
+    """
+    from tradingagents.analyze.analyzer import DeepAnalyzer
+    from tradingagents.fast_config import FAST_CONFIG
+
+    status = cl.Message(content=f"🔍 Analyzing **{ticker}**...")
+    await status.send()
+
+    analyzer = await asyncio.to_thread(
+        DeepAnalyzer, config=FAST_CONFIG, enable_rag=False, use_pool=True
+    )
+    async for event in analyzer.astream_analyze(ticker):
+        if event.type == PropagationEventType.TOKEN_USAGE:
+            status.content = (
+                f"🔍 Analyzing **{ticker}**... {event.elapsed:.0f}s, "
+                f"{event.data['total_tokens']:,} tokens"
+            )
+            await status.update()
+            continue
+        text = _format_event(event)
+        if text:
+            await cl.Message(content=text).send()
+
+
 @cl.on_message
 async def on_message(message: cl.Message):
     """Handle incoming messages."""
@@ -61,6 +119,13 @@ async def on_message(message: cl.Message):
     agent = get_agent()
     
     try:
+        command = _ANALYZE_COMMAND.match(message.content.strip())
+        if command:
+            state_tracker.set_state(EddieState.PROCESSING, f"Analyzing {command.group(1).upper()}...")
+            await stream_analysis(command.group(1).upper())
+            state_tracker.set_state(EddieState.IDLE, "Ready")
+            return
+        
         # Update state to processing
         state_tracker.set_state(EddieState.PROCESSING, "Processing your request...")
         
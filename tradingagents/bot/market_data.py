@@ -0,0 +1,438 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Shared read-through market data service for bot tools.
+
+One chat turn often calls several tools about the same tickers (summary,
+data quality, earnings risk, price validation). Instead of each tool
+building its own ops objects and querying separately, tools read through a
+MarketDataService:
+
+- process scope: results are memoized with per-kind TTLs
+- turn scope: inside ``market_data_turn()`` every lookup is memoized for
+  the rest of the turn (a consistent snapshot, regardless of TTL), and a
+  service can be injected for the tools to use
+- batch queries: ticker rows, scan rows and latest closes for several
+  symbols are loaded with one ``= ANY(%s)`` query each
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from tradingagents.database import get_db_connection
+from tradingagents.database.scan_ops import latest_closes_relation
+
+logger = logging.getLogger(__name__)
+
+# Default TTLs (seconds) for the process-wide memo
+DEFAULT_TTLS = {
+    "ticker": 3600,
+    "scan_date": 300,
+    "scan_row": 300,
+    "quote": 60,
+    "history": 900,
+    "dashboard": 300,
+    # Validation reports have their own TTL cache (price_validation_cache_ttl);
+    # only the turn memo applies here
+    "validation": 0,
+    "earnings": 3600,
+}
+
+# Negative results (unknown ticker, no scan row, no quote) expire sooner, so
+# a ticker added to the watchlist is seen by the bot within a minute
+NEGATIVE_TTL = 60
+
+_MISSING = object()
+
+# Per-turn memo and injected service; None outside market_data_turn()
+_turn_memo: ContextVar[Optional[Dict[Tuple, Any]]] = ContextVar("market_data_turn_memo", default=None)
+_turn_service: ContextVar[Optional["MarketDataService"]] = ContextVar("market_data_turn_service", default=None)
+
+
+class MarketDataService:
+    """
+    Read-through cache over the tickers, daily_scans and daily_prices tables.
+
+    Example:
+        service = get_market_data_service()
+        with market_data_turn():
+            service.prefetch(["NVDA", "AMD"])      # 3 queries for both tickers
+            row = service.get_scan_row("NVDA")     # memo hit
+    """
+
+    def __init__(
+        self,
+        db=None,
+        ttls: Optional[Dict[str, float]] = None,
+        negative_ttl: float = NEGATIVE_TTL
+    ):
+        """
+        Args:
+            db: DatabaseConnection (created lazily if None)
+            ttls: Overrides for DEFAULT_TTLS
+            negative_ttl: Upper bound on the TTL of None results
+        """
+        self._db = db
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self._memo: Dict[Tuple, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.turn_hits = 0
+        self.process_hits = 0
+        self.misses = 0
+        self.db_queries = 0
+        self._latest_closes: Optional[str] = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = get_db_connection()
+        return self._db
+
+    @property
+    def latest_closes(self) -> str:
+        """v_latest_closes, or its inline equivalent before migration 017."""
+        if self._latest_closes is None:
+            self._latest_closes = latest_closes_relation(self.db)
+        return self._latest_closes
+
+    # ------------------------------------------------------------------
+    # Memo plumbing
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: Tuple) -> Any:
+        turn = _turn_memo.get()
+        if turn is not None and key in turn:
+            self.turn_hits += 1
+            return turn[key]
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.process_hits += 1
+                if turn is not None:
+                    turn[key] = entry[1]
+                return entry[1]
+        return _MISSING
+
+    def _store(self, key: Tuple, value: Any):
+        turn = _turn_memo.get()
+        if turn is not None:
+            turn[key] = value
+        ttl = self.ttls.get(key[0], 0)
+        if value is None:
+            ttl = min(ttl, self.negative_ttl)
+        if ttl > 0:
+            with self._lock:
+                self._memo[key] = (time.monotonic() + ttl, value)
+
+    def memoize(self, kind: str, key: Any, loader: Callable[[], Any]) -> Any:
+        """
+        Return the memoized value for (kind, key), loading it on a miss.
+
+        Args:
+            kind: Value kind (selects the TTL)
+            key: Hashable key within the kind
+            loader: Called on a miss
+        """
+        memo_key = (kind, key)
+        value = self._lookup(memo_key)
+        if value is _MISSING:
+            self.misses += 1
+            value = loader()
+            self._store(memo_key, value)
+        return value
+
+    def _memoize_many(
+        self,
+        kind: str,
+        symbols: Iterable[str],
+        loader: Callable[[List[str]], Dict[str, Any]],
+        extra: Tuple = ()
+    ) -> Dict[str, Any]:
+        """Batch version of memoize: one loader call for all missing symbols."""
+        symbols = [s.upper() for s in symbols]
+        results: Dict[str, Any] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            value = self._lookup((kind, symbol) + extra)
+            if value is _MISSING:
+                missing.append(symbol)
+            else:
+                results[symbol] = value
+        if missing:
+            self.misses += len(missing)
+            loaded = loader(missing)
+            for symbol in missing:
+                # Negative results are memoized too
+                value = loaded.get(symbol)
+                self._store((kind, symbol) + extra, value)
+                results[symbol] = value
+        return results
+
+    def _query(self, query: str, params: Tuple) -> List[Dict[str, Any]]:
+        self.db_queries += 1
+        return self.db.execute_dict_query(query, params) or []
+
+    # ------------------------------------------------------------------
+    # Tickers, scans and quotes
+    # ------------------------------------------------------------------
+
+    def get_tickers(self, symbols: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Ticker rows for several symbols (one query for all misses)."""
+        def load(missing):
+            rows = self._query("SELECT * FROM tickers WHERE symbol = ANY(%s)", (missing,))
+            return {row["symbol"]: row for row in rows}
+        return self._memoize_many("ticker", symbols, load)
+
+    def get_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Ticker row, or None if the symbol is not in the watchlist."""
+        return self.get_tickers([symbol])[symbol.upper()]
+
+    def get_latest_scan_date(self) -> Optional[date]:
+        """Most recent scan date."""
+        def load():
+            self.db_queries += 1
+            result = self.db.execute_query("SELECT MAX(scan_date) FROM daily_scans", fetch_one=True)
+            return result[0] if result and result[0] else None
+        return self.memoize("scan_date", None, load)
+
+    def get_scan_rows(
+        self,
+        symbols: Iterable[str],
+        scan_date: Optional[date] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Scan rows (with ticker info and latest closes) for several symbols.
+
+        Args:
+            symbols: Ticker symbols
+            scan_date: Scan date (defaults to the latest scan)
+        """
+        scan_date = scan_date or self.get_latest_scan_date()
+        if scan_date is None:
+            return {s.upper(): None for s in symbols}
+
+        def load(missing):
+            rows = self._query(
+                """
+                SELECT
+                    ds.*,
+                    t.symbol,
+                    t.company_name,
+                    t.sector,
+                    lc.close AS latest_close,
+                    lc.volume AS latest_volume,
+                    lc.prev_close
+                FROM daily_scans ds
+                JOIN tickers t ON ds.ticker_id = t.ticker_id
+                LEFT JOIN {latest_closes} lc ON t.ticker_id = lc.ticker_id
+                WHERE ds.scan_date = %s AND t.symbol = ANY(%s)
+                """.format(latest_closes=self.latest_closes),
+                (scan_date, missing)
+            )
+            return {row["symbol"]: row for row in rows}
+        return self._memoize_many("scan_row", symbols, load, extra=(scan_date,))
+
+    def get_scan_row(self, symbol: str, scan_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """Scan row for one symbol from the latest (or given) scan."""
+        return self.get_scan_rows([symbol], scan_date)[symbol.upper()]
+
+    def get_quotes(self, symbols: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Latest close, volume, previous close and change % from daily_prices."""
+        def load(missing):
+            rows = self._query(
+                """
+                SELECT t.symbol, lc.price_date, lc.close, lc.volume, lc.prev_close, lc.change_pct
+                FROM tickers t
+                JOIN {latest_closes} lc ON t.ticker_id = lc.ticker_id
+                WHERE t.symbol = ANY(%s)
+                """.format(latest_closes=self.latest_closes),
+                (missing,)
+            )
+            return {row["symbol"]: row for row in rows}
+        return self._memoize_many("quote", symbols, load)
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest quote for one symbol."""
+        return self.get_quotes([symbol])[symbol.upper()]
+
+    def get_histories(self, symbols: Iterable[str], period: str = "3mo") -> Dict[str, Any]:
+        """
+        Daily OHLCV histories from yfinance, downloaded in one request.
+
+        Returns:
+            Symbol -> DataFrame (None if unavailable)
+        """
+        def load(missing):
+            import yfinance as yf
+
+            try:
+                data = yf.download(
+                    tickers=missing,
+                    period=period,
+                    group_by="ticker",
+                    auto_adjust=True,
+                    progress=False,
+                    threads=True
+                )
+            except Exception as e:
+                logger.warning(f"Could not download histories for {missing}: {e}")
+                return {}
+            histories = {}
+            for symbol in missing:
+                try:
+                    frame = data[symbol] if symbol in data.columns.get_level_values(0) else data
+                    frame = frame.dropna(how="all")
+                    histories[symbol] = frame if not frame.empty else None
+                except Exception:
+                    histories[symbol] = None
+            return histories
+        return self._memoize_many("history", symbols, load, extra=(period,))
+
+    def get_history(self, symbol: str, period: str = "3mo"):
+        """Daily history for one symbol (None if unavailable)."""
+        return self.get_histories([symbol], period)[symbol.upper()]
+
+    def get_top_opportunities(self, scan_date: Optional[date] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Top-ranked scan rows (see ScanOperations.get_top_opportunities)."""
+        from tradingagents.database import ScanOperations
+
+        def load():
+            self.db_queries += 1
+            return ScanOperations(self.db).get_top_opportunities(scan_date=scan_date, limit=limit)
+        return self.memoize("scan_row", ("top", scan_date, limit), load)
+
+    def get_dashboard_stats(self) -> Dict[str, Any]:
+        """
+        Watchlist summary and scan/analysis counts for the data dashboard.
+
+        Returns:
+            Dict with watchlist, latest_scan_date, scanned_count, total_scans,
+            analysis_count and rag_context_count
+        """
+        from tradingagents.database import TickerOperations
+
+        def load():
+            self.db_queries += 1
+            stats = {"watchlist": TickerOperations(self.db).get_watchlist_summary()}
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT
+                        (SELECT MAX(scan_date) FROM daily_scans),
+                        (SELECT COUNT(*) FROM daily_scans),
+                        (SELECT COUNT(*) FROM analyses),
+                        (SELECT COUNT(*) FROM analyses WHERE embedding IS NOT NULL)
+                    """
+                )
+                latest, total_scans, analysis_count, rag_count = cursor.fetchone()
+                scanned_count = 0
+                if latest:
+                    cursor.execute("SELECT COUNT(*) FROM daily_scans WHERE scan_date = %s", (latest,))
+                    scanned_count = cursor.fetchone()[0]
+            stats.update({
+                "latest_scan_date": latest,
+                "scanned_count": scanned_count,
+                "total_scans": total_scans,
+                "analysis_count": analysis_count,
+                "rag_context_count": rag_count,
+            })
+            return stats
+        return self.memoize("dashboard", "stats", load)
+
+    def prefetch(self, symbols: Iterable[str]) -> List[str]:
+        """
+        Load ticker rows, scan rows and quotes for several symbols up front.
+
+        Unknown symbols are dropped after the ticker query.
+
+        Returns:
+            Symbols found in the watchlist
+        """
+        symbols = list(symbols)
+        if not symbols:
+            return []
+        known = [s for s, row in self.get_tickers(symbols).items() if row]
+        if known:
+            self.get_scan_rows(known)
+            self.get_quotes(known)
+        return known
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Drop memoized values (all, or one kind), e.g. after a screener run or a ticker insert."""
+        with self._lock:
+            if kind is None:
+                self._memo.clear()
+            else:
+                self._memo = {k: v for k, v in self._memo.items() if k[0] != kind}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss and query counters."""
+        lookups = self.turn_hits + self.process_hits + self.misses
+        return {
+            "turn_hits": self.turn_hits,
+            "process_hits": self.process_hits,
+            "misses": self.misses,
+            "db_queries": self.db_queries,
+            "hit_rate": (self.turn_hits + self.process_hits) / lookups if lookups else 0.0,
+            "memo_entries": len(self._memo),
+        }
+
+
+@contextmanager
+def market_data_turn(service: Optional[MarketDataService] = None):
+    """
+    Scope lookups to one conversation turn.
+
+    Within the block every value is memoized for the rest of the turn, so a
+    multi-tool answer touches the database once per ticker. Nested scopes
+    share the outer turn.
+
+    Args:
+        service: Service the tools should use during the turn (injected;
+            defaults to the process-wide service)
+    """
+    if _turn_memo.get() is not None and service is None:
+        yield
+        return
+    memo_token = _turn_memo.set(_turn_memo.get() if _turn_memo.get() is not None else {})
+    service_token = _turn_service.set(service or _turn_service.get())
+    try:
+        yield
+    finally:
+        try:
+            _turn_service.reset(service_token)
+            _turn_memo.reset(memo_token)
+        except ValueError:
+            # Closed from another context (e.g. an abandoned async generator)
+            _turn_service.set(None)
+            _turn_memo.set(None)
+
+
+_market_data_service: Optional[MarketDataService] = None
+
+
+def get_market_data_service() -> MarketDataService:
+    """
+    Get the market data service for the current turn.
+
+    Returns the service injected with market_data_turn(service), otherwise
+    the process-wide service.
+    """
+    injected = _turn_service.get()
+    if injected is not None:
+        return injected
+    global _market_data_service
+    if _market_data_service is None:
+        _market_data_service = MarketDataService()
+    return _market_data_service
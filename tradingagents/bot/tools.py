@@ -32,6 +32,7 @@ from tradingagents.validation import validate_data_quality
 from tradingagents.dividends.dividend_metrics import DividendMetrics
 from tradingagents.portfolio.position_sizer import PositionSizer
 from tradingagents.database import TickerOperations
+from tradingagents.bot.market_data import get_market_data_service
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
@@ -104,6 +105,9 @@ def run_screener(sector_analysis: bool = True, top_n: int = 10) -> str:
                 logger.warning("Screener scan timed out after 30 seconds")
                 raise TimeoutError("Screener scan took too long")
 
+        # Fresh scan rows supersede memoized lookups
+        get_market_data_service().invalidate()
+
         if not results:
             return "No screening results available. The database may need to be updated."
 
@@ -384,10 +388,12 @@ def analyze_stock(ticker: str, portfolio_value: float = 100000) -> str:
         # Use fast config for bot (no news to save time)
         import os
         os.environ["LANGFUSE_ENABLED"] = "false"
+        # Lease a warm, already-compiled graph instead of rebuilding per request
         analyzer = DeepAnalyzer(
             config=FAST_CONFIG,
             enable_rag=False,
-            debug=False
+            debug=False,
+            use_pool=True
         )
 
         logger.info(f"🤖 Running multi-agent analysis (30-90 seconds)...")
@@ -398,7 +404,12 @@ def analyze_stock(ticker: str, portfolio_value: float = 100000) -> str:
             store_results=True
         )
 
-        logger.info(f"✓ Analysis complete for {ticker.upper()}")
+        timing = results.get('timing', {})
+        logger.info(
+            f"✓ Analysis complete for {ticker.upper()} "
+            f"(graph construction {timing.get('construction_seconds', 0)}s, "
+            f"run {timing.get('run_seconds', 0)}s)"
+        )
 
         # Extract key information
         decision = results.get('decision', 'WAIT')
@@ -580,16 +591,15 @@ def get_stock_summary(ticker: str) -> str:
     Use this for quick lookups without full AI analysis.
     """
     try:
-        db, ticker_ops, scan_ops, _ = get_db()
+        market_data = get_market_data_service()
 
         # Get ticker info
-        ticker_info = ticker_ops.get_ticker(symbol=ticker.upper())
+        ticker_info = market_data.get_ticker(ticker)
         if not ticker_info:
             return f"Ticker {ticker} not found in database."
 
         # Get latest scan result
-        latest_scan = scan_ops.get_top_opportunities(limit=200)
-        stock_scan = next((s for s in latest_scan if s['symbol'] == ticker.upper()), None)
+        stock_scan = market_data.get_scan_row(ticker)
 
         response = [f"📋 {ticker.upper()} - Quick Summary\n"]
 
@@ -629,9 +639,9 @@ def get_stock_info(ticker: str) -> str:
         Company name, sector, industry, and other details
     """
     try:
-        db, ticker_ops, _, _ = get_db()
+        market_data = get_market_data_service()
 
-        ticker_info = ticker_ops.get_ticker(symbol=ticker.upper())
+        ticker_info = market_data.get_ticker(ticker)
         if not ticker_info:
             return f"Ticker {ticker} not found."
 
@@ -1490,7 +1500,13 @@ def calculate_data_age(latest_scan_date: date) -> dict:
     }
 
 
-def detect_data_issues(db, ticker_ops, scan_ops, latest_scan_date: date) -> list:
+def detect_data_issues(
+    db,
+    ticker_ops,
+    scan_ops,
+    latest_scan_date: date,
+    stats: Optional[Dict[str, Any]] = None
+) -> list:
     """
     Detect data quality issues and gaps.
 
@@ -1499,6 +1515,8 @@ def detect_data_issues(db, ticker_ops, scan_ops, latest_scan_date: date) -> list
         ticker_ops: TickerOperations instance
         scan_ops: ScanOperations instance
         latest_scan_date: Most recent scan date
+        stats: Precomputed counts from MarketDataService.get_dashboard_stats()
+            (skips the queries)
 
     Returns:
         List of issue strings
@@ -1506,38 +1524,41 @@ def detect_data_issues(db, ticker_ops, scan_ops, latest_scan_date: date) -> list
     issues = []
 
     try:
-        # Check scan coverage
-        total_active = ticker_ops.get_watchlist_summary()['active_tickers']
-
-        # Get scan count for latest date
-        with db.get_cursor() as cursor:
-            cursor.execute(
-                "SELECT COUNT(*) FROM daily_scans WHERE scan_date = %s",
-                (latest_scan_date,)
-            )
-            scanned_count = cursor.fetchone()[0]
+        if stats is None:
+            stats = {"watchlist": ticker_ops.get_watchlist_summary()}
+            with db.get_cursor() as cursor:
+                # Get scan count for latest date
+                cursor.execute(
+                    "SELECT COUNT(*) FROM daily_scans WHERE scan_date = %s",
+                    (latest_scan_date,)
+                )
+                stats["scanned_count"] = cursor.fetchone()[0]
+                cursor.execute("SELECT COUNT(*) FROM analyses")
+                stats["analysis_count"] = cursor.fetchone()[0]
 
-            coverage_pct = (scanned_count / total_active * 100) if total_active > 0 else 0
+        # Check scan coverage
+        total_active = stats["watchlist"]['active_tickers']
+        scanned_count = stats["scanned_count"]
+        coverage_pct = (scanned_count / total_active * 100) if total_active > 0 else 0
 
-            if coverage_pct < 80:
-                issues.append(f"Low scan coverage: Only {scanned_count}/{total_active} stocks ({coverage_pct:.1f}%)")
-            elif coverage_pct < 100:
-                missing = total_active - scanned_count
-                issues.append(f"{missing} stocks not scanned on latest date")
+        if coverage_pct < 80:
+            issues.append(f"Low scan coverage: Only {scanned_count}/{total_active} stocks ({coverage_pct:.1f}%)")
+        elif coverage_pct < 100:
+            missing = total_active - scanned_count
+            issues.append(f"{missing} stocks not scanned on latest date")
 
-            # Check for analyses
-            cursor.execute("SELECT COUNT(*) FROM analyses")
-            analysis_count = cursor.fetchone()[0]
+        # Check for analyses
+        analysis_count = stats["analysis_count"]
 
-            if analysis_count == 0:
-                issues.append("No deep analyses performed yet - RAG pattern recognition unavailable")
-            elif analysis_count < 5:
-                issues.append(f"Only {analysis_count} analyses - need 5+ for robust pattern recognition")
+        if analysis_count == 0:
+            issues.append("No deep analyses performed yet - RAG pattern recognition unavailable")
+        elif analysis_count < 5:
+            issues.append(f"Only {analysis_count} analyses - need 5+ for robust pattern recognition")
 
-            # Check data age
-            age_info = calculate_data_age(latest_scan_date)
-            if age_info['is_stale']:
-                issues.append(f"Data is {age_info['days_old']} days old - recommend refresh")
+        # Check data age
+        age_info = calculate_data_age(latest_scan_date)
+        if age_info['is_stale']:
+            issues.append(f"Data is {age_info['days_old']} days old - recommend refresh")
 
     except Exception as e:
         logger.error(f"Error detecting data issues: {e}")
@@ -1673,56 +1694,37 @@ def show_data_dashboard() -> str:
     Eddie should use this proactively to make data-driven recommendations!
     """
     try:
-        db, ticker_ops, scan_ops, _ = get_db()
+        market_data = get_market_data_service()
 
-        # ===== WATCHLIST STATUS =====
-        watchlist = ticker_ops.get_watchlist_summary()
+        # ===== WATCHLIST, SCAN AND ANALYSIS COUNTS =====
+        stats = market_data.get_dashboard_stats()
+        watchlist = stats['watchlist']
+        latest_scan_date = stats['latest_scan_date']
 
-        # ===== SCAN STATUS =====
-        with db.get_cursor() as cursor:
-            # Get latest scan date
-            cursor.execute("SELECT MAX(scan_date) FROM daily_scans")
-            latest_scan_date = cursor.fetchone()[0]
-
-            if not latest_scan_date:
-                return "📊 DATA DASHBOARD\n\n⚠️ No scan data available yet.\n\nRecommendation: Run the screener to populate the database."
-
-            # Get scan count for latest date
-            cursor.execute(
-                "SELECT COUNT(*) FROM daily_scans WHERE scan_date = %s",
-                (latest_scan_date,)
-            )
-            scanned_count = cursor.fetchone()[0]
-
-            # Calculate coverage
-            total_active = watchlist['active_tickers']
-            coverage_pct = (scanned_count / total_active * 100) if total_active > 0 else 0
+        if not latest_scan_date:
+            return "📊 DATA DASHBOARD\n\n⚠️ No scan data available yet.\n\nRecommendation: Run the screener to populate the database."
 
-            # Get total historical scans
-            cursor.execute("SELECT COUNT(*) FROM daily_scans")
-            total_scans = cursor.fetchone()[0]
+        scanned_count = stats['scanned_count']
+        total_scans = stats['total_scans']
+        analysis_count = stats['analysis_count']
+        rag_context_count = stats['rag_context_count']
 
-            # Get data age
-            data_age = calculate_data_age(latest_scan_date)
+        # Calculate coverage
+        total_active = watchlist['active_tickers']
+        coverage_pct = (scanned_count / total_active * 100) if total_active > 0 else 0
 
-            # ===== ANALYSIS HISTORY =====
-            cursor.execute("SELECT COUNT(*) FROM analyses")
-            analysis_count = cursor.fetchone()[0]
-
-            cursor.execute(
-                "SELECT COUNT(*) FROM analyses WHERE embedding IS NOT NULL"
-            )
-            rag_context_count = cursor.fetchone()[0]
+        # Get data age
+        data_age = calculate_data_age(latest_scan_date)
 
         # ===== TOP OPPORTUNITIES =====
-        top_stocks = scan_ops.get_top_opportunities(scan_date=latest_scan_date, limit=5)
+        top_stocks = market_data.get_top_opportunities(scan_date=latest_scan_date, limit=5)
 
         # ===== DATA ISSUES =====
-        issues = detect_data_issues(db, ticker_ops, scan_ops, latest_scan_date)
+        issues = detect_data_issues(None, None, None, latest_scan_date, stats=stats)
 
         # ===== STRATEGIC RECOMMENDATIONS =====
         recommendations = generate_strategic_recommendations(
-            db, ticker_ops, scan_ops, data_age, analysis_count, top_stocks, coverage_pct
+            market_data.db, None, None, data_age, analysis_count, top_stocks, coverage_pct
         )
 
         # ===== FORMAT DASHBOARD =====
@@ -1900,16 +1902,14 @@ def check_data_quality(ticker: str) -> str:
     """
     try:
         # Get latest stock data to check timestamp
-        db, ticker_ops, scan_ops, _ = get_db()
+        market_data = get_market_data_service()
 
         # Get ticker info
-        ticker_id = ticker_ops.get_ticker_id(ticker.upper())
-        if not ticker_id:
+        if not market_data.get_ticker(ticker):
             return f"Ticker {ticker} not found in database."
 
         # Get latest scan result to check data freshness
-        latest_scan_date = scan_ops.get_latest_scan_date()
-        latest_scan = scan_ops.get_latest_scan(ticker_id=ticker_id, scan_date=latest_scan_date) if latest_scan_date else None
+        latest_scan = market_data.get_scan_row(ticker)
 
         if latest_scan:
             price_timestamp = latest_scan.get('scanned_at')
@@ -1964,7 +1964,9 @@ def validate_price_sources(ticker: str) -> str:
     try:
         from tradingagents.validation import validate_price_multi_source
 
-        report = validate_price_multi_source(ticker.upper())
+        market_data = get_market_data_service()
+        symbol = ticker.upper()
+        report = market_data.memoize("validation", symbol, lambda: validate_price_multi_source(symbol))
         return report.format_for_display()
 
     except Exception as e:
@@ -1994,9 +1996,13 @@ def check_earnings_risk(ticker: str) -> str:
     Eddie should ALWAYS check this before recommending new positions!
     """
     try:
-        from tradingagents.validation import check_earnings_proximity
+        from tradingagents.validation import get_earnings_calendar_cache
 
-        report = check_earnings_proximity(ticker.upper())
+        market_data = get_market_data_service()
+        symbol = ticker.upper()
+        report = market_data.memoize(
+            "earnings", symbol, lambda: get_earnings_calendar_cache().check_proximity(symbol)
+        )
         return report.format_for_display()
 
     except Exception as e:
@@ -2031,20 +2037,16 @@ def run_system_doctor_check(ticker: str) -> str:
     """
     try:
         from tradingagents.validation import SystemDoctor
-        import pandas as pd
-        import yfinance as yf
         
         doctor = SystemDoctor()
-        db, ticker_ops, scan_ops, _ = get_db()
+        market_data = get_market_data_service()
         
         # Get ticker info
-        ticker_id = ticker_ops.get_ticker_id(ticker.upper())
-        if not ticker_id:
+        if not market_data.get_ticker(ticker):
             return f"Ticker {ticker} not found in database."
         
         # Get latest price from database
-        latest_scan_date = scan_ops.get_latest_scan_date()
-        latest_scan = scan_ops.get_latest_scan(ticker_id=ticker_id, scan_date=latest_scan_date) if latest_scan_date else None
+        latest_scan = market_data.get_scan_row(ticker)
         if not latest_scan:
             return f"No scan data available for {ticker}. Please run screener first."
         
@@ -2066,9 +2068,8 @@ def run_system_doctor_check(ticker: str) -> str:
         if application_indicators:
             try:
                 # Fetch historical data for indicator calculation
-                stock = yf.Ticker(ticker.upper())
-                hist = stock.history(period="3mo")  # 3 months should be enough
-                if not hist.empty:
+                hist = market_data.get_history(ticker, period="3mo")  # 3 months should be enough
+                if hist is not None:
                     price_history = hist['Close']
             except Exception as e:
                 logger.warning(f"Could not fetch price history for indicator audit: {e}")
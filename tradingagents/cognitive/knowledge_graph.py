@@ -12,11 +12,29 @@ import networkx as nx
 from typing import Dict, List, Optional, Set, Tuple, Any, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from collections import deque
+from pathlib import Path
+import gzip
 import json
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Tokens for the inverted index: maximal runs of word characters. Any
+# word-character substring of a text therefore lies inside a single token.
+_TOKEN_RE = re.compile(r"\w+")
+
+# Confidence is bucketed in tenths (0.0-0.1 -> 0, ..., 1.0 -> 10)
+CONFIDENCE_BUCKETS = 10
+
+SNAPSHOT_VERSION = 1
+
+
+def _confidence_bucket(confidence: float) -> int:
+    """Map a confidence value to its index bucket."""
+    return max(0, min(CONFIDENCE_BUCKETS, int(confidence * CONFIDENCE_BUCKETS)))
+
 
 @dataclass
 class KnowledgeNode:
@@ -81,6 +99,104 @@ class KnowledgeGraph:
         self.graph = nx.DiGraph()  # Directed graph for relationships
         self.nodes: Dict[str, KnowledgeNode] = {}
         self.edges: List[KnowledgeEdge] = []
+        
+        # Secondary indexes, maintained by add_node/add_edge.
+        # Insertion sequence keeps indexed results in the same order as self.nodes.
+        self._node_seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._by_type: Dict[str, Set[str]] = {}
+        self._by_confidence: Dict[int, Set[str]] = {}
+        self._token_index: Dict[str, Set[str]] = {}
+        # Lowercased (label, string property values) per node, computed once
+        self._search_text: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        # Out/in adjacency with relationship type: node_id -> {neighbor_id: rel_type}
+        self._out_edges: Dict[str, Dict[str, str]] = {}
+        self._in_edges: Dict[str, Dict[str, str]] = {}
+    
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    
+    def _index_node(self, node: KnowledgeNode):
+        """Add a node to the secondary indexes (replacing any previous entry)."""
+        if node.id in self._search_text:
+            self._unindex_node(node.id)
+        
+        if node.id not in self._node_seq:
+            self._node_seq[node.id] = self._next_seq
+            self._next_seq += 1
+        
+        label_lower = node.label.lower()
+        prop_values = tuple(
+            value.lower() for value in node.properties.values()
+            if isinstance(value, str)
+        )
+        self._search_text[node.id] = (label_lower, prop_values)
+        
+        self._by_type.setdefault(node.node_type, set()).add(node.id)
+        self._by_confidence.setdefault(_confidence_bucket(node.confidence), set()).add(node.id)
+        for token in self._tokens_for(node.id):
+            self._token_index.setdefault(token, set()).add(node.id)
+    
+    def _unindex_node(self, node_id: str):
+        """Remove a node's entries from the secondary indexes."""
+        old = self.nodes.get(node_id)
+        if old is not None:
+            self._discard(self._by_type, old.node_type, node_id)
+            self._discard(self._by_confidence, _confidence_bucket(old.confidence), node_id)
+        for token in self._tokens_for(node_id):
+            self._discard(self._token_index, token, node_id)
+        self._search_text.pop(node_id, None)
+    
+    def _attach_edge(self, edge: KnowledgeEdge):
+        """Record an edge in the edge list, the NetworkX graph and the adjacency index."""
+        self.edges.append(edge)
+        self.graph.add_edge(edge.source, edge.target, **edge.to_dict())
+        self._out_edges.setdefault(edge.source, {})[edge.target] = edge.relationship_type
+        self._in_edges.setdefault(edge.target, {})[edge.source] = edge.relationship_type
+    
+    def _tokens_for(self, node_id: str) -> Set[str]:
+        """Tokens of a node's indexed label and string properties."""
+        label_lower, prop_values = self._search_text.get(node_id, ("", ()))
+        tokens = set(_TOKEN_RE.findall(label_lower))
+        for value in prop_values:
+            tokens.update(_TOKEN_RE.findall(value))
+        return tokens
+    
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], key: Any, node_id: str):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.discard(node_id)
+            if not bucket:
+                del index[key]
+    
+    def _text_candidates(self, text_lower: str) -> Optional[Set[str]]:
+        """
+        Candidate node IDs whose indexed text may contain ``text_lower``.
+        
+        Uses the longest word-character run of the query: a direct token hit is
+        a dictionary lookup, otherwise only the (much smaller) token vocabulary
+        is scanned for substrings. Returns None when the query has no word
+        characters and the index cannot narrow the search.
+        """
+        pieces = _TOKEN_RE.findall(text_lower)
+        if not pieces:
+            return None
+        piece = max(pieces, key=len)
+        
+        candidates: Set[str] = set()
+        exact = self._token_index.get(piece)
+        if exact:
+            candidates.update(exact)
+        for token, node_ids in self._token_index.items():
+            if token != piece and piece in token:
+                candidates.update(node_ids)
+        return candidates
+    
+    def _ordered(self, node_ids: Set[str]) -> List[str]:
+        """Sort node IDs into insertion order (matches iteration over self.nodes)."""
+        return sorted(node_ids, key=self._node_seq.__getitem__)
     
     def add_node(
         self,
@@ -111,6 +227,7 @@ class KnowledgeGraph:
             confidence=confidence
         )
         
+        self._index_node(node)
         self.nodes[node_id] = node
         self.graph.add_node(node_id, **node.to_dict())
         
@@ -152,12 +269,7 @@ class KnowledgeGraph:
             properties=properties or {}
         )
         
-        self.edges.append(edge)
-        self.graph.add_edge(
-            source_id,
-            target_id,
-            **edge.to_dict()
-        )
+        self._attach_edge(edge)
         
         logger.debug(f"Added knowledge edge: {source_id} --{relationship_type}--> {target_id}")
         return edge
@@ -183,13 +295,31 @@ class KnowledgeGraph:
         Returns:
             List of matching nodes
         """
+        candidates: Optional[Set[str]] = None
+        
+        if node_type:
+            candidates = set(self._by_type.get(node_type, ()))
+        
+        if min_confidence > 0.0:
+            in_range: Set[str] = set()
+            for bucket in range(_confidence_bucket(min_confidence), CONFIDENCE_BUCKETS + 1):
+                in_range.update(self._by_confidence.get(bucket, ()))
+            candidates = in_range if candidates is None else candidates & in_range
+        
+        pattern_lower = label_pattern.lower() if label_pattern else None
+        if pattern_lower:
+            text_hits = self._text_candidates(pattern_lower)
+            if text_hits is not None:
+                candidates = text_hits if candidates is None else candidates & text_hits
+        
+        node_ids = self._ordered(candidates) if candidates is not None else list(self.nodes)
+        
         results = []
-        for node in self.nodes.values():
-            if node_type and node.node_type != node_type:
-                continue
+        for node_id in node_ids:
+            node = self.nodes[node_id]
             if node.confidence < min_confidence:
                 continue
-            if label_pattern and label_pattern.lower() not in node.label.lower():
+            if pattern_lower and pattern_lower not in self._search_text[node_id][0]:
                 continue
             results.append(node)
         return results
@@ -203,6 +333,9 @@ class KnowledgeGraph:
         """
         Get nodes related to a given node.
         
+        Breadth-first over both outgoing and incoming edges, so each related
+        node is reported once, at its shortest distance from the start node.
+        
         Args:
             node_id: Starting node ID
             relationship_type: Filter by relationship type
@@ -215,39 +348,27 @@ class KnowledgeGraph:
             return []
         
         related = []
-        visited = set()
+        visited = {node_id}
+        frontier = deque([(node_id, 0)])
         
-        def traverse(current_id: str, depth: int):
-            if depth > max_depth or current_id in visited:
-                return
-            
-            visited.add(current_id)
-            
-            # Get outgoing edges
-            for target_id in self.graph.successors(current_id):
-                edge_data = self.graph[current_id][target_id]
-                rel_type = edge_data.get('type', '')
-                
-                if relationship_type and rel_type != relationship_type:
-                    continue
-                
-                if target_id in self.nodes:
-                    related.append((self.nodes[target_id], rel_type, depth))
-                    traverse(target_id, depth + 1)
+        while frontier:
+            current_id, depth = frontier.popleft()
+            if depth >= max_depth:
+                continue
             
-            # Get incoming edges (reverse relationships)
-            for source_id in self.graph.predecessors(current_id):
-                edge_data = self.graph[source_id][current_id]
-                rel_type = edge_data.get('type', '')
-                
-                if relationship_type and rel_type != relationship_type:
-                    continue
-                
-                if source_id in self.nodes:
-                    related.append((self.nodes[source_id], rel_type, depth))
-                    traverse(source_id, depth + 1)
-        
-        traverse(node_id, 1)
+            for adjacency in (self._out_edges, self._in_edges):
+                for neighbor_id, rel_type in adjacency.get(current_id, {}).items():
+                    if neighbor_id in visited:
+                        continue
+                    if relationship_type and rel_type != relationship_type:
+                        continue
+                    if neighbor_id not in self.nodes:
+                        continue
+                    
+                    visited.add(neighbor_id)
+                    related.append((self.nodes[neighbor_id], rel_type, depth + 1))
+                    frontier.append((neighbor_id, depth + 1))
+        
         return related
     
     def query(
@@ -270,20 +391,24 @@ class KnowledgeGraph:
         query_lower = query_text.lower()
         results = []
         
-        for node in self.nodes.values():
+        candidates = self._text_candidates(query_lower)
+        node_ids = self._ordered(candidates) if candidates is not None else list(self.nodes)
+        
+        for node_id in node_ids:
+            label_lower, prop_values = self._search_text[node_id]
             score = 0.0
             
             # Check label
-            if query_lower in node.label.lower():
+            if query_lower in label_lower:
                 score += 2.0
             
             # Check properties
-            for key, value in node.properties.items():
-                if isinstance(value, str) and query_lower in value.lower():
+            for value in prop_values:
+                if query_lower in value:
                     score += 1.0
             
             if score > 0:
-                results.append((node, score))
+                results.append((self.nodes[node_id], score))
         
         # Sort by score
         results.sort(key=lambda x: x[1], reverse=True)
@@ -354,11 +479,23 @@ class KnowledgeGraph:
             }
         }
     
-    def from_dict(self, data: Dict[str, Any]):
-        """Import graph from dictionary."""
+    def clear(self):
+        """Remove all nodes, edges and index entries."""
         self.nodes.clear()
         self.edges.clear()
         self.graph.clear()
+        self._node_seq.clear()
+        self._next_seq = 0
+        self._by_type.clear()
+        self._by_confidence.clear()
+        self._token_index.clear()
+        self._search_text.clear()
+        self._out_edges.clear()
+        self._in_edges.clear()
+    
+    def from_dict(self, data: Dict[str, Any]):
+        """Import graph from dictionary."""
+        self.clear()
         
         # Load nodes
         for node_data in data.get("nodes", []):
@@ -369,6 +506,7 @@ class KnowledgeGraph:
                 properties=node_data.get("properties", {}),
                 confidence=node_data.get("confidence", 1.0)
             )
+            self._index_node(node)
             self.nodes[node.id] = node
             self.graph.add_node(node.id, **node.to_dict())
         
@@ -381,8 +519,109 @@ class KnowledgeGraph:
                 weight=edge_data.get("weight", 1.0),
                 properties=edge_data.get("properties", {})
             )
-            self.edges.append(edge)
-            self.graph.add_edge(edge.source, edge.target, **edge.to_dict())
+            self._attach_edge(edge)
+    
+    def save_snapshot(self, path: Union[str, Path]) -> Path:
+        """
+        Write a compact, gzip-compressed snapshot of the graph.
+        
+        Columnar layout: node types and relationship types are interned into
+        lookup tables, edges reference nodes by position, and timestamps are
+        stored as epoch seconds. Unlike to_dict, timestamps are preserved.
+        
+        Args:
+            path: Destination file (conventionally ``*.kg.json.gz``)
+        
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        node_ids = list(self.nodes)
+        position = {node_id: i for i, node_id in enumerate(node_ids)}
+        node_types: Dict[str, int] = {}
+        rel_types: Dict[str, int] = {}
+        nodes = list(self.nodes.values())
+        
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "node_types": None,
+            "rel_types": None,
+            "nodes": {
+                "id": node_ids,
+                "label": [n.label for n in nodes],
+                "type": [node_types.setdefault(n.node_type, len(node_types)) for n in nodes],
+                "confidence": [n.confidence for n in nodes],
+                "created_at": [n.created_at.timestamp() for n in nodes],
+                "updated_at": [n.updated_at.timestamp() for n in nodes],
+                "properties": [n.properties for n in nodes],
+            },
+            "edges": {
+                "source": [position[e.source] for e in self.edges],
+                "target": [position[e.target] for e in self.edges],
+                "type": [rel_types.setdefault(e.relationship_type, len(rel_types)) for e in self.edges],
+                "weight": [e.weight for e in self.edges],
+                "created_at": [e.created_at.timestamp() for e in self.edges],
+                "properties": [e.properties for e in self.edges],
+            },
+        }
+        snapshot["node_types"] = list(node_types)
+        snapshot["rel_types"] = list(rel_types)
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"), default=str)
+        
+        logger.info(f"Saved knowledge graph snapshot: {len(node_ids)} nodes, {len(self.edges)} edges -> {path}")
+        return path
+    
+    def load_snapshot(self, path: Union[str, Path]):
+        """
+        Replace the graph contents with a snapshot written by save_snapshot.
+        
+        Args:
+            path: Snapshot file
+        """
+        path = Path(path)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        
+        version = snapshot.get("version")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported knowledge graph snapshot version: {version}")
+        
+        self.clear()
+        node_types = snapshot["node_types"]
+        rel_types = snapshot["rel_types"]
+        
+        cols = snapshot["nodes"]
+        for i, node_id in enumerate(cols["id"]):
+            node = KnowledgeNode(
+                id=node_id,
+                label=cols["label"][i],
+                node_type=node_types[cols["type"][i]],
+                properties=cols["properties"][i],
+                created_at=datetime.fromtimestamp(cols["created_at"][i], tz=timezone.utc),
+                updated_at=datetime.fromtimestamp(cols["updated_at"][i], tz=timezone.utc),
+                confidence=cols["confidence"][i]
+            )
+            self._index_node(node)
+            self.nodes[node_id] = node
+            self.graph.add_node(node_id, **node.to_dict())
+        
+        node_ids = cols["id"]
+        cols = snapshot["edges"]
+        for i, source_pos in enumerate(cols["source"]):
+            edge = KnowledgeEdge(
+                source=node_ids[source_pos],
+                target=node_ids[cols["target"][i]],
+                relationship_type=rel_types[cols["type"][i]],
+                weight=cols["weight"][i],
+                properties=cols["properties"][i],
+                created_at=datetime.fromtimestamp(cols["created_at"][i], tz=timezone.utc)
+            )
+            self._attach_edge(edge)
+        
+        logger.info(f"Loaded knowledge graph snapshot: {len(self.nodes)} nodes, {len(self.edges)} edges <- {path}")
 
 
 # Global instance
@@ -10,14 +10,28 @@ Automatically triggers learning based on market events and patterns.
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Callable, Any
+from typing import List, Dict, Optional, Callable, Any, Set
 from enum import Enum
 import logging
 import asyncio
+import re
+import time
 from collections import defaultdict
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Keywords that indicate major news
+MAJOR_NEWS_KEYWORDS = [
+    'earnings', 'acquisition', 'merger', 'fda approval', 'bankruptcy',
+    'lawsuit', 'ceo', 'guidance', 'recall', 'investigation'
+]
+_MAJOR_NEWS_RE = re.compile("|".join(re.escape(k) for k in MAJOR_NEWS_KEYWORDS))
+
+# Threshold for check_price_movements
+PRICE_MOVEMENT_THRESHOLD = 5.0
+
 
 class TriggerType(Enum):
     """Types of learning triggers"""
@@ -49,10 +63,23 @@ class TriggerStatus(Enum):
 
 @dataclass
 class TriggerCondition:
-    """Condition for triggering learning"""
+    """
+    Condition for triggering learning.
+    
+    ``depends_on`` lists the context keys the evaluator reads; the manager
+    only evaluates the condition for contexts containing one of them
+    (None means evaluate on every context). ``tickers`` restricts the
+    condition to contexts whose ``ticker`` is listed. ``batch_evaluator``
+    is an optional vectorized form taking a dict of NumPy columns (keyed
+    like the context) and returning a boolean mask; with ``depends_on``
+    None, a column no ticker in the batch carries reads as all NaN.
+    """
     condition_type: str
     parameters: Dict[str, Any]
     evaluator: Optional[Callable] = None
+    depends_on: Optional[List[str]] = None
+    tickers: Optional[List[str]] = None
+    batch_evaluator: Optional[Callable] = None
     
     def evaluate(self, context: Dict[str, Any]) -> bool:
         """
@@ -130,6 +157,39 @@ class Trigger:
         }
 
 
+@dataclass
+class TriggerEvalStats:
+    """Condition evaluation latency counters for one trigger"""
+    evaluations: int = 0
+    fired: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    
+    def record(self, seconds: float, evaluations: int = 1, fired: int = 0):
+        """Record one (possibly batched) evaluation call"""
+        self.evaluations += evaluations
+        self.fired += fired
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+    
+    @property
+    def avg_seconds(self) -> float:
+        """Average seconds per evaluated context"""
+        return self.total_seconds / self.evaluations if self.evaluations else 0.0
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "evaluations": self.evaluations,
+            "fired": self.fired,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "avg_seconds": self.avg_seconds,
+            "max_seconds": self.max_seconds
+        }
+
+
 @dataclass
 class TriggerExecution:
     """Record of a trigger execution"""
@@ -156,6 +216,17 @@ class TriggerExecution:
         }
 
 
+class _NaNColumns(dict):
+    """Batch columns where a key absent from the batch reads as an all-NaN column."""
+    
+    def __init__(self, columns: Dict[str, np.ndarray], length: int):
+        super().__init__(columns)
+        self.length = length
+    
+    def __missing__(self, key):
+        return np.full(self.length, np.nan)
+
+
 class EventTriggerManager:
     """
     Manages event-driven learning triggers.
@@ -166,6 +237,9 @@ class EventTriggerManager:
     - Execute triggered learning
     - Priority-based execution
     - Cooldown management
+    - Trigger index by context key and ticker (only affected triggers are evaluated)
+    - Vectorized evaluation over batches of ticker updates
+    - Per-trigger evaluation latency counters
     """
     
     def __init__(self):
@@ -174,6 +248,14 @@ class EventTriggerManager:
         self.execution_history: List[TriggerExecution] = []
         self.running = False
         self._check_interval = 300  # 5 minutes
+        
+        # Trigger index: context key -> trigger ids, plus triggers with no declared keys
+        self._key_index: Dict[str, Set[str]] = defaultdict(set)
+        self._unkeyed: Set[str] = set()
+        # Registration order, so indexed lookups keep the original evaluation order
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self.eval_stats: Dict[str, TriggerEvalStats] = {}
         logger.info("EventTriggerManager initialized")
         
         # Register default triggers
@@ -214,7 +296,11 @@ class EventTriggerManager:
             cooldown_seconds=cooldown_seconds
         )
         
+        if trigger_id in self.triggers:
+            self._unindex_trigger(trigger_id)
         self.triggers[trigger_id] = trigger
+        self._index_trigger(trigger)
+        self.eval_stats[trigger_id] = TriggerEvalStats()
         logger.info(f"Registered trigger: {name} ({trigger_id})")
         
         return trigger
@@ -230,7 +316,9 @@ class EventTriggerManager:
             True if removed
         """
         if trigger_id in self.triggers:
+            self._unindex_trigger(trigger_id)
             del self.triggers[trigger_id]
+            self.eval_stats.pop(trigger_id, None)
             logger.info(f"Unregistered trigger: {trigger_id}")
             return True
         return False
@@ -253,7 +341,11 @@ class EventTriggerManager:
     
     async def check_triggers(self, context: Dict[str, Any]) -> List[Trigger]:
         """
-        Check all triggers and return those that should fire.
+        Check affected triggers and return those that should fire.
+        
+        Only triggers that depend on a key present in the context (or that
+        declare no dependencies) and that match the context's ticker are
+        evaluated.
         
         Args:
             context: Context data for evaluation
@@ -262,23 +354,109 @@ class EventTriggerManager:
             List of triggers that should fire
         """
         triggered = []
+        ticker = context.get('ticker')
         
-        for trigger in self.triggers.values():
+        for trigger in self._affected_triggers(context.keys()):
             if not trigger.can_trigger():
                 continue
+            tickers = trigger.condition.tickers
+            if tickers is not None and ticker not in tickers:
+                continue
             
-            try:
-                if trigger.condition.evaluate(context):
-                    triggered.append(trigger)
-                    logger.info(f"Trigger fired: {trigger.name}")
-            except Exception as e:
-                logger.error(f"Error evaluating trigger {trigger.name}: {e}")
+            if self._evaluate(trigger, context):
+                triggered.append(trigger)
+                logger.info(f"Trigger fired: {trigger.name}")
         
         # Sort by priority
         triggered.sort(key=lambda t: t.priority.value, reverse=True)
         
         return triggered
     
+    def check_triggers_batch(
+        self,
+        ticker_contexts: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Trigger]]:
+        """
+        Evaluate triggers over a batch of per-ticker updates at once.
+        
+        Conditions with a ``batch_evaluator`` (e.g. price spikes) are
+        evaluated vectorized over all tickers; other affected conditions
+        fall back to per-ticker evaluation. As in check_triggers, a ticker
+        whose update has none of a condition's ``depends_on`` keys does not
+        trigger it.
+        
+        Args:
+            ticker_contexts: Dict of ticker -> context (e.g. {"price_change_percent": 6.2})
+        
+        Returns:
+            Dict of ticker -> triggers that should fire, by priority
+        """
+        tickers = list(ticker_contexts)
+        fired: Dict[str, List[Trigger]] = defaultdict(list)
+        if not tickers:
+            return {}
+        
+        keys = set()
+        for ctx in ticker_contexts.values():
+            keys.update(ctx.keys())
+        columns = {
+            key: np.array([ticker_contexts[t].get(key, np.nan) for t in tickers], dtype=float)
+            for key in keys
+            if all(isinstance(ctx.get(key, 0.0), (int, float)) for ctx in ticker_contexts.values())
+        }
+        ticker_array = np.array(tickers, dtype=object)
+        
+        for trigger in self._affected_triggers(keys):
+            if not trigger.can_trigger():
+                continue
+            condition = trigger.condition
+            allowed = (
+                np.isin(ticker_array, condition.tickers)
+                if condition.tickers is not None else np.ones(len(tickers), dtype=bool)
+            )
+            if condition.depends_on is not None:
+                # A ticker whose update lacks every dependency key is not triggered
+                allowed &= np.array([
+                    any(key in ticker_contexts[t] for key in condition.depends_on) for t in tickers
+                ], dtype=bool)
+            
+            if condition.batch_evaluator and all(k in columns for k in condition.depends_on or ()):
+                stats = self.eval_stats[trigger.id]
+                start = time.perf_counter()
+                # Without declared dependencies the evaluator reads whatever is available
+                batch_columns = columns if condition.depends_on is not None else _NaNColumns(columns, len(tickers))
+                try:
+                    mask = np.asarray(condition.batch_evaluator(batch_columns, condition.parameters), dtype=bool)
+                    mask &= allowed
+                except Exception as e:
+                    stats.errors += 1
+                    logger.error(f"Error evaluating trigger {trigger.name}: {e}")
+                    continue
+                stats.record(time.perf_counter() - start, evaluations=len(tickers), fired=int(mask.sum()))
+                hits = ticker_array[mask]
+            else:
+                hits = [
+                    t for t, ok in zip(tickers, allowed)
+                    if ok and self._evaluate(trigger, {"ticker": t, **ticker_contexts[t]})
+                ]
+            
+            for ticker in hits:
+                fired[ticker].append(trigger)
+        
+        for ticker_triggers in fired.values():
+            ticker_triggers.sort(key=lambda t: t.priority.value, reverse=True)
+        
+        return dict(fired)
+    
+    def get_evaluation_stats(self) -> Dict[str, Dict]:
+        """
+        Get per-trigger condition evaluation latency counters.
+        
+        Returns:
+            Dict of trigger_id -> counters (evaluations, fired, errors, seconds)
+        """
+        return {trigger_id: stats.to_dict() for trigger_id, stats in self.eval_stats.items()}
+    
     async def execute_trigger(
         self,
         trigger: Trigger,
@@ -376,21 +554,26 @@ class EventTriggerManager:
         Returns:
             List of price movement events
         """
-        events = []
+        if not ticker_data:
+            return []
         
-        for ticker, data in ticker_data.items():
-            change_percent = abs(data.get('change_percent', 0))
-            
-            if change_percent >= 5.0:
-                events.append({
-                    "ticker": ticker,
-                    "event_type": "price_spike",
-                    "change_percent": change_percent,
-                    "price": data.get('price'),
-                    "prev_price": data.get('prev_price'),
-                    "direction": "up" if data.get('change_percent', 0) > 0 else "down"
-                })
-                logger.info(f"Price movement detected: {ticker} {change_percent:+.2f}%")
+        tickers = list(ticker_data)
+        changes = np.array([ticker_data[t].get('change_percent', 0) for t in tickers], dtype=float)
+        abs_changes = np.abs(changes)
+        
+        events = []
+        for i in np.flatnonzero(abs_changes >= PRICE_MOVEMENT_THRESHOLD):
+            ticker = tickers[i]
+            data = ticker_data[ticker]
+            events.append({
+                "ticker": ticker,
+                "event_type": "price_spike",
+                "change_percent": float(abs_changes[i]),
+                "price": data.get('price'),
+                "prev_price": data.get('prev_price'),
+                "direction": "up" if changes[i] > 0 else "down"
+            })
+            logger.info(f"Price movement detected: {ticker} {abs_changes[i]:+.2f}%")
         
         return events
     
@@ -436,16 +619,10 @@ class EventTriggerManager:
         """
         events = []
         
-        # Keywords that indicate major news
-        major_keywords = [
-            'earnings', 'acquisition', 'merger', 'fda approval', 'bankruptcy',
-            'lawsuit', 'ceo', 'guidance', 'recall', 'investigation'
-        ]
-        
         for item in news_items:
             headline = item.get('headline', '').lower()
             
-            if any(keyword in headline for keyword in major_keywords):
+            if _MAJOR_NEWS_RE.search(headline):
                 events.append({
                     "ticker": item.get('ticker'),
                     "event_type": "major_news",
@@ -557,11 +734,54 @@ class EventTriggerManager:
             "total_executions": total_executions,
             "executions_by_status": dict(status_counts),
             "triggers_by_type": dict(type_counts),
-            "last_execution": self.execution_history[-1].triggered_at.isoformat() if self.execution_history else None
+            "last_execution": self.execution_history[-1].triggered_at.isoformat() if self.execution_history else None,
+            "evaluation_seconds_total": sum(s.total_seconds for s in self.eval_stats.values())
         }
     
     # Private methods
     
+    def _index_trigger(self, trigger: Trigger):
+        """Add a trigger to the context-key index"""
+        if trigger.id not in self._order:
+            self._order[trigger.id] = self._next_order
+            self._next_order += 1
+        
+        if trigger.condition.depends_on is None:
+            self._unkeyed.add(trigger.id)
+        else:
+            for key in trigger.condition.depends_on:
+                self._key_index[key].add(trigger.id)
+    
+    def _unindex_trigger(self, trigger_id: str):
+        """Remove a trigger from the context-key index"""
+        self._unkeyed.discard(trigger_id)
+        for key in self.triggers[trigger_id].condition.depends_on or ():
+            ids = self._key_index.get(key)
+            if ids is not None:
+                ids.discard(trigger_id)
+                if not ids:
+                    del self._key_index[key]
+    
+    def _affected_triggers(self, keys) -> List[Trigger]:
+        """Triggers that depend on any of the given context keys, in registration order"""
+        ids = set(self._unkeyed)
+        for key in keys:
+            ids.update(self._key_index.get(key, ()))
+        return [self.triggers[i] for i in sorted(ids, key=self._order.__getitem__)]
+    
+    def _evaluate(self, trigger: Trigger, context: Dict[str, Any]) -> bool:
+        """Evaluate one trigger's condition, recording latency"""
+        stats = self.eval_stats[trigger.id]
+        start = time.perf_counter()
+        try:
+            result = bool(trigger.condition.evaluate(context))
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Error evaluating trigger {trigger.name}: {e}")
+            result = False
+        stats.record(time.perf_counter() - start, fired=int(result))
+        return result
+    
     def _register_default_triggers(self):
         """Register default triggers"""
         # These are template triggers - actual implementations would be added by the system
@@ -600,6 +820,9 @@ def create_price_spike_trigger(
         price_change = abs(context.get('price_change_percent', 0))
         return price_change >= params['threshold']
     
+    def batch_evaluator(columns: Dict[str, np.ndarray], params: Dict) -> np.ndarray:
+        return np.abs(np.nan_to_num(columns['price_change_percent'])) >= params['threshold']
+    
     return {
         "id": f"price_spike_{threshold_percent}",
         "name": f"Price Spike ≥{threshold_percent}%",
@@ -608,7 +831,9 @@ def create_price_spike_trigger(
         "condition": TriggerCondition(
             condition_type="price_change",
             parameters={"threshold": threshold_percent},
-            evaluator=condition_evaluator
+            evaluator=condition_evaluator,
+            depends_on=["price_change_percent"],
+            batch_evaluator=batch_evaluator
         ),
         "action": LearningAction(
             action_type="research_cause",
@@ -645,7 +870,8 @@ def create_earnings_trigger(
         "condition": TriggerCondition(
             condition_type="earnings_proximity",
             parameters={"days_before": days_before},
-            evaluator=condition_evaluator
+            evaluator=condition_evaluator,
+            depends_on=["days_until_earnings"]
         ),
         "action": LearningAction(
             action_type="research_earnings",
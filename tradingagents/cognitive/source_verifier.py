@@ -126,6 +126,7 @@ class SourceVerifier:
     def __init__(self):
         """Initialize source verifier"""
         self.verification_cache: Dict[str, VerificationResult] = {}
+        self._domain_scores: Dict[str, Tuple[float, SourceTier]] = {}  # domain -> (score, tier)
         logger.info("SourceVerifier initialized")
     
     def verify_source(
@@ -157,7 +158,7 @@ class SourceVerifier:
         domain = self._extract_domain(url)
         
         # Calculate credibility score
-        credibility_score, tier = self._calculate_credibility_score(domain, url)
+        credibility_score, tier = self._domain_credibility(domain, url)
         
         # Detect bias
         bias_level, bias_score = self._detect_bias(content) if content else (BiasLevel.NEUTRAL, 0.0)
@@ -200,7 +201,7 @@ class SourceVerifier:
             Credibility score (0-1)
         """
         domain = self._extract_domain(url)
-        score, _ = self._calculate_credibility_score(domain, url)
+        score, _ = self._domain_credibility(domain, url)
         return score
     
     def extract_publish_date(self, content: str) -> Optional[datetime]:
@@ -316,6 +317,14 @@ class SourceVerifier:
             logger.warning(f"Failed to parse URL {url}: {e}")
             return "unknown"
     
+    def _domain_credibility(self, domain: str, url: str) -> Tuple[float, SourceTier]:
+        """Credibility score and tier for a domain, memoized (scores depend only on the domain)"""
+        cached = self._domain_scores.get(domain)
+        if cached is None:
+            cached = self._calculate_credibility_score(domain, url)
+            self._domain_scores[domain] = cached
+        return cached
+    
     def _calculate_credibility_score(self, domain: str, url: str) -> Tuple[float, SourceTier]:
         """Calculate credibility score and tier for domain"""
         # Check exact domain matches
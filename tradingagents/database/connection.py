@@ -61,8 +61,8 @@ def get_db_credentials() -> Dict[str, Any]:
     return credentials
 
 
-class MonitoredConnectionPool(psycopg2.pool.SimpleConnectionPool):
-    """Connection pool with monitoring and statistics"""
+class MonitoredConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """Connection pool with monitoring and statistics (safe to share across threads)"""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -4,14 +4,65 @@
 """
 Price cache database operations.
 Provides caching for stock price data to reduce API calls and improve performance.
+
+The cache is range-aware: a read returns the fresh cached rows of a window
+together with the trading-day segments that are missing or stale, so callers
+fetch only those segments and merge them (see
+dataflows.interface.get_stock_data_frame).
 """
 import logging
+import math
+import threading
+import time
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from decimal import Decimal
 
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from tradingagents.market.calendar import trading_day_segments, trading_days
+
 logger = logging.getLogger(__name__)
 
+# Columns of the price frames returned by get_price_range (yfinance layout)
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+_PRICE_UPSERT = """
+INSERT INTO price_cache (
+    ticker_id, price_date,
+    open_price, high_price, low_price, close_price, adj_close_price,
+    volume, data_source, is_realtime
+) VALUES %s
+ON CONFLICT (ticker_id, price_date)
+DO UPDATE SET
+    open_price = EXCLUDED.open_price,
+    high_price = EXCLUDED.high_price,
+    low_price = EXCLUDED.low_price,
+    close_price = EXCLUDED.close_price,
+    adj_close_price = EXCLUDED.adj_close_price,
+    volume = EXCLUDED.volume,
+    data_source = EXCLUDED.data_source,
+    fetched_at = CURRENT_TIMESTAMP,
+    is_realtime = EXCLUDED.is_realtime
+"""
+
+# Seconds a day without vendor data is left out of the missing segments
+NO_DATA_TTL = 6 * 3600
+
+# Past trading days a vendor returned no data for (halts, pre-IPO dates,
+# unscheduled closures): symbol -> {day: monotonic expiry}
+_no_data_days: Dict[str, Dict[date, float]] = {}
+_no_data_lock = threading.Lock()
+
+
+def _number(value):
+    """Decimal/float/NaN -> float or None."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
 
 class PriceCacheOperations:
     """Database operations for price caching."""
@@ -41,8 +92,56 @@ class PriceCacheOperations:
 
         Returns:
             List of price dictionaries, or None if cache miss
-            Returns None if ANY date in range is missing from cache or if data is stale
+            Returns None if ANY trading day in range is missing from cache or stale
         """
+        frame, missing = self.get_price_range(ticker_symbol, start_date, end_date)
+        if missing or frame.empty:
+            return None
+
+        prices = []
+        for timestamp, row in frame.iterrows():
+            volume = _number(row["Volume"])
+            prices.append({
+                'symbol': ticker_symbol,
+                'date': timestamp.date(),
+                'open': _number(row["Open"]),
+                'high': _number(row["High"]),
+                'low': _number(row["Low"]),
+                'close': _number(row["Close"]),
+                'adj_close': _number(row["Adj Close"]),
+                'volume': int(volume) if volume is not None else None,
+                'source': frame.attrs["sources"].get(timestamp),
+                'cached_at': frame.attrs["fetched_at"].get(timestamp),
+            })
+        return prices
+
+    def get_price_range(
+        self,
+        ticker_symbol: str,
+        start_date: date,
+        end_date: date,
+        today: Optional[date] = None
+    ) -> Tuple[pd.DataFrame, List[Tuple[date, date]]]:
+        """
+        Fresh cached prices for a window plus the segments that need fetching.
+
+        Expected rows come from the trading calendar (weekends and exchange
+        holidays are never reported missing; nor are future days). Stale rows
+        are left out of the frame and reported as missing.
+
+        Args:
+            ticker_symbol: Stock ticker symbol
+            start_date: First day of the window
+            end_date: Last day of the window (inclusive)
+            today: Reference day (defaults to date.today())
+
+        Returns:
+            Tuple of (frame indexed by Date with PRICE_COLUMNS, list of
+            inclusive (start, end) segments that are missing or stale)
+        """
+        today = today or date.today()
+        expected = trading_days(start_date, min(end_date, today))
+
         query = """
         SELECT
             t.symbol,
@@ -68,43 +167,62 @@ class PriceCacheOperations:
             with self.db.get_cursor() as cursor:
                 cursor.execute(query, (ticker_symbol, start_date, end_date))
                 rows = cursor.fetchall()
-
-            if not rows:
-                logger.debug(f"Cache miss: No data for {ticker_symbol} {start_date} to {end_date}")
-                return None
-
-            # Check if we have ALL dates in range (no gaps)
-            # For simplicity, we'll accept what we have - gaps might be weekends/holidays
-            # A more robust implementation would use a trading calendar
-
-            # Check if cache is stale
-            for row in rows:
-                if self._is_stale(row):
-                    logger.debug(f"Cache stale: Data from {row[9]} is too old")
-                    return None
-
-            # Convert to dict format
-            prices = []
-            for row in rows:
-                prices.append({
-                    'symbol': row[0],
-                    'date': row[1],
-                    'open': float(row[2]) if row[2] else None,
-                    'high': float(row[3]) if row[3] else None,
-                    'low': float(row[4]) if row[4] else None,
-                    'close': float(row[5]) if row[5] else None,
-                    'adj_close': float(row[6]) if row[6] else None,
-                    'volume': int(row[7]) if row[7] else None,
-                    'source': row[8],
-                    'cached_at': row[9]
-                })
-
-            logger.info(f"✓ Cache hit: Retrieved {len(prices)} prices for {ticker_symbol}")
-            return prices
-
         except Exception as e:
             logger.error(f"Error retrieving cached prices: {e}")
-            return None
+            rows = []
+
+        fresh = [row for row in rows if not self._is_stale(row, today)]
+        have = {row[1] for row in fresh}
+        now = time.monotonic()
+        with _no_data_lock:
+            entries = _no_data_days.get(ticker_symbol.upper(), {})
+            known_empty = {day for day, expires in entries.items() if expires > now}
+            missing_days = [d for d in expected if d not in have and d not in known_empty]
+        missing = trading_day_segments(missing_days, expected)
+
+        frame = self._rows_to_frame(fresh)
+        if missing:
+            logger.debug(
+                f"Cache partial for {ticker_symbol}: {len(fresh)} fresh rows, "
+                f"{len(missing_days)} trading days missing in {len(missing)} segment(s)"
+            )
+        else:
+            logger.debug(f"Cache hit: {len(fresh)} prices for {ticker_symbol} {start_date} to {end_date}")
+        return frame, missing
+
+    @staticmethod
+    def _rows_to_frame(rows: List[Tuple]) -> pd.DataFrame:
+        frame = pd.DataFrame(
+            [[_number(v) for v in row[2:8]] for row in rows],
+            columns=PRICE_COLUMNS,
+            index=pd.DatetimeIndex([pd.Timestamp(row[1]) for row in rows], name="Date"),
+            dtype="float64",
+        )
+        frame.attrs["sources"] = {pd.Timestamp(row[1]): row[8] for row in rows}
+        frame.attrs["fetched_at"] = {pd.Timestamp(row[1]): row[9] for row in rows}
+        return frame
+
+    @staticmethod
+    def record_no_data(
+        ticker_symbol: str,
+        days: Iterable[date],
+        today: Optional[date] = None,
+        ttl: float = NO_DATA_TTL
+    ):
+        """
+        Remember past trading days a vendor had no data for, so they are not
+        re-requested on every read for the next ``ttl`` seconds.
+        """
+        today = today or date.today()
+        days = {d for d in days if d < today}
+        if days:
+            now = time.monotonic()
+            expires = now + ttl
+            with _no_data_lock:
+                entries = _no_data_days.setdefault(ticker_symbol.upper(), {})
+                for day in [day for day, until in entries.items() if until <= now]:
+                    del entries[day]
+                entries.update(dict.fromkeys(days, expires))
 
     def store_prices(
         self,
@@ -120,13 +238,72 @@ class PriceCacheOperations:
             ticker_symbol: Stock ticker symbol
             prices: List of price dicts with keys: date, open, high, low, close, volume
             data_source: Vendor name ('yfinance', 'alpha_vantage', etc.)
-            is_realtime: True if fetched during market hours
+            is_realtime: True if fetched during market hours (applies to
+                rows for today; earlier sessions are final)
+
+        Returns:
+            Number of prices stored
+        """
+        today = date.today()
+        rows = [
+            (
+                price.get('date'),
+                price.get('open'),
+                price.get('high'),
+                price.get('low'),
+                price.get('close'),
+                price.get('adj_close'),
+                price.get('volume'),
+                is_realtime and price.get('date') is not None and price['date'] >= today,
+            )
+            for price in prices
+        ]
+        return self._upsert_rows(ticker_symbol, rows, data_source)
+
+    def store_price_frame(
+        self,
+        ticker_symbol: str,
+        frame: pd.DataFrame,
+        data_source: str,
+        today: Optional[date] = None
+    ) -> int:
+        """
+        Store a price frame (indexed by Date, PRICE_COLUMNS) in one upsert.
+
+        Rows for today (or later) are marked realtime so they expire quickly.
 
         Returns:
             Number of prices stored
         """
+        if frame is None or frame.empty:
+            return 0
+        today = today or date.today()
+        columns = frame.reindex(columns=PRICE_COLUMNS)
+        rows = []
+        for timestamp, values in zip(columns.index, columns.itertuples(index=False)):
+            day = pd.Timestamp(timestamp).date()
+            volume = _number(values[5])
+            rows.append((
+                day,
+                _number(values[0]),
+                _number(values[1]),
+                _number(values[2]),
+                _number(values[3]),
+                _number(values[4]),
+                int(volume) if volume is not None else None,
+                day >= today,
+            ))
+        return self._upsert_rows(ticker_symbol, rows, data_source)
+
+    def _upsert_rows(self, ticker_symbol: str, rows: List[Tuple], data_source: str) -> int:
+        """Upsert (date, open, high, low, close, adj_close, volume, is_realtime) rows in one statement."""
         from tradingagents.database.ticker_ops import TickerOperations
 
+        # One row per date: a single upsert cannot touch the same row twice
+        by_date = {row[0]: row for row in rows if row[0] is not None}
+        if not by_date:
+            return 0
+
         try:
             # Get ticker_id
             ticker_ops = TickerOperations(self.db)
@@ -142,51 +319,15 @@ class PriceCacheOperations:
                     industry="Unknown"
                 )
 
-            insert_query = """
-            INSERT INTO price_cache (
-                ticker_id, price_date,
-                open_price, high_price, low_price, close_price, adj_close_price,
-                volume, data_source, is_realtime
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-            )
-            ON CONFLICT (ticker_id, price_date)
-            DO UPDATE SET
-                open_price = EXCLUDED.open_price,
-                high_price = EXCLUDED.high_price,
-                low_price = EXCLUDED.low_price,
-                close_price = EXCLUDED.close_price,
-                adj_close_price = EXCLUDED.adj_close_price,
-                volume = EXCLUDED.volume,
-                data_source = EXCLUDED.data_source,
-                fetched_at = CURRENT_TIMESTAMP,
-                is_realtime = EXCLUDED.is_realtime
-            """
-
+            values = [
+                (ticker_id, day, o, h, l, c, adj, vol, data_source, realtime)
+                for day, o, h, l, c, adj, vol, realtime in by_date.values()
+            ]
             with self.db.get_cursor() as cursor:
-                count = 0
-
-                for price in prices:
-                    try:
-                        cursor.execute(insert_query, (
-                            ticker_id,
-                            price.get('date'),
-                            price.get('open'),
-                            price.get('high'),
-                            price.get('low'),
-                            price.get('close'),
-                            price.get('adj_close'),
-                            price.get('volume'),
-                            data_source,
-                            is_realtime
-                        ))
-                        count += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to store price for {price.get('date')}: {e}")
-                        continue
-
-            logger.info(f"✓ Stored {count} prices for {ticker_symbol} from {data_source}")
-            return count
+                execute_values(cursor, _PRICE_UPSERT, values, page_size=1000)
+
+            logger.info(f"✓ Stored {len(values)} prices for {ticker_symbol} from {data_source}")
+            return len(values)
 
         except Exception as e:
             logger.error(f"Error storing prices: {e}")
@@ -291,12 +432,13 @@ class PriceCacheOperations:
             logger.error(f"Error during cache cleanup: {e}")
             return {'realtime_deleted': 0, 'eod_deleted': 0, 'total_deleted': 0}
 
-    def _is_stale(self, row: Tuple) -> bool:
+    def _is_stale(self, row: Tuple, today: Optional[date] = None) -> bool:
         """
         Check if cached data is stale based on age and type.
 
         Args:
-            row: Database row tuple from get_cached_prices query
+            row: Database row tuple from get_price_range query
+            today: Reference day (defaults to date.today())
 
         Returns:
             True if data is stale and should not be used
@@ -312,7 +454,7 @@ class PriceCacheOperations:
             return True
 
         # Recent EOD data (within last 7 days) expires in 24 hours
-        if not is_realtime and price_date >= date.today() - timedelta(days=7):
+        if not is_realtime and price_date >= (today or date.today()) - timedelta(days=7):
             if age > timedelta(hours=self.EOD_CACHE_HOURS):
                 return True
 
@@ -13,11 +13,140 @@ from decimal import Decimal
 import logging
 import json
 import numpy as np
+from psycopg2.extras import execute_values
 
 from .connection import get_db_connection, DatabaseConnection
 
 logger = logging.getLogger(__name__)
 
+# Column order shared by the single-row and bulk daily_scans upserts
+_SCAN_COLUMNS = (
+    'ticker_id', 'scan_date', 'price', 'volume', 'priority_score', 'priority_rank',
+    'technical_signals', 'triggered_alerts', 'pe_ratio', 'forward_pe',
+    'news_sentiment_score', 'scan_duration_seconds',
+    'entry_price_min', 'entry_price_max', 'entry_price_reasoning',
+    'bb_upper', 'bb_lower', 'bb_middle',
+    'support_level', 'resistance_level',
+    'enterprise_value', 'enterprise_to_ebitda', 'market_cap',
+    'entry_timing', 'recommendation',
+    'target', 'stop_loss', 'gain_percent', 'risk_reward_ratio'
+)
+
+_SCAN_UPSERT = """
+    INSERT INTO daily_scans ({columns}) VALUES {values}
+    ON CONFLICT (ticker_id, scan_date) DO UPDATE
+    SET {updates}
+    RETURNING {returning}
+"""
+
+
+def _scan_upsert_sql(values: str, returning: str) -> str:
+    """Build the daily_scans upsert for a VALUES clause and RETURNING list."""
+    return _SCAN_UPSERT.format(
+        columns=", ".join(_SCAN_COLUMNS),
+        values=values,
+        updates=",\n        ".join(
+            f"{col} = EXCLUDED.{col}" for col in _SCAN_COLUMNS[2:]
+        ),
+        returning=returning
+    )
+
+
+# Same rows as the v_latest_closes view (migration 017), for databases without it
+_LATEST_CLOSES_SUBQUERY = """(
+    SELECT
+        t.ticker_id,
+        latest.price_date,
+        latest.close,
+        latest.volume,
+        prev.close AS prev_close,
+        CASE
+            WHEN prev.close > 0 THEN (latest.close - prev.close) / prev.close * 100
+        END AS change_pct
+    FROM tickers t
+    CROSS JOIN LATERAL (
+        SELECT dp.price_date, dp.close, dp.volume
+        FROM daily_prices dp
+        WHERE dp.ticker_id = t.ticker_id
+        ORDER BY dp.price_date DESC
+        LIMIT 1
+    ) latest
+    LEFT JOIN LATERAL (
+        SELECT dp.close
+        FROM daily_prices dp
+        WHERE dp.ticker_id = t.ticker_id
+            AND dp.price_date < latest.price_date
+        ORDER BY dp.price_date DESC
+        LIMIT 1
+    ) prev ON TRUE
+)"""
+
+
+def latest_closes_relation(db: DatabaseConnection) -> str:
+    """
+    Relation to join for latest/previous closes.
+
+    Returns ``v_latest_closes`` when migration 017 is applied, otherwise an
+    equivalent inline subquery, so enrichment queries work on older schemas.
+    """
+    query = """
+        SELECT EXISTS (
+            SELECT FROM information_schema.views
+            WHERE table_schema = 'public'
+            AND table_name = 'v_latest_closes'
+        )
+    """
+    try:
+        result = db.execute_query(query, fetch_one=True)
+        if result and result[0]:
+            return "v_latest_closes"
+    except Exception as e:
+        logger.warning(f"Could not check for v_latest_closes: {e}")
+    logger.info("v_latest_closes not found (migration 017), joining an inline subquery")
+    return _LATEST_CLOSES_SUBQUERY
+
+
+def _scan_row(ticker_id: int, scan_date: date, scan_data: Dict[str, Any]) -> tuple:
+    """Convert a scan result into a daily_scans row (numpy/Decimal-safe), in _SCAN_COLUMNS order."""
+    # Make technical signals JSON-serializable
+    technical_signals = json_serializable(scan_data.get('technical_signals', {}))
+
+    # Convert all numeric fields to ensure they're not numpy types
+    data = {
+        'ticker_id': ticker_id,
+        'scan_date': scan_date,
+        'price': json_serializable(scan_data.get('price')),
+        'volume': json_serializable(scan_data.get('volume')),
+        'priority_score': json_serializable(scan_data.get('priority_score')),
+        'priority_rank': json_serializable(scan_data.get('priority_rank')),
+        'technical_signals': json.dumps(technical_signals),
+        'triggered_alerts': scan_data.get('triggered_alerts', []),
+        'pe_ratio': json_serializable(scan_data.get('pe_ratio')),
+        'forward_pe': json_serializable(scan_data.get('forward_pe')),
+        'news_sentiment_score': json_serializable(scan_data.get('news_sentiment_score')),
+        'scan_duration_seconds': json_serializable(scan_data.get('scan_duration_seconds')),
+        # Entry price tracking fields
+        'entry_price_min': json_serializable(scan_data.get('entry_price_min')),
+        'entry_price_max': json_serializable(scan_data.get('entry_price_max')),
+        'entry_price_reasoning': scan_data.get('entry_price_reasoning'),  # String, no conversion needed
+        'bb_upper': json_serializable(scan_data.get('bb_upper')),
+        'bb_lower': json_serializable(scan_data.get('bb_lower')),
+        'bb_middle': json_serializable(scan_data.get('bb_middle')),
+        'support_level': json_serializable(scan_data.get('support_level')),
+        'resistance_level': json_serializable(scan_data.get('resistance_level')),
+        'enterprise_value': json_serializable(scan_data.get('enterprise_value')),
+        'enterprise_to_ebitda': json_serializable(scan_data.get('enterprise_to_ebitda')),
+        'market_cap': json_serializable(scan_data.get('market_cap')),
+        'entry_timing': scan_data.get('entry_timing'),  # String, no conversion needed
+        'recommendation': scan_data.get('recommendation'),  # Store recommendation for sector analysis
+        # Trading metrics
+        'target': json_serializable(scan_data.get('target')),
+        'stop_loss': json_serializable(scan_data.get('stop_loss')),
+        'gain_percent': json_serializable(scan_data.get('gain_percent')),
+        'risk_reward_ratio': json_serializable(scan_data.get('risk_reward_ratio'))
+    }
+    return tuple(data[col] for col in _SCAN_COLUMNS)
+
 
 def json_serializable(obj):
     """Convert numpy/pandas/decimal types to JSON-serializable types."""
@@ -62,6 +191,8 @@ class ScanOperations:
             db: DatabaseConnection instance (creates one if not provided)
         """
         self.db = db or get_db_connection()
+        # Resolved on first use by latest_closes_relation()
+        self._latest_closes: Optional[str] = None
 
     def store_scan_result(
         self,
@@ -80,128 +211,93 @@ class ScanOperations:
         Returns:
             scan_id of the stored result
         """
-        # Make technical signals JSON-serializable
-        technical_signals = json_serializable(scan_data.get('technical_signals', {}))
-
-        # Convert all numeric fields to ensure they're not numpy types
-        data = {
-            'ticker_id': ticker_id,
-            'scan_date': scan_date,
-            'price': json_serializable(scan_data.get('price')),
-            'volume': json_serializable(scan_data.get('volume')),
-            'priority_score': json_serializable(scan_data.get('priority_score')),
-            'priority_rank': json_serializable(scan_data.get('priority_rank')),
-            'technical_signals': json.dumps(technical_signals),
-            'triggered_alerts': scan_data.get('triggered_alerts', []),
-            'pe_ratio': json_serializable(scan_data.get('pe_ratio')),
-            'forward_pe': json_serializable(scan_data.get('forward_pe')),
-            'news_sentiment_score': json_serializable(scan_data.get('news_sentiment_score')),
-            'scan_duration_seconds': json_serializable(scan_data.get('scan_duration_seconds')),
-            # Entry price tracking fields
-            'entry_price_min': json_serializable(scan_data.get('entry_price_min')),
-            'entry_price_max': json_serializable(scan_data.get('entry_price_max')),
-            'entry_price_reasoning': scan_data.get('entry_price_reasoning'),  # String, no conversion needed
-            'bb_upper': json_serializable(scan_data.get('bb_upper')),
-            'bb_lower': json_serializable(scan_data.get('bb_lower')),
-            'bb_middle': json_serializable(scan_data.get('bb_middle')),
-            'support_level': json_serializable(scan_data.get('support_level')),
-            'resistance_level': json_serializable(scan_data.get('resistance_level')),
-            'enterprise_value': json_serializable(scan_data.get('enterprise_value')),
-            'enterprise_to_ebitda': json_serializable(scan_data.get('enterprise_to_ebitda')),
-            'market_cap': json_serializable(scan_data.get('market_cap')),
-            'entry_timing': scan_data.get('entry_timing'),  # String, no conversion needed
-            'recommendation': scan_data.get('recommendation'),  # Store recommendation for sector analysis
-            # Trading metrics
-            'target': json_serializable(scan_data.get('target')),
-            'stop_loss': json_serializable(scan_data.get('stop_loss')),
-            'gain_percent': json_serializable(scan_data.get('gain_percent')),
-            'risk_reward_ratio': json_serializable(scan_data.get('risk_reward_ratio'))
-        }
+        row = _scan_row(ticker_id, scan_date, scan_data)
 
         # Use upsert to handle re-running scans on same day
-        query = """
-            INSERT INTO daily_scans (
-                ticker_id, scan_date, price, volume, priority_score, priority_rank,
-                technical_signals, triggered_alerts, pe_ratio, forward_pe,
-                news_sentiment_score, scan_duration_seconds,
-                entry_price_min, entry_price_max, entry_price_reasoning,
-                bb_upper, bb_lower, bb_middle,
-                support_level, resistance_level,
-                enterprise_value, enterprise_to_ebitda, market_cap,
-                entry_timing, recommendation,
-                target, stop_loss, gain_percent, risk_reward_ratio
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (ticker_id, scan_date) DO UPDATE
-            SET price = EXCLUDED.price,
-                volume = EXCLUDED.volume,
-                priority_score = EXCLUDED.priority_score,
-                priority_rank = EXCLUDED.priority_rank,
-                technical_signals = EXCLUDED.technical_signals,
-                triggered_alerts = EXCLUDED.triggered_alerts,
-                pe_ratio = EXCLUDED.pe_ratio,
-                forward_pe = EXCLUDED.forward_pe,
-                news_sentiment_score = EXCLUDED.news_sentiment_score,
-                scan_duration_seconds = EXCLUDED.scan_duration_seconds,
-                entry_price_min = EXCLUDED.entry_price_min,
-                entry_price_max = EXCLUDED.entry_price_max,
-                entry_price_reasoning = EXCLUDED.entry_price_reasoning,
-                bb_upper = EXCLUDED.bb_upper,
-                bb_lower = EXCLUDED.bb_lower,
-                bb_middle = EXCLUDED.bb_middle,
-                support_level = EXCLUDED.support_level,
-                resistance_level = EXCLUDED.resistance_level,
-                enterprise_value = EXCLUDED.enterprise_value,
-                enterprise_to_ebitda = EXCLUDED.enterprise_to_ebitda,
-                market_cap = EXCLUDED.market_cap,
-                entry_timing = EXCLUDED.entry_timing,
-                recommendation = EXCLUDED.recommendation,
-                target = EXCLUDED.target,
-                stop_loss = EXCLUDED.stop_loss,
-                gain_percent = EXCLUDED.gain_percent,
-                risk_reward_ratio = EXCLUDED.risk_reward_ratio
-            RETURNING scan_id
-        """
-
-        result = self.db.execute_query(
-            query,
-            (
-                ticker_id,
-                scan_date,
-                data['price'],
-                data['volume'],
-                data['priority_score'],
-                data['priority_rank'],
-                data['technical_signals'],
-                data['triggered_alerts'],
-                data['pe_ratio'],
-                data['forward_pe'],
-                data['news_sentiment_score'],
-                data['scan_duration_seconds'],
-                data['entry_price_min'],
-                data['entry_price_max'],
-                data['entry_price_reasoning'],
-                data['bb_upper'],
-                data['bb_lower'],
-                data['bb_middle'],
-                data['support_level'],
-                data['resistance_level'],
-                data['enterprise_value'],
-                data['enterprise_to_ebitda'],
-                data['market_cap'],
-                data['entry_timing'],
-                data['recommendation'],
-                data['target'],
-                data['stop_loss'],
-                data['gain_percent'],
-                data['risk_reward_ratio']
-            ),
-            fetch_one=True
+        query = _scan_upsert_sql(
+            "(" + ", ".join(["%s"] * len(_SCAN_COLUMNS)) + ")",
+            "scan_id"
         )
 
+        result = self.db.execute_query(query, row, fetch_one=True)
+
         scan_id = result[0] if result else None
-        logger.info(f"Stored scan result {scan_id} for ticker_id {ticker_id} with entry price: {data.get('entry_price_min')}-{data.get('entry_price_max')}")
+        logger.info(f"Stored scan result {scan_id} for ticker_id {ticker_id} with entry price: {scan_data.get('entry_price_min')}-{scan_data.get('entry_price_max')}")
         return scan_id
 
+    def store_scan_results(
+        self,
+        scan_date: date,
+        results: List[Dict[str, Any]],
+        track_entry_prices: bool = True
+    ) -> Dict[int, int]:
+        """
+        Store many scan results with one multi-row upsert.
+
+        Entry price outcome rows for results with an entry range are written
+        in the same transaction, so a scan is stored all-or-nothing.
+
+        Args:
+            scan_date: Date of the scan
+            results: Scan result dicts (each with 'ticker_id')
+            track_entry_prices: Also create entry_price_outcomes rows
+
+        Returns:
+            Dict mapping ticker_id to scan_id
+        """
+        if not results:
+            return {}
+
+        # One row per ticker: a single upsert cannot touch the same row twice
+        by_ticker = {r['ticker_id']: r for r in results}
+        rows = [_scan_row(ticker_id, scan_date, r) for ticker_id, r in by_ticker.items()]
+
+        with self.db.get_cursor() as cursor:
+            returned = execute_values(
+                cursor,
+                _scan_upsert_sql("%s", "ticker_id, scan_id"),
+                rows,
+                page_size=1000,
+                fetch=True
+            )
+            scan_ids = {ticker_id: scan_id for ticker_id, scan_id in returned}
+
+            outcomes = []
+            if track_entry_prices:
+                for ticker_id, r in by_ticker.items():
+                    scan_id = scan_ids.get(ticker_id)
+                    if scan_id and r.get('entry_price_min') and r.get('entry_price_max'):
+                        outcomes.append((
+                            scan_id,
+                            ticker_id,
+                            scan_date,
+                            Decimal(str(r['entry_price_min'])),
+                            Decimal(str(r['entry_price_max'])),
+                            r.get('entry_timing')
+                        ))
+
+            if outcomes:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO entry_price_outcomes (
+                        scan_id, ticker_id, scan_date,
+                        entry_price_min, entry_price_max,
+                        recommended_timing, outcome_status
+                    ) VALUES %s
+                    ON CONFLICT (scan_id) DO NOTHING
+                    """,
+                    outcomes,
+                    template="(%s, %s, %s, %s, %s, %s, 'STILL_WAITING')",
+                    page_size=1000
+                )
+
+        logger.info(
+            f"Stored {len(scan_ids)} scan results for {scan_date} "
+            f"({len(outcomes)} entry price outcomes)"
+        )
+        return scan_ids
+
     def get_latest_scan(
         self,
         ticker_id: int = None,
@@ -290,13 +386,18 @@ class ScanOperations:
             filter_buy_only: If True, prioritize BUY recommendations
 
         Returns:
-            List of top-ranked scan results with ticker info, dividend yield, and entry price
+            List of top-ranked scan results with ticker info, dividend yield, entry price,
+            and latest_close/latest_volume/prev_close from daily_prices
         """
         if scan_date is None:
             scan_date = date.today()
 
+        if self._latest_closes is None:
+            self._latest_closes = latest_closes_relation(self.db)
+
         # Base query with dividend yield
         # Use NULL instead of 0 to distinguish "no data" from "0% yield"
+        # Latest/previous close come from v_latest_closes (migration 017) or its inline equivalent
         query = """
             SELECT
                 ds.*,
@@ -304,12 +405,16 @@ class ScanOperations:
                 t.company_name,
                 t.sector,
                 dyc.dividend_yield_pct,
-                dyc.annual_dividend
+                dyc.annual_dividend,
+                lc.close AS latest_close,
+                lc.volume AS latest_volume,
+                lc.prev_close
             FROM daily_scans ds
             JOIN tickers t ON ds.ticker_id = t.ticker_id
             LEFT JOIN dividend_yield_cache dyc ON t.ticker_id = dyc.ticker_id
+            LEFT JOIN {latest_closes} lc ON t.ticker_id = lc.ticker_id
             WHERE ds.scan_date = %s
-        """
+        """.format(latest_closes=self._latest_closes)
         
         params = [scan_date]
         
@@ -1,9 +1,13 @@
 # Copyright (c) 2024. All rights reserved.
 # Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
 
-from typing import Annotated, List, Dict
+from typing import Annotated, List, Dict, Tuple
+from datetime import date, datetime, timedelta
+import io
 import logging
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 # Import from vendor-specific modules
@@ -28,6 +32,7 @@ from .alpha_vantage_common import AlphaVantageRateLimitError
 
 # Configuration and routing logic
 from .config import get_config
+from .vendor_router import get_vendor_router
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -153,135 +158,89 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
-def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
-    category = get_category_for_method(method)
-    vendor_config = get_vendor(category, method)
-    config = get_config()
+# Methods whose failure is tolerated (a placeholder is returned instead)
+OPTIONAL_METHODS = [
+    'get_news', 'get_global_news', 'get_insider_sentiment', 'get_insider_transactions',
+    'get_fundamentals', 'get_balance_sheet', 'get_cashflow', 'get_income_statement'
+]
 
-    # Handle "skip" vendor - return placeholder immediately for optional methods
-    if vendor_config == "skip" or "skip" in vendor_config:
-        optional_methods = [
-            'get_news', 'get_global_news', 'get_insider_sentiment', 'get_insider_transactions',
-            'get_fundamentals', 'get_balance_sheet', 'get_cashflow', 'get_income_statement'
-        ]
-        if method in optional_methods:
-            print(f"INFO: Skipping '{method}' (vendor='skip' in config) - analysis will continue with available data")
-            return f"Skipped: '{method}' disabled in fast mode configuration."
-        else:
-            raise ValueError(f"Cannot skip critical method '{method}'")
 
-    # Handle comma-separated vendors
+def _vendor_fallback_order(method: str, vendor_config: str) -> Tuple[List[str], List[str]]:
+    """Configured primary vendors and the full fallback order for a method."""
     primary_vendors = [v.strip() for v in vendor_config.split(',')]
 
-    if method not in VENDOR_METHODS:
-        raise ValueError(f"Method '{method}' not supported")
-
     # Get all available vendors for this method for fallback
     all_available_vendors = list(VENDOR_METHODS[method].keys())
 
     # If using Ollama, exclude OpenAI from fallbacks to avoid API key errors
-    llm_provider = config.get("llm_provider", "").lower()
-    if llm_provider == "ollama":
-        # Remove OpenAI from fallback list when using Ollama
+    if get_config().get("llm_provider", "").lower() == "ollama":
         all_available_vendors = [v for v in all_available_vendors if v != "openai"]
-        logger.debug(f"Using Ollama - excluding OpenAI from fallbacks for {method}")
 
     # Create fallback vendor list: primary vendors first, then remaining vendors as fallbacks
     fallback_vendors = primary_vendors.copy()
     for vendor in all_available_vendors:
         if vendor not in fallback_vendors:
             fallback_vendors.append(vendor)
+    return primary_vendors, fallback_vendors
 
-    # Debug: Print fallback ordering
-    primary_str = " → ".join(primary_vendors)
-    fallback_str = " → ".join(fallback_vendors)
-    print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
 
-    # Track results and execution state
-    results = []
-    vendor_attempt_count = 0
-    any_primary_vendor_attempted = False
-    successful_vendor = None
+def route_to_vendor(method: str, *args, **kwargs):
+    """
+    Route method calls to appropriate vendor implementation with fallback support.
+
+    Vendors are tried through the VendorRouter: implementations with an open
+    circuit are skipped, fallbacks are ordered by observed health, vendors
+    with several implementations run them in parallel and, when
+    vendor_routing.hedge_delay is set, a slow primary is hedged with the next
+    vendor. Single-vendor configs stop at the first vendor with results;
+    comma-separated configs collect results from every vendor.
+    """
+    category = get_category_for_method(method)
+    vendor_config = get_vendor(category, method)
+    router = get_vendor_router()
 
-    for vendor in fallback_vendors:
-        if vendor not in VENDOR_METHODS[method]:
-            if vendor in primary_vendors:
-                print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
-            continue
+    # Handle "skip" vendor - return placeholder immediately for optional methods
+    if vendor_config == "skip" or "skip" in vendor_config:
+        if method in OPTIONAL_METHODS:
+            router.log_event("skipped", method, "skip")
+            return f"Skipped: '{method}' disabled in fast mode configuration."
+        else:
+            raise ValueError(f"Cannot skip critical method '{method}'")
 
-        vendor_impl = VENDOR_METHODS[method][vendor]
-        is_primary_vendor = vendor in primary_vendors
-        vendor_attempt_count += 1
+    if method not in VENDOR_METHODS:
+        raise ValueError(f"Method '{method}' not supported")
 
-        # Track if we attempted any primary vendor
-        if is_primary_vendor:
-            any_primary_vendor_attempted = True
+    primary_vendors, fallback_vendors = _vendor_fallback_order(method, vendor_config)
+    for vendor in primary_vendors:
+        if vendor not in VENDOR_METHODS[method]:
+            router.log_event("unsupported", method, vendor, level=logging.INFO)
 
-        # Debug: Print current attempt
-        vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
-        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
+    vendors = router.order(method, fallback_vendors, primary_vendors, VENDOR_METHODS[method])
+    router.log_event("routing", method, ",".join(primary_vendors), order=" > ".join(vendors))
 
-        # Handle list of methods for a vendor
-        if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
-        else:
-            vendor_methods = [(vendor_impl, vendor)]
-
-        # Run methods for this vendor
-        vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
-                continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
-                continue
-
-        # Add this vendor's results
-        if vendor_results:
+    results = []
+    if len(primary_vendors) == 1:
+        results, successful_vendor, vendor_attempt_count = router.first_success(
+            method, vendors, VENDOR_METHODS[method], args, kwargs
+        )
+    else:
+        # Multiple vendor configs (comma-separated) collect from all sources
+        vendor_attempt_count = len(vendors)
+        for vendor, vendor_results in router.run_all(method, vendors, VENDOR_METHODS[method], args, kwargs):
             results.extend(vendor_results)
-            successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
-            
-            # Stopping logic: Stop after first successful vendor for single-vendor configs
-            # Multiple vendor configs (comma-separated) may want to collect from multiple sources
-            if len(primary_vendors) == 1:
-                print(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
-                break
-        else:
-            print(f"FAILED: Vendor '{vendor}' produced no results")
 
     # Final result summary
     if not results:
-        print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        router.log_event("all_failed", method, ",".join(primary_vendors), level=logging.WARNING,
+                         attempts=vendor_attempt_count)
 
         # For news-related and fundamental methods, return a placeholder instead of failing
         # This allows analysis to continue with limited data
-        optional_methods = [
-            'get_news', 'get_global_news', 'get_insider_sentiment', 'get_insider_transactions',
-            'get_fundamentals', 'get_balance_sheet', 'get_cashflow', 'get_income_statement'
-        ]
-        if method in optional_methods:
-            print(f"INFO: Returning placeholder for optional method '{method}' - analysis will continue with limited data")
+        if method in OPTIONAL_METHODS:
             return f"Data unavailable for '{method}'. All vendors require API keys or local data files that are not configured. Analysis will proceed using available technical and price data."
 
         # For other critical methods, still raise an error
         raise RuntimeError(f"All vendor implementations failed for method '{method}'")
-    else:
-        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
 
     # Return single result if only one, otherwise concatenate as string
     if len(results) == 1:
@@ -320,68 +279,49 @@ def route_to_vendor_with_metadata(method: str, *args, **kwargs):
 
     # Handle "skip" vendor
     if vendor_config == "skip" or "skip" in vendor_config:
-        optional_methods = [
-            'get_news', 'get_global_news', 'get_insider_sentiment', 'get_insider_transactions',
-            'get_fundamentals', 'get_balance_sheet', 'get_cashflow', 'get_income_statement'
-        ]
-        if method in optional_methods:
+        if method in OPTIONAL_METHODS:
             metadata["vendor_used"] = "skip"
             return (f"Skipped: '{method}' disabled in fast mode configuration.", metadata)
 
+    implementations = VENDOR_METHODS.get(method, {})
     primary_vendors = [v.strip() for v in vendor_config.split(',')]
-    all_available_vendors = list(VENDOR_METHODS.get(method, {}).keys())
+    for vendor in primary_vendors:
+        if vendor not in implementations:
+            metadata["failed_vendors"].append({"vendor": vendor, "reason": "not supported for method"})
 
-    fallback_vendors = primary_vendors.copy()
-    for vendor in all_available_vendors:
-        if vendor not in fallback_vendors:
-            fallback_vendors.append(vendor)
+    fallback_vendors = primary_vendors + [v for v in implementations if v not in primary_vendors]
+    router = get_vendor_router()
+    vendors = router.order(method, fallback_vendors, primary_vendors, implementations)
+    for vendor in fallback_vendors:
+        if vendor in implementations and vendor not in vendors:
+            metadata["failed_vendors"].append({"vendor": vendor, "reason": "circuit_open"})
 
     # Try each vendor
-    for i, vendor in enumerate(fallback_vendors):
-        if vendor not in VENDOR_METHODS.get(method, {}):
-            if vendor in primary_vendors:
-                metadata["failed_vendors"].append({"vendor": vendor, "reason": "not supported for method"})
-            continue
-
-        vendor_impl = VENDOR_METHODS[method][vendor]
-        is_primary = vendor in primary_vendors
+    for vendor in vendors:
+        vendor_impl = implementations[vendor]
         metadata["attempts"] += 1
 
-        if not is_primary:
+        if vendor not in primary_vendors:
             metadata["fallback_occurred"] = True
 
         # Handle list of methods
-        vendor_methods = [(vendor_impl, vendor)] if not isinstance(vendor_impl, list) else [(impl, vendor) for impl in vendor_impl]
+        vendor_methods = vendor_impl if isinstance(vendor_impl, list) else [vendor_impl]
 
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                result = impl_func(*args, **kwargs)
-                metadata["vendor_used"] = vendor_name
+        for impl_func in vendor_methods:
+            ok, result = router.call(method, vendor, impl_func, args, kwargs)
+            if ok:
+                metadata["vendor_used"] = vendor
                 return (result, metadata)
 
-            except AlphaVantageRateLimitError as e:
-                metadata["failed_vendors"].append({
-                    "vendor": vendor_name,
-                    "reason": "rate_limit",
-                    "error": str(e)
-                })
-                continue
-
-            except Exception as e:
-                metadata["failed_vendors"].append({
-                    "vendor": vendor_name,
-                    "reason": "error",
-                    "error": str(e)
-                })
-                continue
+            if isinstance(result, AlphaVantageRateLimitError):
+                metadata["failed_vendors"].append({"vendor": vendor, "reason": "rate_limit", "error": str(result)})
+            elif result is None:
+                metadata["failed_vendors"].append({"vendor": vendor, "reason": "circuit_open"})
+            else:
+                metadata["failed_vendors"].append({"vendor": vendor, "reason": "error", "error": str(result)})
 
     # All vendors failed
-    optional_methods = [
-        'get_news', 'get_global_news', 'get_insider_sentiment', 'get_insider_transactions',
-        'get_fundamentals', 'get_balance_sheet', 'get_cashflow', 'get_income_statement'
-    ]
-
-    if method in optional_methods:
+    if method in OPTIONAL_METHODS:
         placeholder = f"Data unavailable for '{method}'. All vendors require API keys or local data files that are not configured."
         return (placeholder, metadata)
 
@@ -392,132 +332,148 @@ def route_to_vendor_with_cache(method: str, *args, **kwargs):
     """
     Route method calls with caching support for stock price data.
 
-    For get_stock_data:
-        1. Check cache first
-        2. If cache hit and not stale: return cached data
-        3. If cache miss: fetch from vendor and cache result
+    For get_stock_data the range-aware price cache is used (see
+    get_stock_data_frame): only missing or stale trading-day segments are
+    fetched from vendors. Other methods are routed directly.
 
     Returns:
         Same format as the original method (CSV string for get_stock_data, etc.)
     """
-    # Only cache stock price data
     if method == "get_stock_data" and len(args) >= 3:
-        ticker = args[0]
-        start_date = args[1]
-        end_date = args[2]
-
-        # Convert string dates to date objects if needed
-        from datetime import date as date_type
-        if isinstance(start_date, str):
-            from datetime import datetime
-            start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-        if isinstance(end_date, str):
-            from datetime import datetime
-            end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-
-        # Try cache first
-        try:
-            from tradingagents.database import get_db_connection
-            from tradingagents.database.price_cache_ops import PriceCacheOperations
+        ticker, start_date, end_date = args[:3]
+        frame = get_stock_data_frame(ticker, start_date, end_date)
+        if not frame.empty:
+            return _frame_to_csv(frame)
+        return f"No data found for symbol '{ticker}' between {start_date} and {end_date}"
 
-            db = get_db_connection()
-            cache_ops = PriceCacheOperations(db)
+    data, _ = route_to_vendor_with_metadata(method, *args, **kwargs)
+    return data
 
-            cached_prices = cache_ops.get_cached_prices(ticker, start_date, end_date)
 
-            if cached_prices:
-                logger.info(f"✓ Cache hit for {ticker} {start_date} to {end_date}")
-                # Convert to CSV format (same as yfinance)
-                return _prices_to_csv(cached_prices)
-        except Exception as e:
-            logger.warning(f"Cache lookup failed, fetching from vendor: {e}")
+def get_stock_data_frame(ticker: str, start_date, end_date, use_cache: bool = True) -> pd.DataFrame:
+    """
+    OHLCV prices for [start_date, end_date] as a DataFrame, served from the price cache.
+
+    The cache reports which trading-day segments are missing or stale; only
+    those segments are fetched from the vendors, stored with a single upsert
+    and merged with the cached rows.
 
-    # Cache miss or error - fetch from vendor
-    data, metadata = route_to_vendor_with_metadata(method, *args, **kwargs)
+    Args:
+        ticker: Stock ticker symbol
+        start_date: First day (date or YYYY-mm-dd)
+        end_date: Last day, inclusive (date or YYYY-mm-dd)
+        use_cache: Read and write the database cache (False fetches the whole window)
 
-    # Store in cache for future use (only for get_stock_data)
-    if method == "get_stock_data" and data and len(args) >= 3:
-        ticker = args[0]
-        start_date = args[1]
-        end_date = args[2]
+    Returns:
+        DataFrame indexed by Date with Open, High, Low, Close, Adj Close, Volume.
+        A segment no vendor could serve is left out (and logged).
+
+    Raises:
+        RuntimeError: A segment fetch failed and no rows are available at all
+    """
+    from tradingagents.database.price_cache_ops import PriceCacheOperations
 
-        # Convert string dates to date objects if needed
-        from datetime import date as date_type, datetime
-        if isinstance(start_date, str):
-            start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-        if isinstance(end_date, str):
-            end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+    start_date, end_date = _as_date(start_date), _as_date(end_date)
+    ticker = ticker.upper()
+    cache_ops = None
+    cached = _empty_price_frame()
+    missing = [(start_date, end_date)]
 
+    if use_cache:
         try:
             from tradingagents.database import get_db_connection
-            from tradingagents.database.price_cache_ops import PriceCacheOperations
-
-            db = get_db_connection()
-            cache_ops = PriceCacheOperations(db)
-
-            prices = _csv_to_prices(data)
-            is_realtime = end_date >= date_type.today()
+            cache_ops = PriceCacheOperations(get_db_connection())
+            cached, missing = cache_ops.get_price_range(ticker, start_date, end_date)
+        except Exception as e:
+            logger.warning(f"Cache lookup failed, fetching from vendor: {e}")
+            cache_ops = None
 
-            cache_ops.store_prices(
-                ticker_symbol=ticker,
-                prices=prices,
-                data_source=metadata.get('vendor_used', 'unknown'),
-                is_realtime=is_realtime
+    frames = [cached]
+    errors = []
+    for segment_start, segment_end in missing:
+        try:
+            data, metadata = route_to_vendor_with_metadata(
+                "get_stock_data", ticker,
+                segment_start.strftime("%Y-%m-%d"),
+                # Vendors treat the end date as exclusive
+                (segment_end + timedelta(days=1)).strftime("%Y-%m-%d"),
             )
-            logger.info(f"✓ Cached {len(prices)} prices for {ticker}")
         except Exception as e:
-            logger.warning(f"Failed to cache prices: {e}")
-
-    return data
-
-
-def _prices_to_csv(prices: List[Dict]) -> str:
-    """Convert price dicts to CSV string (yfinance format)."""
-    import io
-
-    output = io.StringIO()
-    output.write("Date,Open,High,Low,Close,Adj Close,Volume\n")
-
-    for price in prices:
-        date_str = price['date'].strftime('%Y-%m-%d') if hasattr(price['date'], 'strftime') else str(price['date'])
-        open_val = price.get('open', '') if price.get('open') is not None else ''
-        high_val = price.get('high', '') if price.get('high') is not None else ''
-        low_val = price.get('low', '') if price.get('low') is not None else ''
-        close_val = price.get('close', '') if price.get('close') is not None else ''
-        adj_close_val = price.get('adj_close', '') if price.get('adj_close') is not None else ''
-        volume_val = price.get('volume', '') if price.get('volume') is not None else ''
-
-        output.write(f"{date_str},{open_val},{high_val},{low_val},{close_val},{adj_close_val},{volume_val}\n")
-
-    return output.getvalue()
-
-
-def _csv_to_prices(csv_data: str) -> List[Dict]:
-    """Convert CSV string to price dicts."""
-    import csv
-    from io import StringIO
-    from datetime import datetime
-
-    prices = []
-    reader = csv.DictReader(StringIO(csv_data))
-
-    for row in reader:
-        # Parse date
-        date_val = row.get('Date', '')
-        if date_val:
-            try:
-                date_obj = datetime.strptime(date_val, '%Y-%m-%d').date()
-            except:
-                date_obj = date_val
-
-            prices.append({
-                'date': date_obj,
-                'open': float(row.get('Open')) if row.get('Open') and row['Open'] != '' else None,
-                'high': float(row.get('High')) if row.get('High') and row['High'] != '' else None,
-                'low': float(row.get('Low')) if row.get('Low') and row['Low'] != '' else None,
-                'close': float(row.get('Close')) if row.get('Close') and row['Close'] != '' else None,
-                'adj_close': float(row.get('Adj Close')) if row.get('Adj Close') and row['Adj Close'] != '' else None,
-                'volume': int(float(row.get('Volume'))) if row.get('Volume') and row['Volume'] != '' else None
-            })
-
-    return prices
\ No newline at end of file
+            # Serve the cached rows and other segments; retried on the next read
+            logger.warning(f"Could not fetch {ticker} {segment_start} to {segment_end}: {e}")
+            errors.append(e)
+            continue
+        fetched = _parse_price_frame(data)
+        fetched = fetched[(fetched.index >= pd.Timestamp(segment_start)) & (fetched.index <= pd.Timestamp(segment_end))]
+        logger.debug(f"Fetched {len(fetched)} rows for {ticker} {segment_start} to {segment_end} from {metadata.get('vendor_used')}")
+
+        if cache_ops is not None and not fetched.empty:
+            cache_ops.store_price_frame(ticker, fetched, metadata.get("vendor_used") or "unknown")
+            if metadata.get("vendor_used"):
+                # Days before or between the returned bars are gaps (pre-IPO
+                # dates, halts). An empty answer may be a rate limit or outage,
+                # and days after the last bar may not be published yet.
+                from tradingagents.market.calendar import trading_days
+                returned = {ts.date() for ts in fetched.index}
+                cache_ops.record_no_data(
+                    ticker, [d for d in trading_days(segment_start, max(returned)) if d not in returned]
+                )
+        frames.append(fetched)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        if errors:
+            raise errors[-1]
+        return _empty_price_frame()
+    merged = pd.concat(frames)
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    return merged
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def _empty_price_frame() -> pd.DataFrame:
+    from tradingagents.database.price_cache_ops import PRICE_COLUMNS
+    return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date"), dtype="float64")
+
+
+def _parse_price_frame(data) -> pd.DataFrame:
+    """Vendor get_stock_data output (CSV text with optional '#' header lines, or a frame) -> price frame."""
+    from tradingagents.database.price_cache_ops import PRICE_COLUMNS
+
+    if isinstance(data, pd.DataFrame):
+        frame = data.copy()
+    else:
+        text = str(data or "")
+        if "Date" not in text:
+            return _empty_price_frame()
+        try:
+            frame = pd.read_csv(io.StringIO(text), comment="#")
+        except Exception as e:
+            logger.warning(f"Could not parse vendor price data: {e}")
+            return _empty_price_frame()
+
+    if "Date" in frame.columns:
+        frame = frame.set_index("Date")
+    if frame.empty:
+        return _empty_price_frame()
+    # Dates may carry a time or timezone ("2024-01-02 00:00:00-05:00")
+    frame.index = pd.DatetimeIndex(pd.to_datetime(frame.index.astype(str).str[:10]), name="Date")
+    frame = frame.reindex(columns=PRICE_COLUMNS)
+    if frame["Adj Close"].isna().all():
+        frame["Adj Close"] = frame["Close"]
+    return frame.apply(pd.to_numeric, errors="coerce").dropna(subset=["Close"])
+
+
+def _frame_to_csv(frame: pd.DataFrame) -> str:
+    """Price frame -> CSV string (yfinance format)."""
+    out = frame.copy()
+    out.index = out.index.strftime("%Y-%m-%d")
+    out["Volume"] = out["Volume"].astype("Int64")
+    return out.to_csv(index_label="Date")
@@ -0,0 +1,330 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Latency- and health-aware vendor routing for route_to_vendor.
+
+Every vendor implementation call is timed and its outcome folded into
+exponentially weighted moving averages (latency and error rate), and into a
+CircuitBreaker that stops calling an implementation after repeated failures
+until its cooldown passes. The router uses this to:
+
+- skip implementations whose circuit is open
+- order fallback vendors by health (configured primaries keep their order)
+- run multi-implementation vendors (e.g. local news) in parallel
+- optionally hedge a slow primary with a delayed request to the next vendor
+
+Routing is logged through the module logger with structured fields (method,
+vendor, duration_ms, event); routine success events are sampled.
+"""
+
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from tradingagents.utils.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTING = {
+    "ewma_alpha": 0.3,           # Weight of the newest observation
+    "failure_threshold": 3,      # Consecutive failures that open a circuit
+    "cooldown_seconds": 60,      # Open circuits are retried after this long
+    "hedge_delay": None,         # Seconds before a slow primary is hedged (None disables)
+    "max_workers": 8,            # Threads for fan-out and hedged requests
+    "log_sample_rate": 0.1,      # Fraction of routine routing events logged
+}
+
+
+@dataclass
+class ImplementationHealth:
+    """Rolling health of one vendor implementation (e.g. local:get_finnhub_news)."""
+    key: str
+    breaker: CircuitBreaker
+    latency_ewma: Optional[float] = None  # Seconds
+    error_ewma: float = 0.0               # 0 (healthy) .. 1 (always failing)
+    calls: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, duration: float, ok: bool, alpha: float, error: Optional[str] = None):
+        with self.lock:
+            self.calls += 1
+            self.latency_ewma = duration if self.latency_ewma is None else alpha * duration + (1 - alpha) * self.latency_ewma
+            self.error_ewma = alpha * (0.0 if ok else 1.0) + (1 - alpha) * self.error_ewma
+            if not ok:
+                self.failures += 1
+                self.last_error = error
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+                "error_rate": round(self.error_ewma, 3),
+                "circuit": self.breaker.get_state()["state"],
+                "last_error": self.last_error,
+            }
+
+
+class VendorRouter:
+    """
+    Routes a method call across vendors using observed latency and errors.
+
+    Example:
+        router = get_vendor_router()
+        results, vendor, attempts = router.first_success("get_news", vendors, impls, args, kwargs)
+        router.get_stats()["local:get_finnhub_news"]["error_rate"]
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            settings: Overrides for DEFAULT_ROUTING (usually config["vendor_routing"])
+        """
+        self.settings = {**DEFAULT_ROUTING, **(settings or {})}
+        self._health: Dict[str, ImplementationHealth] = {}
+        self._lock = threading.Lock()
+        self._executors: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+
+    # ------------------------------------------------------------------
+    # Health bookkeeping
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def impl_key(vendor: str, impl: Callable) -> str:
+        return f"{vendor}:{getattr(impl, '__name__', repr(impl))}"
+
+    def health(self, key: str) -> ImplementationHealth:
+        with self._lock:
+            health = self._health.get(key)
+            if health is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=self.settings["failure_threshold"],
+                    timeout_seconds=self.settings["cooldown_seconds"],
+                    name=key,
+                )
+                health = self._health[key] = ImplementationHealth(key=key, breaker=breaker)
+            return health
+
+    def vendor_score(self, vendor: str, impls: Sequence[Callable]) -> Tuple[float, float]:
+        """Sort key for fallback ordering: (error rate, latency); untried vendors sort first."""
+        scores = []
+        for impl in impls:
+            health = self.health(self.impl_key(vendor, impl))
+            scores.append((health.error_ewma, health.latency_ewma if health.latency_ewma is not None else 0.0))
+        return (sum(s[0] for s in scores) / len(scores), sum(s[1] for s in scores) / len(scores))
+
+    def is_available(self, vendor: str, impls: Sequence[Callable]) -> bool:
+        """A vendor is available if any of its implementations has a closed (or cooled-down) circuit."""
+        return any(not self.health(self.impl_key(vendor, impl)).breaker.is_open() for impl in impls)
+
+    def order(self, method: str, vendors: Sequence[str], primary_vendors: Sequence[str],
+              implementations: Dict[str, Any]) -> List[str]:
+        """
+        Vendors to try, in order.
+
+        Configured primaries keep their configured order; the remaining
+        fallbacks are ordered by health. Vendors whose circuits are all open
+        are left out.
+        """
+        candidates = [v for v in vendors if v in implementations]
+        available = []
+        for vendor in candidates:
+            if self.is_available(vendor, _as_list(implementations[vendor])):
+                available.append(vendor)
+            else:
+                self.log_event("circuit_open", method, vendor, level=logging.INFO)
+        primaries = [v for v in available if v in primary_vendors]
+        fallbacks = sorted(
+            (v for v in available if v not in primary_vendors),
+            key=lambda v: self.vendor_score(v, _as_list(implementations[v]))
+        )
+        return primaries + fallbacks
+
+    # ------------------------------------------------------------------
+    # Calling vendors
+    # ------------------------------------------------------------------
+
+    def _get_executor(self, kind: str) -> concurrent.futures.ThreadPoolExecutor:
+        # Vendor-level tasks ("vendor") wait on implementation calls ("impl"),
+        # so the two never share a pool
+        with self._lock:
+            if kind not in self._executors:
+                self._executors[kind] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.settings["max_workers"], thread_name_prefix=f"vendor-router-{kind}"
+                )
+            return self._executors[kind]
+
+    def call(self, method: str, vendor: str, impl: Callable, args: tuple, kwargs: dict) -> Tuple[bool, Any]:
+        """
+        Call one implementation, recording latency and outcome.
+
+        Returns:
+            (True, result) on success, (False, exception) on failure or open circuit
+        """
+        health = self.health(self.impl_key(vendor, impl))
+        if not health.breaker.allow_request():
+            return False, None
+        started = time.perf_counter()
+        try:
+            result = impl(*args, **kwargs)
+        except Exception as e:
+            duration = time.perf_counter() - started
+            health.observe(duration, False, self.settings["ewma_alpha"], error=f"{type(e).__name__}: {e}")
+            self.log_event("failed", method, vendor, level=logging.WARNING, duration=duration,
+                           impl=impl, error=f"{type(e).__name__}: {e}")
+            return False, e
+        duration = time.perf_counter() - started
+        health.observe(duration, True, self.settings["ewma_alpha"])
+        self.log_event("succeeded", method, vendor, duration=duration, impl=impl)
+        return True, result
+
+    def run_vendor(self, method: str, vendor: str, implementation: Any, args: tuple, kwargs: dict) -> List[Any]:
+        """
+        Run all implementations of a vendor, in parallel when there are several.
+
+        Returns:
+            Successful results in implementation order
+        """
+        impls = _as_list(implementation)
+        if len(impls) == 1:
+            ok, result = self.call(method, vendor, impls[0], args, kwargs)
+            return [result] if ok else []
+        executor = self._get_executor("impl")
+        futures = [executor.submit(self.call, method, vendor, impl, args, kwargs) for impl in impls]
+        return [result for ok, result in (f.result() for f in futures) if ok]
+
+    def first_success(self, method: str, vendors: Sequence[str], implementations: Dict[str, Any],
+                      args: tuple, kwargs: dict) -> Tuple[List[Any], Optional[str], int]:
+        """
+        Results from the first vendor that succeeds.
+
+        Vendors are tried in order. With hedge_delay set, a vendor that has not
+        answered within the delay gets the next vendor started alongside it and
+        the first successful answer wins; the slower call still finishes in the
+        background and updates health.
+
+        Returns:
+            (results, vendor that produced them or None, vendors attempted)
+        """
+        queue = list(vendors)
+        hedge_delay = self.settings.get("hedge_delay")
+        attempts = 0
+
+        if not hedge_delay:
+            for vendor in queue:
+                attempts += 1
+                results = self.run_vendor(method, vendor, implementations[vendor], args, kwargs)
+                if results:
+                    return results, vendor, attempts
+                self.log_event("no_results", method, vendor, level=logging.INFO)
+            return [], None, attempts
+
+        executor = self._get_executor("vendor")
+        pending: Dict[concurrent.futures.Future, str] = {}
+
+        def launch():
+            nonlocal attempts
+            vendor = queue.pop(0)
+            attempts += 1
+            pending[executor.submit(self.run_vendor, method, vendor, implementations[vendor], args, kwargs)] = vendor
+
+        launch()
+        while pending:
+            can_hedge = bool(queue) and len(pending) == 1
+            done, _ = concurrent.futures.wait(
+                list(pending), timeout=hedge_delay if can_hedge else None,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done:
+                slow = next(iter(pending.values()))
+                self.log_event("hedged", method, slow, level=logging.INFO, backup=queue[0])
+                launch()
+                continue
+            for future in done:
+                vendor = pending.pop(future)
+                results = future.result()
+                if results:
+                    return results, vendor, attempts
+                self.log_event("no_results", method, vendor, level=logging.INFO)
+            if queue and not pending:
+                launch()
+        return [], None, attempts
+
+    def run_all(self, method: str, vendors: Sequence[str], implementations: Dict[str, Any],
+                args: tuple, kwargs: dict) -> List[Tuple[str, List[Any]]]:
+        """
+        Run every vendor in parallel (multi-vendor configs collect from all).
+
+        Returns:
+            (vendor, results) pairs in vendor order
+        """
+        if len(vendors) <= 1:
+            return [(v, self.run_vendor(method, v, implementations[v], args, kwargs)) for v in vendors]
+        executor = self._get_executor("vendor")
+        futures = [executor.submit(self.run_vendor, method, v, implementations[v], args, kwargs) for v in vendors]
+        return [(v, f.result()) for v, f in zip(vendors, futures)]
+
+    # ------------------------------------------------------------------
+    # Logging and stats
+    # ------------------------------------------------------------------
+
+    def log_event(self, event: str, method: str, vendor: str, level: int = logging.DEBUG,
+                  duration: Optional[float] = None, impl: Optional[Callable] = None, **fields):
+        """
+        Structured routing log record; DEBUG events are sampled.
+
+        Fields are attached as record attributes (method, vendor, event,
+        duration_ms, ...) for the JSON formatter.
+        """
+        if level <= logging.DEBUG and random.random() >= self.settings["log_sample_rate"]:
+            return
+        if not logger.isEnabledFor(level):
+            return
+        extra = {"event": event, "method": method, "vendor": vendor, **fields}
+        if impl is not None:
+            extra["implementation"] = getattr(impl, "__name__", repr(impl))
+        if duration is not None:
+            extra["duration_ms"] = round(duration * 1000, 1)
+        details = " ".join(f"{k}={v}" for k, v in extra.items() if k not in ("event", "method", "vendor"))
+        logger.log(level, f"vendor_route {event} method={method} vendor={vendor} {details}".rstrip(), extra=extra)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Health per vendor implementation, keyed "vendor:function"."""
+        with self._lock:
+            health = list(self._health.values())
+        return {h.key: h.to_dict() for h in health}
+
+    def reset(self):
+        """Forget all health data (e.g. after changing API keys)."""
+        with self._lock:
+            self._health.clear()
+
+
+def _as_list(implementation: Any) -> List[Callable]:
+    return list(implementation) if isinstance(implementation, (list, tuple)) else [implementation]
+
+
+_vendor_router: Optional[VendorRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_vendor_router() -> VendorRouter:
+    """Get the global vendor router (settings from config["vendor_routing"])."""
+    global _vendor_router
+    with _router_lock:
+        if _vendor_router is None:
+            from .config import get_config
+            _vendor_router = VendorRouter(get_config().get("vendor_routing"))
+        return _vendor_router
@@ -8,8 +8,11 @@ Four-gate buy decision framework.
 """
 
 from .four_gate import FourGateFramework, GateResult
+from .batch_four_gate import BatchFourGateEvaluator, flatten_gate_inputs
 
 __all__ = [
     'FourGateFramework',
     'GateResult',
+    'BatchFourGateEvaluator',
+    'flatten_gate_inputs',
 ]
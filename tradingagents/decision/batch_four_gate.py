@@ -0,0 +1,337 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Batch Four-Gate Evaluation
+
+Columnar counterpart of FourGateFramework.evaluate_all_gates(): one row per
+ticker (or ticker/date), every gate scored with array operations. Scores,
+pass flags, final decision and confidence are identical to the scalar path;
+the per-gate reasoning text is not produced (use the scalar path to explain
+a single row).
+
+Input columns (a missing column or NaN means the value is absent, i.e. the
+key is missing or None in the scalar inputs):
+
+    Gate 1  pe_ratio, forward_pe, revenue_growth_yoy, debt_to_equity,
+            dividend_yield, sector_pe (sector_avg['pe_ratio'])
+    Gate 2  current_price, week_52_high, rsi, volume_ratio,
+            macd_bullish_crossover, macd_bearish_crossover, price_above_ma20,
+            price_above_ma50, ma20_above_ma50, near_support, near_resistance,
+            pattern_success_rate (historical_context)
+    Gate 3  position_size_pct, max_expected_drawdown_pct, risk_reward_ratio,
+            red_flag_count, sector_exposure and sector_limit
+            (portfolio_context), max_correlation (correlation_risk)
+    Gate 4  price (price_data['price'], as the scalar path reads it),
+            last_analysis_price, similar_buy_count, similar_total,
+            days_to_next_catalyst, sector_buy_rate
+    Other   confidence_score (dynamic thresholds)
+"""
+
+from typing import Dict, Any, List, Optional, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .four_gate import FourGateFramework
+
+logger = logging.getLogger(__name__)
+
+
+BOOLEAN_SIGNALS = [
+    'macd_bullish_crossover',
+    'macd_bearish_crossover',
+    'price_above_ma20',
+    'price_above_ma50',
+    'ma20_above_ma50',
+    'near_support',
+    'near_resistance',
+]
+
+
+def flatten_gate_inputs(
+    fundamentals: Dict[str, Any],
+    signals: Dict[str, Any],
+    price_data: Dict[str, Any],
+    risk_analysis: Dict[str, Any],
+    position_size_pct: float,
+    historical_context: Dict[str, Any],
+    sector_avg: Dict[str, Any] = None,
+    portfolio_context: Dict[str, Any] = None,
+    catalyst_timeline: Dict[str, Any] = None,
+    confidence_score: int = None,
+    correlation_risk: Dict[str, Any] = None
+) -> Dict[str, Any]:
+    """
+    Convert evaluate_all_gates() arguments into one batch row.
+
+    Args:
+        Same as FourGateFramework.evaluate_all_gates()
+
+    Returns:
+        Dictionary of column -> value (None for absent values)
+    """
+    historical_context = historical_context or {}
+    last_analysis = historical_context.get('last_analysis') or {}
+    similar = historical_context.get('similar_situations') or []
+
+    row = {
+        'pe_ratio': fundamentals.get('pe_ratio'),
+        'forward_pe': fundamentals.get('forward_pe'),
+        'revenue_growth_yoy': fundamentals.get('revenue_growth_yoy'),
+        'debt_to_equity': fundamentals.get('debt_to_equity'),
+        'dividend_yield': fundamentals.get('dividend_yield'),
+        'sector_pe': (sector_avg or {}).get('pe_ratio'),
+        'current_price': price_data.get('current_price'),
+        'week_52_high': price_data.get('week_52_high'),
+        'rsi': signals.get('rsi'),
+        'volume_ratio': signals.get('volume_ratio'),
+        'pattern_success_rate': historical_context.get('pattern_success_rate'),
+        'position_size_pct': position_size_pct,
+        'max_expected_drawdown_pct': risk_analysis.get('max_expected_drawdown_pct'),
+        'risk_reward_ratio': risk_analysis.get('risk_reward_ratio'),
+        'red_flag_count': len(risk_analysis.get('red_flags') or []),
+        'sector_exposure': None,
+        'sector_limit': None,
+        'max_correlation': None,
+        'price': price_data.get('price'),
+        'last_analysis_price': last_analysis.get('price'),
+        'similar_buy_count': sum(1 for s in similar if s.get('final_decision') == 'BUY'),
+        'similar_total': len(similar),
+        'days_to_next_catalyst': (catalyst_timeline or {}).get('days_to_next_catalyst'),
+        'sector_buy_rate': (historical_context.get('sector_context') or {}).get('buy_signal_rate'),
+        'confidence_score': confidence_score,
+    }
+    for name in BOOLEAN_SIGNALS:
+        row[name] = bool(signals.get(name))
+
+    if portfolio_context:
+        row['sector_exposure'] = portfolio_context.get('sector_exposure', 0)
+        row['sector_limit'] = portfolio_context.get('sector_limit', 35.0)
+    if correlation_risk:
+        row['max_correlation'] = correlation_risk.get('max_correlation', 0.0)
+
+    return row
+
+
+class BatchFourGateEvaluator:
+    """
+    Vectorized four-gate evaluation over many tickers or dates.
+
+    Thresholds (including the confidence-based dynamic adjustment) are taken
+    from the wrapped FourGateFramework, so both paths stay in lockstep.
+    """
+
+    def __init__(self, framework: FourGateFramework = None):
+        """
+        Initialize evaluator.
+
+        Args:
+            framework: Framework supplying the thresholds (optional)
+        """
+        self.framework = framework or FourGateFramework()
+
+    def evaluate(self, inputs: Union[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]) -> pd.DataFrame:
+        """
+        Evaluate all four gates for every row.
+
+        Args:
+            inputs: DataFrame, dict of columns or list of rows (see module docstring)
+
+        Returns:
+            DataFrame on the input index with <gate>_score / <gate>_passed for
+            the fundamental, technical, risk and timing gates, plus
+            final_decision, confidence_score and gates_passed
+        """
+        frame = inputs if isinstance(inputs, pd.DataFrame) else pd.DataFrame(inputs)
+        thresholds = self.thresholds(frame)
+
+        scores = {
+            'fundamental': self._fundamental_scores(frame),
+            'technical': self._technical_scores(frame),
+            'risk': self._risk_scores(frame),
+            'timing': self._timing_scores(frame),
+        }
+        passed = {
+            gate: scores[gate] >= thresholds[f'{gate}_min_score']
+            for gate in scores
+        }
+
+        core_passed = passed['fundamental'] & passed['technical'] & passed['risk']
+        final_decision = np.where(core_passed, np.where(passed['timing'], 'BUY', 'WAIT'), 'PASS')
+
+        result = pd.DataFrame(index=frame.index)
+        for gate in scores:
+            result[f'{gate}_score'] = scores[gate]
+            result[f'{gate}_passed'] = passed[gate]
+        result['final_decision'] = final_decision
+        result['confidence_score'] = sum(scores.values()) // 4
+        result['gates_passed'] = sum(p.astype(int) for p in passed.values())
+        return result
+
+    def thresholds(self, frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Per-row gate thresholds, as get_dynamic_thresholds(confidence_score) would return."""
+        base = self.framework.thresholds
+        n = len(frame)
+        thresholds = {name: np.full(n, value) for name, value in base.items()}
+
+        confidence = _column(frame, 'confidence_score')
+        high = confidence > 85
+        low = confidence < 60
+        for name, floor, ceiling in [
+            ('fundamental_min_score', 65, 75),
+            ('technical_min_score', 60, 70),
+        ]:
+            thresholds[name] = np.select(
+                [high, low],
+                [np.maximum(floor, base[name] - 5), np.minimum(ceiling, base[name] + 5)],
+                thresholds[name],
+            )
+        return thresholds
+
+    @staticmethod
+    def _fundamental_scores(frame: pd.DataFrame) -> np.ndarray:
+        """Gate 1 scores (see FourGateFramework.evaluate_fundamental_gate)."""
+        pe = _column(frame, 'pe_ratio')
+        sector_pe = _column(frame, 'sector_pe')
+        has_pe = _truthy(pe)
+        has_sector = has_pe & _truthy(sector_pe)
+        absolute = has_pe & ~has_sector
+
+        score = np.full(len(frame), 50)
+        score += np.select(
+            [has_sector & (pe < sector_pe * 0.8), has_sector & (pe < sector_pe), has_sector & (pe > sector_pe * 1.5)],
+            [20, 10, -10], 0,
+        )
+        score += np.select([absolute & (pe < 15), absolute & (pe < 25), absolute & (pe > 50)], [15, 5, -10], 0)
+
+        forward_pe = _column(frame, 'forward_pe')
+        has_forward = has_pe & _truthy(forward_pe)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            peg_proxy = np.where(pe > 0, forward_pe / pe, 1)
+        score += np.select([has_forward & (peg_proxy < 0.8), has_forward & (peg_proxy < 1.0)], [15, 5], 0)
+
+        growth = _column(frame, 'revenue_growth_yoy')
+        score += np.select([growth > 0.20, growth > 0.10, growth < 0], [15, 10, -15], 0)
+
+        debt_to_equity = _column(frame, 'debt_to_equity')
+        has_de = _truthy(debt_to_equity)
+        score += np.select([has_de & (debt_to_equity < 0.5), has_de & (debt_to_equity > 2.0)], [5, -5], 0)
+
+        dividend_yield = _column(frame, 'dividend_yield')
+        score += np.select([dividend_yield >= 3.0, dividend_yield >= 2.0], [10, 5], 0)
+
+        return np.clip(score, 0, 100)
+
+    @staticmethod
+    def _technical_scores(frame: pd.DataFrame) -> np.ndarray:
+        """Gate 2 scores (see FourGateFramework.evaluate_technical_gate)."""
+        current_price = _column(frame, 'current_price')
+        week_52_high = _column(frame, 'week_52_high')
+        has_range = _truthy(week_52_high) & _truthy(current_price)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_from_high = (week_52_high - current_price) / week_52_high * 100
+
+        score = np.full(len(frame), 50)
+        score += np.select([has_range & (pct_from_high < 5), has_range & (pct_from_high > 20)], [-20, 10], 0)
+
+        rsi = _column(frame, 'rsi')
+        score += np.select([rsi < 30, (rsi >= 30) & (rsi <= 50), rsi > 70], [20, 10, -15], 0)
+
+        for name, points in zip(BOOLEAN_SIGNALS, [15, -10, 5, 5, 10, 15, -10]):
+            score += np.where(_flag(frame, name), points, 0)
+
+        volume_ratio = _column(frame, 'volume_ratio', default=1.0)
+        score += np.where(volume_ratio > 1.5, 10, 0)
+
+        success_rate = _column(frame, 'pattern_success_rate')
+        has_rate = _truthy(success_rate)
+        score += np.select([has_rate & (success_rate > 0.7), has_rate & (success_rate < 0.4)], [10, -10], 0)
+
+        return np.clip(score, 0, 100)
+
+    @staticmethod
+    def _risk_scores(frame: pd.DataFrame) -> np.ndarray:
+        """Gate 3 scores (see FourGateFramework.evaluate_risk_gate)."""
+        size = _column(frame, 'position_size_pct')
+        score = np.full(len(frame), 50)
+        score += np.select([size > 10, size > 7], [-20, -10], 5)
+
+        drawdown = _column(frame, 'max_expected_drawdown_pct')
+        score += np.select([drawdown > 20, drawdown > 15, ~np.isnan(drawdown)], [-20, -10, 10], 0)
+
+        risk_reward = _column(frame, 'risk_reward_ratio')
+        score += np.select([risk_reward > 3.0, risk_reward > 2.0, risk_reward < 1.5], [15, 10, -15], 0)
+
+        exposure = _column(frame, 'sector_exposure')
+        has_portfolio = ~np.isnan(exposure)
+        limit = np.nan_to_num(_column(frame, 'sector_limit'), nan=35.0)
+        proposed = exposure + size
+        score += np.select(
+            [
+                has_portfolio & (proposed > limit),
+                has_portfolio & (proposed > limit * 0.9),
+                has_portfolio & (exposure < limit * 0.5),
+            ],
+            [-25, -10, 5], 0,
+        )
+
+        correlation = _column(frame, 'max_correlation')
+        score += np.select([correlation > 0.75, correlation > 0.6, correlation < 0.3], [-20, -10, 5], 0)
+
+        red_flags = np.nan_to_num(_column(frame, 'red_flag_count'), nan=0).astype(int)
+        score -= red_flags * 5
+
+        return np.clip(score, 0, 100)
+
+    @staticmethod
+    def _timing_scores(frame: pd.DataFrame) -> np.ndarray:
+        """Gate 4 scores (see FourGateFramework.evaluate_timing_gate)."""
+        price = _column(frame, 'price', default=0.0)
+        last_price = _column(frame, 'last_analysis_price')
+        has_last = _truthy(last_price)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_pct = (price - last_price) / last_price * 100
+
+        score = np.full(len(frame), 50)
+        score += np.select([has_last & (change_pct < -10), has_last & (change_pct > 10)], [15, -10], 0)
+
+        buys = np.nan_to_num(_column(frame, 'similar_buy_count'), nan=0)
+        total = _column(frame, 'similar_total')
+        has_buys = (buys > 0) & (total > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            success_rate = buys / total
+        score += np.select([has_buys & (success_rate > 0.7), has_buys & (success_rate < 0.3)], [15, -10], 0)
+
+        days = _column(frame, 'days_to_next_catalyst')
+        score += np.select([(days > 0) & (days < 30), days > 90], [10, -5], 0)
+
+        sector_rate = _column(frame, 'sector_buy_rate')
+        has_sector = _truthy(sector_rate)
+        score += np.select([has_sector & (sector_rate > 0.5), has_sector & (sector_rate < 0.2)], [10, -5], 0)
+
+        return np.clip(score, 0, 100)
+
+
+def _column(frame: pd.DataFrame, name: str, default: Optional[float] = np.nan) -> np.ndarray:
+    """Float column with absent values (missing column, None, NaN) set to ``default``."""
+    if name not in frame:
+        return np.full(len(frame), default, dtype=float)
+    values = pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=float)
+    if not np.isnan(default):
+        values = np.where(np.isnan(values), default, values)
+    return values
+
+
+def _flag(frame: pd.DataFrame, name: str) -> np.ndarray:
+    """Boolean column; absent values are False."""
+    if name not in frame:
+        return np.zeros(len(frame), dtype=bool)
+    column = frame[name]
+    return (column.notna() & column.astype(bool)).to_numpy()
+
+
+def _truthy(values: np.ndarray) -> np.ndarray:
+    """Python truthiness of an optional number: present and non-zero."""
+    return ~np.isnan(values) & (values != 0)
@@ -25,6 +25,9 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Role memory store (bull/bear/trader/judge/risk). None keeps memories in-process only;
+    # set a directory to persist them (ChromaDB) so they are warm across restarts.
+    "memory_persist_dir": os.getenv("TRADINGAGENTS_MEMORY_DIR"),
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
@@ -47,6 +50,9 @@ DEFAULT_CONFIG = {
         "require_multi_source_validation": True,   # ✅ Cross-validate prices across sources
         "check_earnings_proximity": True,          # ✅ Warn about earnings volatility windows
         "price_discrepancy_threshold": 2.0,        # ✅ Max acceptable price difference (%)
+        "price_validation_timeout": 5.0,           # ✅ Deadline (s) for the concurrent source fetches
+        "price_validation_quorum": 2,              # ✅ Stop early once this many sources agree
+        "price_validation_cache_ttl": 60,          # ✅ Reuse a ticker's validation result for this long (s)
         "earnings_days_before": 7,                 # ✅ Days before earnings to warn
         "earnings_days_after": 3,                  # ✅ Days after earnings to warn
 
@@ -61,6 +67,13 @@ DEFAULT_CONFIG = {
         "get_news": "skip",                           # Skip news to avoid OpenAI fallback
         "get_global_news": "skip",                     # Skip global news to avoid OpenAI fallback
     },
+    # Vendor routing (see dataflows/vendor_router.py)
+    "vendor_routing": {
+        "failure_threshold": 3,      # Consecutive failures before a vendor implementation is skipped
+        "cooldown_seconds": 60,      # How long a failing implementation is skipped
+        "hedge_delay": None,         # Seconds before a slow primary is backed up by the next vendor (None = off)
+        "log_sample_rate": 0.1,      # Fraction of routine routing events logged at DEBUG
+    },
     # Profitability Features Configuration
     # Enable profitability improvements for enhanced trading performance
     "enable_profitability_features": True,  # ✅ ENABLED: All profitability features active
@@ -88,12 +88,9 @@ def cmd_upcoming(args):
                 with conn.cursor() as cur:
                     cur.execute(query)
                     symbols = [row[0] for row in cur.fetchall()]
-            for symbol in symbols[:50]:  # Limit to first 50 to avoid timeout
-                try:
-                    fetcher.fetch_and_store(symbol)
-                    fetcher.update_yield_cache(symbol)
-                except:
-                    pass
+            symbols = symbols[:50]  # Limit to first 50 to avoid timeout
+            fetcher.store_dividend_histories(fetcher.fetch_dividend_histories(symbols))
+            fetcher.update_yield_caches(symbols)
         print("✓ Dividend data refreshed\n")
 
     calendar = DividendCalendar()
@@ -269,16 +266,15 @@ def cmd_update_cache(args):
                 cur.execute(query)
                 symbols = [row[0] for row in cur.fetchall()]
 
+        results = fetcher.update_yield_caches(symbols, cache_hours=args.cache_hours)
+
         success_count = 0
-        for symbol in symbols:
-            try:
-                if fetcher.update_yield_cache(symbol, cache_hours=args.cache_hours):
-                    print(f"✓ {symbol}")
-                    success_count += 1
-                else:
-                    print(f"- {symbol} (no data)")
-            except Exception as e:
-                print(f"✗ {symbol} (error: {e})")
+        for symbol, updated in results.items():
+            if updated:
+                print(f"✓ {symbol}")
+                success_count += 1
+            else:
+                print(f"- {symbol} (no data)")
 
         print(f"\n{'='*60}")
         print(f"Cache update complete!")
@@ -12,11 +12,31 @@ from typing import List, Dict, Any, Optional
 import logging
 from collections import defaultdict
 
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
 from tradingagents.database import DatabaseConnection
 from .dividend_fetcher import get_ticker_id
 
 logger = logging.getLogger(__name__)
 
+_CALENDAR_UPSERT = """
+    INSERT INTO dividend_calendar (
+        ticker_id,
+        expected_ex_date,
+        expected_payment_date,
+        expected_amount_per_share,
+        is_confirmed
+    )
+    VALUES %s
+    ON CONFLICT (ticker_id, expected_ex_date)
+    DO UPDATE SET
+        expected_payment_date = EXCLUDED.expected_payment_date,
+        expected_amount_per_share = EXCLUDED.expected_amount_per_share,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
 
 class DividendCalendar:
     """Manages upcoming dividend payment calendar."""
@@ -142,10 +162,129 @@ class DividendCalendar:
         else:
             return 'LOW'
 
+    def predict_next_dividends(
+        self,
+        active_only: bool = True
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Predict the next dividend for every ticker with dividend history.
+
+        Same rules as predict_next_dividend, computed for the whole universe
+        from one query with grouped pandas operations.
+
+        Args:
+            active_only: Only include active tickers
+
+        Returns:
+            Dict mapping ticker_id to predicted dividend info
+        """
+        query = f"""
+            SELECT ticker_id, symbol, ex_dividend_date, dividend_per_share, payment_date, rn
+            FROM (
+                SELECT
+                    t.ticker_id,
+                    t.symbol,
+                    dp.ex_dividend_date,
+                    dp.dividend_per_share,
+                    dp.payment_date,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY dp.ticker_id ORDER BY dp.ex_dividend_date DESC
+                    ) AS rn
+                FROM dividend_payments dp
+                JOIN tickers t ON t.ticker_id = dp.ticker_id
+                WHERE dp.status = 'PAID'
+                    {"AND t.active = TRUE" if active_only else ""}
+            ) recent
+            WHERE rn <= 8
+            ORDER BY ticker_id, rn
+        """
+
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query)
+                rows = cur.fetchall()
+
+        if not rows:
+            return {}
+
+        df = pd.DataFrame(
+            rows,
+            columns=['ticker_id', 'symbol', 'ex_date', 'amount', 'payment_date', 'rn']
+        )
+        return self._predict_from_frame(df)
+
+    def _predict_from_frame(self, df: pd.DataFrame) -> Dict[int, Dict[str, Any]]:
+        """
+        Vectorized next-dividend prediction.
+
+        Args:
+            df: Rows of (ticker_id, symbol, ex_date, amount, payment_date, rn),
+                newest first within each ticker (rn = 1 is the latest)
+
+        Returns:
+            Dict mapping ticker_id to predicted dividend info
+        """
+        df = df.copy()
+        df['ex_date'] = pd.to_datetime(df['ex_date'])
+        df['payment_date'] = pd.to_datetime(df['payment_date'])
+        df['amount'] = df['amount'].astype(float)
+
+        grouped = df.groupby('ticker_id', sort=False)
+        # Days between consecutive ex-dates (rows are newest first, so negate)
+        df['interval'] = -grouped['ex_date'].diff().dt.days
+        df['payment_delay'] = (df['payment_date'] - df['ex_date']).dt.days
+
+        stats = grouped.agg(
+            symbol=('symbol', 'first'),
+            history=('ex_date', 'size'),
+            last_ex_date=('ex_date', 'first'),
+        )
+        stats['avg_interval'] = grouped['interval'].mean()
+        stats['std_interval'] = grouped['interval'].std(ddof=0)
+        stats['avg_payment_delay'] = grouped['payment_delay'].mean().fillna(21)
+        stats['amount'] = df[df['rn'] <= 4].groupby('ticker_id', sort=False)['amount'].mean()
+
+        stats = stats[(stats['history'] >= 2) & (stats['avg_interval'] >= 1)]
+        if stats.empty:
+            return {}
+
+        # Roll the ex-date forward by whole intervals until it is in the future
+        today = pd.Timestamp(datetime.now().date())
+        step = stats['avg_interval'].astype(int)
+        next_ex = stats['last_ex_date'] + pd.to_timedelta(step, unit='D')
+        behind = (today - next_ex).dt.days
+        periods = np.where(behind >= 0, behind // step + 1, 0)
+        next_ex = next_ex + pd.to_timedelta(periods * step, unit='D')
+        next_payment = next_ex + pd.to_timedelta(stats['avg_payment_delay'].astype(int), unit='D')
+
+        # Confidence from coefficient of variation of the intervals
+        cv = stats['std_interval'] / stats['avg_interval']
+        confidence = np.select(
+            [stats['history'] < 3, cv < 0.05, cv < 0.15],
+            ['LOW', 'HIGH', 'MEDIUM'],
+            default='LOW'
+        )
+
+        predictions = {}
+        for i, (ticker_id, row) in enumerate(stats.iterrows()):
+            predictions[ticker_id] = {
+                'symbol': row['symbol'],
+                'expected_ex_date': next_ex.iloc[i].date(),
+                'expected_payment_date': next_payment.iloc[i].date(),
+                'expected_amount_per_share': row['amount'],
+                'is_confirmed': False,
+                'based_on_history': int(row['history']),
+                'confidence': str(confidence[i])
+            }
+        return predictions
+
     def update_calendar(self, days_ahead: int = 180) -> int:
         """
         Update dividend calendar with predictions for all tickers.
 
+        Predicts for the whole universe at once and writes every prediction
+        with a single upsert.
+
         Args:
             days_ahead: How many days ahead to predict
 
@@ -153,31 +292,28 @@ class DividendCalendar:
             Number of predictions added
         """
         try:
-            # Get all active tickers with dividend history
-            query = """
-                SELECT DISTINCT t.ticker_id, t.symbol
-                FROM tickers t
-                JOIN dividend_payments dp ON t.ticker_id = dp.ticker_id
-                WHERE t.active = TRUE
-                ORDER BY t.symbol
-            """
-
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(query)
-                    tickers = cur.fetchall()
-
-            count = 0
+            predictions = self.predict_next_dividends()
             cutoff_date = datetime.now().date() + timedelta(days=days_ahead)
 
-            for ticker_id, symbol in tickers:
-                prediction = self.predict_next_dividend(symbol)
+            records = [
+                (
+                    ticker_id,
+                    prediction['expected_ex_date'],
+                    prediction['expected_payment_date'],
+                    prediction['expected_amount_per_share'],
+                    prediction['is_confirmed']
+                )
+                for ticker_id, prediction in predictions.items()
+                if prediction['expected_ex_date'] <= cutoff_date
+            ]
 
-                if prediction and prediction['expected_ex_date'] <= cutoff_date:
-                    # Store in calendar
-                    if self._store_prediction(ticker_id, prediction):
-                        count += 1
+            if records:
+                with self.db.get_connection() as conn:
+                    with conn.cursor() as cur:
+                        execute_values(cur, _CALENDAR_UPSERT, records, page_size=1000)
+                        conn.commit()
 
+            count = len(records)
             logger.info(f"Updated dividend calendar: {count} predictions")
             return count
 
@@ -192,31 +328,15 @@ class DividendCalendar:
     ) -> bool:
         """Store dividend prediction in calendar."""
         try:
-            query = """
-                INSERT INTO dividend_calendar (
-                    ticker_id,
-                    expected_ex_date,
-                    expected_payment_date,
-                    expected_amount_per_share,
-                    is_confirmed
-                )
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (ticker_id, expected_ex_date)
-                DO UPDATE SET
-                    expected_payment_date = EXCLUDED.expected_payment_date,
-                    expected_amount_per_share = EXCLUDED.expected_amount_per_share,
-                    updated_at = CURRENT_TIMESTAMP
-            """
-
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(query, (
+                    execute_values(cur, _CALENDAR_UPSERT, [(
                         ticker_id,
                         prediction['expected_ex_date'],
                         prediction['expected_payment_date'],
                         prediction['expected_amount_per_share'],
                         prediction['is_confirmed']
-                    ))
+                    )])
                     conn.commit()
 
             return True
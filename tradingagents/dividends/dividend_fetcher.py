@@ -8,13 +8,15 @@ Fetches historical dividend data and stores it in the database.
 """
 
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 import psycopg2
 from psycopg2.extras import execute_values
 import logging
 
 from tradingagents.database import DatabaseConnection
+from tradingagents.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,108 @@ def get_ticker_id(db_conn: DatabaseConnection, symbol: str) -> Optional[int]:
         return None
 
 
+def get_ticker_ids(db_conn: DatabaseConnection, symbols: Iterable[str]) -> Dict[str, int]:
+    """
+    Get ticker_ids for many symbols in one query.
+
+    Args:
+        db_conn: Database connection
+        symbols: Stock symbols
+
+    Returns:
+        Dict mapping symbol to ticker_id (unknown symbols are omitted)
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+
+    try:
+        query = "SELECT symbol, ticker_id FROM tickers WHERE symbol = ANY(%s)"
+        with db_conn.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (symbols,))
+                return {symbol: ticker_id for symbol, ticker_id in cur.fetchall()}
+    except Exception as e:
+        logger.error(f"Error getting ticker_ids for {len(symbols)} symbols: {e}")
+        return {}
+
+
+def get_latest_closes(db_conn: DatabaseConnection, ticker_ids: Iterable[int]) -> Dict[int, float]:
+    """
+    Get the most recent close from daily_prices for many tickers in one query.
+
+    Args:
+        db_conn: Database connection
+        ticker_ids: Ticker IDs
+
+    Returns:
+        Dict mapping ticker_id to latest close (tickers without prices are omitted)
+    """
+    ticker_ids = list(ticker_ids)
+    if not ticker_ids:
+        return {}
+
+    try:
+        query = """
+            SELECT DISTINCT ON (ticker_id) ticker_id, close
+            FROM daily_prices
+            WHERE ticker_id = ANY(%s) AND close IS NOT NULL
+            ORDER BY ticker_id, price_date DESC
+        """
+        with db_conn.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (ticker_ids,))
+                return {ticker_id: float(close) for ticker_id, close in cur.fetchall()}
+    except Exception as e:
+        logger.error(f"Error getting latest closes: {e}")
+        return {}
+
+
+_PAYMENT_UPSERT = """
+    INSERT INTO dividend_payments (
+        ticker_id,
+        ex_dividend_date,
+        payment_date,
+        record_date,
+        dividend_per_share,
+        dividend_type,
+        status
+    )
+    VALUES %s
+    ON CONFLICT (ticker_id, ex_dividend_date)
+    DO UPDATE SET
+        payment_date = EXCLUDED.payment_date,
+        dividend_per_share = EXCLUDED.dividend_per_share,
+        dividend_type = EXCLUDED.dividend_type,
+        status = EXCLUDED.status,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def _payment_records(
+    ticker_id: int,
+    dividends: List[Dict[str, Any]],
+    dividend_type: str
+) -> List[Tuple]:
+    """Build dividend_payments rows for one ticker."""
+    records = []
+    for div in dividends:
+        # Estimate payment date (typically 2-4 weeks after ex-date)
+        ex_date = div['date']
+        payment_date = ex_date + timedelta(days=21)  # Estimate
+
+        records.append((
+            ticker_id,
+            ex_date,
+            payment_date,
+            ex_date,  # record_date (estimate)
+            div['amount'],
+            dividend_type,
+            'PAID'  # status
+        ))
+    return records
+
+
 class DividendFetcher:
     """Fetches dividend data from yfinance and stores in database."""
 
@@ -135,47 +239,11 @@ class DividendFetcher:
                 logger.error(f"Ticker {symbol} not found in database")
                 return 0
 
-            # Prepare data for insertion
-            records = []
-            for div in dividends:
-                # Estimate payment date (typically 2-4 weeks after ex-date)
-                ex_date = div['date']
-                payment_date = ex_date + timedelta(days=21)  # Estimate
-
-                records.append((
-                    ticker_id,
-                    ex_date,
-                    payment_date,
-                    ex_date,  # record_date (estimate)
-                    div['amount'],
-                    dividend_type,
-                    'PAID'  # status
-                ))
-
-            # Insert with ON CONFLICT DO UPDATE
-            query = """
-                INSERT INTO dividend_payments (
-                    ticker_id,
-                    ex_dividend_date,
-                    payment_date,
-                    record_date,
-                    dividend_per_share,
-                    dividend_type,
-                    status
-                )
-                VALUES %s
-                ON CONFLICT (ticker_id, ex_dividend_date)
-                DO UPDATE SET
-                    payment_date = EXCLUDED.payment_date,
-                    dividend_per_share = EXCLUDED.dividend_per_share,
-                    dividend_type = EXCLUDED.dividend_type,
-                    status = EXCLUDED.status,
-                    updated_at = CURRENT_TIMESTAMP
-            """
+            records = _payment_records(ticker_id, dividends, dividend_type)
 
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
-                    execute_values(cur, query, records)
+                    execute_values(cur, _PAYMENT_UPSERT, records)
                     conn.commit()
                     inserted_count = len(records)
 
@@ -206,17 +274,109 @@ class DividendFetcher:
         dividends = self.fetch_dividend_history(symbol, start_date, end_date)
         return self.store_dividend_history(symbol, dividends)
 
+    def fetch_dividend_histories(
+        self,
+        symbols: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        max_workers: int = 8,
+        requests_per_second: float = 4.0
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch dividend history for many symbols concurrently.
+
+        Requests run on a thread pool; a shared rate limiter caps how many
+        yfinance calls start per second regardless of pool size.
+
+        Args:
+            symbols: Stock symbols
+            start_date: Start date (defaults to 5 years ago)
+            end_date: End date (defaults to today)
+            max_workers: Concurrent fetch threads
+            requests_per_second: Maximum yfinance requests started per second
+
+        Returns:
+            Dict mapping symbol to list of dividend records
+        """
+        limiter = RateLimiter(requests_per_second)
+
+        def fetch(symbol: str) -> List[Dict[str, Any]]:
+            limiter.wait()
+            return self.fetch_dividend_history(symbol, start_date, end_date)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            histories = executor.map(fetch, symbols)
+            return dict(zip(symbols, histories))
+
+    def store_dividend_histories(
+        self,
+        histories: Dict[str, List[Dict[str, Any]]],
+        ticker_ids: Optional[Dict[str, int]] = None,
+        dividend_type: str = 'REGULAR'
+    ) -> Dict[str, int]:
+        """
+        Store dividend history for many symbols with one upsert in one transaction.
+
+        Args:
+            histories: Dict mapping symbol to dividend records
+            ticker_ids: Symbol to ticker_id map (looked up in one query if not provided)
+            dividend_type: Type of dividend (REGULAR, SPECIAL, etc.)
+
+        Returns:
+            Dict mapping symbol to number of records stored
+        """
+        results = {symbol: 0 for symbol in histories}
+        if ticker_ids is None:
+            ticker_ids = get_ticker_ids(self.db, [s for s, divs in histories.items() if divs])
+
+        # Keyed by (ticker_id, ex_date): one upsert cannot touch the same row twice
+        rows: Dict[Tuple[int, Any], Tuple] = {}
+        counts: Dict[str, int] = {}
+        for symbol, dividends in histories.items():
+            if not dividends:
+                continue
+            ticker_id = ticker_ids.get(symbol)
+            if ticker_id is None:
+                logger.error(f"Ticker {symbol} not found in database")
+                continue
+            records = _payment_records(ticker_id, dividends, dividend_type)
+            for record in records:
+                rows[(record[0], record[1])] = record
+            counts[symbol] = len(records)
+
+        if not rows:
+            return results
+
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_values(cur, _PAYMENT_UPSERT, list(rows.values()), page_size=1000)
+                    conn.commit()
+            results.update(counts)
+            logger.info(f"Stored {len(rows)} dividend records for {len(counts)} tickers")
+        except Exception as e:
+            logger.error(f"Error storing dividends for {len(counts)} tickers: {e}")
+
+        return results
+
     def backfill_all_tickers(
         self,
         years_back: int = 5,
-        active_only: bool = True
+        active_only: bool = True,
+        max_workers: int = 8,
+        requests_per_second: float = 4.0
     ) -> Dict[str, int]:
         """
         Backfill dividend history for all tickers in database.
 
+        Fetches concurrently (rate limited) and writes every payment with a
+        single upsert, reusing the ticker_ids from the ticker listing.
+
         Args:
             years_back: How many years of history to fetch
             active_only: Only process active tickers
+            max_workers: Concurrent fetch threads
+            requests_per_second: Maximum yfinance requests started per second
 
         Returns:
             Dict mapping symbol to number of records stored
@@ -235,8 +395,6 @@ class DividendFetcher:
             ORDER BY symbol
         """
 
-        results = {}
-
         with self.db.get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(query)
@@ -244,20 +402,22 @@ class DividendFetcher:
 
         logger.info(f"Backfilling dividends for {len(tickers)} tickers...")
 
-        for ticker_id, symbol in tickers:
-            try:
-                count = self.fetch_and_store(symbol, start_date)
-                results[symbol] = count
-
-                if count > 0:
-                    print(f"✓ {symbol}: {count} dividends")
-                else:
-                    print(f"- {symbol}: No dividends")
-
-            except Exception as e:
-                logger.error(f"Error processing {symbol}: {e}")
-                results[symbol] = 0
+        ticker_ids = {symbol: ticker_id for ticker_id, symbol in tickers}
+        histories = self.fetch_dividend_histories(
+            list(ticker_ids),
+            start_date,
+            max_workers=max_workers,
+            requests_per_second=requests_per_second
+        )
+        results = self.store_dividend_histories(histories, ticker_ids)
+
+        for symbol, count in results.items():
+            if count > 0:
+                print(f"✓ {symbol}: {count} dividends")
+            elif histories.get(symbol):
                 print(f"✗ {symbol}: Error")
+            else:
+                print(f"- {symbol}: No dividends")
 
         total = sum(results.values())
         logger.info(f"Backfill complete: {total} total dividend records")
@@ -301,71 +461,84 @@ class DividendFetcher:
                     cur.execute(query, (ticker_id,))
                     dividends = cur.fetchall()
 
-            if not dividends:
-                return None
+            return self._metrics_from_history(symbol, dividends, current_price)
+
+        except Exception as e:
+            logger.error(f"Error calculating dividend metrics for {symbol}: {e}")
+            return None
 
-            # Calculate metrics
-            recent_dividends = [float(d[1]) for d in dividends[:4]]  # Last 4 dividends
-            annual_dividend = sum(recent_dividends)
+    def _metrics_from_history(
+        self,
+        symbol: str,
+        dividends: List[tuple],
+        current_price: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Calculate dividend metrics from (ex_date, amount, payment_date) rows, newest first.
 
-            # Get current price if not provided
-            if current_price is None:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                current_price = info.get('currentPrice') or info.get('regularMarketPrice')
+        Fetches the current price from yfinance only when it is not provided.
+        """
+        if not dividends:
+            return None
 
-            if current_price is None or current_price <= 0:
-                logger.warning(f"Could not get valid price for {symbol}")
-                return None
+        # Calculate metrics
+        recent_dividends = [float(d[1]) for d in dividends[:4]]  # Last 4 dividends
+        annual_dividend = sum(recent_dividends)
 
-            # Calculate yield
-            dividend_yield = (annual_dividend / current_price) * 100
-
-            # Determine frequency
-            if len(dividends) >= 4:
-                # Calculate average days between dividends
-                dates = [d[0] for d in dividends[:4]]
-                intervals = [(dates[i] - dates[i+1]).days for i in range(len(dates)-1)]
-                avg_interval = sum(intervals) / len(intervals) if intervals else 0
-
-                if avg_interval < 45:
-                    frequency = 'MONTHLY'
-                elif avg_interval < 120:
-                    frequency = 'QUARTERLY'
-                elif avg_interval < 210:
-                    frequency = 'SEMI_ANNUAL'
-                else:
-                    frequency = 'ANNUAL'
-            else:
-                frequency = 'UNKNOWN'
-
-            # Calculate growth rates
-            growth_1yr = self._calculate_dividend_growth(dividends, 1)
-            growth_3yr = self._calculate_dividend_growth(dividends, 3)
-            growth_5yr = self._calculate_dividend_growth(dividends, 5)
-
-            # Count consecutive years with dividends
-            consecutive_years = self._count_consecutive_years(dividends)
-
-            return {
-                'symbol': symbol,
-                'current_price': current_price,
-                'annual_dividend': annual_dividend,
-                'dividend_yield_pct': dividend_yield,
-                'frequency': frequency,
-                'last_dividend_amount': dividends[0][1] if dividends else None,
-                'last_ex_date': dividends[0][0] if dividends else None,
-                'dividend_growth_1yr_pct': growth_1yr,
-                'dividend_growth_3yr_pct': growth_3yr,
-                'dividend_growth_5yr_pct': growth_5yr,
-                'consecutive_years_paid': consecutive_years,
-                'total_dividends_count': len(dividends)
-            }
+        # Get current price if not provided
+        if current_price is None:
+            ticker = yf.Ticker(symbol)
+            info = ticker.info
+            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
 
-        except Exception as e:
-            logger.error(f"Error calculating dividend metrics for {symbol}: {e}")
+        if current_price is None or current_price <= 0:
+            logger.warning(f"Could not get valid price for {symbol}")
             return None
 
+        # Calculate yield
+        dividend_yield = (annual_dividend / current_price) * 100
+
+        # Determine frequency
+        if len(dividends) >= 4:
+            # Calculate average days between dividends
+            dates = [d[0] for d in dividends[:4]]
+            intervals = [(dates[i] - dates[i+1]).days for i in range(len(dates)-1)]
+            avg_interval = sum(intervals) / len(intervals) if intervals else 0
+
+            if avg_interval < 45:
+                frequency = 'MONTHLY'
+            elif avg_interval < 120:
+                frequency = 'QUARTERLY'
+            elif avg_interval < 210:
+                frequency = 'SEMI_ANNUAL'
+            else:
+                frequency = 'ANNUAL'
+        else:
+            frequency = 'UNKNOWN'
+
+        # Calculate growth rates
+        growth_1yr = self._calculate_dividend_growth(dividends, 1)
+        growth_3yr = self._calculate_dividend_growth(dividends, 3)
+        growth_5yr = self._calculate_dividend_growth(dividends, 5)
+
+        # Count consecutive years with dividends
+        consecutive_years = self._count_consecutive_years(dividends)
+
+        return {
+            'symbol': symbol,
+            'current_price': current_price,
+            'annual_dividend': annual_dividend,
+            'dividend_yield_pct': dividend_yield,
+            'frequency': frequency,
+            'last_dividend_amount': dividends[0][1] if dividends else None,
+            'last_ex_date': dividends[0][0] if dividends else None,
+            'dividend_growth_1yr_pct': growth_1yr,
+            'dividend_growth_3yr_pct': growth_3yr,
+            'dividend_growth_5yr_pct': growth_5yr,
+            'consecutive_years_paid': consecutive_years,
+            'total_dividends_count': len(dividends)
+        }
+
     def _calculate_dividend_growth(
         self,
         dividends: List[tuple],
@@ -427,19 +600,84 @@ class DividendFetcher:
         Returns:
             True if successful
         """
-        try:
-            ticker_id = get_ticker_id(self.db, symbol)
-            if ticker_id is None:
-                return False
+        return self.update_yield_caches([symbol], cache_hours=cache_hours)[symbol]
+
+    def update_yield_caches(
+        self,
+        symbols: List[str],
+        cache_hours: int = 24
+    ) -> Dict[str, bool]:
+        """
+        Update the dividend yield cache for many symbols at once.
 
-            # Calculate metrics
-            metrics = self.calculate_dividend_metrics(symbol)
-            if metrics is None:
-                logger.warning(f"No dividend metrics for {symbol}")
-                return False
+        Loads dividend history and latest closes (from daily_prices) for all
+        symbols in two queries, computes metrics in memory and writes them
+        with one upsert. Only symbols without a stored close fall back to a
+        yfinance price lookup.
 
-            # Store in cache
+        Args:
+            symbols: Stock symbols
+            cache_hours: How long cache should be valid
+
+        Returns:
+            Dict mapping symbol to True if its cache row was written
+        """
+        results = {symbol: False for symbol in symbols}
+        ticker_ids = get_ticker_ids(self.db, symbols)
+        if not ticker_ids:
+            return results
+
+        try:
             query = """
+                SELECT
+                    ticker_id,
+                    ex_dividend_date,
+                    dividend_per_share,
+                    payment_date
+                FROM dividend_payments
+                WHERE ticker_id = ANY(%s)
+                    AND ex_dividend_date >= CURRENT_DATE - INTERVAL '5 years'
+                ORDER BY ticker_id, ex_dividend_date DESC
+            """
+
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, (list(ticker_ids.values()),))
+                    rows = cur.fetchall()
+
+            history: Dict[int, List[tuple]] = {}
+            for ticker_id, ex_date, amount, payment_date in rows:
+                history.setdefault(ticker_id, []).append((ex_date, amount, payment_date))
+
+            closes = get_latest_closes(self.db, history.keys())
+
+            records = []
+            for symbol, ticker_id in ticker_ids.items():
+                metrics = self._metrics_from_history(
+                    symbol, history.get(ticker_id, []), closes.get(ticker_id)
+                )
+                if metrics is None:
+                    continue
+                records.append((
+                    ticker_id,
+                    metrics['current_price'],
+                    metrics['annual_dividend'],
+                    metrics['dividend_yield_pct'],
+                    metrics['frequency'],
+                    metrics['last_dividend_amount'],
+                    metrics['last_ex_date'],
+                    metrics['dividend_growth_1yr_pct'],
+                    metrics['dividend_growth_3yr_pct'],
+                    metrics['dividend_growth_5yr_pct'],
+                    metrics['consecutive_years_paid'],
+                    cache_hours
+                ))
+                results[symbol] = True
+
+            if not records:
+                return results
+
+            upsert = """
                 INSERT INTO dividend_yield_cache (
                     ticker_id,
                     current_price,
@@ -455,11 +693,7 @@ class DividendFetcher:
                     calculated_at,
                     valid_until
                 )
-                VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                    CURRENT_TIMESTAMP,
-                    CURRENT_TIMESTAMP + INTERVAL '%s hours'
-                )
+                VALUES %s
                 ON CONFLICT (ticker_id)
                 DO UPDATE SET
                     current_price = EXCLUDED.current_price,
@@ -472,32 +706,23 @@ class DividendFetcher:
                     dividend_growth_3yr_pct = EXCLUDED.dividend_growth_3yr_pct,
                     dividend_growth_5yr_pct = EXCLUDED.dividend_growth_5yr_pct,
                     consecutive_years_paid = EXCLUDED.consecutive_years_paid,
-                    calculated_at = CURRENT_TIMESTAMP,
-                    valid_until = CURRENT_TIMESTAMP + INTERVAL '%s hours'
+                    calculated_at = EXCLUDED.calculated_at,
+                    valid_until = EXCLUDED.valid_until
             """
+            template = (
+                "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, "
+                "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + %s * INTERVAL '1 hour')"
+            )
 
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(query, (
-                        ticker_id,
-                        metrics['current_price'],
-                        metrics['annual_dividend'],
-                        metrics['dividend_yield_pct'],
-                        metrics['frequency'],
-                        metrics['last_dividend_amount'],
-                        metrics['last_ex_date'],
-                        metrics['dividend_growth_1yr_pct'],
-                        metrics['dividend_growth_3yr_pct'],
-                        metrics['dividend_growth_5yr_pct'],
-                        metrics['consecutive_years_paid'],
-                        cache_hours,
-                        cache_hours
-                    ))
+                    execute_values(cur, upsert, records, template=template, page_size=1000)
                     conn.commit()
 
-            logger.info(f"Updated yield cache for {symbol}: {metrics['dividend_yield_pct']:.2f}%")
-            return True
+            logger.info(f"Updated yield cache for {len(records)}/{len(symbols)} symbols")
 
         except Exception as e:
-            logger.error(f"Error updating yield cache for {symbol}: {e}")
-            return False
+            logger.error(f"Error updating yield cache for {len(symbols)} symbols: {e}")
+            return {symbol: False for symbol in symbols}
+
+        return results
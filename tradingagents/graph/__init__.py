@@ -9,6 +9,8 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .graph_pool import GraphPool, GraphPoolStats, get_graph_pool
+from .streaming import PropagationEvent, PropagationEventType, TokenUsageCallback
 
 __all__ = [
     "TradingAgentsGraph",
@@ -17,4 +19,10 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "GraphPool",
+    "GraphPoolStats",
+    "get_graph_pool",
+    "PropagationEvent",
+    "PropagationEventType",
+    "TokenUsageCallback",
 ]
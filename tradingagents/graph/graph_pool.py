@@ -0,0 +1,345 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Warm pool of compiled TradingAgentsGraph instances.
+
+Building a TradingAgentsGraph detects the market regime, creates the LLM
+clients and ChromaDB memories, and compiles the LangGraph. The pool does
+that once per (config, analyst set, flags) and hands out warm instances.
+
+Each instance is leased to one caller at a time, so per-run state
+(curr_state, ticker, middleware counters) never leaks between concurrent
+requests; it is cleared with reset_run_state() on every checkout. Every
+graph gets its own deep copy of the config, because TradingAgentsGraph
+adjusts its config per run (adaptive risk rounds) and the pool key must
+keep matching the caller's config.
+"""
+
+import asyncio
+import copy
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GraphPoolStats:
+    """Construction vs. run timing for one pool key"""
+    builds: int = 0
+    build_seconds: float = 0.0
+    leases: int = 0
+    reuses: int = 0
+    runs: int = 0
+    run_seconds: float = 0.0
+    last_build_seconds: float = 0.0
+    last_run_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary with averages, suitable for logging or an API response."""
+        return {
+            "builds": self.builds,
+            "leases": self.leases,
+            "reuses": self.reuses,
+            "runs": self.runs,
+            "build_seconds": round(self.build_seconds, 3),
+            "run_seconds": round(self.run_seconds, 3),
+            "avg_build_seconds": round(self.build_seconds / self.builds, 3) if self.builds else 0.0,
+            "avg_run_seconds": round(self.run_seconds / self.runs, 3) if self.runs else 0.0,
+            "last_build_seconds": round(self.last_build_seconds, 3),
+            "last_run_seconds": round(self.last_run_seconds, 3),
+        }
+
+
+@dataclass
+class _PoolEntry:
+    idle: List[Any] = field(default_factory=list)
+    stats: GraphPoolStats = field(default_factory=GraphPoolStats)
+
+
+class GraphPool:
+    """
+    Builds TradingAgentsGraph instances once per configuration and reuses them.
+
+    Example:
+        pool = get_graph_pool()
+        with pool.lease(config=FAST_CONFIG, enable_rag=False) as graph:
+            final_state, signal = graph.propagate("AAPL", date.today())
+
+    A lease never blocks: if every warm instance for a key is busy, a new one
+    is built. At most ``max_idle_per_key`` instances are kept per key.
+    """
+
+    def __init__(self, max_idle_per_key: int = 2, graph_factory=None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_idle_per_key: Warm instances kept per configuration
+            graph_factory: Callable used to build graphs (defaults to TradingAgentsGraph)
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self._graph_factory = graph_factory
+        self._entries: Dict[str, _PoolEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        config: Optional[Dict[str, Any]] = None,
+        selected_analysts: Optional[List[str]] = None,
+        **graph_kwargs
+    ) -> str:
+        """
+        Stable key for a graph configuration.
+
+        Args:
+            config: Graph configuration (DEFAULT_CONFIG if None)
+            selected_analysts: Analyst set
+            **graph_kwargs: Remaining TradingAgentsGraph flags
+
+        Returns:
+            JSON string identifying the configuration
+        """
+        return json.dumps(
+            {
+                "config": config or DEFAULT_CONFIG,
+                "analysts": list(selected_analysts or ["market", "social", "news", "fundamentals"]),
+                "flags": graph_kwargs,
+            },
+            sort_keys=True,
+            default=str,
+        )
+
+    def _entry(self, key: str) -> _PoolEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _PoolEntry()
+            return entry
+
+    def _build(self, config, selected_analysts, db, graph_kwargs):
+        factory = self._graph_factory
+        if factory is None:
+            from tradingagents.graph.trading_graph import TradingAgentsGraph
+            factory = TradingAgentsGraph
+        kwargs = dict(graph_kwargs)
+        if selected_analysts is not None:
+            kwargs["selected_analysts"] = selected_analysts
+        if db is not None:
+            kwargs["db"] = db
+        # The graph writes to its config; keep the caller's dict (and DEFAULT_CONFIG) intact
+        return factory(config=copy.deepcopy(config or DEFAULT_CONFIG), **kwargs)
+
+    def acquire(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        selected_analysts: Optional[List[str]] = None,
+        db=None,
+        **graph_kwargs
+    ) -> Tuple[str, Any]:
+        """
+        Check out a graph for exclusive use; pair with release().
+
+        Args:
+            config: Graph configuration
+            selected_analysts: Analyst set
+            db: DatabaseConnection used only when a new graph is built
+            **graph_kwargs: Remaining TradingAgentsGraph flags (debug, enable_rag, ...)
+
+        Returns:
+            Tuple of (pool key, graph)
+        """
+        key, graph, _ = self._checkout(config, selected_analysts, db, graph_kwargs)
+        return key, graph
+
+    def _checkout(self, config, selected_analysts, db, graph_kwargs) -> Tuple[str, Any, bool]:
+        """acquire() that also reports whether a warm graph was reused."""
+        key = self.make_key(config, selected_analysts, **graph_kwargs)
+        entry = self._entry(key)
+
+        with self._lock:
+            graph = entry.idle.pop() if entry.idle else None
+            reused = graph is not None
+            entry.stats.leases += 1
+            if reused:
+                entry.stats.reuses += 1
+
+        if graph is None:
+            start = time.perf_counter()
+            graph = self._build(config, selected_analysts, db, graph_kwargs)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry.stats.builds += 1
+                entry.stats.build_seconds += elapsed
+                entry.stats.last_build_seconds = elapsed
+            logger.info(f"Built TradingAgentsGraph in {elapsed:.2f}s (pool builds: {entry.stats.builds})")
+        else:
+            graph.reset_run_state()
+
+        return key, graph, reused
+
+    def release(self, key: str, graph, run_seconds: Optional[float] = None):
+        """
+        Return a leased graph to the pool.
+
+        Args:
+            key: Key returned by acquire()
+            graph: The leased graph
+            run_seconds: Time spent running it, recorded in the stats
+        """
+        entry = self._entry(key)
+        graph.reset_run_state()
+        with self._lock:
+            if run_seconds is not None:
+                entry.stats.runs += 1
+                entry.stats.run_seconds += run_seconds
+                entry.stats.last_run_seconds = run_seconds
+            if len(entry.idle) < self.max_idle_per_key:
+                entry.idle.append(graph)
+
+    @contextmanager
+    def lease(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        selected_analysts: Optional[List[str]] = None,
+        db=None,
+        **graph_kwargs
+    ) -> Iterator[Any]:
+        """
+        Context manager around acquire()/release(); times the body as a run.
+
+        A graph whose run raised is discarded rather than returned to the pool.
+        """
+        key, graph = self.acquire(config, selected_analysts, db, **graph_kwargs)
+        start = time.perf_counter()
+        yield graph
+        self.release(key, graph, run_seconds=time.perf_counter() - start)
+
+    def propagate(
+        self,
+        company_name: str,
+        trade_date,
+        store_analysis: bool = False,
+        config: Optional[Dict[str, Any]] = None,
+        selected_analysts: Optional[List[str]] = None,
+        db=None,
+        **graph_kwargs
+    ) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+        """
+        Run one analysis on a pooled graph.
+
+        Args:
+            company_name: Ticker symbol to analyze
+            trade_date: Date of analysis
+            store_analysis: Whether to store analysis results to database
+            config: Graph configuration
+            selected_analysts: Analyst set
+            db: DatabaseConnection used only when a new graph is built
+            **graph_kwargs: Remaining TradingAgentsGraph flags
+
+        Returns:
+            Tuple of (final_state, processed_signal, timing) where timing has
+            construction_seconds (0 when a warm graph was reused), run_seconds
+            and graph_reused.
+        """
+        start = time.perf_counter()
+        key, graph, reused = self._checkout(config, selected_analysts, db, graph_kwargs)
+        construction_seconds = time.perf_counter() - start
+
+        run_start = time.perf_counter()
+        final_state, processed_signal = graph.propagate(
+            company_name, trade_date, store_analysis=store_analysis
+        )
+        run_seconds = time.perf_counter() - run_start
+        self.release(key, graph, run_seconds=run_seconds)
+
+        timing = {
+            "construction_seconds": round(construction_seconds, 3),
+            "run_seconds": round(run_seconds, 3),
+            "graph_reused": reused,
+        }
+        logger.info(
+            f"Analysis of {company_name}: construction {timing['construction_seconds']}s, "
+            f"run {timing['run_seconds']}s (reused: {timing['graph_reused']})"
+        )
+        return final_state, processed_signal, timing
+
+    async def astream_propagate(
+        self,
+        company_name: str,
+        trade_date,
+        store_analysis: bool = False,
+        config: Optional[Dict[str, Any]] = None,
+        selected_analysts: Optional[List[str]] = None,
+        db=None,
+        **graph_kwargs
+    ) -> AsyncIterator[Any]:
+        """
+        Stream one analysis on a pooled graph (see TradingAgentsGraph.astream_propagate).
+
+        The graph is returned to the pool once the COMPLETED event has been
+        delivered. A run that fails or is cancelled discards its graph, since
+        a node may still be finishing on an executor thread.
+
+        Yields:
+            PropagationEvent objects
+        """
+        from tradingagents.graph.streaming import PropagationEventType
+
+        key, graph = await asyncio.to_thread(
+            self.acquire, config, selected_analysts, db, **graph_kwargs
+        )
+        start = time.perf_counter()
+        completed = False
+        try:
+            async for event in graph.astream_propagate(company_name, trade_date, store_analysis=store_analysis):
+                completed = event.type == PropagationEventType.COMPLETED
+                yield event
+        finally:
+            if completed:
+                self.release(key, graph, run_seconds=time.perf_counter() - start)
+            else:
+                logger.info(f"Discarding graph after interrupted streaming run for {company_name}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-configuration timing stats keyed by analyst set and LLM models."""
+        with self._lock:
+            items = list(self._entries.items())
+        report = {}
+        for key, entry in items:
+            spec = json.loads(key)
+            label = (
+                f"{'+'.join(spec['analysts'])} "
+                f"[{spec['config'].get('quick_think_llm')}/{spec['config'].get('deep_think_llm')}]"
+            )
+            stats = entry.stats.to_dict()
+            stats["idle"] = len(entry.idle)
+            report[label] = stats
+        return report
+
+    def clear(self):
+        """Drop all warm graphs and stats."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+_graph_pool: Optional[GraphPool] = None
+_graph_pool_lock = threading.Lock()
+
+
+def get_graph_pool() -> GraphPool:
+    """Get the global graph pool."""
+    global _graph_pool
+    with _graph_pool_lock:
+        if _graph_pool is None:
+            _graph_pool = GraphPool()
+    return _graph_pool
@@ -0,0 +1,170 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+# TradingAgents/graph/streaming.py
+
+"""
+Typed progress events for TradingAgentsGraph.astream_propagate.
+
+Events are derived from the per-node state updates LangGraph streams, so a
+client sees each analyst report, debate round, trader plan and risk verdict
+as soon as the node that produced it finishes.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class PropagationEventType(str, Enum):
+    """Kinds of events emitted while the graph runs."""
+    STARTED = "started"
+    ANALYST_REPORT = "analyst_report"
+    DEBATE_ROUND = "debate_round"
+    INVESTMENT_PLAN = "investment_plan"
+    TRADER_PLAN = "trader_plan"
+    RISK_ROUND = "risk_round"
+    RISK_VERDICT = "risk_verdict"
+    TOKEN_USAGE = "token_usage"
+    COMPLETED = "completed"
+
+
+@dataclass
+class PropagationEvent:
+    """One progress event from a streaming propagation."""
+    type: PropagationEventType
+    sequence: int
+    elapsed: float  # Seconds since the run started
+    node: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self, include_state: bool = False) -> Dict[str, Any]:
+        """
+        JSON-friendly form (e.g. for Server-Sent Events).
+
+        Args:
+            include_state: Keep the full final state on COMPLETED events
+        """
+        data = self.data
+        if not include_state and "final_state" in data:
+            data = {k: v for k, v in data.items() if k != "final_state"}
+        return {
+            "type": self.type.value,
+            "sequence": self.sequence,
+            "elapsed": self.elapsed,
+            "node": self.node,
+            "data": data,
+        }
+
+
+# State keys written by the analyst nodes -> analyst type
+ANALYST_REPORT_KEYS = {
+    "market_report": "market",
+    "sentiment_report": "social",
+    "news_report": "news",
+    "fundamentals_report": "fundamentals",
+}
+
+
+def extract_events(node: str, update: Any) -> List[Tuple[PropagationEventType, Dict[str, Any]]]:
+    """
+    Events contained in one node's state update.
+
+    Args:
+        node: Graph node name (e.g. "Bull Researcher")
+        update: State update returned by the node
+
+    Returns:
+        List of (event type, data) in the order they should be emitted
+    """
+    if not isinstance(update, dict):
+        return []
+
+    events: List[Tuple[PropagationEventType, Dict[str, Any]]] = []
+
+    for key, analyst in ANALYST_REPORT_KEYS.items():
+        report = update.get(key)
+        if report:
+            events.append((PropagationEventType.ANALYST_REPORT, {"analyst": analyst, "report": report}))
+
+    debate = update.get("investment_debate_state")
+    if update.get("investment_plan"):
+        events.append((PropagationEventType.INVESTMENT_PLAN, {"plan": update["investment_plan"]}))
+    elif isinstance(debate, dict) and debate.get("current_response"):
+        argument = debate["current_response"]
+        speaker = "bull" if node.startswith("Bull") or argument.startswith("Bull") else "bear"
+        events.append((PropagationEventType.DEBATE_ROUND, {
+            "round": debate.get("count", 0),
+            "speaker": speaker,
+            "argument": argument,
+        }))
+
+    if update.get("trader_investment_plan"):
+        events.append((PropagationEventType.TRADER_PLAN, {"plan": update["trader_investment_plan"]}))
+
+    risk = update.get("risk_debate_state")
+    if update.get("final_trade_decision"):
+        events.append((PropagationEventType.RISK_VERDICT, {"decision": update["final_trade_decision"]}))
+    elif isinstance(risk, dict) and risk.get("latest_speaker"):
+        speaker = risk["latest_speaker"].lower()
+        events.append((PropagationEventType.RISK_ROUND, {
+            "round": risk.get("count", 0),
+            "speaker": speaker,
+            "argument": risk.get(f"current_{speaker}_response", ""),
+        }))
+
+    return events
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """
+    Accumulates LLM token usage reported by the providers during a run.
+
+    Thread-safe: graph nodes run on executor threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.llm_calls = 0
+
+    def on_llm_end(self, response, **kwargs):
+        prompt = completion = total = cached = 0
+        found = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    found = True
+                    prompt += usage.get("input_tokens", 0)
+                    completion += usage.get("output_tokens", 0)
+                    total += usage.get("total_tokens", 0)
+                    cached += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        if not found:
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt = usage.get("prompt_tokens", 0)
+            completion = usage.get("completion_tokens", 0)
+            total = usage.get("total_tokens", 0)
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+            self.total_tokens += total or (prompt + completion)
+            self.cached_prompt_tokens += cached
+
+    def snapshot(self) -> Dict[str, int]:
+        """Cumulative usage so far."""
+        with self._lock:
+            return {
+                "llm_calls": self.llm_calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.total_tokens,
+                "cached_prompt_tokens": self.cached_prompt_tokens,
+            }
@@ -3,12 +3,18 @@
 
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
+import concurrent.futures
+import contextvars
+import itertools
 import os
+import threading
+import time
 from pathlib import Path
 import json
 from datetime import date
 from decimal import Decimal
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, AsyncIterator
 import logging
 
 from langchain_openai import ChatOpenAI
@@ -19,7 +25,8 @@ from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory import FinancialSituationMemory, SituationMemoryRun
+from tradingagents.agents.utils.prompt_cache import PromptAssembler
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -46,13 +53,15 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .streaming import PropagationEvent, PropagationEventType, TokenUsageCallback, extract_events
 
 # RAG and database imports
 from tradingagents.database import get_db_connection, DatabaseConnection, TickerOperations
 from tradingagents.rag import EmbeddingGenerator, ContextRetriever, PromptFormatter
 from tradingagents.decision import FourGateFramework, GateResult
 from tradingagents.validation.circuit_breaker import check_circuit_breaker, CircuitBreakerException
-from tradingagents.market.regime import detect_market_regime
+from tradingagents.market.regime import get_market_regime
+from tradingagents.utils.startup_timing import get_startup_timer
 
 # Langfuse integration (optional)
 try:
@@ -84,9 +93,28 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Node updates buffered between the graph thread and an astream_propagate consumer
+STREAM_QUEUE_SIZE = 8
+
 
 class TradingAgentsGraph:
-    """Main class that orchestrates the trading agents framework."""
+    """Main class that orchestrates the trading agents framework.
+
+    Components that are not needed to compile the graph (RAG, profitability
+    enhancer, market regime, role memories) are built on first use; their
+    init times are recorded in the startup timer (see utils/startup_timing.py).
+    """
+
+    # Attribute -> initializer for lazily built components
+    _LAZY_ATTRIBUTES = {
+        "db": "_init_rag",
+        "ticker_ops": "_init_rag",
+        "embedding_generator": "_init_rag",
+        "context_retriever": "_init_rag",
+        "prompt_formatter": "_init_rag",
+        "four_gate_framework": "_init_rag",
+        "profitability_enhancer": "_init_profitability_enhancer",
+    }
 
     def __init__(
         self,
@@ -119,13 +147,20 @@ class TradingAgentsGraph:
             enable_filesystem: Whether to enable filesystem middleware (default: True)
             enable_subagents: Whether to enable sub-agent delegation middleware (default: True)
         """
+        timer = get_startup_timer()
+        init_start = time.perf_counter()
+
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
         self.enable_rag = enable_rag
         self.enable_langfuse = enable_langfuse
         self.selected_analysts = selected_analysts
-        
-        # Initialize middleware
+        self._db_arg = db
+        self._profitability_config = config
+        self.market_regime = None
+
+        # Initialize middleware (tools are bound into the graph, so not lazy)
+        middleware_start = time.perf_counter()
         self.middleware = middleware or []
         
         # Add default middleware if enabled and available
@@ -148,10 +183,17 @@ class TradingAgentsGraph:
                     isinstance(mw, SummarizationMiddleware) for mw in self.middleware
                 )
                 if not has_summarization:
+                    # Share the token tracking middleware's tracker (and its count cache)
+                    shared_tracker = next(
+                        (mw.tracker for mw in self.middleware
+                         if TokenTrackingMiddleware and isinstance(mw, TokenTrackingMiddleware)),
+                        None
+                    )
                     summarization_middleware = SummarizationMiddleware(
                         token_threshold=self.config.get("summarization_threshold", 50000),
                         summarization_model=self.config.get("summarization_model", "gpt-4o-mini"),
-                        llm_provider=self.config.get("llm_provider", "openai")
+                        llm_provider=self.config.get("llm_provider", "openai"),
+                        tracker=shared_tracker
                     )
                     self.middleware.append(summarization_middleware)
                     logger.info("✓ Summarization middleware enabled")
@@ -195,6 +237,7 @@ class TradingAgentsGraph:
         
         if self.middleware_tools:
             logger.info(f"✓ Loaded {len(self.middleware_tools)} middleware tools")
+        timer.record("middleware", time.perf_counter() - middleware_start)
         
         # Initialize Langfuse tracer if available and enabled
         self.langfuse_tracer = None
@@ -210,66 +253,20 @@ class TradingAgentsGraph:
         # Update the interface's config
         set_config(self.config)
 
-        # Adaptive Configuration based on Market Regime
-        if self.config.get("enable_adaptive_config", True):
-            regime = detect_market_regime()
-            logger.info(f"Detected Market Regime: {regime}")
-            
-            if regime == "BEAR":
-                self.config["max_risk_discuss_rounds"] = 3 # More caution
-                logger.info("Adjusted risk discussion rounds to 3 (Bear Market)")
-            elif regime == "VOLATILE":
-                self.config["max_risk_discuss_rounds"] = 5 # Max caution
-                logger.info("Adjusted risk discussion rounds to 5 (Volatile Market)")
-            else: # BULL
-                self.config["max_risk_discuss_rounds"] = 1 # Standard
-                logger.info("Adjusted risk discussion rounds to 1 (Bull Market)")
-
         # Create necessary directories
         os.makedirs(
             os.path.join(self.config["project_dir"], "dataflows/data_cache"),
             exist_ok=True,
         )
 
-        # Initialize RAG components if enabled
-        if self.enable_rag:
-            try:
-                self.db = db or get_db_connection()
-                self.ticker_ops = TickerOperations(self.db)
-                self.embedding_generator = EmbeddingGenerator()
-                self.context_retriever = ContextRetriever(self.db)
-                self.prompt_formatter = PromptFormatter()
-                self.four_gate_framework = FourGateFramework()
-                logger.info("✓ RAG system initialized")
-            except Exception as e:
-                logger.warning(f"⚠ RAG initialization failed: {e}. Running without RAG.")
-                self.enable_rag = False
-        else:
+        # RAG components, profitability enhancer and market regime are
+        # initialized on first use (see _init_rag, _init_profitability_enhancer,
+        # _apply_adaptive_config)
+        if not self.enable_rag:
             logger.info("RAG system disabled")
-        
-        # Initialize profitability enhancer (optional)
-        self.profitability_enhancer = None
-        if config and config.get("enable_profitability_features", False):
-            try:
-                from tradingagents.graph.profitability_enhancer import ProfitabilityEnhancer
-                portfolio_value = config.get("portfolio_value")
-                if portfolio_value:
-                    portfolio_value = Decimal(str(portfolio_value))
-                
-                self.profitability_enhancer = ProfitabilityEnhancer(
-                    portfolio_value=portfolio_value,
-                    enable_regime_detection=config.get("enable_regime_detection", True),
-                    enable_sector_rotation=config.get("enable_sector_rotation", True),
-                    enable_correlation_check=config.get("enable_correlation_check", True),
-                    db=self.db if self.enable_rag else None
-                )
-                logger.info("✓ Profitability enhancer initialized")
-            except Exception as e:
-                logger.warning(f"⚠ Profitability enhancer initialization failed: {e}")
-                self.profitability_enhancer = None
-
 
         # Initialize LLMs
+        llm_start = time.perf_counter()
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
             # For Ollama, we need to set a dummy API key since it doesn't require authentication
             # Always explicitly pass the API key to avoid LangChain reading from environment
@@ -314,19 +311,27 @@ class TradingAgentsGraph:
             self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
-        # Initialize memories
+        timer.record("llm_clients", time.perf_counter() - llm_start)
+
+        # Initialize memories (ChromaDB collections are created on first lookup)
         self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
         self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
         self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
         self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
         self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        # One situation embedding and query pass per run, shared by the five memories
+        self.memory_run = SituationMemoryRun([
+            self.bull_memory, self.bear_memory, self.trader_memory,
+            self.invest_judge_memory, self.risk_manager_memory,
+        ])
 
         # Create tool nodes
+        compile_start = time.perf_counter()
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
         self.conditional_logic = ConditionalLogic()
+        self.prompt_assembler = PromptAssembler(provider=self.config["llm_provider"])
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -337,6 +342,7 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            self.prompt_assembler,
         )
 
         self.propagator = Propagator()
@@ -350,6 +356,95 @@ class TradingAgentsGraph:
 
         # Set up the graph
         self.graph = self.graph_setup.setup_graph(selected_analysts)
+        timer.record("graph_compile", time.perf_counter() - compile_start)
+        timer.record("TradingAgentsGraph.__init__", time.perf_counter() - init_start)
+
+    def __getattr__(self, name):
+        """Build lazily initialized components on first access."""
+        initializer = TradingAgentsGraph._LAZY_ATTRIBUTES.get(name)
+        if initializer is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        getattr(self, initializer)()
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def _init_rag(self):
+        """Initialize RAG components (DB connection, embeddings, retriever, gates)."""
+        with get_startup_timer().measure("rag"):
+            self.db = self._db_arg
+            self.ticker_ops = None
+            self.embedding_generator = None
+            self.context_retriever = None
+            self.prompt_formatter = None
+            self.four_gate_framework = None
+            if not self.enable_rag:
+                return
+            try:
+                self.db = self._db_arg or get_db_connection()
+                self.ticker_ops = TickerOperations(self.db)
+                self.embedding_generator = EmbeddingGenerator()
+                self.context_retriever = ContextRetriever(self.db)
+                self.prompt_formatter = PromptFormatter()
+                self.four_gate_framework = FourGateFramework()
+                logger.info("✓ RAG system initialized")
+            except Exception as e:
+                logger.warning(f"⚠ RAG initialization failed: {e}. Running without RAG.")
+                self.enable_rag = False
+
+    def _ensure_rag(self) -> bool:
+        """Initialize RAG if enabled and not yet built; returns whether RAG is usable."""
+        if self.enable_rag and "ticker_ops" not in self.__dict__:
+            self._init_rag()
+        return self.enable_rag
+
+    def _init_profitability_enhancer(self):
+        """Initialize the profitability enhancer (optional, config-driven)."""
+        self.profitability_enhancer = None
+        config = self._profitability_config
+        if not (config and config.get("enable_profitability_features", False)):
+            return
+        with get_startup_timer().measure("profitability_enhancer"):
+            try:
+                from tradingagents.graph.profitability_enhancer import ProfitabilityEnhancer
+                portfolio_value = config.get("portfolio_value")
+                if portfolio_value:
+                    portfolio_value = Decimal(str(portfolio_value))
+
+                self.profitability_enhancer = ProfitabilityEnhancer(
+                    portfolio_value=portfolio_value,
+                    enable_regime_detection=config.get("enable_regime_detection", True),
+                    enable_sector_rotation=config.get("enable_sector_rotation", True),
+                    enable_correlation_check=config.get("enable_correlation_check", True),
+                    db=self.db if self._ensure_rag() else None
+                )
+                logger.info("✓ Profitability enhancer initialized")
+            except Exception as e:
+                logger.warning(f"⚠ Profitability enhancer initialization failed: {e}")
+                self.profitability_enhancer = None
+
+    def _apply_adaptive_config(self):
+        """Adjust risk discussion rounds to the market regime (detected once per trading day)."""
+        if not self.config.get("enable_adaptive_config", True):
+            return
+
+        with get_startup_timer().measure("market_regime"):
+            regime = get_market_regime()
+        if regime == self.market_regime:
+            return
+        self.market_regime = regime
+        logger.info(f"Detected Market Regime: {regime}")
+
+        if regime == "BEAR":
+            self.config["max_risk_discuss_rounds"] = 3 # More caution
+            logger.info("Adjusted risk discussion rounds to 3 (Bear Market)")
+        elif regime == "VOLATILE":
+            self.config["max_risk_discuss_rounds"] = 5 # Max caution
+            logger.info("Adjusted risk discussion rounds to 5 (Volatile Market)")
+        else: # BULL
+            self.config["max_risk_discuss_rounds"] = 1 # Standard
+            logger.info("Adjusted risk discussion rounds to 1 (Bull Market)")
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
@@ -401,7 +496,199 @@ class TradingAgentsGraph:
         Returns:
             Tuple of (final_state, processed_signal)
         """
+        init_agent_state, args = self._start_run(company_name, trade_date)
+        if args is None:
+            # Circuit breaker tripped: safe "WAIT" state
+            return init_agent_state, "WAIT"
+
+        try:
+            if self.debug:
+                # Debug mode with tracing (only the latest chunk is kept)
+                final_state = None
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        # Apply middleware post-processing to each chunk
+                        for mw in self.middleware:
+                            chunk = mw.post_process(chunk)
+                        final_state = chunk
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+
+                # Apply middleware post-processing to final state
+                for mw in self.middleware:
+                    final_state = mw.post_process(final_state)
+        finally:
+            # A failed run must not leave its memory matches active
+            self.memory_run.end_run()
+
+        return self._finish_run(company_name, trade_date, final_state, store_analysis)
+
+    async def astream_propagate(
+        self,
+        company_name,
+        trade_date,
+        store_analysis: bool = False
+    ) -> AsyncIterator[PropagationEvent]:
+        """Run the graph and yield typed progress events as nodes finish.
+
+        Events: STARTED, ANALYST_REPORT, DEBATE_ROUND, INVESTMENT_PLAN,
+        TRADER_PLAN, RISK_ROUND, RISK_VERDICT, TOKEN_USAGE (after nodes that
+        called an LLM) and finally COMPLETED with the processed signal and
+        final state. Only the latest graph state is held, never a trace.
+
+        The graph runs on a worker thread that hands node updates over a
+        bounded queue. Closing the generator (``aclose()``, breaking out of
+        ``async for`` or cancelling the consuming task, e.g. on client
+        disconnect) stops the run: the node in flight finishes but no
+        further LLM calls are made.
+
+        Args:
+            company_name: Ticker symbol to analyze
+            trade_date: Date of analysis
+            store_analysis: Whether to store analysis results to database
+
+        Yields:
+            PropagationEvent objects
+        """
+        started = time.perf_counter()
+        sequence = itertools.count()
+        usage = TokenUsageCallback()
+
+        def event(event_type, node="", **data):
+            return PropagationEvent(
+                type=event_type,
+                sequence=next(sequence),
+                elapsed=round(time.perf_counter() - started, 3),
+                node=node,
+                data=data
+            )
+
+        yield event(PropagationEventType.STARTED, ticker=company_name, trade_date=str(trade_date))
+
+        # Setup does blocking I/O (regime detection, RAG retrieval)
+        init_agent_state, args = await asyncio.to_thread(
+            self._start_run, company_name, trade_date, [usage]
+        )
+        if args is None:
+            yield event(
+                PropagationEventType.COMPLETED,
+                signal="WAIT",
+                final_trade_decision=init_agent_state.get("final_trade_decision", "WAIT"),
+                reason=init_agent_state.get("reason", ""),
+                final_state=init_agent_state
+            )
+            return
+
+        args = dict(args, stream_mode=["updates", "values"])
+        loop = asyncio.get_running_loop()
+        # Bounded hand-off: the graph thread blocks while the consumer is behind
+        updates: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def put(item):
+            if stop.is_set():
+                return
+            try:
+                future = asyncio.run_coroutine_threadsafe(updates.put(item), loop)
+            except RuntimeError:
+                return  # Consumer's event loop is gone
+            while not stop.is_set():
+                try:
+                    return future.result(timeout=0.1)
+                except concurrent.futures.TimeoutError:
+                    continue
+            future.cancel()
+
+        def run_graph():
+            # The sync stream keeps LangChain's callback context on Python 3.10,
+            # where graph.astream would drop it for sync nodes
+            final_state = None
+            stream = self.graph.stream(init_agent_state, **args)
+            try:
+                for mode, chunk in stream:
+                    if stop.is_set():
+                        break
+                    if mode == "values":
+                        final_state = chunk  # Only the latest state is kept
+                    else:
+                        put(("updates", chunk))
+                put(("done", final_state))
+            except Exception as e:
+                put(("error", e))
+            finally:
+                stream.close()
+
+        # Baseline before the graph thread starts, or a fast first LLM call
+        # would be folded into it and never reported
+        last_usage = usage.snapshot()
+        worker = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(run_graph,),
+            name=f"propagate-{company_name}",
+            daemon=True
+        )
+
+        final_state = None
+        try:
+            worker.start()
+            while True:
+                kind, payload = await updates.get()
+                if kind == "error":
+                    raise payload
+                if kind == "done":
+                    final_state = payload
+                    break
+                for node, update in payload.items():
+                    for event_type, data in extract_events(node, update):
+                        yield event(event_type, node, **data)
+                    current_usage = usage.snapshot()
+                    if current_usage != last_usage:
+                        last_usage = current_usage
+                        yield event(PropagationEventType.TOKEN_USAGE, node, **current_usage)
+        finally:
+            # On cancellation the node in flight finishes, then the graph stops
+            stop.set()
+            self.memory_run.end_run()
+
+        if final_state is None:
+            raise RuntimeError(f"Graph produced no state for {company_name}")
+
+        def finish(state):
+            for mw in self.middleware:
+                state = mw.post_process(state)
+            return self._finish_run(company_name, trade_date, state, store_analysis)
+
+        # Middleware, signal processing and storage block; keep them off the loop
+        final_state, processed_signal = await asyncio.to_thread(finish, final_state)
+        yield event(
+            PropagationEventType.COMPLETED,
+            signal=processed_signal,
+            final_trade_decision=final_state.get("final_trade_decision", ""),
+            token_usage=usage.snapshot(),
+            final_state=final_state
+        )
+
+    def _start_run(self, company_name, trade_date, callbacks: Optional[List] = None):
+        """Prepare a run: adaptive config, circuit breaker, RAG context, initial state.
+
+        Args:
+            company_name: Ticker symbol to analyze
+            trade_date: Date of analysis
+            callbacks: Extra LangChain callback handlers for the run
+
+        Returns:
+            Tuple of (initial_state, graph_args), or (wait_state, None) when
+            the circuit breaker blocks the ticker
+        """
         self.ticker = company_name
+        self.prompt_assembler.reset()
+
+        # Adaptive Configuration based on Market Regime
+        self._apply_adaptive_config()
 
         # Circuit Breaker Check
         if self.config.get("validation", {}).get("enable_circuit_breaker", True):
@@ -409,17 +696,16 @@ class TradingAgentsGraph:
                 check_circuit_breaker(company_name)
             except CircuitBreakerException as e:
                 logger.error(f"Circuit breaker triggered: {e}")
-                # Return a safe "WAIT" state
                 return {
                     "final_trade_decision": "WAIT",
                     "reason": str(e),
                     "company_of_interest": company_name,
                     "trade_date": trade_date
-                }, "WAIT"
+                }, None
 
         # Generate historical context if RAG is enabled
         historical_context = None
-        if self.enable_rag:
+        if self._ensure_rag():
             historical_context = self._generate_historical_context(company_name)
 
         # Initialize state with historical context
@@ -432,7 +718,7 @@ class TradingAgentsGraph:
             init_agent_state = mw.pre_process(init_agent_state)
         
         # Get Langfuse callback handler if enabled
-        langfuse_callbacks = []
+        run_callbacks = list(callbacks or [])
         if self.langfuse_tracer and self.langfuse_tracer.enabled:
             # Create trace name and metadata for better trace identification
             trace_name = f"Stock Analysis: {company_name}"
@@ -448,7 +734,7 @@ class TradingAgentsGraph:
                 metadata=trace_metadata
             )
             if callback_handler:
-                langfuse_callbacks.append(callback_handler)
+                run_callbacks.append(callback_handler)
                 # Note: trace_analysis is a no-op in v3 (auto-tracing via handler)
                 self.langfuse_tracer.trace_analysis(
                     ticker=company_name,
@@ -457,30 +743,16 @@ class TradingAgentsGraph:
                 )
         
         # Get graph args with callbacks
-        args = self.propagator.get_graph_args(callbacks=langfuse_callbacks if langfuse_callbacks else None)
-
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    # Apply middleware post-processing to each chunk
-                    for mw in self.middleware:
-                        chunk = mw.post_process(chunk)
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
-            
-            # Apply middleware post-processing to final state
-            for mw in self.middleware:
-                final_state = mw.post_process(final_state)
+        args = self.propagator.get_graph_args(callbacks=run_callbacks if run_callbacks else None)
+        self.memory_run.begin_run()
+        return init_agent_state, args
+
+    def _finish_run(self, company_name, trade_date, final_state, store_analysis: bool = False):
+        """Post-run steps shared by propagate and astream_propagate.
 
+        Returns:
+            Tuple of (final_state, processed_signal)
+        """
         # Store current state for reflection
         self.curr_state = final_state
 
@@ -501,7 +773,7 @@ class TradingAgentsGraph:
                 logger.warning(f"⚠ Error enhancing analysis: {e}")
 
         # Optionally store analysis to database
-        if store_analysis and self.enable_rag:
+        if store_analysis and self._ensure_rag():
             self._store_analysis(company_name, trade_date, final_state)
 
         # Add profitability enhancements to final state if available
@@ -517,6 +789,17 @@ class TradingAgentsGraph:
                         logger.info(f"Token usage summary: {token_summary}")
                         final_state["_token_usage_summary"] = token_summary
 
+        # Cached vs. fresh prompt tokens of the debate and manager nodes
+        prompt_cache = self.prompt_assembler.get_stats()
+        if prompt_cache["total"]["calls"]:
+            cached_tokens = prompt_cache['total']['cached_tokens']
+            logger.info(
+                f"Prompt cache ({prompt_cache['mode']}): "
+                f"{'unknown' if cached_tokens is None else cached_tokens}/"
+                f"{prompt_cache['total']['prompt_tokens']} prompt tokens cached"
+            )
+            final_state["_prompt_cache"] = prompt_cache
+
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
@@ -562,6 +845,16 @@ class TradingAgentsGraph:
         ) as f:
             json.dump(self.log_states_dict, f, indent=4)
 
+    def reset_run_state(self):
+        """Clear per-run state so the compiled graph can be reused for another request."""
+        self.curr_state = None
+        self.ticker = None
+        self.log_states_dict = {}
+        self.prompt_assembler.reset()
+        for mw in self.middleware:
+            if hasattr(mw, "reset"):
+                mw.reset()
+
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
         self.reflector.reflect_bull_researcher(
@@ -0,0 +1,107 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+NYSE trading-day calendar.
+
+Built on pandas holiday rules (no extra dependency). Covers the regular
+exchange holidays; one-off closures (e.g. national days of mourning) are not
+included, so callers should tolerate a "trading day" without data.
+"""
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Regular NYSE full-day holidays."""
+    rules = [
+        # The exchange does not close on the Friday before a Saturday New Year's Day
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+@lru_cache(maxsize=64)
+def _holidays(year: int) -> frozenset:
+    days = NYSEHolidayCalendar().holidays(start=f"{year}-01-01", end=f"{year}-12-31")
+    return frozenset(day.date() for day in days)
+
+
+def is_trading_day(day: date) -> bool:
+    """Whether the exchange is open on ``day``."""
+    return day.weekday() < 5 and day not in _holidays(day.year)
+
+
+def trading_days(start: date, end: date) -> List[date]:
+    """Trading days in [start, end], ascending."""
+    days = []
+    day = start
+    while day <= end:
+        if is_trading_day(day):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def previous_trading_day(day: date) -> date:
+    """Most recent trading day on or before ``day``."""
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def trading_day_segments(days: Sequence[date], calendar_days: Sequence[date]) -> List[Tuple[date, date]]:
+    """
+    Group ``days`` into runs that are consecutive on the trading calendar.
+
+    Args:
+        days: Subset of ``calendar_days`` (e.g. missing days)
+        calendar_days: Ascending trading days of the window
+
+    Returns:
+        List of inclusive (first, last) segments; Friday and the following
+        Monday belong to the same segment
+    """
+    wanted = set(days)
+    segments: List[Tuple[date, date]] = []
+    run_start = previous = None
+    for day in calendar_days:
+        if day in wanted:
+            if run_start is None:
+                run_start = day
+            previous = day
+        elif run_start is not None:
+            segments.append((run_start, previous))
+            run_start = None
+    if run_start is not None:
+        segments.append((run_start, previous))
+    return segments
+
+
+def to_timestamp_index(days: Sequence[date]) -> pd.DatetimeIndex:
+    """Trading days as a DatetimeIndex (the index used by price frames)."""
+    return pd.DatetimeIndex([pd.Timestamp(day) for day in days], name="Date")
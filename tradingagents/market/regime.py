@@ -1,16 +1,26 @@
 # Copyright (c) 2024. All rights reserved.
 # Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
 
+import threading
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
 
-def detect_market_regime(ticker: str = "SPY") -> str:
+# (ticker, trading day) -> regime
+_regime_cache: Dict[Tuple[str, date], str] = {}
+_regime_lock = threading.Lock()
+
+def detect_market_regime(ticker: str = "SPY", fallback: Optional[str] = "VOLATILE") -> Optional[str]:
     """
     Detect the current market regime based on a benchmark ticker (default SPY).
     
+    Args:
+        ticker: Benchmark ticker
+        fallback: Returned when no data could be fetched or detection failed
+    
     Returns:
-        "BULL", "BEAR", or "VOLATILE"
+        "BULL", "BEAR", or "VOLATILE" (``fallback`` on failure)
     """
     try:
         stock = yf.Ticker(ticker)
@@ -18,7 +28,7 @@ def detect_market_regime(ticker: str = "SPY") -> str:
         hist = stock.history(period="6mo")
         
         if hist.empty:
-            return "VOLATILE" # Default fallback
+            return fallback
             
         # Calculate 50-day and 200-day SMA
         hist['SMA50'] = hist['Close'].rolling(window=50).mean()
@@ -38,4 +48,44 @@ def detect_market_regime(ticker: str = "SPY") -> str:
             
     except Exception as e:
         print(f"Error detecting market regime: {e}")
+        return fallback
+
+
+def last_trading_day(day: Optional[date] = None) -> date:
+    """Most recent weekday on or before ``day`` (defaults to today)."""
+    day = day or date.today()
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def get_market_regime(ticker: str = "SPY", trading_day: Optional[date] = None) -> str:
+    """
+    Market regime, detected at most once per trading day.
+
+    The regime uses daily closes, so it cannot change within a trading day;
+    weekends reuse Friday's result. A failed detection returns "VOLATILE"
+    without caching it, so the next call tries again.
+
+    Args:
+        ticker: Benchmark ticker
+        trading_day: Day to cache under (defaults to the last trading day)
+
+    Returns:
+        "BULL", "BEAR", or "VOLATILE"
+    """
+    key = (ticker, last_trading_day(trading_day))
+    with _regime_lock:
+        if key in _regime_cache:
+            return _regime_cache[key]
+
+    regime = detect_market_regime(ticker, fallback=None)
+    if regime is None:
         return "VOLATILE"
+
+    with _regime_lock:
+        # Keep only the current day's entries
+        for stale_key in [k for k in _regime_cache if k[1] != key[1]]:
+            del _regime_cache[stale_key]
+        _regime_cache[key] = regime
+    return regime
@@ -11,6 +11,7 @@ Inspired by deepagents architecture patterns.
 """
 
 from .base import TradingMiddleware
+from .token_tracker import TokenTracker
 from .token_tracking import TokenTrackingMiddleware
 from .summarization import SummarizationMiddleware
 from .todolist import TodoListMiddleware
@@ -19,6 +20,7 @@ from .subagent import SubAgentMiddleware, SubAgentDefinition
 
 __all__ = [
     "TradingMiddleware",
+    "TokenTracker",
     "TokenTrackingMiddleware",
     "SummarizationMiddleware",
     "TodoListMiddleware",
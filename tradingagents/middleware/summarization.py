@@ -35,7 +35,8 @@ class SummarizationMiddleware(TradingMiddleware):
         llm_provider: str = "openai",
         preserve_key_info: bool = True,
         summarize_analyst_reports: bool = True,
-        summarize_debates: bool = True
+        summarize_debates: bool = True,
+        tracker: Optional[TokenTracker] = None
     ):
         """
         Initialize summarization middleware.
@@ -47,6 +48,8 @@ class SummarizationMiddleware(TradingMiddleware):
             preserve_key_info: Whether to preserve key data points in summaries
             summarize_analyst_reports: Whether to summarize analyst team outputs
             summarize_debates: Whether to summarize debate histories
+            tracker: TokenTracker to share (e.g. the token tracking middleware's),
+                so state text already counted is not encoded again
         """
         self.token_threshold = token_threshold
         self.summarization_model = summarization_model
@@ -55,15 +58,26 @@ class SummarizationMiddleware(TradingMiddleware):
         self.summarize_analyst_reports = summarize_analyst_reports
         self.summarize_debates = summarize_debates
         
-        # Initialize LLM for summarization
-        self.llm = self._create_llm()
-        self.tracker = TokenTracker(model="gpt-4o")  # For counting tokens
+        # LLM for summarization is created on first use
+        self._llm = None
+        self.tracker = tracker or TokenTracker(model="gpt-4o")  # For counting tokens
         
         logger.info(
             f"Initialized SummarizationMiddleware "
             f"(threshold: {token_threshold}, model: {summarization_model})"
         )
     
+    @property
+    def llm(self):
+        """LLM used for summarization (created on first use)."""
+        if self._llm is None:
+            self._llm = self._create_llm()
+        return self._llm
+
+    @llm.setter
+    def llm(self, value):
+        self._llm = value
+
     def _create_llm(self):
         """Create LLM instance for summarization."""
         if self.llm_provider == "openai":
@@ -244,10 +258,8 @@ Provide concise summary (max 800 tokens) with clear structure."""
             ]):
                 # Check if analyst reports are large
                 analyst_tokens = sum([
-                    self.tracker.count_tokens(state.get("market_report", "")),
-                    self.tracker.count_tokens(state.get("sentiment_report", "")),
-                    self.tracker.count_tokens(state.get("news_report", "")),
-                    self.tracker.count_tokens(state.get("fundamentals_report", ""))
+                    self.tracker.count_tokens(state.get(key, ""), (key,))
+                    for key in ("market_report", "sentiment_report", "news_report", "fundamentals_report")
                 ])
                 
                 if analyst_tokens > 10000:  # Summarize if > 10k tokens
@@ -262,7 +274,9 @@ Provide concise summary (max 800 tokens) with clear structure."""
         if self.summarize_debates and not state.get("_research_summarized"):
             debate_state = state.get("investment_debate_state", {})
             if debate_state:
-                debate_tokens = self.tracker.count_state_tokens(debate_state)
+                debate_tokens = self.tracker.count_state_tokens(
+                    debate_state, path_prefix=("investment_debate_state",)
+                )
                 if debate_tokens > 5000:  # Summarize if > 5k tokens
                     logger.info(f"Summarizing research debate ({debate_tokens} tokens)")
                     summary = self.summarize_debate(debate_state)
@@ -273,7 +287,9 @@ Provide concise summary (max 800 tokens) with clear structure."""
         if self.summarize_debates and not state.get("_risk_summarized"):
             risk_state = state.get("risk_debate_state", {})
             if risk_state:
-                risk_tokens = self.tracker.count_state_tokens(risk_state)
+                risk_tokens = self.tracker.count_state_tokens(
+                    risk_state, path_prefix=("risk_debate_state",)
+                )
                 if risk_tokens > 5000:  # Summarize if > 5k tokens
                     logger.info(f"Summarizing risk debate ({risk_tokens} tokens)")
                     summary = self.summarize_debate(risk_state)
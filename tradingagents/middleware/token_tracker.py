@@ -7,7 +7,11 @@ Token counting utilities for TradingAgents.
 Provides token counting functionality for cost tracking and optimization.
 """
 
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,12 +24,74 @@ except ImportError:
     logger.warning("tiktoken not available. Using approximate token counting.")
 
 
+# Token counts kept per encoding in the shared content-hash cache
+TOKEN_CACHE_MAX_ENTRIES = 4096
+# Shorter strings are encoded directly (hashing them costs about as much)
+MIN_CACHED_LENGTH = 256
+# State paths remembered for incremental (append-only) counting
+MAX_TRACKED_PATHS = 256
+
+
+class TokenCountCache:
+    """
+    Bounded LRU of token counts keyed by a content hash of the text.
+
+    One cache per encoding is shared by every TokenTracker, so the token
+    tracking and summarization middleware never encode the same text twice.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+            return count
+
+    def put(self, key: bytes, count: int):
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+_count_caches: Dict[str, TokenCountCache] = {}
+_count_caches_lock = threading.Lock()
+
+
+def get_token_count_cache(encoding_name: str) -> TokenCountCache:
+    """Get the shared token-count cache for an encoding."""
+    with _count_caches_lock:
+        cache = _count_caches.get(encoding_name)
+        if cache is None:
+            cache = _count_caches[encoding_name] = TokenCountCache()
+        return cache
+
+
 class TokenTracker:
     """
     Track token usage across agent execution.
     
     Provides accurate token counting when tiktoken is available,
     falls back to approximation otherwise.
+
+    Counting is memoized: long strings are looked up by content hash in a
+    shared bounded cache, and strings that grew by appending since the last
+    count at the same state path (debate histories) only have the new suffix
+    encoded. Suffix counts can differ from a full re-encode by a token at
+    the join when the appended text does not start at a whitespace boundary.
     """
     
     def __init__(self, model: str = "gpt-4o"):
@@ -38,6 +104,9 @@ class TokenTracker:
         self.model = model
         self.token_counts: Dict[str, int] = {}
         self.encoding = None
+        # State path -> (text, token count) of the last count at that path
+        self._last_counted: "OrderedDict[Tuple[str, ...], Tuple[str, int]]" = OrderedDict()
+        self._reset_cache_stats()
         
         if TIKTOKEN_AVAILABLE:
             try:
@@ -49,35 +118,101 @@ class TokenTracker:
         else:
             logger.info("Using approximate token counting (tiktoken not available)")
     
-    def count_tokens(self, text: str) -> int:
+    def _reset_cache_stats(self):
+        self.encode_calls = 0
+        self.encoded_chars = 0
+        self.encode_seconds = 0.0
+        self.cache_hits = 0
+        self.incremental_hits = 0
+        self.reused_chars = 0
+
+    def _encode_count(self, text: str) -> int:
+        """Encode text and record how long it took."""
+        start = time.perf_counter()
+        count = len(self.encoding.encode(text))
+        self.encode_seconds += time.perf_counter() - start
+        self.encode_calls += 1
+        self.encoded_chars += len(text)
+        return count
+
+    def count_tokens(self, text: str, path: Optional[Tuple[str, ...]] = None) -> int:
         """
         Count tokens in text.
         
         Args:
             text: Text to count tokens for
+            path: Location of the text in the state; enables incremental
+                counting when the text at that path only grew by appending
         
         Returns:
             Number of tokens
         """
         if not text:
             return 0
+        text = str(text)
         
         if self.encoding:
             try:
-                return len(self.encoding.encode(str(text)))
+                return self._count_memoized(text, path)
             except Exception as e:
                 logger.warning(f"Error counting tokens with encoding: {e}. Using approximation.")
         
         # Fallback: approximate (4 characters = 1 token)
-        return len(str(text)) // 4
+        return len(text) // 4
+
+    def _count_memoized(self, text: str, path: Optional[Tuple[str, ...]]) -> int:
+        if path is not None:
+            previous = self._last_counted.get(path)
+            if previous is not None:
+                prev_text, prev_count = previous
+                if prev_text is text or prev_text == text:
+                    self.cache_hits += 1
+                    self.reused_chars += len(text)
+                    return prev_count
+                if len(text) > len(prev_text) and text.startswith(prev_text):
+                    count = prev_count + self._encode_count(text[len(prev_text):])
+                    self.incremental_hits += 1
+                    self.reused_chars += len(prev_text)
+                    self._remember(path, text, count)
+                    return count
+
+        if len(text) < MIN_CACHED_LENGTH:
+            count = self._encode_count(text)
+        else:
+            cache = get_token_count_cache(getattr(self.encoding, "name", self.model))
+            key = TokenCountCache.key(text)
+            count = cache.get(key)
+            if count is None:
+                count = self._encode_count(text)
+                cache.put(key, count)
+            else:
+                self.cache_hits += 1
+                self.reused_chars += len(text)
+
+        if path is not None:
+            self._remember(path, text, count)
+        return count
+
+    def _remember(self, path: Tuple[str, ...], text: str, count: int):
+        self._last_counted[path] = (text, count)
+        self._last_counted.move_to_end(path)
+        while len(self._last_counted) > MAX_TRACKED_PATHS:
+            self._last_counted.popitem(last=False)
     
-    def count_state_tokens(self, state: Dict[str, Any], exclude_keys: Optional[List[str]] = None) -> int:
+    def count_state_tokens(
+        self,
+        state: Dict[str, Any],
+        exclude_keys: Optional[List[str]] = None,
+        path_prefix: Tuple[str, ...] = ()
+    ) -> int:
         """
         Count total tokens in state dictionary.
         
         Args:
             state: State dictionary
             exclude_keys: Keys to exclude from counting (e.g., ["_token_count"])
+            path_prefix: Path of ``state`` within the full agent state (for
+                incremental counting of nested dictionaries)
         
         Returns:
             Total token count
@@ -88,17 +223,18 @@ class TokenTracker:
         for key, value in state.items():
             if key in exclude_keys:
                 continue
+            path = path_prefix + (str(key),)
             
             if isinstance(value, str):
-                total += self.count_tokens(value)
+                total += self.count_tokens(value, path)
             elif isinstance(value, dict):
-                total += self.count_state_tokens(value, exclude_keys)
+                total += self.count_state_tokens(value, exclude_keys, path)
             elif isinstance(value, list):
-                for item in value:
+                for index, item in enumerate(value):
                     if isinstance(item, str):
-                        total += self.count_tokens(item)
+                        total += self.count_tokens(item, path + (str(index),))
                     elif isinstance(item, dict):
-                        total += self.count_state_tokens(item, exclude_keys)
+                        total += self.count_state_tokens(item, exclude_keys, path + (str(index),))
             elif value is not None:
                 # Count string representation of other types
                 total += self.count_tokens(str(value))
@@ -135,11 +271,32 @@ class TokenTracker:
         return {
             "agent_counts": self.token_counts.copy(),
             "total": self.get_total_tokens(),
-            "agent_count": len(self.token_counts)
+            "agent_count": len(self.token_counts),
+            "cache": self.get_cache_stats()
+        }
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Token-count cache effectiveness.
+
+        encode_seconds_saved estimates the encoding time avoided, from the
+        measured encode rate and the number of characters served from cache.
+        """
+        seconds_per_char = self.encode_seconds / self.encoded_chars if self.encoded_chars else 0.0
+        return {
+            "encode_calls": self.encode_calls,
+            "encoded_chars": self.encoded_chars,
+            "encode_seconds": round(self.encode_seconds, 4),
+            "cache_hits": self.cache_hits,
+            "incremental_hits": self.incremental_hits,
+            "reused_chars": self.reused_chars,
+            "encode_seconds_saved": round(self.reused_chars * seconds_per_char, 4)
         }
     
     def reset(self):
         """Reset token counts."""
         self.token_counts.clear()
+        self._last_counted.clear()
+        self._reset_cache_stats()
         logger.debug("Token tracker reset")
 
@@ -15,6 +15,14 @@ from .web_crawler import (
     get_autonomous_researcher
 )
 
+from .crawl_scheduler import (
+    CrawlScheduler,
+    DedupStore,
+    ResponseCache,
+    HTTPFetcher,
+    normalize_url
+)
+
 from .autonomous_learner import (
     AdvancedAutonomousLearner,
     SourceVerifier,
@@ -34,6 +42,13 @@ __all__ = [
     'AutonomousResearcher',
     'get_autonomous_researcher',
     
+    # Crawling
+    'CrawlScheduler',
+    'DedupStore',
+    'ResponseCache',
+    'HTTPFetcher',
+    'normalize_url',
+    
     # Advanced Learning
     'AdvancedAutonomousLearner',
     'SourceVerifier',
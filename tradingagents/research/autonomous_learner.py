@@ -91,6 +91,39 @@ class SourceVerifier:
             "twitter.com": 0.3,
             "4chan.org": 0.1,
         }
+        
+        # Memoized domain -> credibility score
+        self._domain_scores: Dict[str, float] = {}
+    
+    def domain_credibility(self, domain: str) -> float:
+        """
+        Credibility score of a domain (memoized per domain).
+        
+        Args:
+            domain: Lowercase network location, e.g. "www.reuters.com"
+        
+        Returns:
+            Credibility score (0-1)
+        """
+        score = self._domain_scores.get(domain)
+        if score is not None:
+            return score
+        
+        score = 0.5  # Default
+        
+        if domain in self.trusted_domains:
+            score = self.trusted_domains[domain]
+        elif domain in self.suspicious_domains:
+            score = self.suspicious_domains[domain]
+        else:
+            # Unknown domain - check for indicators
+            if "edu" in domain or "gov" in domain:
+                score = 0.8
+            elif "blog" in domain or "wordpress" in domain:
+                score = 0.4
+        
+        self._domain_scores[domain] = score
+        return score
     
     def verify_source(self, url: str, content: str) -> SourceVerification:
         """
@@ -109,18 +142,7 @@ class SourceVerifier:
         domain = parsed.netloc.lower()
         
         # Check domain reputation
-        credibility_score = 0.5  # Default
-        
-        if domain in self.trusted_domains:
-            credibility_score = self.trusted_domains[domain]
-        elif domain in self.suspicious_domains:
-            credibility_score = self.suspicious_domains[domain]
-        else:
-            # Unknown domain - check for indicators
-            if "edu" in domain or "gov" in domain:
-                credibility_score = 0.8
-            elif "blog" in domain or "wordpress" in domain:
-                credibility_score = 0.4
+        credibility_score = self.domain_credibility(domain)
         
         # Determine verification status
         if credibility_score >= 0.8:
@@ -0,0 +1,598 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Crawl Scheduler - Eddie v2.0
+
+Concurrent page fetching for the autonomous researcher:
+
+- bounded global concurrency with per-domain politeness (concurrent requests
+  and minimum spacing between requests to the same host)
+- URL normalization and content-hash dedup, so tracking-parameter variants
+  and mirrored pages are crawled and returned once
+- on-disk HTTP response cache honoring Cache-Control / Expires, revalidated
+  with ETag / Last-Modified conditional requests
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; EddieResearcher/2.0)"
+DEFAULT_TTL_SECONDS = 3600  # Used when the server sends no freshness information
+MAX_BODY_BYTES = 5 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|gclid|fbclid|mc_cid|mc_eid|ref_src)$", re.IGNORECASE)
+_CACHED_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "expires")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for dedup and cache keys.
+
+    Lowercases scheme and host, drops default ports, fragments, trailing
+    slashes and tracking parameters, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(key)
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def domain_of(url: str) -> str:
+    """Host of a URL without the www. prefix (politeness is per host)."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def content_hash(text: str) -> str:
+    """Hash of whitespace-normalized text, used to detect mirrored pages."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def compute_expiry(headers: Dict[str, str], now: float, default_ttl: float = DEFAULT_TTL_SECONDS) -> Optional[float]:
+    """
+    Expiry timestamp for a response from its caching headers.
+
+    Args:
+        headers: Response headers (lowercase keys)
+        now: Current epoch time
+        default_ttl: Freshness lifetime when the server gives none
+
+    Returns:
+        Epoch time the response stays fresh until, or None if it must not be stored
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    directives = {}
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return now  # Store, but revalidate before every use
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                return now + max(0, int(directives[name]))
+            except ValueError:
+                break
+    if headers.get("expires"):
+        try:
+            return parsedate_to_datetime(headers["expires"]).timestamp()
+        except (TypeError, ValueError):
+            return now  # Invalid Expires means already expired
+    return now + default_ttl
+
+
+@dataclass
+class CachedResponse:
+    """An HTTP response body with the metadata needed to reuse it."""
+    url: str
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+    expires_at: float = 0.0
+    from_cache: bool = False
+    revalidated: bool = False
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) < self.expires_at
+
+    def text(self) -> str:
+        match = re.search(r"charset=([\w-]+)", self.headers.get("content-type", ""), re.IGNORECASE)
+        encoding = match.group(1) if match else "utf-8"
+        try:
+            return self.body.decode(encoding, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache under <data_cache_dir>/web_cache.
+
+    Each URL is stored as ``<sha256>.json`` (status, headers, expiry) plus
+    ``<sha256>.body``; writes are atomic so concurrent crawls never read a
+    half-written entry.
+    """
+
+    def __init__(self, directory: Optional[str] = None, default_ttl: float = DEFAULT_TTL_SECONDS):
+        """
+        Args:
+            directory: Cache directory (defaults to <data_cache_dir>/web_cache)
+            default_ttl: Freshness lifetime when the server gives none
+        """
+        if directory is None:
+            from tradingagents.dataflows.config import get_config
+            directory = os.path.join(get_config()["data_cache_dir"], "web_cache")
+        self.directory = Path(directory)
+        self.default_ttl = default_ttl
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Load a cached response (fresh or stale); None if absent or unreadable."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(body).hexdigest() != meta.get("body_sha256"):
+            return None
+        return CachedResponse(
+            url=meta.get("url", url),
+            status=meta.get("status", 200),
+            body=body,
+            headers=meta.get("headers", {}),
+            fetched_at=meta.get("fetched_at", 0.0),
+            expires_at=meta.get("expires_at", 0.0),
+            from_cache=True
+        )
+
+    def put(self, response: CachedResponse, write_body: bool = True):
+        """Store a response (body first, so metadata never points at a missing body)."""
+        meta_path, body_path = self._paths(response.url)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if write_body:
+                self._write_atomic(body_path, response.body)
+            meta = {
+                "url": response.url,
+                "status": response.status,
+                "headers": {k: v for k, v in response.headers.items() if k in _CACHED_HEADERS},
+                "fetched_at": response.fetched_at,
+                "expires_at": response.expires_at,
+                "body_sha256": hashlib.sha256(response.body).hexdigest(),
+            }
+            self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Could not write web cache entry for {response.url}: {e}")
+
+    def revalidated(self, cached: CachedResponse, headers: Dict[str, str]) -> CachedResponse:
+        """
+        Refresh a stale entry after a 304 Not Modified.
+
+        Args:
+            cached: The stale cached response
+            headers: Headers of the 304 response (lowercase keys)
+
+        Returns:
+            The cached response with updated validators and expiry
+        """
+        now = time.time()
+        merged = dict(cached.headers)
+        merged.update({k: v for k, v in headers.items() if k in _CACHED_HEADERS})
+        expires_at = compute_expiry(merged, now, self.default_ttl)
+        cached.headers = merged
+        cached.fetched_at = now
+        cached.expires_at = expires_at if expires_at is not None else now
+        cached.from_cache = True
+        cached.revalidated = True
+        self.put(cached, write_body=False)
+        return cached
+
+    def delete(self, url: str):
+        for path in self._paths(url):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        if not self.directory.exists():
+            return
+        for path in self.directory.iterdir():
+            if path.suffix in (".json", ".body", ".tmp"):
+                path.unlink(missing_ok=True)
+
+
+class DedupStore:
+    """
+    URL and content-hash dedup.
+
+    Remembers which content each normalized URL resolved to, so an alias of
+    a page (same content under another URL) is skipped before it is fetched
+    again, and pages with identical text are returned once per crawl.
+    """
+
+    def __init__(self):
+        self._url_hashes: Dict[str, str] = {}  # normalized URL -> content hash
+        self._hash_urls: Dict[str, str] = {}  # content hash -> first normalized URL
+        self._lock = threading.Lock()
+        self.duplicate_urls = 0
+        self.duplicate_contents = 0
+
+    def known_hash(self, url: str) -> Optional[str]:
+        with self._lock:
+            return self._url_hashes.get(normalize_url(url))
+
+    def record(self, url: str, digest: str) -> str:
+        """
+        Record the content hash a URL resolved to.
+
+        Returns:
+            Normalized URL that first produced this content (the URL itself if new)
+        """
+        normalized = normalize_url(url)
+        with self._lock:
+            self._url_hashes[normalized] = digest
+            return self._hash_urls.setdefault(digest, normalized)
+
+    def plan(self, urls: List[str]) -> List[str]:
+        """
+        Order-preserving list of URLs worth fetching.
+
+        Drops URL variants that normalize to an earlier entry and URLs known
+        to serve the same content as an earlier entry.
+        """
+        planned: List[str] = []
+        seen_urls = set()
+        seen_hashes = set()
+        with self._lock:
+            for url in urls:
+                if not url:
+                    continue
+                normalized = normalize_url(url)
+                digest = self._url_hashes.get(normalized)
+                if normalized in seen_urls or (digest is not None and digest in seen_hashes):
+                    self.duplicate_urls += 1
+                    continue
+                seen_urls.add(normalized)
+                if digest is not None:
+                    seen_hashes.add(digest)
+                planned.append(url)
+        return planned
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "urls": len(self._url_hashes),
+                "contents": len(self._hash_urls),
+                "duplicate_urls": self.duplicate_urls,
+                "duplicate_contents": self.duplicate_contents,
+            }
+
+
+class CrawlScheduler:
+    """
+    Runs per-URL crawl coroutines with bounded concurrency and per-domain politeness.
+
+    Workers receive ``(url, polite)``; ``polite()`` is an async context
+    manager to hold around the network request, so cache hits never wait on
+    politeness. Semaphores are created per ``run`` call (they bind to the
+    running event loop); the per-domain request spacing persists across runs.
+
+    Example:
+        scheduler = CrawlScheduler(max_concurrency=8, per_domain_concurrency=2)
+        pages = await scheduler.run(urls, fetch_page)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_domain_concurrency: int = 2,
+        per_domain_delay: float = 0.5
+    ):
+        """
+        Args:
+            max_concurrency: Requests in flight across all domains
+            per_domain_concurrency: Requests in flight per domain
+            per_domain_delay: Minimum seconds between request starts to one domain
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_domain_concurrency = max(1, per_domain_concurrency)
+        self.per_domain_delay = max(0.0, per_domain_delay)
+        self._last_request: Dict[str, float] = {}  # domain -> monotonic time of last request start
+        self._lock = threading.Lock()
+
+    def _reserve_slot(self, domain: str) -> float:
+        """Reserve the next request start for a domain; returns seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._last_request.get(domain, 0.0) + self.per_domain_delay)
+            self._last_request[domain] = start
+            return start - now
+
+    async def run(
+        self,
+        urls: List[str],
+        worker: Callable[[str, Callable[[], Any]], Awaitable[T]]
+    ) -> List[Optional[T]]:
+        """
+        Run ``worker`` for every URL concurrently.
+
+        Args:
+            urls: URLs to crawl
+            worker: Coroutine function taking (url, polite)
+
+        Returns:
+            Worker results in input order (None where the worker raised)
+        """
+        overall = asyncio.Semaphore(self.max_concurrency)
+        domains: Dict[str, asyncio.Semaphore] = {}
+
+        def polite_for(url: str):
+            domain = domain_of(url)
+            semaphore = domains.setdefault(domain, asyncio.Semaphore(self.per_domain_concurrency))
+
+            @asynccontextmanager
+            async def polite():
+                async with semaphore:
+                    delay = self._reserve_slot(domain)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    yield
+
+            return polite
+
+        async def run_one(url: str) -> Optional[T]:
+            async with overall:
+                try:
+                    return await worker(url, polite_for(url))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error crawling {url}: {e}")
+                    return None
+
+        return list(await asyncio.gather(*(run_one(url) for url in urls)))
+
+
+class HTTPFetcher:
+    """Cache-aware HTTP GET with conditional revalidation (aiohttp)."""
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        timeout: float = 15.0,
+        user_agent: str = DEFAULT_USER_AGENT,
+        max_bytes: int = MAX_BODY_BYTES
+    ):
+        """
+        Args:
+            cache: Response cache (None disables caching)
+            timeout: Per-request timeout in seconds
+            user_agent: User-Agent header
+            max_bytes: Bodies are truncated beyond this size
+        """
+        self.cache = cache
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_bytes = max_bytes
+        self.stats = {"requests": 0, "cache_hits": 0, "revalidated": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def open_session(self):
+        """New aiohttp session for the running event loop."""
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": self.user_agent}
+        )
+
+    async def fetch(self, session, url: str, polite: Callable[[], Any]) -> Optional[CachedResponse]:
+        """
+        Fetch a URL, serving fresh cache entries without touching the network.
+
+        Args:
+            session: aiohttp ClientSession
+            url: URL to fetch
+            polite: Politeness context manager factory from CrawlScheduler
+
+        Returns:
+            CachedResponse, or None on HTTP/network error
+        """
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        if cached is not None and cached.is_fresh():
+            self._count("cache_hits")
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            async with polite():
+                self._count("requests")
+                async with session.get(url, headers=headers, allow_redirects=True) as resp:
+                    response_headers = {k.lower(): v for k, v in resp.headers.items()}
+                    if resp.status == 304 and cached is not None:
+                        self._count("revalidated")
+                        return await asyncio.to_thread(self.cache.revalidated, cached, response_headers)
+                    if resp.status >= 400:
+                        logger.warning(f"HTTP {resp.status} fetching {url}")
+                        self._count("errors")
+                        return None
+                    # content.read(n) returns what is buffered so far; read to EOF or the cap
+                    chunks = []
+                    size = 0
+                    async for chunk in resp.content.iter_chunked(READ_CHUNK_BYTES):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= self.max_bytes:
+                            break
+                    body = b"".join(chunks)[:self.max_bytes]
+                    final_url = str(resp.url)
+                    status = resp.status
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Error fetching {url}: {e}")
+            self._count("errors")
+            return None
+
+        now = time.time()
+        expires_at = compute_expiry(response_headers, now, self.cache.default_ttl if self.cache else DEFAULT_TTL_SECONDS)
+        response = CachedResponse(
+            url=url,
+            status=status,
+            body=body,
+            headers=response_headers,
+            fetched_at=now,
+            expires_at=expires_at if expires_at is not None else now
+        )
+        if final_url != url:
+            response.headers["x-final-url"] = final_url
+        if self.cache is not None and expires_at is not None:
+            await asyncio.to_thread(self.cache.put, response)
+        return response
+
+
+class _PageExtractor(HTMLParser):
+    """Title, visible text and a light markdown rendering of an HTML page."""
+
+    _SKIP = {"script", "style", "noscript", "template", "svg", "head"}
+    _BLOCK = {"p", "div", "section", "article", "br", "tr", "table", "ul", "ol", "blockquote", "pre"}
+    _HEADINGS = {"h1": "# ", "h2": "## ", "h3": "### ", "h4": "#### ", "h5": "##### ", "h6": "###### "}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.links = 0
+        self._in_title = False
+        self._skip_depth = 0
+        self._lines: List[str] = []
+        self._current: List[str] = []
+        self._prefix = ""
+
+    def _break(self):
+        line = " ".join("".join(self._current).split())
+        if line:
+            self._lines.append(f"{self._prefix}{line}")
+        self._current = []
+        self._prefix = ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        if tag in self._SKIP:
+            self._skip_depth += 1
+            return
+        if tag == "a":
+            self.links += 1
+        if tag in self._HEADINGS or tag == "li" or tag in self._BLOCK:
+            self._break()
+            self._prefix = self._HEADINGS.get(tag, "- " if tag == "li" else "")
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        if tag in self._SKIP:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag in self._HEADINGS or tag == "li" or tag in self._BLOCK:
+            self._break()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._current.append(data)
+
+    def result(self) -> Tuple[str, str, str]:
+        self._break()
+        markdown = "\n".join(self._lines)
+        text = "\n".join(re.sub(r"^(#+ |- )", "", line) for line in self._lines)
+        return " ".join(self.title.split()), text, markdown
+
+
+def extract_page(html: str) -> Dict[str, Any]:
+    """
+    Extract title, text and markdown from an HTML document.
+
+    Returns:
+        Dict with title, text, markdown and links (anchor count)
+    """
+    parser = _PageExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:
+        logger.debug(f"HTML parse error: {e}")
+    title, text, markdown = parser.result()
+    return {"title": title, "text": text, "markdown": markdown, "links": parser.links}
@@ -5,7 +5,9 @@
 Web Crawler - Autonomous Researcher
 
 Eddie v2.0's autonomous researcher that crawls the web to learn new market terms,
-events, and information. Uses Crawl4AI for rendering and DuckDuckGo for search.
+events, and information. Uses DuckDuckGo for search; pages are fetched
+concurrently over HTTP with an on-disk response cache (see crawl_scheduler),
+and rendered with Crawl4AI when JavaScript rendering is required.
 """
 
 import logging
@@ -14,6 +16,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import asyncio
 import re
+import time
+
+from .crawl_scheduler import (
+    CrawlScheduler,
+    DedupStore,
+    HTTPFetcher,
+    ResponseCache,
+    content_hash,
+    extract_page,
+    normalize_url,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -64,15 +77,44 @@ class WebCrawler:
     
     Capabilities:
     - Search the web (DuckDuckGo)
-    - Crawl and render pages (Crawl4AI)
+    - Crawl pages concurrently with per-domain politeness, URL/content dedup
+      and an on-disk HTTP cache (ETag / expiry aware)
+    - Render JavaScript pages (Crawl4AI)
     - Extract knowledge from web content
     - Store learned information
     """
     
-    def __init__(self):
-        """Initialize web crawler."""
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_concurrency: int = 8,
+        per_domain_concurrency: int = 2,
+        per_domain_delay: float = 0.5,
+        timeout: float = 15.0,
+        render_js: bool = False
+    ):
+        """
+        Initialize web crawler.
+        
+        Args:
+            cache_dir: Response cache directory (default: <data_cache_dir>/web_cache)
+            max_concurrency: Pages fetched in parallel across all domains
+            per_domain_concurrency: Pages fetched in parallel from one domain
+            per_domain_delay: Minimum seconds between requests to one domain
+            timeout: Per-request timeout in seconds
+            render_js: Always render pages with Crawl4AI instead of plain HTTP
+        """
         self._crawler = None
         self._initialized = False
+        self._crawler_available = False
+        self.render_js = render_js
+        self.scheduler = CrawlScheduler(
+            max_concurrency=max_concurrency,
+            per_domain_concurrency=per_domain_concurrency,
+            per_domain_delay=per_domain_delay
+        )
+        self.fetcher = HTTPFetcher(ResponseCache(cache_dir), timeout=timeout)
+        self.dedup = DedupStore()
     
     def _initialize_crawler(self):
         """Lazy initialization of Crawl4AI."""
@@ -113,18 +155,22 @@ class WebCrawler:
             
             logger.info(f"Searching web for: {query}")
             
+            def run_search():
+                with DDGS() as ddgs:
+                    return list(ddgs.text(query, max_results=max_results) or [])
+            
+            # DDGS is synchronous; keep it off the event loop so searches can overlap
+            search_results = await asyncio.to_thread(run_search)
+            
             results = []
-            with DDGS() as ddgs:
-                search_results = ddgs.text(query, max_results=max_results)
-                
-                for idx, result in enumerate(search_results, 1):
-                    search_result = SearchResult(
-                        title=result.get('title', ''),
-                        url=result.get('href', ''),
-                        snippet=result.get('body', ''),
-                        rank=idx
-                    )
-                    results.append(search_result)
+            for idx, result in enumerate(search_results, 1):
+                search_result = SearchResult(
+                    title=result.get('title', ''),
+                    url=result.get('href', ''),
+                    snippet=result.get('body', ''),
+                    rank=idx
+                )
+                results.append(search_result)
             
             logger.info(f"Found {len(results)} search results")
             return results
@@ -153,17 +199,126 @@ class WebCrawler:
         Returns:
             CrawlResult or None if failed
         """
-        if not self._initialized:
-            self._initialize_crawler()
+        results = await self.crawl_many([url], extract_markdown=extract_markdown, wait_for=wait_for)
+        return results[0] if results else None
+    
+    async def crawl_many(
+        self,
+        urls: List[str],
+        extract_markdown: bool = True,
+        wait_for: Optional[str] = None
+    ) -> List[CrawlResult]:
+        """
+        Crawl pages concurrently.
+        
+        URL variants (tracking parameters, fragments) and pages known to
+        mirror an earlier URL are skipped before fetching; pages with the
+        same text are returned once. Fresh pages are served from the disk
+        cache, stale ones are revalidated with ETag / Last-Modified.
+        
+        Args:
+            urls: URLs to crawl
+            extract_markdown: If True, extract markdown representation
+            wait_for: CSS selector or text to wait for (forces Crawl4AI rendering)
+        
+        Returns:
+            CrawlResults in input order, failed and duplicate pages omitted
+        """
+        planned = self.dedup.plan(urls)
+        if not planned:
+            return []
+        
+        if wait_for or self.render_js:
+            if not self._initialized:
+                self._initialize_crawler()
+            if not self._crawler_available:
+                logger.warning("Crawl4AI not available, cannot render pages")
+                return []
+            
+            async def render(url, polite):
+                async with polite():
+                    return await self._render_page(url, extract_markdown, wait_for)
+            
+            pages = await self.scheduler.run(planned, render)
+        else:
+            try:
+                session = self.fetcher.open_session()
+            except ImportError:
+                logger.error("aiohttp not installed. Install with: pip install aiohttp")
+                return []
+            
+            async with session:
+                async def fetch(url, polite):
+                    return await self._fetch_page(session, url, polite, extract_markdown)
+                
+                pages = await self.scheduler.run(planned, fetch)
+        
+        results = []
+        returned_hashes = set()
+        for page in pages:
+            if page is None:
+                continue
+            digest = page.metadata.get("content_hash") or content_hash(page.content)
+            self.dedup.record(page.url, digest)
+            if digest in returned_hashes:
+                self.dedup.duplicate_contents += 1
+                logger.debug(f"Skipping duplicate content: {page.url}")
+                continue
+            returned_hashes.add(digest)
+            results.append(page)
+        return results
+    
+    async def _fetch_page(self, session, url: str, polite, extract_markdown: bool) -> Optional[CrawlResult]:
+        """Fetch a page over HTTP (disk-cached) and extract its content."""
+        started = time.perf_counter()
+        response = await self.fetcher.fetch(session, url, polite)
+        if response is None:
+            return None
         
-        if not self._crawler_available:
-            logger.warning("Crawl4AI not available, cannot crawl pages")
+        if response.content_type in ("text/html", "application/xhtml+xml", ""):
+            page = await asyncio.to_thread(extract_page, response.text())
+        elif response.content_type.startswith("text/"):
+            text = response.text()
+            page = {"title": "", "text": text, "markdown": text, "links": 0}
+        else:
+            logger.info(f"Skipping non-text content at {url} ({response.content_type})")
             return None
         
+        if not page["text"].strip():
+            logger.warning(f"No text content extracted from {url}")
+            return None
+        
+        crawl_result = CrawlResult(
+            url=url,
+            title=page["title"],
+            content=page["text"],
+            markdown=page["markdown"] if extract_markdown else None,
+            metadata={
+                "status_code": response.status,
+                "links": page["links"],
+                "from_cache": response.from_cache,
+                "revalidated": response.revalidated,
+                "content_hash": content_hash(page["text"]),
+                "fetch_seconds": round(time.perf_counter() - started, 4)
+            }
+        )
+        logger.info(
+            f"Crawled: {url} ({len(crawl_result.content)} chars"
+            f"{', cached' if response.from_cache else ''})"
+        )
+        return crawl_result
+    
+    async def _render_page(
+        self,
+        url: str,
+        extract_markdown: bool,
+        wait_for: Optional[str]
+    ) -> Optional[CrawlResult]:
+        """Render a page with Crawl4AI (JavaScript-heavy pages)."""
         try:
             from crawl4ai import AsyncWebCrawler
             
-            logger.info(f"Crawling page: {url}")
+            logger.info(f"Rendering page: {url}")
             
             async with AsyncWebCrawler(verbose=False) as crawler:
                 # Crawl the page
@@ -175,15 +330,17 @@ class WebCrawler:
                 )
                 
                 if result.success:
+                    content = result.cleaned_html or result.html or ''
                     crawl_result = CrawlResult(
                         url=url,
                         title=result.metadata.get('title', '') if result.metadata else '',
-                        content=result.cleaned_html or result.html or '',
+                        content=content,
                         markdown=result.markdown if extract_markdown else None,
                         metadata={
                             "status_code": result.status_code,
                             "links": len(result.links) if result.links else 0,
-                            "images": len(result.media) if result.media else 0
+                            "images": len(result.media) if result.media else 0,
+                            "content_hash": content_hash(content)
                         }
                     )
                     
@@ -207,7 +364,7 @@ class WebCrawler:
         crawl_top_n: int = 3
     ) -> Tuple[List[SearchResult], List[CrawlResult]]:
         """
-        Search the web and crawl top results.
+        Search the web and crawl top results concurrently.
         
         Args:
             query: Search query
@@ -220,15 +377,15 @@ class WebCrawler:
         # Search
         search_results = await self.search(query, max_results=max_results)
         
-        # Crawl top results
-        crawl_results = []
-        for result in search_results[:crawl_top_n]:
-            crawl_result = await self.crawl_page(result.url)
-            if crawl_result:
-                crawl_results.append(crawl_result)
+        # Crawl top results (duplicates of a higher-ranked result are dropped)
+        crawl_results = await self.crawl_many([result.url for result in search_results[:crawl_top_n]])
         
         return search_results, crawl_results
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Fetch, cache and dedup counters."""
+        return {**self.fetcher.stats, **self.dedup.get_stats()}
+    
     def extract_knowledge(
         self,
         crawl_results: List[CrawlResult],
@@ -347,6 +504,26 @@ class AutonomousResearcher:
             "sources": len(crawl_results)
         }
     
+    async def learn_about_many(
+        self,
+        topics: List[str],
+        context: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Learn about several topics concurrently.
+        
+        Searches run in parallel and page fetches across all topics share the
+        crawler's per-domain request spacing, dedup store and response cache.
+        
+        Args:
+            topics: Topics to learn about
+            context: Additional context
+        
+        Returns:
+            Learning results in topic order
+        """
+        return list(await asyncio.gather(*(self.learn_about(topic, context) for topic in topics)))
+    
     def get_learned_knowledge(self, topic: str) -> Optional[Dict[str, Any]]:
         """Get previously learned knowledge about a topic."""
         return self.learned_knowledge.get(topic.lower())
@@ -13,6 +13,7 @@ Usage:
     python -m tradingagents.screener report                 # Show latest report
     python -m tradingagents.screener top [N]                # Show top N opportunities
     python -m tradingagents.screener update                 # Update price data only
+    python -m tradingagents.screener earnings --refresh     # Reload earnings calendar cache
 """
 
 import sys
@@ -319,6 +320,37 @@ def cmd_update(args):
     return 0
 
 
+def cmd_earnings(args):
+    """Show or refresh the cached earnings calendar."""
+    from tradingagents.database import get_db_connection, TickerOperations
+    from tradingagents.validation.earnings_calendar import get_earnings_calendar_cache
+
+    cache = get_earnings_calendar_cache()
+    tickers = TickerOperations(get_db_connection()).get_all_tickers(active_only=True)
+    symbols = [t['symbol'] for t in tickers]
+
+    if args.refresh or cache.is_stale():
+        print(f"Refreshing earnings calendar for {len(symbols)} tickers...")
+        found = cache.refresh(symbols)
+        print(f"Earnings dates found for {found}/{len(symbols)} tickers")
+
+    print(f"\nEarnings calendar (refreshed {cache.refreshed_on}, cache: {cache.path})")
+    print("="*70)
+    for symbol in symbols:
+        report = cache.check_proximity(symbol)
+        if report.days_until_next_earnings is None:
+            continue
+        if args.days is not None and not 0 <= report.days_until_next_earnings <= args.days:
+            continue
+        event = report.upcoming_earnings
+        print(
+            f"{symbol:<8} {event.report_date.date()}  "
+            f"{report.days_until_next_earnings:>5} days  {report.proximity_risk_level}"
+        )
+
+    return 0
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -476,6 +508,21 @@ def main():
     )
     update_parser.set_defaults(func=cmd_update)
 
+    # Earnings calendar command
+    earnings_parser = subparsers.add_parser('earnings', help='Show or refresh the earnings calendar cache')
+    earnings_parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Reload earnings dates for the whole watchlist (default: only if stale)'
+    )
+    earnings_parser.add_argument(
+        '--days',
+        type=int,
+        default=None,
+        help='Only show tickers reporting within N days'
+    )
+    earnings_parser.set_defaults(func=cmd_earnings)
+
     # Legend command
     def cmd_legend(args):
         show_screener_legend()
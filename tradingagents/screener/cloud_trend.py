@@ -10,12 +10,20 @@ Identifies trend reversals when price enters the cloud.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _entries(in_cloud: np.ndarray) -> np.ndarray:
+    """True on bars inside the cloud whose previous bar was not (along the last axis)."""
+    entries = np.zeros(in_cloud.shape, dtype=bool)
+    entries[..., 1:] = in_cloud[..., 1:] & ~in_cloud[..., :-1]
+    return entries
+
+
 class HighLowCloudTrend:
     """Calculate and analyze High Low Cloud Trend indicator."""
     
@@ -79,12 +87,53 @@ class HighLowCloudTrend:
         in_cloud = (close >= cloud_lower) & (close <= cloud_upper)
         
         # Detect entry (price just entered cloud)
-        cloud_entry = pd.Series(False, index=data.index)
-        for i in range(1, len(data)):
-            if in_cloud.iloc[i] and not in_cloud.iloc[i-1]:
-                cloud_entry.iloc[i] = True
+        return pd.Series(_entries(in_cloud.to_numpy()), index=data.index)
+    
+    @staticmethod
+    def detect_cloud_entry_batch(
+        frames: Dict[str, pd.DataFrame],
+        period: int = 20
+    ) -> Dict[str, pd.Series]:
+        """
+        Detect cloud entries for many tickers at once.
+        
+        Frames of equal length are stacked into one (tickers, bars) panel, so the
+        rolling bands and entry masks are computed with a single set of array
+        operations per group.
+        
+        Args:
+            frames: Ticker -> DataFrame with 'high', 'low', 'close' columns
+            period: Period for cloud calculation (20 default)
+        
+        Returns:
+            Ticker -> the Series detect_cloud_entry() returns for
+            calculate_cloud_bands(data, period)
+        """
+        by_length: Dict[int, List[str]] = {}
+        for ticker, frame in frames.items():
+            by_length.setdefault(len(frame), []).append(ticker)
+        
+        results = {}
+        for length, tickers in by_length.items():
+            high = np.vstack([frames[t]['high'].to_numpy(dtype=float) for t in tickers])
+            low = np.vstack([frames[t]['low'].to_numpy(dtype=float) for t in tickers])
+            close = np.vstack([frames[t]['close'].to_numpy(dtype=float) for t in tickers])
+            
+            # Rolling max/min with pandas' semantics: NaN until a full window,
+            # NaN for any window containing NaN
+            cloud_upper = np.full(high.shape, np.nan)
+            cloud_lower = np.full(low.shape, np.nan)
+            if 0 < period <= length:
+                cloud_upper[:, period - 1:] = sliding_window_view(high, period, axis=1).max(axis=2)
+                cloud_lower[:, period - 1:] = sliding_window_view(low, period, axis=1).min(axis=2)
+            
+            with np.errstate(invalid='ignore'):
+                in_cloud = (close >= cloud_lower) & (close <= cloud_upper)
+            entries = _entries(in_cloud)
+            for row, ticker in enumerate(tickers):
+                results[ticker] = pd.Series(entries[row], index=frames[ticker].index)
         
-        return cloud_entry
+        return results
     
     @staticmethod
     def determine_cloud_direction(
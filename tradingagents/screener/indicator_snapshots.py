@@ -0,0 +1,188 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Indicator Snapshot Cache
+
+Per-ticker rows of the indicator comparison table (latest scan signals plus
+pattern analysis), cached in memory and on disk under
+<data_cache_dir>/indicator_snapshots. A snapshot is keyed by the ticker's
+latest bar: when a new bar lands (or the latest bar or scan is rewritten)
+the key changes and the snapshot is recomputed.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Snapshot fields stored as ISO dates on disk
+_DATE_FIELDS = ('scan_date',)
+
+
+def snapshot_key(price_date: Optional[date], close: Any = None, scan_date: Optional[date] = None) -> Optional[str]:
+    """
+    Cache key for a ticker's latest data.
+
+    Args:
+        price_date: Date of the latest daily bar
+        close: Close of that bar (an intraday refresh rewrites it)
+        scan_date: Date of the latest daily scan
+
+    Returns:
+        Key string, or None when the ticker has no price data (never cached)
+    """
+    if price_date is None:
+        return None
+    return f"{price_date.isoformat()}|{close}|{scan_date.isoformat() if scan_date else ''}"
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class IndicatorSnapshotCache:
+    """
+    Comparison-table snapshots per ticker (memory + atomic JSON files).
+
+    Thread-safe; snapshots are written by the parallel table builder.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory: Cache directory (defaults to <data_cache_dir>/indicator_snapshots)
+        """
+        if directory is None:
+            from tradingagents.dataflows.config import get_config
+            directory = os.path.join(get_config()["data_cache_dir"], "indicator_snapshots")
+        self.directory = Path(directory)
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0}
+
+    def _path(self, ticker: str) -> Path:
+        return self.directory / f"{ticker.upper()}.json"
+
+    def _load(self, ticker: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(ticker), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        snapshot = entry.get('snapshot') or {}
+        for field in _DATE_FIELDS:
+            if isinstance(snapshot.get(field), str):
+                try:
+                    snapshot[field] = date.fromisoformat(snapshot[field][:10])
+                except ValueError:
+                    pass
+        return entry
+
+    def get(self, ticker: str, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Snapshot for a ticker if it was computed for ``key``.
+
+        Args:
+            ticker: Ticker symbol
+            key: Current snapshot_key() of the ticker
+
+        Returns:
+            Snapshot dict (a copy), or None on a miss or stale entry
+        """
+        ticker = ticker.upper()
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(ticker)
+        if entry is None:
+            entry = self._load(ticker)
+            if entry is not None:
+                with self._lock:
+                    self._memory[ticker] = entry
+
+        with self._lock:
+            if entry is None or entry.get('key') != key:
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            return dict(entry['snapshot'])
+
+    def put(self, ticker: str, key: Optional[str], snapshot: Dict[str, Any]):
+        """Store a ticker's snapshot for ``key`` (ignored when key is None)."""
+        ticker = ticker.upper()
+        if key is None:
+            return
+
+        entry = {'key': key, 'snapshot': dict(snapshot)}
+        with self._lock:
+            self._memory[ticker] = entry
+            self._stats['writes'] += 1
+
+        path = self._path(ticker)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, default=_json_default)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write indicator snapshot for {ticker}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def invalidate(self, ticker: str):
+        """Drop a ticker's snapshot (e.g. after its indicators were recalculated)."""
+        ticker = ticker.upper()
+        with self._lock:
+            self._memory.pop(ticker, None)
+        try:
+            self._path(ticker).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove indicator snapshot for {ticker}: {e}")
+
+    def clear(self):
+        """Drop all snapshots."""
+        with self._lock:
+            self._memory.clear()
+        if self.directory.exists():
+            for path in self.directory.glob('*.json'):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss/write counters."""
+        with self._lock:
+            return dict(self._stats)
+
+
+_snapshot_cache: Optional[IndicatorSnapshotCache] = None
+_snapshot_cache_lock = threading.Lock()
+
+
+def get_indicator_snapshot_cache() -> IndicatorSnapshotCache:
+    """Get the global indicator snapshot cache."""
+    global _snapshot_cache
+    with _snapshot_cache_lock:
+        if _snapshot_cache is None:
+            _snapshot_cache = IndicatorSnapshotCache()
+        return _snapshot_cache
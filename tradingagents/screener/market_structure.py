@@ -14,12 +14,53 @@ Detects institutional trading patterns including:
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _strict_extrema(values: np.ndarray, lookback: int, highs: bool) -> np.ndarray:
+    """
+    Mask of bars strictly above (highs) or below (lows) every other bar within
+    ``lookback`` bars on each side.
+
+    Works along the last axis, so a (tickers, bars) panel is evaluated in one
+    pass. As in a bar-by-bar comparison, a NaN neighbour never disqualifies a bar.
+    """
+    mask = np.zeros(values.shape, dtype=bool)
+    width = lookback * 2 + 1
+    if values.shape[-1] < width:
+        return mask
+    
+    windows = sliding_window_view(values, width, axis=-1)
+    centre = windows[..., lookback:lookback + 1]
+    beaten = windows >= centre if highs else windows <= centre
+    beaten[..., lookback] = False
+    mask[..., lookback:values.shape[-1] - lookback] = ~beaten.any(axis=-1)
+    return mask
+
+
+def _filter_swings(
+    mask: np.ndarray,
+    values: np.ndarray,
+    index: pd.Index,
+    min_swing_strength: float,
+    highs: bool
+) -> List[Tuple[int, Any, Any]]:
+    """Keep candidate swings that move at least ``min_swing_strength`` past the last kept one."""
+    swings = []
+    for i in np.flatnonzero(mask):
+        value = values[i]
+        if swings:
+            move = value / swings[-1][1] - 1 if highs else swings[-1][1] / value - 1
+            if not move >= min_swing_strength:
+                continue
+        swings.append((int(i), value, index[i]))
+    return swings
+
+
 class MarketStructure:
     """Detect market structure patterns for institutional trading analysis."""
     
@@ -51,44 +92,16 @@ class MarketStructure:
                 'latest_swing_low': None
             }
         
-        high = data['high']
-        low = data['low']
-        close = data['close']
-        
-        swing_highs = []
-        swing_lows = []
+        index = data.index
+        high = data['high'].to_numpy()
+        low = data['low'].to_numpy()
         
-        # Detect swing highs
-        for i in range(lookback, len(data) - lookback):
-            current_high = high.iloc[i]
-            
-            # Check if current high is higher than surrounding bars
-            is_swing_high = True
-            for j in range(i - lookback, i + lookback + 1):
-                if j != i and high.iloc[j] >= current_high:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                # Check swing strength (minimum move from previous swing)
-                if not swing_highs or (current_high / swing_highs[-1][1] - 1) >= min_swing_strength:
-                    swing_highs.append((i, current_high, data.index[i]))
-        
-        # Detect swing lows
-        for i in range(lookback, len(data) - lookback):
-            current_low = low.iloc[i]
-            
-            # Check if current low is lower than surrounding bars
-            is_swing_low = True
-            for j in range(i - lookback, i + lookback + 1):
-                if j != i and low.iloc[j] <= current_low:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                # Check swing strength (minimum move from previous swing)
-                if not swing_lows or (swing_lows[-1][1] / current_low - 1) >= min_swing_strength:
-                    swing_lows.append((i, current_low, data.index[i]))
+        swing_highs = _filter_swings(
+            _strict_extrema(high, lookback, highs=True), high, index, min_swing_strength, highs=True
+        )
+        swing_lows = _filter_swings(
+            _strict_extrema(low, lookback, highs=False), low, index, min_swing_strength, highs=False
+        )
         
         # Get latest swing points
         latest_swing_high = swing_highs[-1] if swing_highs else None
@@ -101,6 +114,63 @@ class MarketStructure:
             'latest_swing_low': latest_swing_low
         }
     
+    @staticmethod
+    def detect_swing_points_batch(
+        frames: Dict[str, pd.DataFrame],
+        lookback: int = 5,
+        min_swing_strength: float = 0.01
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Detect swing points for many tickers at once.
+        
+        Frames of equal length are stacked into one (tickers, bars) panel so the
+        candidate masks are computed with a single set of array operations per
+        group; only the strength filter runs per ticker.
+        
+        Args:
+            frames: Ticker -> DataFrame with 'high', 'low' columns
+            lookback: Number of bars on each side to confirm swing point
+            min_swing_strength: Minimum price move to qualify as swing (1% default)
+        
+        Returns:
+            Ticker -> the same dictionary detect_swing_points() returns
+        """
+        by_length: Dict[int, List[str]] = {}
+        for ticker, frame in frames.items():
+            by_length.setdefault(len(frame), []).append(ticker)
+        
+        results = {}
+        for length, tickers in by_length.items():
+            if length < lookback * 2 + 1:
+                for ticker in tickers:
+                    results[ticker] = MarketStructure.detect_swing_points(
+                        frames[ticker], lookback, min_swing_strength
+                    )
+                continue
+            
+            high_mask = _strict_extrema(
+                np.vstack([frames[t]['high'].to_numpy(dtype=float) for t in tickers]), lookback, highs=True
+            )
+            low_mask = _strict_extrema(
+                np.vstack([frames[t]['low'].to_numpy(dtype=float) for t in tickers]), lookback, highs=False
+            )
+            for row, ticker in enumerate(tickers):
+                frame = frames[ticker]
+                swing_highs = _filter_swings(
+                    high_mask[row], frame['high'].to_numpy(), frame.index, min_swing_strength, highs=True
+                )
+                swing_lows = _filter_swings(
+                    low_mask[row], frame['low'].to_numpy(), frame.index, min_swing_strength, highs=False
+                )
+                results[ticker] = {
+                    'swing_highs': swing_highs,
+                    'swing_lows': swing_lows,
+                    'latest_swing_high': swing_highs[-1] if swing_highs else None,
+                    'latest_swing_low': swing_lows[-1] if swing_lows else None
+                }
+        
+        return results
+    
     @staticmethod
     def identify_structure_breaks(
         data: pd.DataFrame,
@@ -96,7 +96,7 @@ from .scorer import PriorityScorer
 from .entry_price_calculator import EntryPriceCalculator
 from tradingagents.database import get_db_connection, TickerOperations
 from tradingagents.database.scan_ops import ScanOperations
-from tradingagents.validation.earnings_calendar import check_earnings_proximity
+from tradingagents.validation.earnings_calendar import get_earnings_calendar_cache
 
 logger = logging.getLogger(__name__)
 
@@ -118,10 +118,14 @@ class DailyScreener:
         self.entry_calculator = EntryPriceCalculator()
         self.ticker_ops = TickerOperations(self.db)
         self.scan_ops = ScanOperations(self.db)
+        self.earnings_cache = get_earnings_calendar_cache()
 
     def should_skip_ticker(self, symbol: str, analysis_date: date = None) -> Tuple[bool, str]:
         """
         Check if ticker should be skipped due to earnings proximity (Quick Win 4).
+
+        Uses the daily earnings calendar cache; scan_all() refreshes it once
+        per day before scanning, so this is a dictionary lookup.
         
         Args:
             symbol: Ticker symbol
@@ -134,7 +138,7 @@ class DailyScreener:
             analysis_date = date.today()
         
         try:
-            earnings_report = check_earnings_proximity(symbol, days_before=7, days_after=3)
+            earnings_report = self.earnings_cache.check_proximity(symbol, days_before=7, days_after=3)
             
             if earnings_report.is_in_proximity_window:
                 days_until = earnings_report.days_until_next_earnings
@@ -284,6 +288,13 @@ class DailyScreener:
                 f"{stats['records_added']} new records"
             )
 
+        # Load the earnings calendar for the whole watchlist once per day
+        try:
+            if self.earnings_cache.ensure_fresh(t['symbol'] for t in tickers):
+                logger.info("Earnings calendar refreshed")
+        except Exception as e:
+            logger.warning(f"Could not refresh earnings calendar: {e}")
+
         # Scan each ticker
         logger.info("\nScanning tickers...")
         results = []
@@ -334,28 +345,10 @@ class DailyScreener:
         for i, result in enumerate(results):
             result['priority_rank'] = i + 1
 
-        # Store results in database
+        # Store results in database (one upsert, entry price outcomes in the same transaction)
         if store_results and results:
             logger.info("\nStoring scan results...")
-            for result in results:
-                scan_id = self.scan_ops.store_scan_result(
-                    result['ticker_id'],
-                    scan_date,
-                    result
-                )
-
-                # Create entry price outcome tracking if entry price was calculated
-                if (scan_id and result.get('entry_price_min') and
-                    result.get('entry_price_max')):
-                    from decimal import Decimal
-                    self.scan_ops.create_entry_price_outcome(
-                        scan_id=scan_id,
-                        ticker_id=result['ticker_id'],
-                        scan_date=scan_date,
-                        entry_price_min=Decimal(str(result['entry_price_min'])),
-                        entry_price_max=Decimal(str(result['entry_price_max'])),
-                        recommended_timing=result.get('entry_timing')
-                    )
+            self.scan_ops.store_scan_results(scan_date, results)
 
             # Update rankings
             self.scan_ops.update_rankings(scan_date)
@@ -377,46 +370,11 @@ class DailyScreener:
         # If results were stored, fetch enriched data from database
         # This includes company_name, sector, and current prices
         if store_results and results:
-            enriched_results = self.get_top_opportunities(
+            return self.get_top_opportunities(
                 limit=len(results),
                 scan_date=scan_date
             )
 
-            # Add current price and change_pct from latest price data
-            for result in enriched_results:
-                # Get latest price data for this ticker
-                price_query = """
-                    SELECT close, volume
-                    FROM daily_prices
-                    WHERE ticker_id = %s
-                    ORDER BY price_date DESC
-                    LIMIT 2
-                """
-                prices = self.scan_ops.db.execute_dict_query(
-                    price_query,
-                    (result['ticker_id'],)
-                )
-
-                if prices and len(prices) > 0:
-                    result['current_price'] = float(prices[0]['close'])
-                    result['current_volume'] = float(prices[0]['volume']) if prices[0].get('volume') else 0.0
-                    result['name'] = result.get('company_name', 'N/A')
-
-                    # Calculate change percentage
-                    if len(prices) > 1:
-                        prev_close = float(prices[1]['close'])
-                        curr_close = float(prices[0]['close'])
-                        result['change_pct'] = ((curr_close - prev_close) / prev_close) * 100
-                    else:
-                        result['change_pct'] = 0.0
-                else:
-                    result['current_price'] = 0.0
-                    result['current_volume'] = 0.0
-                    result['change_pct'] = 0.0
-                    result['name'] = result.get('company_name', 'N/A')
-
-            return enriched_results
-
         return results
 
     def get_top_opportunities(
@@ -438,38 +396,27 @@ class DailyScreener:
         """
         results = self.scan_ops.get_top_opportunities(scan_date, limit * 3 if filter_buy_only else limit, filter_buy_only)
         
-        # Enrich with current price and change
+        # Enrich with current price and change (latest closes are joined in by scan_ops)
         for result in results:
-            # Get latest price data
-            price_query = """
-                SELECT close, volume
-                FROM daily_prices
-                WHERE ticker_id = %s
-                ORDER BY price_date DESC
-                LIMIT 2
-            """
-            prices = self.scan_ops.db.execute_dict_query(
-                price_query,
-                (result['ticker_id'],)
-            )
-            
-            if prices and len(prices) > 0:
-                result['current_price'] = float(prices[0]['close'])
-                result['current_volume'] = float(prices[0]['volume']) if prices[0].get('volume') else 0.0
-                result['name'] = result.get('company_name', 'N/A')
-                
+            latest_close = result.pop('latest_close', None)
+            latest_volume = result.pop('latest_volume', None)
+            prev_close = result.pop('prev_close', None)
+            result['name'] = result.get('company_name', 'N/A')
+
+            if latest_close is not None:
+                result['current_price'] = float(latest_close)
+                result['current_volume'] = float(latest_volume) if latest_volume else 0.0
+
                 # Calculate change percentage
-                if len(prices) > 1:
-                    prev_close = float(prices[1]['close'])
-                    curr_close = float(prices[0]['close'])
-                    result['change_pct'] = ((curr_close - prev_close) / prev_close) * 100
+                if prev_close:
+                    prev_close = float(prev_close)
+                    result['change_pct'] = ((result['current_price'] - prev_close) / prev_close) * 100
                 else:
                     result['change_pct'] = 0.0
             else:
                 result['current_price'] = result.get('price', 0.0)
                 result['current_volume'] = result.get('volume', 0.0)
                 result['change_pct'] = 0.0
-                result['name'] = result.get('company_name', 'N/A')
         
         return results
 
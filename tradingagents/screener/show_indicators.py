@@ -9,14 +9,16 @@ Helps traders understand what each indicator means and how to use them.
 """
 
 import sys
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 from tradingagents.database import get_db_connection, TickerOperations, ScanOperations
+from tradingagents.database.scan_ops import latest_closes_relation
 from tradingagents.utils.cli_formatter import CLIFormatter
 from tradingagents.utils import display_next_steps
 from tradingagents.screener.indicators import TechnicalIndicators
 from tradingagents.screener.pattern_recognition import PatternRecognition
 from tradingagents.screener.data_fetcher import DataFetcher
-from tradingagents.screener.screener import DailyScreener
+from tradingagents.screener.indicator_snapshots import get_indicator_snapshot_cache, snapshot_key
 from tradingagents.screener.scorer import PriorityScorer
 import pandas as pd
 from datetime import datetime, timedelta, date
@@ -24,6 +26,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Parallel workers for refreshing/recalculating and building table rows
+SNAPSHOT_WORKERS = 8
+
 
 class IndicatorDisplay:
     """Display indicator values with interpretations."""
@@ -36,6 +41,9 @@ class IndicatorDisplay:
         self.data_fetcher = DataFetcher(self.db)
         self.indicators = TechnicalIndicators()
         self.scorer = PriorityScorer()
+        self.snapshot_cache = get_indicator_snapshot_cache()
+        # v_latest_closes or its inline equivalent, resolved on first use
+        self._latest_closes = None
 
     def show_all_indicators(self, ticker: Optional[str] = None, refresh: bool = False, refresh_data: bool = False):
         """Show all indicators with interpretations.
@@ -63,82 +71,8 @@ class IndicatorDisplay:
 
     def _show_comparison_table(self, tickers: list, refresh: bool = False, refresh_data: bool = False):
         """Show comparison table for multiple tickers."""
-        from tradingagents.screener.pattern_recognition import PatternRecognition
-        
-        # Collect data for all tickers
-        ticker_data = []
-        
-        # Show refresh progress if refreshing
-        if refresh_data or refresh:
-            print(f"{self.formatter.YELLOW}Processing {len(tickers)} tickers...{self.formatter.NC}")
-        
-        for i, ticker in enumerate(tickers, 1):
-            # Handle refresh flags
-            if refresh_data:
-                print(f"  [{i}/{len(tickers)}] Refreshing {ticker}...", end=' ', flush=True)
-                if self._refresh_price_data(ticker):
-                    print(f"{self.formatter.GREEN}✓{self.formatter.NC}")
-                else:
-                    print(f"{self.formatter.RED}✗{self.formatter.NC}")
-            
-            if refresh or refresh_data:
-                print(f"  [{i}/{len(tickers)}] Calculating indicators for {ticker}...", end=' ', flush=True)
-                if self._recalculate_indicators(ticker):
-                    print(f"{self.formatter.GREEN}✓{self.formatter.NC}")
-                else:
-                    print(f"{self.formatter.RED}✗{self.formatter.NC}")
-            
-            # Get latest scan data
-            query = """
-                SELECT
-                    t.symbol,
-                    t.sector,
-                    ds.price as current_price,
-                    ds.priority_score,
-                    ds.technical_signals,
-                    ds.scan_date
-                FROM daily_scans ds
-                JOIN tickers t ON ds.ticker_id = t.ticker_id
-                WHERE t.symbol = %s
-                ORDER BY ds.scan_date DESC
-                LIMIT 1
-            """
-            
-            result = self.db.execute_dict_query(query, (ticker.upper(),))
-            
-            if not result:
-                ticker_data.append({
-                    'ticker': ticker,
-                    'error': 'No data found'
-                })
-                continue
-            
-            data = result[0]
-            signals = data.get('technical_signals', {})
-            current_price = float(data.get('current_price', 0)) if data.get('current_price') else 0.0
-            
-            # Calculate signal score
-            pattern_analysis = PatternRecognition.analyze_patterns(signals)
-            signal_score = pattern_analysis.get('overall_score', PatternRecognition._calculate_signal_score(signals))
-            
-            # Extract key metrics
-            ticker_data.append({
-                'ticker': ticker.upper(),
-                'sector': data.get('sector', 'N/A'),
-                'price': current_price,
-                'priority_score': data.get('priority_score', 0),
-                'signal_score': signal_score,
-                'rsi': signals.get('rsi'),
-                'macd_hist': signals.get('macd_histogram'),
-                'ma_trend': self._get_ma_trend(signals),
-                'vwap_dist': signals.get('vwap_distance_pct', 0),
-                'bb_position': self._get_bb_position(signals, current_price),
-                'volume_ratio': signals.get('volume_ratio'),
-                'atr_pct': signals.get('atr_pct'),
-                'mtf_signal': signals.get('mtf_signal', 'NEUTRAL'),
-                'signals': signals,
-                'scan_date': data.get('scan_date')
-            })
+        # Collect data for all tickers (cached snapshots for unchanged tickers)
+        ticker_data = self._collect_comparison_data(tickers, refresh=refresh, refresh_data=refresh_data)
         
         # Print comparison table header
         print(f"\n{self.formatter.CYAN}{self.formatter.BOLD}{'='*120}{self.formatter.NC}")
@@ -309,6 +243,141 @@ class IndicatorDisplay:
         # Store ticker_data for potential detailed view
         return ticker_data
     
+    def _collect_comparison_data(self, tickers: list, refresh: bool = False, refresh_data: bool = False) -> list:
+        """
+        Build comparison-table rows, in ticker order.
+
+        Rows come from the snapshot cache while a ticker's latest bar and scan
+        are unchanged; only missing or stale tickers are recalculated and
+        rebuilt, in parallel.
+        """
+        if refresh_data or refresh:
+            print(f"{self.formatter.YELLOW}Processing {len(tickers)} tickers...{self.formatter.NC}")
+        
+        if refresh_data:
+            self._run_parallel(tickers, self._refresh_price_data, "Refreshing")
+        
+        keys = self._snapshot_keys(tickers)
+        
+        if refresh or refresh_data:
+            stale = [t for t in tickers if self.snapshot_cache.get(t, keys.get(t.upper())) is None]
+            current = len(tickers) - len(stale)
+            if current:
+                print(f"  {current} ticker(s) already up to date with their latest bar")
+            if stale:
+                self._run_parallel(stale, self._recalculate_indicators, "Calculating indicators for")
+                keys = self._snapshot_keys(tickers)
+        
+        rows = {}
+        missing = []
+        for ticker in tickers:
+            snapshot = self.snapshot_cache.get(ticker, keys.get(ticker.upper()))
+            if snapshot is None:
+                missing.append(ticker)
+            else:
+                rows[ticker] = snapshot
+        
+        if missing:
+            scans = self._latest_scans(missing)
+            with ThreadPoolExecutor(max_workers=min(SNAPSHOT_WORKERS, len(missing))) as executor:
+                built = list(executor.map(lambda t: self._build_snapshot(t, scans.get(t.upper())), missing))
+            for ticker, snapshot in zip(missing, built):
+                rows[ticker] = snapshot
+                if 'error' not in snapshot:
+                    self.snapshot_cache.put(ticker, keys.get(ticker.upper()), snapshot)
+        
+        return [rows[ticker] for ticker in tickers]
+    
+    def _run_parallel(self, tickers: list, action: Callable[[str], bool], label: str):
+        """Run a per-ticker action in parallel and report each result in ticker order."""
+        with ThreadPoolExecutor(max_workers=min(SNAPSHOT_WORKERS, len(tickers))) as executor:
+            results = list(executor.map(action, tickers))
+        
+        for i, (ticker, ok) in enumerate(zip(tickers, results), 1):
+            status = f"{self.formatter.GREEN}✓{self.formatter.NC}" if ok else f"{self.formatter.RED}✗{self.formatter.NC}"
+            print(f"  [{i}/{len(tickers)}] {label} {ticker}... {status}")
+    
+    def _snapshot_keys(self, tickers: list) -> Dict[str, Optional[str]]:
+        """Current snapshot key per ticker symbol (latest bar and scan), in one query."""
+        if self._latest_closes is None:
+            self._latest_closes = latest_closes_relation(self.db)
+        query = """
+            SELECT t.symbol, lc.price_date, lc.close, ls.scan_date
+            FROM tickers t
+            LEFT JOIN {latest_closes} lc ON lc.ticker_id = t.ticker_id
+            LEFT JOIN LATERAL (
+                SELECT ds.scan_date
+                FROM daily_scans ds
+                WHERE ds.ticker_id = t.ticker_id
+                ORDER BY ds.scan_date DESC
+                LIMIT 1
+            ) ls ON TRUE
+            WHERE t.symbol = ANY(%s)
+        """.format(latest_closes=self._latest_closes)
+        try:
+            result = self.db.execute_dict_query(query, ([t.upper() for t in tickers],)) or []
+        except Exception as e:
+            # Without keys nothing is served from (or written to) the cache
+            logger.warning(f"Could not read latest price dates for snapshot cache: {e}")
+            return {}
+        
+        return {
+            row['symbol']: snapshot_key(row['price_date'], row['close'], row['scan_date'])
+            for row in result
+        }
+    
+    def _latest_scans(self, tickers: list) -> Dict[str, dict]:
+        """Latest daily scan row per ticker symbol, in one query."""
+        query = """
+            SELECT DISTINCT ON (t.symbol)
+                t.symbol,
+                t.sector,
+                ds.price as current_price,
+                ds.priority_score,
+                ds.technical_signals,
+                ds.scan_date
+            FROM daily_scans ds
+            JOIN tickers t ON ds.ticker_id = t.ticker_id
+            WHERE t.symbol = ANY(%s)
+            ORDER BY t.symbol, ds.scan_date DESC
+        """
+        result = self.db.execute_dict_query(query, ([t.upper() for t in tickers],)) or []
+        return {row['symbol']: row for row in result}
+    
+    def _build_snapshot(self, ticker: str, data: Optional[dict]) -> dict:
+        """Comparison-table row for a ticker from its latest scan row."""
+        if not data:
+            return {
+                'ticker': ticker,
+                'error': 'No data found'
+            }
+        
+        signals = data.get('technical_signals', {})
+        current_price = float(data.get('current_price', 0)) if data.get('current_price') else 0.0
+        
+        # Calculate signal score
+        pattern_analysis = PatternRecognition.analyze_patterns(signals)
+        signal_score = pattern_analysis.get('overall_score', PatternRecognition._calculate_signal_score(signals))
+        
+        # Extract key metrics
+        return {
+            'ticker': ticker.upper(),
+            'sector': data.get('sector', 'N/A'),
+            'price': current_price,
+            'priority_score': data.get('priority_score', 0),
+            'signal_score': signal_score,
+            'rsi': signals.get('rsi'),
+            'macd_hist': signals.get('macd_histogram'),
+            'ma_trend': self._get_ma_trend(signals),
+            'vwap_dist': signals.get('vwap_distance_pct', 0),
+            'bb_position': self._get_bb_position(signals, current_price),
+            'volume_ratio': signals.get('volume_ratio'),
+            'atr_pct': signals.get('atr_pct'),
+            'mtf_signal': signals.get('mtf_signal', 'NEUTRAL'),
+            'signals': signals,
+            'scan_date': data.get('scan_date')
+        }
+    
     def _get_ma_trend(self, signals):
         """Get MA trend description."""
         ma_20 = signals.get('ma_20')
@@ -1765,16 +1834,17 @@ class IndicatorDisplay:
         """Fetch fresh price data for a ticker."""
         try:
             # Get ticker ID
-            ticker_info = self.ticker_ops.get_ticker_by_symbol(ticker.upper())
+            ticker_info = self.ticker_ops.get_ticker(symbol=ticker.upper())
             if not ticker_info:
                 print(f"{self.formatter.RED}Error: Ticker {ticker} not found{self.formatter.NC}")
                 return False
             
             ticker_id = ticker_info['ticker_id']
             
-            # Use screener's data fetcher to update prices
-            screener = DailyScreener()
-            screener.data_fetcher.update_ticker_prices(ticker_id, ticker.upper())
+            self.data_fetcher.update_ticker_prices(ticker_id, ticker.upper())
+            
+            # The latest bar may have been rewritten without a new price_date
+            self.snapshot_cache.invalidate(ticker)
             
             return True
         except Exception as e:
@@ -1786,7 +1856,7 @@ class IndicatorDisplay:
         """Recalculate indicators for a ticker and update daily_scans table."""
         try:
             # Get ticker ID
-            ticker_info = self.ticker_ops.get_ticker_by_symbol(ticker.upper())
+            ticker_info = self.ticker_ops.get_ticker(symbol=ticker.upper())
             if not ticker_info:
                 print(f"{self.formatter.RED}Error: Ticker {ticker} not found{self.formatter.NC}")
                 return False
@@ -1835,6 +1905,7 @@ class IndicatorDisplay:
             
             # Store scan result
             self.scan_ops.store_scan_result(ticker_id, scan_date, scan_data)
+            self.snapshot_cache.invalidate(ticker)
             
             return True
         except Exception as e:
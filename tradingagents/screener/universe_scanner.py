@@ -0,0 +1,419 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Universe Scanner
+
+Market Structure and Cloud Trend signals for a whole universe in one pass.
+
+The universe is loaded once into an OHLCPanel: (tickers, bars) arrays aligned
+on the latest bar, with shorter histories left-padded with NaN. Swing points,
+cloud bands, structure breaks, inducements, liquidity sweeps and ATR are then
+computed as array operations across all tickers, producing the same signals
+as MarketStructureCloudTrendSignalGenerator.analyze_stock() per ticker.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+import logging
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.database import get_db_connection
+from tradingagents.screener.market_structure import _strict_extrema
+from tradingagents.screener.market_structure_cloud_trend_signals import MarketStructureCloudTrendSignalGenerator
+
+logger = logging.getLogger(__name__)
+
+# analyze_stock() needs this many bars
+MIN_BARS = 50
+
+# Defaults of MarketStructure / HighLowCloudTrend used by analyze_stock()
+INDUCEMENT_TOLERANCE = 0.001
+SWEEP_TOLERANCE = 0.001
+ATR_PERIOD = 14
+VOLUME_AVERAGE_BARS = 20
+
+
+class OHLCPanel:
+    """
+    High/low/close/volume of many tickers as (tickers, bars) arrays.
+
+    Rows are aligned on the latest bar; ``lengths`` holds the number of real
+    bars of each ticker (earlier columns are NaN padding).
+    """
+
+    def __init__(
+        self,
+        tickers: List[str],
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        lengths: np.ndarray
+    ):
+        self.tickers = tickers
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.lengths = lengths
+
+    @property
+    def starts(self) -> np.ndarray:
+        """Column of each ticker's first real bar."""
+        return self.high.shape[1] - self.lengths
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], bars: Optional[int] = None) -> 'OHLCPanel':
+        """
+        Stack per-ticker frames with 'high', 'low', 'close', 'volume' columns.
+
+        Args:
+            frames: Ticker -> DataFrame, oldest bar first
+            bars: Keep only the latest ``bars`` bars of each ticker (default: all)
+        """
+        tickers = list(frames)
+        lengths = np.array([len(frames[t]) if bars is None else min(len(frames[t]), bars) for t in tickers], dtype=int)
+        width = int(lengths.max()) if len(lengths) else 0
+
+        arrays = {name: np.full((len(tickers), width), np.nan) for name in ('high', 'low', 'close', 'volume')}
+        for row, ticker in enumerate(tickers):
+            length = lengths[row]
+            if length:
+                frame = frames[ticker].iloc[-length:]
+                for name, array in arrays.items():
+                    array[row, width - length:] = frame[name].to_numpy(dtype=float)
+
+        return cls(tickers, arrays['high'], arrays['low'], arrays['close'], arrays['volume'], lengths)
+
+    @classmethod
+    def from_database(cls, db=None, tickers: Optional[Sequence[str]] = None, bars: int = 250) -> 'OHLCPanel':
+        """
+        Load the latest ``bars`` daily bars of many tickers with one query.
+
+        Args:
+            db: DatabaseConnection instance (optional)
+            tickers: Symbols to load (default: all active tickers)
+            bars: Bars per ticker
+        """
+        db = db or get_db_connection()
+        ticker_filter = "t.symbol = ANY(%s)" if tickers is not None else "t.active = true"
+        query = f"""
+            SELECT symbol, high, low, close, volume
+            FROM (
+                SELECT
+                    t.symbol,
+                    dp.price_date,
+                    dp.high,
+                    dp.low,
+                    dp.close,
+                    dp.volume,
+                    ROW_NUMBER() OVER (PARTITION BY dp.ticker_id ORDER BY dp.price_date DESC) AS bar_rank
+                FROM daily_prices dp
+                JOIN tickers t ON dp.ticker_id = t.ticker_id
+                WHERE {ticker_filter}
+            ) latest
+            WHERE bar_rank <= %s
+            ORDER BY symbol, price_date
+        """
+        params = ([t.upper() for t in tickers], bars) if tickers is not None else (bars,)
+        rows = db.execute_query(query, params) or []
+
+        frame = pd.DataFrame(rows, columns=['symbol', 'high', 'low', 'close', 'volume'])
+        frames = {
+            symbol: group.drop(columns='symbol').apply(pd.to_numeric).astype(float)
+            for symbol, group in frame.groupby('symbol', sort=False)
+        }
+        logger.info(f"Loaded OHLC panel: {len(frames)} tickers, {len(rows)} bars")
+        return cls.from_frames(frames)
+
+
+def _latest_swings(values: np.ndarray, candidates: np.ndarray, min_swing_strength: float, highs: bool):
+    """
+    Last two kept swings per row, applying the sequential strength filter of
+    MarketStructure.detect_swing_points across all rows at once.
+
+    Returns:
+        (latest value, previous value, swing count) arrays
+    """
+    rows = values.shape[0]
+    latest = np.full(rows, np.nan)
+    previous = np.full(rows, np.nan)
+    count = np.zeros(rows, dtype=int)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for column in np.flatnonzero(candidates.any(axis=0)):
+            value = values[:, column]
+            move = value / latest - 1 if highs else latest / value - 1
+            keep = candidates[:, column] & ((count == 0) | (move >= min_swing_strength))
+            previous[keep] = latest[keep]
+            latest[keep] = value[keep]
+            count[keep] += 1
+
+    return latest, previous, count
+
+
+def _window_extreme(values: np.ndarray, period: int, offset: int, highs: bool) -> np.ndarray:
+    """Rolling max/min of ``period`` bars ending ``offset`` bars before the last (NaN like pandas)."""
+    bars = values.shape[1]
+    if period <= 0 or period + offset > bars:
+        return np.full(values.shape[0], np.nan)
+    window = values[:, bars - offset - period:bars - offset]
+    return window.max(axis=1) if highs else window.min(axis=1)
+
+
+class UniverseSignalScanner:
+    """Market Structure and Cloud Trend signals for every ticker of a panel."""
+
+    def __init__(
+        self,
+        timeframe: str = "swing",
+        min_confidence: int = 70,
+        cloud_period: int = 20,
+        swing_lookback: int = 5,
+        min_swing_strength: float = 0.01,
+        min_break_strength: float = 0.005,
+        min_reversal_strength: float = 0.003,
+        min_volume_confirmation: float = 1.2
+    ):
+        """
+        Args:
+            timeframe: 'swing' or 'scalp'
+            min_confidence: Minimum confidence to take trade
+            cloud_period: Period for cloud calculation
+            swing_lookback: Lookback for swing points
+            min_swing_strength: Minimum swing strength (1% default)
+            min_break_strength: Minimum break strength (0.5% default)
+            min_reversal_strength: Minimum cloud reversal strength
+            min_volume_confirmation: Minimum volume ratio
+        """
+        self.timeframe = timeframe
+        self.min_confidence = min_confidence
+        self.cloud_period = cloud_period
+        self.swing_lookback = swing_lookback
+        self.min_swing_strength = min_swing_strength
+        self.min_break_strength = min_break_strength
+        self.min_reversal_strength = min_reversal_strength
+        self.min_volume_confirmation = min_volume_confirmation
+
+    def scan_universe(self, tickers: Optional[Sequence[str]] = None, bars: int = 250, db=None) -> pd.DataFrame:
+        """Load the universe from the database and scan it (see scan())."""
+        return self.scan(OHLCPanel.from_database(db, tickers, bars))
+
+    def scan(self, panel: OHLCPanel) -> pd.DataFrame:
+        """
+        Compute signals for every ticker of the panel.
+
+        Returns:
+            DataFrame indexed by ticker with signal, confidence, reasoning,
+            entry_price, stop_loss, take_profit, atr, structure_break_type,
+            cloud_direction, volume_confirmed (as analyze_stock() returns), plus
+            has_inducement, sweep_type, current_trend, latest swing levels and
+            cloud bands
+        """
+        high, low, close, volume = panel.high, panel.low, panel.close, panel.volume
+        rows = len(panel.tickers)
+        if rows == 0 or high.shape[1] == 0:
+            return pd.DataFrame(columns=['signal', 'confidence', 'reasoning']).rename_axis('ticker')
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._scan(panel, high, low, close, volume)
+
+    def _scan(self, panel, high, low, close, volume) -> pd.DataFrame:
+        bars = high.shape[1]
+        cur_high, cur_low, cur_close = high[:, -1], low[:, -1], close[:, -1]
+        prev_close = close[:, -2] if bars >= 2 else np.full(len(close), np.nan)
+
+        # Swing points: candidate masks for the whole panel, bars near a
+        # ticker's first real bar excluded (their windows reach into padding)
+        lookback = self.swing_lookback
+        valid = np.arange(bars)[None, :] >= (panel.starts + lookback)[:, None]
+        high_last, high_prev, high_count = _latest_swings(
+            high, _strict_extrema(high, lookback, highs=True) & valid, self.min_swing_strength, highs=True
+        )
+        low_last, low_prev, low_count = _latest_swings(
+            low, _strict_extrema(low, lookback, highs=False) & valid, self.min_swing_strength, highs=False
+        )
+
+        # Structure breaks (MarketStructure.identify_structure_breaks)
+        both = (high_count > 0) & (low_count > 0)
+        strength = self.min_break_strength
+        bos_bullish = both & (cur_high > high_last * (1 + strength))
+        bos_bearish = both & (cur_low < low_last * (1 - strength))
+        chach_bullish = both & (high_count >= 2) & (high_last < high_prev) & (cur_high > low_last * (1 + strength))
+        chach_bearish = both & (low_count >= 2) & (low_last > low_prev) & (cur_low < high_last * (1 - strength))
+
+        # Inducements: the latest break (last in BOS+, BOS-, Chach+, Chach- order) reverted
+        latest_bullish = chach_bullish & ~chach_bearish | bos_bullish & ~(chach_bullish | chach_bearish | bos_bearish)
+        broken_level = np.select(
+            [chach_bearish, chach_bullish, bos_bearish, bos_bullish],
+            [high_last, low_last, low_last, high_last],
+            default=np.nan
+        )
+        any_break = bos_bullish | bos_bearish | chach_bullish | chach_bearish
+        has_inducement = any_break & np.where(
+            latest_bullish,
+            cur_close < broken_level * (1 - INDUCEMENT_TOLERANCE),
+            cur_close > broken_level * (1 + INDUCEMENT_TOLERANCE)
+        )
+
+        # Liquidity sweeps (a bearish sweep overrides a bullish one)
+        bullish_sweep = (low_count > 0) & (cur_low < low_last * (1 - SWEEP_TOLERANCE)) & (cur_close > low_last)
+        bearish_sweep = (high_count > 0) & (cur_high > high_last * (1 + SWEEP_TOLERANCE)) & (cur_close < high_last)
+        sweep_type = np.select([bearish_sweep, bullish_sweep], ['BEARISH_SWEEP', 'BULLISH_SWEEP'], default=None)
+
+        # Trend from the last two swings
+        enough = (high_count >= 2) & (low_count >= 2)
+        current_trend = np.select(
+            [~enough, (high_last > high_prev) & (low_last > low_prev), (high_last < high_prev) & (low_last < low_prev)],
+            ['UNKNOWN', 'UPTREND', 'DOWNTREND'],
+            default='RANGING'
+        )
+
+        # Cloud bands of the last two bars (HighLowCloudTrend.detect_cloud_reversal)
+        period = self.cloud_period
+        upper = _window_extreme(high, period, 0, highs=True)
+        lower = _window_extreme(low, period, 0, highs=False)
+        prev_upper = _window_extreme(high, period, 1, highs=True)
+        prev_lower = _window_extreme(low, period, 1, highs=False)
+        mid = (upper + lower) / 2
+
+        in_cloud = (cur_close >= lower) & (cur_close <= upper)
+        prev_in_cloud = (prev_close >= prev_lower) & (prev_close <= prev_upper)
+        cloud_direction = np.select([cur_close > mid, cur_close < mid], ['BULLISH', 'BEARISH'], default='NEUTRAL')
+
+        entered = in_cloud & ~prev_in_cloud
+        bullish_reversal = entered & (prev_close < prev_lower) & \
+            ((cur_close - prev_close) / prev_close >= self.min_reversal_strength)
+        bearish_reversal = entered & (prev_close > prev_upper) & \
+            ((prev_close - cur_close) / prev_close >= self.min_reversal_strength)
+        has_mid = mid != 0  # `if current_mid:` - NaN counts as set but never crosses
+        crossover_bullish = has_mid & (prev_close <= mid) & (cur_close > mid)
+        crossover_bearish = has_mid & ~crossover_bullish & (prev_close >= mid) & (cur_close < mid)
+        reversal_type = np.select(
+            [bullish_reversal, bearish_reversal, crossover_bullish, crossover_bearish],
+            ['BULLISH', 'BEARISH', 'BULLISH', 'BEARISH'],
+            default=None
+        )
+
+        # ATR of the last bar (TechnicalIndicators.calculate_atr)
+        previous_close = np.concatenate([np.full((len(close), 1), np.nan), close[:, :-1]], axis=1)
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - previous_close)), np.abs(low - previous_close))
+        atr = true_range[:, -ATR_PERIOD:].mean(axis=1) if bars >= ATR_PERIOD else np.full(len(close), np.nan)
+        atr = np.where(np.isnan(atr), 0.0, atr)
+
+        # Volume confirmation (mean skips NaN, as pandas does)
+        recent_volume = volume[:, -VOLUME_AVERAGE_BARS:]
+        counted = (~np.isnan(recent_volume)).sum(axis=1)
+        avg_volume = np.where(counted > 0, np.nansum(recent_volume, axis=1) / np.maximum(counted, 1), np.nan)
+        volume_ratio = np.where(avg_volume > 0, volume[:, -1] / avg_volume, 1.0)
+        volume_confirmed = volume_ratio >= self.min_volume_confirmation
+
+        # Signals (MarketStructureCloudTrendSignalGenerator.generate_signals)
+        bullish = bos_bullish | chach_bullish
+        bearish = ~bullish & (bos_bearish | chach_bearish)
+        cloud_confirmed = np.where(
+            bullish,
+            (reversal_type == 'BULLISH') | (cloud_direction == 'BULLISH'),
+            (reversal_type == 'BEARISH') | (cloud_direction == 'BEARISH')
+        )
+        directional = bullish | bearish
+        take = directional & ~has_inducement & cloud_confirmed & volume_confirmed
+        signal = np.where(take, np.where(bullish, 'BUY', 'SELL'), 'WAIT').astype(object)
+        confidence = np.select(
+            [~directional, has_inducement, ~cloud_confirmed, ~volume_confirmed],
+            [0, 30, 40, 50],
+            default=75
+        )
+        swept = ((signal == 'BUY') & (sweep_type == 'BULLISH_SWEEP')) | ((signal == 'SELL') & (sweep_type == 'BEARISH_SWEEP'))
+        confidence = np.where(swept, np.minimum(100, confidence + 10), confidence)
+        below_minimum = (confidence < self.min_confidence) & (signal != 'WAIT')
+        signal[below_minimum] = 'WAIT'
+
+        levels = MarketStructureCloudTrendSignalGenerator.calculate_entry_exit_levels(cur_close, atr, self.timeframe)
+        trade = ((signal == 'BUY') | (signal == 'SELL')) & (atr > 0)
+        structure_break_type = np.select(
+            [bos_bullish | bos_bearish, chach_bullish | chach_bearish], ['BOS', 'CHACH'], default=None
+        )
+
+        result = pd.DataFrame(
+            {
+                'signal': signal,
+                'confidence': confidence.astype(int),
+                'reasoning': None,
+                'entry_price': cur_close,
+                'stop_loss': np.where(trade, levels['stop_loss'], np.nan),
+                'take_profit': np.where(trade, levels['take_profit'], np.nan),
+                'atr': atr,
+                'timeframe': self.timeframe,
+                'structure_break_type': structure_break_type,
+                'cloud_direction': cloud_direction,
+                'volume_confirmed': volume_confirmed,
+                'has_inducement': has_inducement,
+                'sweep_type': sweep_type,
+                'current_trend': current_trend,
+                'latest_swing_high': np.where(high_count > 0, high_last, np.nan),
+                'latest_swing_low': np.where(low_count > 0, low_last, np.nan),
+                'cloud_upper': upper,
+                'cloud_lower': lower,
+                'bars': panel.lengths,
+            },
+            index=pd.Index(panel.tickers, name='ticker'),
+        )
+        result['reasoning'] = [
+            self._reasoning(
+                bool(bullish[i]), bool(bearish[i]), bool(bos_bullish[i] if bullish[i] else bos_bearish[i]), bool(has_inducement[i]),
+                reversal_type[i], cloud_direction[i], bool(volume_confirmed[i]), bool(swept[i]),
+                bool(below_minimum[i]), int(confidence[i])
+            )
+            for i in range(len(result))
+        ]
+
+        # Tickers analyze_stock() rejects before generating signals
+        short = panel.lengths < MIN_BARS
+        no_atr = ~short & (atr == 0)
+        for mask, reasoning in ((short, 'Insufficient historical data'), (no_atr, 'Unable to calculate ATR')):
+            result.loc[mask, ['signal', 'confidence', 'reasoning']] = ['WAIT', 0, reasoning]
+            result.loc[mask, ['entry_price', 'stop_loss', 'take_profit']] = np.nan
+
+        return result
+
+    def _reasoning(
+        self,
+        bullish: bool,
+        bearish: bool,
+        is_bos: bool,
+        has_inducement: bool,
+        reversal_type: Optional[str],
+        cloud_direction: str,
+        volume_confirmed: bool,
+        swept: bool,
+        below_minimum: bool,
+        confidence: int
+    ) -> str:
+        """Reasoning text of generate_signals() from the per-ticker flags."""
+        if not (bullish or bearish):
+            return "No clear signal"
+        if has_inducement:
+            return "Structure break detected but inducement filter triggered - waiting"
+
+        side, word = ('BULLISH', 'Bullish') if bullish else ('BEARISH', 'Bearish')
+        parts = []
+        if reversal_type == side:
+            parts.append(f"Cloud trend reversal {side.lower()}")
+        elif cloud_direction == side:
+            parts.append("Price above cloud (bullish)" if bullish else "Price below cloud (bearish)")
+        else:
+            return "Structure break detected but cloud trend not confirmed"
+
+        if not volume_confirmed:
+            parts.append("Structure break detected but volume not confirmed")
+            return ". ".join(parts)
+
+        parts.append(f"{word} {'BOS' if is_bos else 'Chach'} with cloud and volume confirmation")
+        if swept:
+            parts.append(f"{word} liquidity sweep confirmed")
+        if below_minimum:
+            parts.append(f"Confidence {confidence}% below minimum {self.min_confidence}%")
+        return ". ".join(parts)
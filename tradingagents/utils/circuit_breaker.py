@@ -5,6 +5,7 @@
 Circuit breaker pattern for fault tolerance
 """
 import logging
+import threading
 from enum import Enum
 from datetime import datetime, timedelta
 from typing import Optional, Callable, Any
@@ -42,7 +43,44 @@ class CircuitBreaker:
         self.last_failure_time: Optional[datetime] = None
         self.state = CircuitState.CLOSED
         self.success_count = 0  # For half-open state
-    
+        self._lock = threading.RLock()
+
+    def allow_request(self) -> bool:
+        """
+        Whether a call may go through now.
+
+        Moves an OPEN circuit to HALF_OPEN once the timeout has passed, so
+        callers that time and record calls themselves (see record_success /
+        record_failure) get the same behavior as call().
+        """
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if self.last_failure_time and datetime.now() - self.last_failure_time > self.timeout:
+                    # Try half-open
+                    self.state = CircuitState.HALF_OPEN
+                    self.success_count = 0
+                    logger.info(f"Circuit breaker {self.name} entering HALF_OPEN state")
+                else:
+                    return False
+            return True
+
+    def is_open(self) -> bool:
+        """Whether calls are currently rejected (does not change state)."""
+        with self._lock:
+            return self.state == CircuitState.OPEN and not (
+                self.last_failure_time and datetime.now() - self.last_failure_time > self.timeout
+            )
+
+    def record_success(self):
+        """Record a successful call made outside call()."""
+        with self._lock:
+            self._on_success()
+
+    def record_failure(self):
+        """Record a failed call made outside call()."""
+        with self._lock:
+            self._on_failure()
+
     def call(self, func: Callable, *args, **kwargs) -> Any:
         """
         Execute function with circuit breaker protection
@@ -59,21 +97,15 @@ class CircuitBreaker:
             CircuitBreakerOpen: If circuit is open
             Exception: Any exception from the function
         """
-        if self.state == CircuitState.OPEN:
-            if self.last_failure_time and datetime.now() - self.last_failure_time > self.timeout:
-                # Try half-open
-                self.state = CircuitState.HALF_OPEN
-                self.success_count = 0
-                logger.info(f"Circuit breaker {self.name} entering HALF_OPEN state")
-            else:
-                raise CircuitBreakerOpen(f"Circuit breaker {self.name} is OPEN")
+        if not self.allow_request():
+            raise CircuitBreakerOpen(f"Circuit breaker {self.name} is OPEN")
         
         try:
             result = func(*args, **kwargs)
-            self._on_success()
+            self.record_success()
             return result
         except Exception as e:
-            self._on_failure()
+            self.record_failure()
             raise
     
     def _on_success(self):
@@ -31,7 +31,7 @@ class JSONFormatter(logging.Formatter):
             log_data['exception'] = self.formatException(record.exc_info)
         
         # Add custom fields
-        for attr in ['ticker', 'duration_ms', 'vendor', 'cache_hit']:
+        for attr in ['ticker', 'duration_ms', 'vendor', 'cache_hit', 'method', 'event']:
             if hasattr(record, attr):
                 log_data[attr] = getattr(record, attr)
         
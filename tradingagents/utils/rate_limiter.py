@@ -0,0 +1,51 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Thread-safe rate limiting for concurrent API fetches
+"""
+import time
+import threading
+
+
+class RateLimiter:
+    """
+    Spaces out calls so that at most ``rate`` calls start per second.
+
+    Safe to share across worker threads: each caller reserves the next free
+    slot under a lock and then sleeps outside it until that slot arrives.
+
+    Example:
+        limiter = RateLimiter(rate=4.0)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pool.map(lambda s: (limiter.wait(), fetch(s)), symbols)
+    """
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Maximum calls per second (<= 0 disables limiting)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """
+        Block until the caller may proceed.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.interval == 0.0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
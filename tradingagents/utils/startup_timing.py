@@ -0,0 +1,176 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Startup profiling for TradingAgentsGraph and its heavy dependencies
+
+Records how long each lazily built component takes to initialize and
+measures the import cost of heavy third-party modules.
+"""
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Modules whose import cost dominates process startup
+HEAVY_MODULES = (
+    "chromadb",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_anthropic",
+    "langchain_google_genai",
+    "langgraph",
+    "openai",
+    "yfinance",
+    "pandas",
+    "tradingagents.graph.trading_graph",
+)
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+class StartupTimer:
+    """
+    Collects per-component initialization durations.
+
+    Example:
+        timer = get_startup_timer()
+        with timer.measure("rag"):
+            init_rag()
+        print(timer.get_report())
+    """
+
+    def __init__(self):
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, component: str, seconds: float):
+        """Add one initialization of a component."""
+        with self._lock:
+            entry = self._timings.setdefault(
+                component, {"count": 0, "total_seconds": 0.0, "last_seconds": 0.0}
+            )
+            entry["count"] += 1
+            entry["total_seconds"] += seconds
+            entry["last_seconds"] = seconds
+
+    @contextmanager
+    def measure(self, component: str) -> Iterator[None]:
+        """Time the body as one initialization of ``component``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.record(component, elapsed)
+            logger.debug(f"Initialized {component} in {elapsed:.3f}s")
+
+    def get_report(self) -> Dict[str, Dict[str, float]]:
+        """Component timings, slowest first."""
+        with self._lock:
+            items = [(name, dict(entry)) for name, entry in self._timings.items()]
+        items.sort(key=lambda item: item[1]["total_seconds"], reverse=True)
+        return {
+            name: {
+                "count": int(entry["count"]),
+                "total_seconds": round(entry["total_seconds"], 4),
+                "last_seconds": round(entry["last_seconds"], 4),
+            }
+            for name, entry in items
+        }
+
+    def reset(self):
+        """Forget all recorded timings."""
+        with self._lock:
+            self._timings.clear()
+
+
+def measure_import_times(
+    modules: Iterable[str] = HEAVY_MODULES,
+    timeout: int = 120
+) -> Dict[str, Optional[float]]:
+    """
+    Measure cold import time of each module in a fresh interpreter.
+
+    Uses ``python -X importtime`` so the figures are independent of what the
+    current process has already imported.
+
+    Args:
+        modules: Module names to import
+        timeout: Seconds allowed per module
+
+    Returns:
+        Dict of module -> cumulative import seconds (None if the import failed)
+    """
+    results: Dict[str, Optional[float]] = {}
+    for module in modules:
+        try:
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.warning(f"Could not time import of {module}: {e}")
+            results[module] = None
+            continue
+
+        if proc.returncode != 0:
+            results[module] = None
+            continue
+
+        cumulative_us = None
+        for line in proc.stderr.splitlines():
+            match = _IMPORTTIME_RE.search(line)
+            if match and match.group(3) == module:
+                cumulative_us = int(match.group(2))
+        results[module] = cumulative_us / 1e6 if cumulative_us is not None else None
+    return results
+
+
+def format_startup_report(import_times: Optional[Dict[str, Optional[float]]] = None) -> str:
+    """
+    Plain-text startup report.
+
+    Args:
+        import_times: Output of measure_import_times() to include (optional)
+
+    Returns:
+        Report text
+    """
+    lines = ["Component initialization", "-" * 60]
+    report = get_startup_timer().get_report()
+    if not report:
+        lines.append("(no components initialized yet)")
+    for name, entry in report.items():
+        lines.append(
+            f"{name:<32} {entry['total_seconds']:>9.3f}s  x{entry['count']}"
+        )
+
+    if import_times is not None:
+        lines += ["", "Cold import time", "-" * 60]
+        for module, seconds in sorted(
+            import_times.items(), key=lambda item: item[1] or 0.0, reverse=True
+        ):
+            shown = f"{seconds:>9.3f}s" if seconds is not None else "   failed"
+            lines.append(f"{module:<32} {shown}")
+    return "\n".join(lines)
+
+
+# Global instance
+_startup_timer: Optional[StartupTimer] = None
+
+
+def get_startup_timer() -> StartupTimer:
+    """Get the global startup timer."""
+    global _startup_timer
+    if _startup_timer is None:
+        _startup_timer = StartupTimer()
+    return _startup_timer
@@ -16,7 +16,10 @@ from .data_quality import (
 
 from .price_validation import (
     validate_price_multi_source,
+    validate_prices_multi_source,
     PriceValidationReport,
+    PriceValidationCache,
+    get_price_validation_cache,
     check_volume_anomaly,
     get_yfinance_current_price,
     get_alphavantage_current_price,
@@ -28,6 +31,8 @@ from .earnings_calendar import (
     EarningsEvent,
     get_earnings_calendar_yfinance,
     get_earnings_calendar_alphavantage,
+    EarningsCalendarCache,
+    get_earnings_calendar_cache,
 )
 
 from .system_doctor import (
@@ -45,7 +50,10 @@ __all__ = [
 
     # Phase 2: Multi-Source Price Validation
     'validate_price_multi_source',
+    'validate_prices_multi_source',
     'PriceValidationReport',
+    'PriceValidationCache',
+    'get_price_validation_cache',
     'check_volume_anomaly',
     'get_yfinance_current_price',
     'get_alphavantage_current_price',
@@ -56,6 +64,8 @@ __all__ = [
     'EarningsEvent',
     'get_earnings_calendar_yfinance',
     'get_earnings_calendar_alphavantage',
+    'EarningsCalendarCache',
+    'get_earnings_calendar_cache',
 
     # Phase 3: System Doctor (v2.0)
     'SystemDoctor',
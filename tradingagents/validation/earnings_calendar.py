@@ -8,12 +8,19 @@ Checks for upcoming earnings announcements and warns when recommendations
 are made close to earnings dates (increased volatility risk).
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, timezone, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable
 import json
+import logging
+import os
+import threading
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class EarningsEvent:
     """Represents an upcoming or recent earnings event"""
@@ -318,15 +325,31 @@ def check_earnings_proximity(
     Returns:
         EarningsProximityReport with risk assessment
     """
-    report = EarningsProximityReport(ticker=ticker.upper())
+    return _build_proximity_report(ticker, fetch_earnings_event(ticker))
+
 
-    # Try yfinance first (has forward-looking calendar)
+def fetch_earnings_event(ticker: str) -> Optional[EarningsEvent]:
+    """
+    Fetch the next (or most recent) earnings event for a ticker.
+
+    Tries yfinance first (has forward-looking calendar), then Alpha Vantage.
+    """
     upcoming = get_earnings_calendar_yfinance(ticker)
 
     # Fallback to Alpha Vantage if yfinance fails
     if not upcoming:
         upcoming = get_earnings_calendar_alphavantage(ticker)
 
+    return upcoming
+
+
+def _build_proximity_report(
+    ticker: str,
+    upcoming: Optional[EarningsEvent]
+) -> EarningsProximityReport:
+    """Assess earnings proximity risk for an already-fetched event."""
+    report = EarningsProximityReport(ticker=ticker.upper())
+
     if upcoming:
         report.upcoming_earnings = upcoming
         report.days_until_next_earnings = upcoming.days_until_earnings()
@@ -344,3 +367,186 @@ def check_earnings_proximity(
         report.proximity_risk_level = "UNKNOWN"
 
     return report
+
+
+class EarningsCalendarCache:
+    """
+    Scan-wide earnings calendar, bulk-loaded once per day into a local JSON file.
+
+    Proximity checks become a dictionary lookup instead of one or two API
+    calls per ticker.
+
+    Staleness policy:
+    - A snapshot is fresh on the calendar day (local time) it was refreshed.
+      ``ensure_fresh`` reloads the whole watchlist on the first call of a
+      new day; ``refresh`` forces a reload at any time.
+    - Days-until-earnings is always computed at lookup time from the cached
+      report date, so a day-old entry is still accurate for the proximity
+      window. Staleness only matters when a company reschedules or a
+      report date passes and the next one is announced.
+    - Tickers with no earnings data are cached as such (negative entries)
+      and are not re-fetched until the next refresh.
+    - Lookups for tickers missing from the snapshot fall back to a live
+      fetch and are kept in memory until the next ``save``.
+
+    Refresh explicitly with ``python -m tradingagents.screener earnings --refresh``.
+    """
+
+    FILENAME = "earnings_calendar.json"
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache (loads the snapshot file if it exists).
+
+        Args:
+            path: Snapshot file (defaults to <data_cache_dir>/earnings_calendar.json)
+        """
+        if path is None:
+            from tradingagents.dataflows.config import get_config
+            path = os.path.join(get_config()["data_cache_dir"], self.FILENAME)
+        self.path = Path(path)
+        self.refreshed_on: Optional[date] = None
+        self._events: Dict[str, Optional[EarningsEvent]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> bool:
+        """Load the snapshot file; returns False if missing or unreadable."""
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            events = {}
+            for ticker, event in data.get("events", {}).items():
+                if event is not None:
+                    event["report_date"] = datetime.fromisoformat(event["report_date"])
+                    event = EarningsEvent(**event)
+                events[ticker] = event
+            with self._lock:
+                self._events = events
+                self.refreshed_on = date.fromisoformat(data["refreshed_on"])
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load earnings calendar cache {self.path}: {e}")
+            return False
+
+    def save(self):
+        """Write the snapshot file."""
+        with self._lock:
+            events = {
+                ticker: (
+                    {**asdict(event), "report_date": event.report_date.isoformat()}
+                    if event is not None else None
+                )
+                for ticker, event in self._events.items()
+            }
+            data = {
+                "refreshed_on": self.refreshed_on.isoformat() if self.refreshed_on else None,
+                "events": events,
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def is_stale(self) -> bool:
+        """True if the snapshot was not refreshed today."""
+        return self.refreshed_on != date.today()
+
+    def refresh(
+        self,
+        tickers: Iterable[str],
+        max_workers: int = 8,
+        requests_per_second: float = 4.0
+    ) -> int:
+        """
+        Bulk-load earnings dates for all tickers and save the snapshot.
+
+        Args:
+            tickers: Watchlist symbols
+            max_workers: Concurrent fetch threads
+            requests_per_second: Maximum lookups started per second
+
+        Returns:
+            Number of tickers with earnings data
+        """
+        from tradingagents.utils.rate_limiter import RateLimiter
+
+        tickers = sorted({t.upper() for t in tickers})
+        limiter = RateLimiter(requests_per_second)
+
+        def fetch(ticker: str) -> Optional[EarningsEvent]:
+            limiter.wait()
+            try:
+                return fetch_earnings_event(ticker)
+            except Exception as e:
+                logger.debug(f"Could not fetch earnings for {ticker}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            events = dict(zip(tickers, executor.map(fetch, tickers)))
+
+        with self._lock:
+            self._events = events
+            self.refreshed_on = date.today()
+        self.save()
+
+        found = sum(1 for e in events.values() if e is not None)
+        logger.info(f"Refreshed earnings calendar: {found}/{len(tickers)} tickers with earnings data")
+        return found
+
+    def ensure_fresh(self, tickers: Iterable[str], **refresh_kwargs) -> bool:
+        """
+        Refresh if the snapshot is stale; returns True if a refresh ran.
+
+        Args:
+            tickers: Watchlist symbols
+            **refresh_kwargs: Passed to refresh()
+        """
+        if not self.is_stale():
+            return False
+        self.refresh(tickers, **refresh_kwargs)
+        return True
+
+    def get_event(self, ticker: str) -> Optional[EarningsEvent]:
+        """Cached earnings event for a ticker (live fetch if not in the snapshot)."""
+        ticker = ticker.upper()
+        with self._lock:
+            if ticker in self._events:
+                return self._events[ticker]
+        event = fetch_earnings_event(ticker)
+        with self._lock:
+            self._events[ticker] = event
+        return event
+
+    def check_proximity(
+        self,
+        ticker: str,
+        days_before: int = 7,
+        days_after: int = 3
+    ) -> EarningsProximityReport:
+        """
+        Cached equivalent of check_earnings_proximity().
+
+        Args:
+            ticker: Stock ticker symbol
+            days_before: Days before earnings to consider risky (default 7)
+            days_after: Days after earnings to consider risky (default 3)
+
+        Returns:
+            EarningsProximityReport with risk assessment
+        """
+        return _build_proximity_report(ticker, self.get_event(ticker))
+
+
+_earnings_cache: Optional[EarningsCalendarCache] = None
+
+
+def get_earnings_calendar_cache() -> EarningsCalendarCache:
+    """Get the global earnings calendar cache."""
+    global _earnings_cache
+    if _earnings_cache is None:
+        _earnings_cache = EarningsCalendarCache()
+    return _earnings_cache
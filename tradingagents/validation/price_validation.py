@@ -4,16 +4,28 @@
 """
 Multi-Source Price Validation Module
 
-Validates stock prices by cross-referencing multiple data sources (yfinance and Alpha Vantage).
-Detects price discrepancies and provides confidence metrics for price data.
+Validates stock prices by cross-referencing multiple data sources (yfinance,
+Alpha Vantage, Alpaca and Polygon). Detects price discrepancies and provides
+confidence metrics for price data.
+
+Sources are queried concurrently under a deadline; validation stops as soon
+as a quorum of sources agree, and results are cached per ticker for a short
+TTL so repeated circuit breaker checks don't hit the vendors again.
 """
 
+import concurrent.futures
+import copy
+import logging
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Tuple, List
+from typing import Callable, Dict, Iterable, Optional, Tuple, List
 import pandas as pd
 from io import StringIO
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class PriceValidationReport:
     """Report containing multi-source price validation results"""
@@ -295,51 +307,245 @@ def get_polygon_current_price(ticker: str) -> Tuple[Optional[float], Optional[in
         return (None, None)
 
 
+# Report attribute prefix for each source
+SOURCE_ATTRIBUTES = {
+    "yfinance": "yfinance",
+    "alpha_vantage": "alphavantage",
+    "alpaca": "alpaca",
+    "polygon": "polygon",
+}
+
+# Shared pool for source fetches; fetches that miss the deadline finish in the
+# background instead of blocking the caller. Each source may hold at most
+# _MAX_FETCHES_PER_SOURCE workers, and the pool has room for all of them, so
+# a slow vendor's abandoned fetches never delay another validation's fetches.
+_MAX_FETCHES_PER_SOURCE = 4
+_fetch_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Running fetches by (source, fetch function, ticker), shared between validations
+_in_flight: Dict[Tuple[str, Callable, str], concurrent.futures.Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _get_fetch_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _fetch_executor
+    with _executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_MAX_FETCHES_PER_SOURCE * len(_price_sources()),
+                thread_name_prefix="price-validation"
+            )
+        return _fetch_executor
+
+
+def _submit_fetch(name: str, fetch: Callable, ticker: str) -> Optional[concurrent.futures.Future]:
+    """
+    Start a source fetch, or join the one already running for the ticker.
+
+    Returns:
+        The fetch future, or None if the source already has
+        _MAX_FETCHES_PER_SOURCE fetches running (it is treated as slow)
+    """
+    key = (name, fetch, ticker)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is not None:
+            return future
+        if sum(1 for source, _, _ in _in_flight if source == name) >= _MAX_FETCHES_PER_SOURCE:
+            return None
+        future = _get_fetch_executor().submit(fetch, ticker)
+        _in_flight[key] = future
+
+    def release(done: concurrent.futures.Future) -> None:
+        with _in_flight_lock:
+            if _in_flight.get(key) is done:
+                del _in_flight[key]
+
+    future.add_done_callback(release)
+    return future
+
+
+def _price_sources() -> List[Tuple[str, Callable[[str], Tuple[Optional[float], Optional[int]]]]]:
+    """Sources in preference order (resolved at call time)."""
+    return [
+        ("yfinance", get_yfinance_current_price),
+        ("alpha_vantage", get_alphavantage_current_price),
+        ("alpaca", get_alpaca_current_price),
+        ("polygon", get_polygon_current_price),
+    ]
+
+
+def _validation_settings() -> Dict:
+    from tradingagents.dataflows.config import get_config
+    return get_config().get("validation", {}) or {}
+
+
+def _prices_agree(prices: List[float], threshold_percent: float) -> bool:
+    avg_price = sum(prices) / len(prices)
+    return avg_price > 0 and (max(prices) - min(prices)) / avg_price * 100 <= threshold_percent
+
+
+def _fetch_quotes(
+    ticker: str,
+    timeout: float,
+    quorum: int,
+    discrepancy_threshold: float
+) -> Tuple[Dict[str, Tuple[float, Optional[int]]], List[str]]:
+    """
+    Fetch all sources concurrently until the deadline or an agreeing quorum.
+
+    Returns:
+        Tuple of (source -> (price, volume) in source order, sources that
+        missed the deadline or were skipped because their earlier fetches
+        are still running)
+    """
+    order = []
+    futures = {}
+    busy = []
+    for name, fetch in _price_sources():
+        order.append(name)
+        future = _submit_fetch(name, fetch, ticker)
+        if future is None:
+            logger.debug(f"{name} has too many slow fetches running; skipping it for {ticker}")
+            busy.append(name)
+        else:
+            futures[future] = name
+    deadline = time.monotonic() + timeout
+    quotes: Dict[str, Tuple[float, Optional[int]]] = {}
+    pending = set(futures)
+    quorum_reached = False
+
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = concurrent.futures.wait(
+            pending, timeout=remaining, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            try:
+                price, volume = future.result()
+            except Exception as e:
+                logger.debug(f"{futures[future]} price fetch failed for {ticker}: {e}")
+                continue
+            if price:
+                quotes[futures[future]] = (price, volume)
+        prices = [price for price, _ in quotes.values()]
+        if quorum and len(prices) >= quorum and _prices_agree(prices, discrepancy_threshold):
+            quorum_reached = True
+            break
+
+    # Fetches still running are left to finish: another validation may share them
+    ordered = {name: quotes[name] for name in order if name in quotes}
+    missed = {futures[future] for future in pending}.union(busy)
+    timed_out = [] if quorum_reached else [name for name in order if name in missed]
+    return ordered, timed_out
+
+
+class PriceValidationCache:
+    """
+    Short-TTL, in-memory cache of validation reports per ticker.
+
+    Keyed by ticker and thresholds; reports with no sources are never cached
+    so an outage is retried on the next call. Callers get copies, so a
+    cached report cannot be mutated from outside.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple, Tuple[float, PriceValidationReport]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[PriceValidationReport]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: Tuple, report: PriceValidationReport, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or not report.sources_checked:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(report))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_validation_cache: Optional[PriceValidationCache] = None
+
+
+def get_price_validation_cache() -> PriceValidationCache:
+    """Get the global price validation result cache."""
+    global _validation_cache
+    if _validation_cache is None:
+        _validation_cache = PriceValidationCache()
+    return _validation_cache
+
+
 def validate_price_multi_source(
     ticker: str,
     discrepancy_threshold: float = 2.0,
-    volume_threshold: float = 10.0
+    volume_threshold: float = 10.0,
+    timeout: Optional[float] = None,
+    quorum: Optional[int] = None,
+    use_cache: bool = True
 ) -> PriceValidationReport:
     """
     Validate stock price by comparing multiple data sources.
 
+    All sources are fetched concurrently. Validation finishes when a quorum
+    of sources agree within the discrepancy threshold, when every source has
+    answered, or at the deadline, whichever comes first.
+
     Args:
         ticker: Stock ticker symbol
         discrepancy_threshold: Maximum acceptable price discrepancy (%)
         volume_threshold: Maximum acceptable volume discrepancy (%)
+        timeout: Deadline in seconds for the source fetches (defaults to
+            validation.price_validation_timeout)
+        quorum: Number of agreeing sources that ends validation early; 0
+            waits for all sources (defaults to validation.price_validation_quorum)
+        use_cache: Reuse a recent result for the same ticker and thresholds
 
     Returns:
         PriceValidationReport with validation results
     """
-    report = PriceValidationReport(ticker=ticker.upper())
-
-    # Fetch from yfinance
-    yf_price, yf_volume = get_yfinance_current_price(ticker)
-    if yf_price:
-        report.yfinance_price = yf_price
-        report.yfinance_volume = yf_volume
-        report.sources_checked.append("yfinance")
-
-    # Fetch from Alpha Vantage
-    av_price, av_volume = get_alphavantage_current_price(ticker)
-    if av_price:
-        report.alphavantage_price = av_price
-        report.alphavantage_volume = av_volume
-        report.sources_checked.append("alpha_vantage")
-
-    # Fetch from Alpaca
-    alp_price, alp_volume = get_alpaca_current_price(ticker)
-    if alp_price:
-        report.alpaca_price = alp_price
-        report.alpaca_volume = alp_volume
-        report.sources_checked.append("alpaca")
-
-    # Fetch from Polygon
-    poly_price, poly_volume = get_polygon_current_price(ticker)
-    if poly_price:
-        report.polygon_price = poly_price
-        report.polygon_volume = poly_volume
-        report.sources_checked.append("polygon")
+    settings = _validation_settings()
+    timeout = settings.get("price_validation_timeout", 5.0) if timeout is None else timeout
+    quorum = settings.get("price_validation_quorum", 2) if quorum is None else quorum
+    ticker = ticker.upper()
+
+    cache = get_price_validation_cache()
+    cache_key = (ticker, discrepancy_threshold, volume_threshold)
+    if use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    report = PriceValidationReport(ticker=ticker)
+    quotes, timed_out = _fetch_quotes(ticker, timeout, quorum, discrepancy_threshold)
+    for source, (price, volume) in quotes.items():
+        attribute = SOURCE_ATTRIBUTES[source]
+        setattr(report, f"{attribute}_price", price)
+        setattr(report, f"{attribute}_volume", volume)
+        report.sources_checked.append(source)
+
+    if timed_out:
+        report.flags.append(f"No response within {timeout:.1f}s from: {', '.join(timed_out)}")
 
     # Calculate discrepancies
     report.calculate_discrepancy(threshold_percent=discrepancy_threshold)
@@ -354,9 +560,52 @@ def validate_price_multi_source(
         report.validation_passed = False
         report.confidence_score = 0.0
 
+    if use_cache:
+        cache.put(cache_key, report, settings.get("price_validation_cache_ttl"))
     return report
 
 
+def validate_prices_multi_source(
+    tickers: Iterable[str],
+    discrepancy_threshold: float = 2.0,
+    volume_threshold: float = 10.0,
+    timeout: Optional[float] = None,
+    quorum: Optional[int] = None,
+    use_cache: bool = True,
+    max_workers: int = 4
+) -> Dict[str, PriceValidationReport]:
+    """
+    Validate a whole watchlist at once.
+
+    Tickers are validated concurrently (each with its own source deadline)
+    and duplicates are validated once.
+
+    Args:
+        tickers: Stock ticker symbols
+        discrepancy_threshold: Maximum acceptable price discrepancy (%)
+        volume_threshold: Maximum acceptable volume discrepancy (%)
+        timeout: Per-ticker deadline in seconds for the source fetches
+        quorum: Number of agreeing sources that ends a ticker's validation early
+        use_cache: Reuse recent results
+        max_workers: Tickers validated at the same time
+
+    Returns:
+        Dict mapping upper-case ticker to its PriceValidationReport, in input order
+    """
+    symbols = list(dict.fromkeys(t.upper() for t in tickers))
+    if not symbols:
+        return {}
+
+    def validate(symbol):
+        return validate_price_multi_source(
+            symbol, discrepancy_threshold=discrepancy_threshold, volume_threshold=volume_threshold,
+            timeout=timeout, quorum=quorum, use_cache=use_cache
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+        return dict(zip(symbols, executor.map(validate, symbols)))
+
+
 def check_volume_anomaly(ticker: str, current_volume: int, lookback_days: int = 20) -> Tuple[bool, Optional[float]]:
     """
     Check if current volume is anomalous compared to historical average.
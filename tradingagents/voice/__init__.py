@@ -15,6 +15,12 @@ from .tts_engine import (
     get_tts_engine
 )
 
+from .tts_pipeline import (
+    TTSPipeline,
+    PhraseAudioCache,
+    get_phrase_cache
+)
+
 from .tone_detector import (
     ToneDetector,
     get_tone_detector
@@ -27,6 +33,12 @@ from .stt_engine import (
     get_stt_engine
 )
 
+from .streaming_stt import (
+    StreamingTranscriber,
+    StreamingSTTConfig,
+    PCMRingBuffer
+)
+
 from .bargein_detector import (
     BargeInDetector,
     BargeInManager,
@@ -41,6 +53,9 @@ __all__ = [
     'EmotionalTone',
     'TTSConfig',
     'get_tts_engine',
+    'TTSPipeline',
+    'PhraseAudioCache',
+    'get_phrase_cache',
     'ToneDetector',
     'get_tone_detector',
     
@@ -49,6 +64,9 @@ __all__ = [
     'STTEngineFallback',
     'STTConfig',
     'get_stt_engine',
+    'StreamingTranscriber',
+    'StreamingSTTConfig',
+    'PCMRingBuffer',
     
     # Barge-in
     'BargeInDetector',
@@ -0,0 +1,73 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Audio Utilities - Eddie v2.0
+
+In-memory WAV helpers shared by the STT and TTS engines.
+"""
+
+import io
+import struct
+import wave
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def parse_wav_header(data: bytes) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Parse a RIFF/WAV header.
+
+    Returns:
+        (sample_rate, channels, sample_width, data_offset) or None if not a WAV
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack("<I", data[offset + 4:offset + 8])[0]
+        if chunk_id == b"fmt ":
+            _, channels, sample_rate, _, _, bits = struct.unpack(
+                "<HHIIHH", data[offset + 8:offset + 24]
+            )
+            fmt = (sample_rate, channels, bits // 8)
+        elif chunk_id == b"data" and fmt is not None:
+            return fmt + (offset + 8,)
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+def pcm_to_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Wrap float32 [-1, 1] or int16 samples as an in-memory mono 16-bit WAV."""
+    if samples.dtype != np.int16:
+        samples = np.clip(samples * 32768.0, -32768, 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def aiff_frames_to_wav(pcm: bytes, sample_width: int) -> bytes:
+    """
+    Convert AIFF sample data to WAV sample data.
+
+    AIFF samples are big-endian and signed; WAV samples are little-endian,
+    and 8-bit WAV is unsigned.
+
+    Raises:
+        ValueError: Unsupported sample width
+    """
+    if sample_width == 1:
+        return (np.frombuffer(pcm, dtype=np.int8).astype(np.int16) + 128).astype(np.uint8).tobytes()
+    if sample_width == 3:
+        # No 24-bit dtype: reverse the bytes of each triplet
+        return np.frombuffer(pcm, dtype=np.uint8).reshape(-1, 3)[:, ::-1].tobytes()
+    if sample_width in (2, 4):
+        return np.frombuffer(pcm, dtype=f">i{sample_width}").astype(f"<i{sample_width}").tobytes()
+    raise ValueError(f"Unsupported AIFF sample width: {sample_width * 8} bits")
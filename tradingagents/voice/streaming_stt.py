@@ -0,0 +1,492 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+Streaming Speech-to-Text - Eddie v2.0
+
+Incremental transcription for live audio (the /voice/ws WebSocket):
+
+- PCM frames are written into a preallocated ring buffer (no per-chunk
+  bytes concatenation)
+- energy-based VAD splits speech into segments as audio arrives
+- a dedicated worker thread decodes segments, so the caller (the event
+  loop) never blocks on Whisper
+- partial transcripts are emitted while the user is still speaking, and
+  every final segment carries latency metrics
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_utils import parse_wav_header
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamingSTTConfig:
+    """Streaming STT configuration."""
+    sample_rate: int = 16000  # Rate the decoder expects (Whisper: 16 kHz)
+    buffer_seconds: float = 60.0  # Ring buffer capacity
+    frame_ms: int = 30  # VAD frame length
+    energy_threshold: float = 0.01  # RMS above which a frame counts as speech
+    min_speech_ms: int = 120  # Speech needed to open a segment
+    end_silence_ms: int = 500  # Silence that closes a segment
+    pre_roll_ms: int = 150  # Audio kept before detected speech onset
+    partial_interval_ms: int = 1000  # Partial transcript cadence while speaking
+    max_segment_seconds: float = 15.0  # Force a final transcript for long speech
+
+
+class PCMRingBuffer:
+    """
+    Preallocated ring buffer of 16-bit PCM samples addressed by absolute sample index.
+
+    The writer appends; readers copy any range that has not been overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Number of samples held
+        """
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self.total_written = 0
+        self._lock = threading.Lock()
+
+    @property
+    def oldest_index(self) -> int:
+        """Absolute index of the oldest sample still in the buffer."""
+        return max(0, self.total_written - self.capacity)
+
+    def write(self, samples: np.ndarray):
+        """Append samples (int16)."""
+        samples = samples[-self.capacity:]
+        n = len(samples)
+        if n == 0:
+            return
+        with self._lock:
+            start = self.total_written % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            if first < n:
+                self._data[:n - first] = samples[first:]
+            self.total_written += n
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """
+        Copy samples [start, end) by absolute index.
+
+        Ranges that were already overwritten are clipped to the oldest sample.
+        """
+        with self._lock:
+            if start < self.oldest_index:
+                logger.warning(f"Ring buffer overrun: dropped {self.oldest_index - start} samples")
+                start = self.oldest_index
+            end = min(end, self.total_written)
+            n = end - start
+            if n <= 0:
+                return np.zeros(0, dtype=np.int16)
+            begin = start % self.capacity
+            first = min(n, self.capacity - begin)
+            out = np.empty(n, dtype=np.int16)
+            out[:first] = self._data[begin:begin + first]
+            if first < n:
+                out[first:] = self._data[:n - first]
+            return out
+
+
+class _LinearResampler:
+    """Stateful linear resampler, continuous across chunk boundaries."""
+
+    def __init__(self, src_rate: int, dst_rate: int):
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.step = src_rate / dst_rate
+        self._pos = 0.0  # Next output position, relative to _prev
+        self._prev: Optional[np.ndarray] = None
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if self.src_rate == self.dst_rate or len(samples) == 0:
+            return samples
+        x = samples.astype(np.float32)
+        if self._prev is not None:
+            x = np.concatenate([self._prev, x])
+        last = len(x) - 1
+        if last < self._pos:
+            self._prev = x[-1:]
+            self._pos -= last
+            return np.zeros(0, dtype=np.float32)
+        count = int((last - self._pos) // self.step) + 1
+        positions = self._pos + self.step * np.arange(count)
+        out = np.interp(positions, np.arange(len(x)), x)
+        self._pos = self._pos + self.step * count - last
+        self._prev = x[-1:]
+        return out.astype(np.float32)
+
+
+@dataclass
+class _Segment:
+    segment_id: int
+    start: int  # Absolute sample index
+    opened_at: float  # Wall clock when speech was detected
+    end: Optional[int] = None
+    closed_at: Optional[float] = None
+    last_partial_end: int = 0
+    partial_pending: bool = False
+    first_partial_at: Optional[float] = None
+    partials: int = 0
+
+
+@dataclass
+class SegmentMetrics:
+    """Latency metrics for one final segment."""
+    segment_id: int
+    audio_seconds: float
+    decode_seconds: float
+    queue_seconds: float
+    finalize_latency_seconds: float  # End of speech detected -> final transcript
+    first_partial_seconds: Optional[float]  # Speech onset -> first partial transcript
+    partials: int
+
+    @property
+    def real_time_factor(self) -> float:
+        return self.decode_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "segment_id": self.segment_id,
+            "audio_seconds": round(self.audio_seconds, 3),
+            "decode_seconds": round(self.decode_seconds, 3),
+            "queue_seconds": round(self.queue_seconds, 3),
+            "finalize_latency_seconds": round(self.finalize_latency_seconds, 3),
+            "first_partial_seconds": (
+                round(self.first_partial_seconds, 3) if self.first_partial_seconds is not None else None
+            ),
+            "partials": self.partials,
+            "real_time_factor": round(self.real_time_factor, 3),
+        }
+
+
+class StreamingTranscriber:
+    """
+    VAD-segmented incremental transcription on a worker thread.
+
+    Example:
+        transcriber = StreamingTranscriber(get_stt_engine(), on_result=handle)
+        for chunk in pcm_chunks:
+            transcriber.feed(chunk, sample_rate=16000)
+        transcriber.flush()
+        transcriber.wait_idle()
+        transcriber.close()
+
+    ``on_result`` is called from the worker thread with dicts of type
+    ``partial`` or ``final`` (final results include ``metrics``).
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        stt_engine,
+        config: Optional[StreamingSTTConfig] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Args:
+            stt_engine: Engine exposing transcribe_array(audio, sample_rate)
+            config: Streaming configuration
+            on_result: Callback for partial/final results (worker thread)
+        """
+        self.stt_engine = stt_engine
+        self.config = config or StreamingSTTConfig()
+        self.on_result = on_result
+
+        rate = self.config.sample_rate
+        self.ring = PCMRingBuffer(int(self.config.buffer_seconds * rate))
+        self._frame_len = int(rate * self.config.frame_ms / 1000)
+        self._min_speech_frames = max(1, self.config.min_speech_ms // self.config.frame_ms)
+        self._end_silence_frames = max(1, self.config.end_silence_ms // self.config.frame_ms)
+        self._pre_roll = int(rate * self.config.pre_roll_ms / 1000)
+        self._partial_interval = int(rate * self.config.partial_interval_ms / 1000)
+        self._max_segment = int(rate * self.config.max_segment_seconds)
+
+        self._lock = threading.Lock()
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self.metrics: List[SegmentMetrics] = []
+        self.final_results: List[Dict[str, Any]] = []
+        self._segment: Optional[_Segment] = None
+        self._next_segment_id = 0
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Producer side (event loop / caller thread)
+    # ------------------------------------------------------------------
+
+    def reset(self):
+        """Forget the current utterance (keeps the worker running)."""
+        with self._lock:
+            self._resampler: Optional[_LinearResampler] = None
+            self._input_format: Optional[Tuple[int, int, int]] = None
+            self._header = b""
+            self._pending_bytes = b""
+            self._vad_pos = self.ring.total_written  # Next sample the VAD looks at
+            self._speech_frames = 0
+            self._silence_frames = 0
+            if self._segment is not None:
+                # Dropped mid-speech: pending partials for it are skipped
+                self._segment.end = self._segment.start
+            self._segment = None
+            # Finals and metrics are per utterance; segments decoded after
+            # this point that belong to the previous one are not recorded
+            self._first_segment_id = self._next_segment_id
+            self.final_results = []
+            self.metrics = []
+
+    def start(self):
+        """Start the decoding worker (idempotent)."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="streaming-stt", daemon=True)
+            self._worker.start()
+
+    def feed(self, chunk: bytes, sample_rate: Optional[int] = None, channels: int = 1):
+        """
+        Add audio. Accepts raw 16-bit PCM, or a WAV stream whose first chunk carries the header.
+
+        Args:
+            chunk: Audio bytes
+            sample_rate: Sample rate of raw PCM (default: config.sample_rate)
+            channels: Channel count of raw PCM
+        """
+        self.start()
+        with self._lock:
+            samples = self._decode_input(chunk, sample_rate, channels)
+            if samples is None or len(samples) == 0:
+                return
+            self.ring.write(samples)
+            self._run_vad()
+
+    def flush(self):
+        """End of input: close the open segment so it gets a final transcript."""
+        with self._lock:
+            if self._segment is not None:
+                self._close_segment(self.ring.total_written)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued segment has been decoded."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._jobs.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self):
+        """Stop the worker after the queued jobs."""
+        if self._worker is not None and self._worker.is_alive():
+            self._jobs.put(self._STOP)
+            self._worker.join()
+        self._worker = None
+
+    def _decode_input(self, chunk: bytes, sample_rate: Optional[int], channels: int) -> Optional[np.ndarray]:
+        if self._input_format is None:
+            data = self._header + chunk
+            if data[:4] == b"RIFF":
+                header = parse_wav_header(data)
+                if header is None:
+                    # Header split across chunks; wait for more
+                    self._header = data
+                    return None
+                wav_rate, wav_channels, width, offset = header
+                if width != 2:
+                    raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+                self._input_format = (wav_rate, wav_channels, width)
+                chunk = data[offset:]
+            else:
+                self._input_format = (sample_rate or self.config.sample_rate, channels, 2)
+                chunk = data
+            self._header = b""
+            self._resampler = _LinearResampler(self._input_format[0], self.config.sample_rate)
+
+        data = self._pending_bytes + chunk
+        frame_bytes = 2 * self._input_format[1]
+        usable = len(data) - len(data) % frame_bytes
+        self._pending_bytes = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype=np.int16)
+        if self._input_format[1] > 1:
+            samples = samples.reshape(-1, self._input_format[1]).mean(axis=1)
+        resampled = self._resampler.process(samples)
+        return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+    def _run_vad(self):
+        """Advance the VAD over all complete frames written so far."""
+        frame_len = self._frame_len
+        while self._vad_pos + frame_len <= self.ring.total_written:
+            frame_start = self._vad_pos
+            frame = self.ring.read(frame_start, frame_start + frame_len).astype(np.float32) / 32768.0
+            is_speech = float(np.sqrt(np.mean(frame ** 2))) > self.config.energy_threshold
+            self._vad_pos += frame_len
+            frame_end = self._vad_pos
+
+            segment = self._segment
+            if segment is None:
+                self._speech_frames = self._speech_frames + 1 if is_speech else 0
+                if self._speech_frames >= self._min_speech_frames:
+                    onset = frame_end - self._speech_frames * frame_len
+                    start = max(onset - self._pre_roll, self.ring.oldest_index)
+                    self._segment = _Segment(self._next_segment_id, start, time.perf_counter())
+                    self._segment.last_partial_end = start
+                    self._next_segment_id += 1
+                    self._silence_frames = 0
+                continue
+
+            if is_speech:
+                self._silence_frames = 0
+            else:
+                self._silence_frames += 1
+                if self._silence_frames >= self._end_silence_frames:
+                    speech_end = frame_end - (self._silence_frames - 1) * frame_len
+                    self._close_segment(speech_end)
+                    continue
+
+            if frame_end - segment.start >= self._max_segment:
+                self._close_segment(frame_end)
+                # Speech continues: open the next segment right away
+                self._segment = _Segment(self._next_segment_id, frame_end, time.perf_counter())
+                self._segment.last_partial_end = frame_end
+                self._next_segment_id += 1
+            elif (
+                frame_end - segment.last_partial_end >= self._partial_interval
+                and not segment.partial_pending
+            ):
+                segment.partial_pending = True
+                segment.last_partial_end = frame_end
+                self._jobs.put(("partial", segment, frame_end, time.perf_counter()))
+
+    def _close_segment(self, end: int):
+        segment = self._segment
+        segment.end = end
+        segment.closed_at = time.perf_counter()
+        self._segment = None
+        self._speech_frames = 0
+        self._silence_frames = 0
+        self._jobs.put(("final", segment, end, segment.closed_at))
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is self._STOP:
+                    return
+                self._process(*job)
+            except Exception as e:
+                logger.error(f"Error in streaming transcription: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def _process(self, kind: str, segment: _Segment, end: int, queued_at: float):
+        if kind == "partial" and segment.end is not None:
+            # Segment already closed; its final transcript supersedes this partial
+            segment.partial_pending = False
+            return
+
+        audio = self.ring.read(segment.start, end).astype(np.float32) / 32768.0
+        decode_start = time.perf_counter()
+        result = self.stt_engine.transcribe_array(audio, sample_rate=self.config.sample_rate)
+        decode_end = time.perf_counter()
+
+        rate = self.config.sample_rate
+        payload = {
+            "type": kind,
+            "segment_id": segment.segment_id,
+            "text": result.get("text", "").strip(),
+            "start": segment.start / rate,
+            "end": end / rate,
+            "language": result.get("language", "en"),
+            "confidence": (result.get("segments") or [{}])[0].get("confidence", 0.0),
+        }
+
+        if kind == "partial":
+            segment.partial_pending = False
+            segment.partials += 1
+            if segment.first_partial_at is None:
+                segment.first_partial_at = decode_end
+        else:
+            metrics = SegmentMetrics(
+                segment_id=segment.segment_id,
+                audio_seconds=len(audio) / rate,
+                decode_seconds=decode_end - decode_start,
+                queue_seconds=decode_start - queued_at,
+                finalize_latency_seconds=decode_end - segment.closed_at,
+                first_partial_seconds=(
+                    segment.first_partial_at - segment.opened_at
+                    if segment.first_partial_at is not None else None
+                ),
+                partials=segment.partials,
+            )
+            payload["metrics"] = metrics.to_dict()
+            with self._lock:
+                if segment.segment_id >= self._first_segment_id:
+                    self.metrics.append(metrics)
+                    self.final_results.append(payload)
+
+        if self.on_result:
+            self.on_result(payload)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Aggregate latency metrics over the final segments since the last reset()."""
+        if not self.metrics:
+            return {"segments": 0}
+        latencies = [m.finalize_latency_seconds for m in self.metrics]
+        return {
+            "segments": len(self.metrics),
+            "audio_seconds": round(sum(m.audio_seconds for m in self.metrics), 3),
+            "decode_seconds": round(sum(m.decode_seconds for m in self.metrics), 3),
+            "avg_finalize_latency_seconds": round(sum(latencies) / len(latencies), 3),
+            "max_finalize_latency_seconds": round(max(latencies), 3),
+            "partials": sum(m.partials for m in self.metrics),
+        }
+
+
+def transcribe_pcm_stream(
+    stt_engine,
+    audio_stream: Iterator[bytes],
+    sample_rate: Optional[int] = None,
+    config: Optional[StreamingSTTConfig] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Synchronous wrapper: feed chunks and yield partial/final results as they are decoded.
+
+    Args:
+        stt_engine: Engine exposing transcribe_array()
+        audio_stream: Iterator of raw PCM16 chunks (or a WAV stream)
+        sample_rate: Sample rate of raw PCM
+        config: Streaming configuration
+
+    Yields:
+        Result dicts (type partial/final)
+    """
+    results: "queue.Queue" = queue.Queue()
+    transcriber = StreamingTranscriber(stt_engine, config, on_result=results.put)
+    try:
+        for chunk in audio_stream:
+            transcriber.feed(chunk, sample_rate=sample_rate)
+            while not results.empty():
+                yield results.get_nowait()
+        transcriber.flush()
+        transcriber.wait_idle()
+        while not results.empty():
+            yield results.get_nowait()
+    finally:
+        transcriber.close()
@@ -8,11 +8,17 @@ Faster-Whisper integration for real-time speech recognition with low latency.
 """
 
 import logging
-from typing import Optional, Dict, Any, BinaryIO, Iterator
+from typing import Optional, Dict, Any, BinaryIO, Iterator, TYPE_CHECKING
 from dataclasses import dataclass
 import io
+import wave
 import numpy as np
 
+from .audio_utils import pcm_to_wav
+
+if TYPE_CHECKING:
+    from .streaming_stt import StreamingSTTConfig
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,14 +110,7 @@ class STTEngine:
         Returns:
             Dictionary with transcription and metadata
         """
-        if not self._initialized:
-            self._initialize_stt()
-        
         try:
-            # Convert audio bytes to numpy array
-            import wave
-            import struct
-            
             # Parse WAV file
             audio_io = io.BytesIO(audio_data)
             with wave.open(audio_io, 'rb') as wav_file:
@@ -126,10 +125,36 @@ class STTEngine:
                 else:
                     dtype = np.int16
                     audio_array = np.frombuffer(audio_bytes, dtype=dtype).astype(np.float32) / 32768.0
+        except Exception as e:
+            logger.error(f"Error transcribing audio: {e}")
+            raise
+        
+        return self.transcribe_array(audio_array, sample_rate=sample_rate)
+    
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = 16000) -> Dict[str, Any]:
+        """
+        Transcribe decoded audio samples (no WAV round trip).
+        
+        Args:
+            audio: Mono float32 samples in [-1, 1]
+            sample_rate: Sample rate in Hz (Whisper expects 16 kHz)
+        
+        Returns:
+            Dictionary with transcription and metadata
+        """
+        if not self._initialized:
+            self._initialize_stt()
+        
+        try:
+            if sample_rate != 16000 and len(audio):
+                target = int(round(len(audio) * 16000 / sample_rate))
+                audio = np.interp(
+                    np.linspace(0, len(audio) - 1, target), np.arange(len(audio)), audio
+                ).astype(np.float32)
             
             # Transcribe
             segments, info = self._model.transcribe(
-                audio_array,
+                audio,
                 language=self.config.language,
                 beam_size=self.config.beam_size,
                 vad_filter=self.config.vad_filter,
@@ -164,44 +189,26 @@ class STTEngine:
     def transcribe_streaming(
         self,
         audio_stream: Iterator[bytes],
-        chunk_size: int = 4096
+        sample_rate: Optional[int] = None,
+        config: Optional["StreamingSTTConfig"] = None
     ) -> Iterator[Dict[str, Any]]:
         """
         Transcribe audio stream in real-time.
         
+        Chunks are raw 16-bit PCM (or one WAV stream split into chunks). Speech
+        is segmented by VAD and decoded on a worker thread as it arrives.
+        
         Args:
             audio_stream: Iterator of audio chunks
-            chunk_size: Size of each chunk
+            sample_rate: Sample rate of raw PCM chunks (default 16 kHz)
+            config: Streaming configuration
         
         Yields:
-            Partial transcription results
+            Partial and final transcription results (see StreamingTranscriber)
         """
-        if not self._initialized:
-            self._initialize_stt()
-        
-        # For streaming, we accumulate chunks and transcribe periodically
-        audio_buffer = b""
-        
-        for chunk in audio_stream:
-            audio_buffer += chunk
-            
-            # Transcribe when buffer is large enough
-            if len(audio_buffer) >= chunk_size * 4:  # ~1 second of audio
-                try:
-                    result = self.transcribe(audio_buffer)
-                    yield result
-                    audio_buffer = b""  # Clear buffer after transcription
-                except Exception as e:
-                    logger.error(f"Error in streaming transcription: {e}")
-                    continue
+        from .streaming_stt import transcribe_pcm_stream
         
-        # Transcribe remaining buffer
-        if audio_buffer:
-            try:
-                result = self.transcribe(audio_buffer)
-                yield result
-            except Exception as e:
-                logger.error(f"Error transcribing final buffer: {e}")
+        yield from transcribe_pcm_stream(self, audio_stream, sample_rate=sample_rate, config=config)
 
 
 class STTEngineFallback:
@@ -257,6 +264,21 @@ class STTEngineFallback:
         except Exception as e:
             logger.error(f"Error in fallback STT: {e}")
             raise
+    
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = 16000) -> Dict[str, Any]:
+        """Transcribe decoded samples by wrapping them as an in-memory WAV."""
+        return self.transcribe(pcm_to_wav(audio, sample_rate), sample_rate=sample_rate)
+    
+    def transcribe_streaming(
+        self,
+        audio_stream: Iterator[bytes],
+        sample_rate: Optional[int] = None,
+        config: Optional["StreamingSTTConfig"] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Transcribe audio stream (see STTEngine.transcribe_streaming)."""
+        from .streaming_stt import transcribe_pcm_stream
+        
+        yield from transcribe_pcm_stream(self, audio_stream, sample_rate=sample_rate, config=config)
 
 
 def get_stt_engine(use_fallback: bool = False) -> STTEngine:
@@ -15,6 +15,11 @@ from dataclasses import dataclass
 import tempfile
 import io
 
+import numpy as np
+
+from .audio_utils import aiff_frames_to_wav, pcm_to_wav
+from .tts_pipeline import MAX_SENTENCE_CHARS, TTSPipeline
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +66,7 @@ class TTSEngine:
         self.config = config or TTSConfig()
         self._tts = None
         self._initialized = False
+        self._pipeline: Optional[TTSPipeline] = None
         
         # Tone-to-prompt mapping for emotional injection
         self.tone_prompts = {
@@ -91,6 +97,41 @@ class TTSEngine:
             logger.error(f"Error initializing TTS: {e}")
             raise
     
+    @property
+    def voice_id(self) -> str:
+        """Identifies the voice for the phrase cache."""
+        return self.config.speaker_wav or self.config.model_name
+    
+    @property
+    def pipeline(self) -> TTSPipeline:
+        """Sentence pipeline with the shared phrase cache."""
+        if self._pipeline is None:
+            self._pipeline = TTSPipeline(self)
+        return self._pipeline
+    
+    def render_wav(self, text: str, tone: EmotionalTone = EmotionalTone.PROFESSIONAL) -> bytes:
+        """
+        Synthesize text to an in-memory WAV (no temp files, no cache).
+        
+        Args:
+            text: Text to synthesize
+            tone: Emotional tone
+        
+        Returns:
+            WAV bytes
+        """
+        if not self._initialized:
+            self._initialize_tts()
+        
+        wav = self._tts.tts(
+            text=text,
+            language=self.config.language,
+            speaker_wav=self.config.speaker_wav
+        )
+        synthesizer = getattr(self._tts, "synthesizer", None)
+        sample_rate = getattr(synthesizer, "output_sample_rate", None) or 24000  # XTTS v2 output rate
+        return pcm_to_wav(np.asarray(wav, dtype=np.float32), sample_rate)
+    
     def synthesize(
         self,
         text: str,
@@ -121,6 +162,10 @@ class TTSEngine:
                 # Tone is more about how we structure the text and use voice parameters
                 pass
             
+            if output_path is None and return_bytes:
+                # In-memory synthesis; repeated phrases come from the cache
+                return self.pipeline.synthesize_phrase(text, tone)
+            
             # Determine output path
             if output_path is None and not return_bytes:
                 # Create temporary file
@@ -130,12 +175,13 @@ class TTSEngine:
             
             # Synthesize speech
             if output_path:
-                self._tts.tts_to_file(
-                    text=text,
-                    file_path=output_path,
-                    language=self.config.language,
-                    speaker_wav=self.config.speaker_wav
-                )
+                with self.pipeline.render_lock:
+                    self._tts.tts_to_file(
+                        text=text,
+                        file_path=output_path,
+                        language=self.config.language,
+                        speaker_wav=self.config.speaker_wav
+                    )
                 
                 if return_bytes:
                     with open(output_path, 'rb') as f:
@@ -161,26 +207,22 @@ class TTSEngine:
         self,
         text: str,
         tone: EmotionalTone = EmotionalTone.PROFESSIONAL,
-        chunk_size: int = 100
+        chunk_size: int = MAX_SENTENCE_CHARS
     ):
         """
-        Synthesize speech in chunks for streaming.
+        Synthesize speech sentence by sentence for streaming.
+        
+        The next sentence is synthesized while the current one is consumed.
         
         Args:
             text: Text to synthesize
             tone: Emotional tone
-            chunk_size: Number of characters per chunk
+            chunk_size: Maximum characters per chunk (long sentences are split at word boundaries)
         
         Yields:
-            Audio chunks as bytes
+            Audio chunks as WAV bytes (one playable file per sentence)
         """
-        # Split text into chunks
-        chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-        
-        for chunk in chunks:
-            audio_bytes = self.synthesize(chunk, tone=tone, return_bytes=True)
-            if audio_bytes:
-                yield audio_bytes
+        yield from self.pipeline.stream(text, tone, max_chars=chunk_size)
     
     def get_available_voices(self) -> list:
         """Get list of available voices."""
@@ -205,10 +247,20 @@ class TTSEngineFallback:
     Fallback TTS engine using system TTS (pyttsx3) if Coqui XTTS is not available.
     """
     
+    voice_id = "pyttsx3"  # Identifies the voice for the phrase cache
+    
     def __init__(self):
         """Initialize fallback TTS."""
         self._engine = None
         self._initialized = False
+        self._pipeline: Optional[TTSPipeline] = None
+    
+    @property
+    def pipeline(self) -> TTSPipeline:
+        """Sentence pipeline with the shared phrase cache."""
+        if self._pipeline is None:
+            self._pipeline = TTSPipeline(self)
+        return self._pipeline
     
     def _initialize(self):
         """Lazy initialization."""
@@ -224,81 +276,99 @@ class TTSEngineFallback:
             logger.warning("pyttsx3 not available. TTS will be disabled.")
             self._engine = None
     
-    def _convert_to_wav(self, audio_path: str) -> bytes:
-        """Convert AIFF (macOS pyttsx3 default) to WAV format."""
-        import os
-        import io
-        
-        # Check if file is AIFF
-        with open(audio_path, 'rb') as f:
-            header = f.read(4)
-        
-        if header != b'FORM':
-            # Already WAV or other format, read as-is
-            with open(audio_path, 'rb') as f:
-                return f.read()
-        
-        # It's AIFF, convert to WAV
-        try:
-            # Method 1: Try using afconvert (macOS built-in tool)
-            import subprocess
-            import tempfile
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_wav:
-                wav_path = tmp_wav.name
-            
-            try:
-                result = subprocess.run(
-                    ['afconvert', '-f', 'WAVE', '-d', 'LEI16', audio_path, wav_path],
-                    capture_output=True,
-                    timeout=10,
-                    check=False
-                )
-                if result.returncode == 0 and os.path.exists(wav_path):
-                    with open(wav_path, 'rb') as f:
-                        wav_data = f.read()
-                    os.unlink(wav_path)
-                    logger.info("Successfully converted AIFF to WAV using afconvert")
-                    return wav_data
-            except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                logger.warning(f"afconvert not available: {e}")
-            finally:
-                if os.path.exists(wav_path):
-                    try:
-                        os.unlink(wav_path)
-                    except:
-                        pass
-        except Exception as e:
-            logger.warning(f"afconvert method failed: {e}")
+    def _convert_to_wav(self, audio_data: bytes) -> bytes:
+        """Convert AIFF (macOS pyttsx3 default) to WAV format, in memory."""
+        if audio_data[:4] != b'FORM':
+            # Already WAV or other format
+            return audio_data
         
-        # Method 2: Try using aifc (works with standard-aifc package on Python 3.13)
+        # Method 1: aifc (works with standard-aifc package on Python 3.13)
         try:
             import aifc
             import wave
             
-            with aifc.open(audio_path, 'rb') as aiff_file:
+            with aifc.open(io.BytesIO(audio_data), 'rb') as aiff_file:
                 frames = aiff_file.getnframes()
                 sample_rate = aiff_file.getframerate()
                 sample_width = aiff_file.getsampwidth()
                 channels = aiff_file.getnchannels()
-                audio_data = aiff_file.readframes(frames)
+                pcm = aiff_file.readframes(frames)
+            
+            pcm = aiff_frames_to_wav(pcm, sample_width)
             
             wav_buffer = io.BytesIO()
             with wave.open(wav_buffer, 'wb') as wav_file:
                 wav_file.setnchannels(channels)
                 wav_file.setsampwidth(sample_width)
                 wav_file.setframerate(sample_rate)
-                wav_file.writeframes(audio_data)
+                wav_file.writeframes(pcm)
             
-            logger.info("Successfully converted AIFF to WAV using aifc")
             return wav_buffer.getvalue()
         except Exception as e:
-            logger.error(f"aifc conversion failed: {e}")
+            logger.warning(f"aifc conversion failed: {e}")
+        
+        # Method 2: afconvert (macOS built-in tool, needs files)
+        try:
+            import subprocess
+            
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                aiff_path = os.path.join(tmp_dir, 'speech.aiff')
+                wav_path = os.path.join(tmp_dir, 'speech.wav')
+                with open(aiff_path, 'wb') as f:
+                    f.write(audio_data)
+                result = subprocess.run(
+                    ['afconvert', '-f', 'WAVE', '-d', 'LEI16', aiff_path, wav_path],
+                    capture_output=True,
+                    timeout=10,
+                    check=False
+                )
+                if result.returncode == 0 and os.path.exists(wav_path):
+                    with open(wav_path, 'rb') as f:
+                        logger.info("Converted AIFF to WAV using afconvert")
+                        return f.read()
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.warning(f"afconvert not available: {e}")
+        except Exception as e:
+            logger.warning(f"afconvert method failed: {e}")
         
         # Fallback: return raw AIFF (browser might not play it, but better than nothing)
         logger.warning("Could not convert AIFF to WAV, returning raw AIFF file")
-        with open(audio_path, 'rb') as f:
-            return f.read()
+        return audio_data
+    
+    def _apply_tone(self, tone: EmotionalTone):
+        """Adjust speaking rate based on tone."""
+        rate_map = {
+            EmotionalTone.CALM: 120,  # Slower
+            EmotionalTone.PROFESSIONAL: 150,  # Normal
+            EmotionalTone.ENERGETIC: 180,  # Faster
+            EmotionalTone.TECHNICAL: 140,  # Slightly slower
+            EmotionalTone.REASSURING: 130  # Slower
+        }
+        self._engine.setProperty('rate', rate_map.get(tone, 150))
+    
+    def render_wav(self, text: str, tone: EmotionalTone = EmotionalTone.PROFESSIONAL) -> Optional[bytes]:
+        """
+        Synthesize text to WAV bytes (no cache).
+        
+        pyttsx3 can only write files, so the raw output is read back once and
+        converted in memory.
+        """
+        if not self._initialized:
+            self._initialize()
+        
+        if not self._engine:
+            logger.warning("TTS not available")
+            return None
+        
+        self._apply_tone(tone)
+        # Use .aiff extension since pyttsx3 on macOS generates AIFF
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = os.path.join(tmp_dir, 'speech.aiff')
+            self._engine.save_to_file(text, tmp_path)
+            self._engine.runAndWait()
+            with open(tmp_path, 'rb') as f:
+                raw = f.read()
+        return self._convert_to_wav(raw)
     
     def synthesize(
         self,
@@ -316,53 +386,43 @@ class TTSEngineFallback:
             return None
         
         try:
-            # Adjust rate based on tone
-            rate_map = {
-                EmotionalTone.CALM: 120,  # Slower
-                EmotionalTone.PROFESSIONAL: 150,  # Normal
-                EmotionalTone.ENERGETIC: 180,  # Faster
-                EmotionalTone.TECHNICAL: 140,  # Slightly slower
-                EmotionalTone.REASSURING: 130  # Slower
-            }
-            
-            self._engine.setProperty('rate', rate_map.get(tone, 150))
-            
             if output_path:
-                self._engine.save_to_file(text, output_path)
-                self._engine.runAndWait()
+                with self.pipeline.render_lock:
+                    self._apply_tone(tone)
+                    self._engine.save_to_file(text, output_path)
+                    self._engine.runAndWait()
                 
                 if return_bytes:
                     # Convert AIFF to WAV if needed (pyttsx3 on macOS generates AIFF)
-                    audio_bytes = self._convert_to_wav(output_path)
-                    return audio_bytes
+                    with open(output_path, 'rb') as f:
+                        return self._convert_to_wav(f.read())
                 return None
+            elif return_bytes:
+                # Repeated phrases come from the cache
+                return self.pipeline.synthesize_phrase(text, tone)
             else:
-                # Can't return bytes directly with pyttsx3, need temp file
-                if return_bytes:
-                    import tempfile
-                    import os
-                    # Use .aiff extension since pyttsx3 on macOS generates AIFF
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.aiff') as tmp_file:
-                        tmp_path = tmp_file.name
-                    try:
-                        self._engine.save_to_file(text, tmp_path)
-                        self._engine.runAndWait()
-                        
-                        # Convert AIFF to WAV
-                        audio_bytes = self._convert_to_wav(tmp_path)
-                        os.unlink(tmp_path)
-                        return audio_bytes
-                    except Exception as e:
-                        if os.path.exists(tmp_path):
-                            os.unlink(tmp_path)
-                        raise
-                else:
-                    logger.warning("pyttsx3 requires output_path when return_bytes=False")
-                    return None
+                logger.warning("pyttsx3 requires output_path when return_bytes=False")
+                return None
                 
         except Exception as e:
             logger.error(f"Error in fallback TTS: {e}")
             return None
+    
+    def synthesize_streaming(
+        self,
+        text: str,
+        tone: EmotionalTone = EmotionalTone.PROFESSIONAL,
+        chunk_size: int = MAX_SENTENCE_CHARS
+    ):
+        """Synthesize speech sentence by sentence (see TTSEngine.synthesize_streaming)."""
+        if not self._initialized:
+            self._initialize()
+        
+        if not self._engine:
+            logger.warning("TTS not available")
+            return
+        
+        yield from self.pipeline.stream(text, tone, max_chars=chunk_size)
 
 
 def get_tts_engine(use_fallback: bool = False) -> TTSEngine:
@@ -0,0 +1,263 @@
+# Copyright (c) 2024. All rights reserved.
+# Licensed under the Apache License, Version 2.0. See LICENSE file in the project root for license information.
+
+"""
+TTS Synthesis Pipeline - Eddie v2.0
+
+Cuts time-to-first-audio for spoken responses:
+
+- text is split on sentence boundaries (never mid-word)
+- the next sentence is synthesized while the current one is streaming
+- audio stays in memory as WAV buffers
+- repeated phrases (greetings, disclaimers) are cached by (text, voice, tone)
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_SENTENCE_CHARS = 240
+PHRASE_CACHE_MAX_ENTRIES = 256
+PHRASE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PHRASE_CACHE_MAX_TEXT_CHARS = 400  # Long one-off answers are not worth caching
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]*\s+|\n{2,}')
+_CLAUSE_BREAK = re.compile(r'(?<=[,;:—-])\s+')
+# Abbreviations that end in a period but do not end a sentence
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "vs", "etc", "inc", "corp", "co", "ltd", "jr", "sr", "st", "e.g", "i.e", "u.s"}
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Split an over-long sentence at clause breaks, then at word boundaries."""
+    parts: List[str] = []
+    current = ""
+    for piece in _CLAUSE_BREAK.split(sentence):
+        for word in piece.split(" ") if len(piece) > max_chars else [piece]:
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > max_chars:
+                parts.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_sentences(text: str, max_chars: int = MAX_SENTENCE_CHARS) -> List[str]:
+    """
+    Split text into sentences for synthesis.
+
+    Args:
+        text: Text to speak
+        max_chars: Longer sentences are split at clause or word boundaries
+
+    Returns:
+        Sentences in order (whitespace normalized, never split mid-word)
+    """
+    sentences: List[str] = []
+    pending = ""
+    for raw in _SENTENCE_END.split(text):
+        raw = " ".join(raw.split())
+        if not raw:
+            continue
+        pending = f"{pending} {raw}".strip()
+        last_word = pending.rsplit(" ", 1)[-1].rstrip(".").lower()
+        if last_word in _ABBREVIATIONS or re.search(r'\b[A-Z]\.$', pending):
+            continue  # "Dr." / "U.S." - keep the sentence going
+        sentences.extend(_split_long(pending, max_chars) if len(pending) > max_chars else [pending])
+        pending = ""
+    if pending:
+        sentences.extend(_split_long(pending, max_chars) if len(pending) > max_chars else [pending])
+    return sentences
+
+
+class PhraseAudioCache:
+    """
+    LRU cache of synthesized audio keyed by (text, voice, tone).
+
+    Bounded by entry count and total bytes; only short phrases are stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PHRASE_CACHE_MAX_ENTRIES,
+        max_bytes: int = PHRASE_CACHE_MAX_BYTES,
+        max_text_chars: int = PHRASE_CACHE_MAX_TEXT_CHARS
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_text_chars = max_text_chars
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, voice: str, tone: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{voice}\x00{tone}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str, voice: str, tone: str) -> Optional[bytes]:
+        key = self.make_key(text, voice, tone)
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def put(self, text: str, voice: str, tone: str, audio: bytes):
+        if not audio or len(text) > self.max_text_chars or len(audio) > self.max_bytes:
+            return
+        key = self.make_key(text, voice, tone)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = audio
+            self._bytes += len(audio)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_phrase_cache: Optional[PhraseAudioCache] = None
+
+
+def get_phrase_cache() -> PhraseAudioCache:
+    """Get the process-wide phrase audio cache."""
+    global _phrase_cache
+    if _phrase_cache is None:
+        _phrase_cache = PhraseAudioCache()
+    return _phrase_cache
+
+
+class TTSPipeline:
+    """
+    Sentence-pipelined synthesis on top of a TTS engine.
+
+    The engine must provide ``render_wav(text, tone) -> bytes`` and a
+    ``voice_id`` attribute. Synthesis runs on a single worker thread,
+    ``prefetch`` sentences ahead of the consumer. TTS backends are not
+    thread-safe, so every render (streamed or not) holds ``render_lock``.
+
+    Example:
+        pipeline = TTSPipeline(engine)
+        for wav_bytes in pipeline.stream(answer, tone=EmotionalTone.CALM):
+            send(wav_bytes)
+    """
+
+    def __init__(self, engine, cache: Optional[PhraseAudioCache] = None, prefetch: int = 1):
+        """
+        Args:
+            engine: TTS engine exposing render_wav() and voice_id
+            cache: Phrase cache (default: process-wide cache)
+            prefetch: Sentences synthesized ahead of the one being streamed
+        """
+        self.engine = engine
+        self.cache = cache if cache is not None else get_phrase_cache()
+        self.prefetch = max(0, prefetch)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Held around every backend call; engines take it for their file output too
+        self.render_lock = threading.Lock()
+        self.last_stream_stats: Dict[str, Any] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-pipeline")
+            return self._executor
+
+    def synthesize_phrase(self, text: str, tone) -> Optional[bytes]:
+        """Synthesize one phrase as WAV bytes, using the phrase cache."""
+        tone_value = getattr(tone, "value", str(tone))
+        voice = str(getattr(self.engine, "voice_id", "default"))
+        audio = self.cache.get(text, voice, tone_value)
+        if audio is not None:
+            return audio
+        with self.render_lock:
+            audio = self.engine.render_wav(text, tone)
+        if audio:
+            self.cache.put(text, voice, tone_value, audio)
+        return audio
+
+    def stream(self, text: str, tone, max_chars: int = MAX_SENTENCE_CHARS) -> Iterator[bytes]:
+        """
+        Yield one WAV buffer per sentence, synthesizing ahead of the consumer.
+
+        Args:
+            text: Text to speak
+            tone: EmotionalTone
+            max_chars: Maximum characters per synthesized chunk
+
+        Yields:
+            WAV bytes, one complete playable file per sentence
+        """
+        sentences = split_sentences(text, max_chars)
+        if not sentences:
+            return
+        executor = self._get_executor()
+        pending = deque()
+        remaining = iter(sentences)
+        started = time.perf_counter()
+        stats = {"sentences": len(sentences), "time_to_first_audio": None, "total_seconds": None}
+        self.last_stream_stats = stats
+
+        def submit_next():
+            sentence = next(remaining, None)
+            if sentence is not None:
+                pending.append(executor.submit(self.synthesize_phrase, sentence, tone))
+
+        for _ in range(self.prefetch + 1):
+            submit_next()
+        try:
+            while pending:
+                audio = pending.popleft().result()
+                submit_next()
+                if audio:
+                    if stats["time_to_first_audio"] is None:
+                        stats["time_to_first_audio"] = time.perf_counter() - started
+                    yield audio
+        finally:
+            for future in pending:
+                future.cancel()
+            stats["total_seconds"] = time.perf_counter() - started
+
+    def warm(self, phrases: Iterable[str], tone):
+        """Pre-synthesize frequently spoken phrases into the cache."""
+        for phrase in phrases:
+            for sentence in split_sentences(phrase):
+                try:
+                    self.synthesize_phrase(sentence, tone)
+                except Exception as e:
+                    logger.warning(f"Could not warm TTS phrase '{sentence[:40]}': {e}")